@@ -1,8 +1,11 @@
 """Comprehensive PR analyzer to extract all valuable information."""
 
+import asyncio
+import copy
 import re
-import subprocess
-from typing import Dict
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -11,10 +14,79 @@ from ..core.logging import setup_logging
 logger = setup_logging(__name__)
 
 
+@dataclass
+class FileDiff:
+    """One file's change between two commits."""
+
+    path: str
+    added: int
+    deleted: int
+    binary: bool = False
+    patch: str = ""
+
+
+@dataclass
+class PRDiff:
+    """Every file change of a (base, head) range, from a single git diff."""
+
+    base_sha: str
+    head_sha: str
+    files: List[FileDiff] = field(default_factory=list)
+
+
+def parse_diff(output: str, base_sha: str, head_sha: str) -> PRDiff:
+    """
+    Parse ``git diff --numstat --patch`` output.
+
+    The numstat block comes first, one line per file in the same order as
+    the patches that follow it.
+    """
+    first_patch = re.search(r"^diff --git ", output, re.M)
+    split_at = first_patch.start() if first_patch else len(output)
+    numstat, patch_text = output[:split_at], output[split_at:]
+
+    files = []
+    for line in numstat.splitlines():
+        if not line.strip():
+            continue
+        added, deleted, path = line.split("\t", 2)
+        binary = added == "-" or deleted == "-"
+        files.append(
+            FileDiff(
+                path=path,
+                added=0 if binary else int(added),
+                deleted=0 if binary else int(deleted),
+                binary=binary,
+            )
+        )
+
+    patches = re.split(r"\n(?=diff --git )", patch_text) if patch_text else []
+    for file_diff, patch in zip(files, patches):
+        file_diff.patch = patch
+    return PRDiff(base_sha=base_sha, head_sha=head_sha, files=files)
+
+
 class ComprehensivePRAnalyzer:
     """Extracts every possible valuable metric and KPI from a PR."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        repo_path: Optional[str] = None,
+        max_concurrency: int = 8,
+        cache_size: int = 256,
+    ):
+        """
+        Args:
+            repo_path: Git checkout to diff in (defaults to the working directory)
+            max_concurrency: Files analyzed at once, and PRs at once in
+                ``analyze_prs``
+            cache_size: (base, head) ranges whose diff and code metrics are kept
+        """
+        self.repo_path = repo_path
+        self.max_concurrency = max_concurrency
+        self.cache_size = cache_size
+        self._diff_cache: "OrderedDict[Tuple[str, str], PRDiff]" = OrderedDict()
+        self._code_metrics_cache: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
         self.code_analyzers = {
             ".py": PythonAnalyzer(),
             ".js": JavaScriptAnalyzer(),
@@ -23,6 +95,16 @@ class ComprehensivePRAnalyzer:
             ".java": JavaAnalyzer(),
         }
 
+    async def analyze_prs(self, prs: Sequence[Tuple[Dict, str, str]]) -> List[Dict]:
+        """Analyze many (pr_data, base_sha, head_sha) PRs, e.g. for a backfill."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def analyze(pr_data: Dict, base_sha: str, head_sha: str) -> Dict:
+            async with semaphore:
+                return await self.analyze_pr(pr_data, base_sha, head_sha)
+
+        return await asyncio.gather(*(analyze(*pr) for pr in prs))
+
     async def analyze_pr(self, pr_data: Dict, base_sha: str, head_sha: str) -> Dict:
         """Extract comprehensive information from PR."""
 
@@ -77,7 +159,11 @@ class ComprehensivePRAnalyzer:
         }
 
     async def _analyze_code_changes(self, base_sha: str, head_sha: str) -> Dict:
-        """Analyze code changes in detail."""
+        """Analyze code changes in detail (cached per base/head pair)."""
+        key = (base_sha, head_sha)
+        if key in self._code_metrics_cache:
+            self._code_metrics_cache.move_to_end(key)
+            return copy.deepcopy(self._code_metrics_cache[key])
 
         metrics = {
             "total_lines_added": 0,
@@ -111,45 +197,114 @@ class ComprehensivePRAnalyzer:
             },
         }
 
-        # Get detailed diff
-        diff_output = subprocess.run(
-            ["git", "diff", "--numstat", f"{base_sha}...{head_sha}"],
-            capture_output=True,
-            text=True,
-        ).stdout
-
-        for line in diff_output.strip().split("\n"):
-            if line:
-                added, deleted, filepath = line.split("\t")
-                if added != "-" and deleted != "-":
-                    metrics["total_lines_added"] += int(added)
-                    metrics["total_lines_deleted"] += int(deleted)
-                    metrics["files_changed"] += 1
-
-                    # Analyze by file type
-                    path = Path(filepath)
-                    ext = path.suffix
-
-                    # Track language distribution
-                    lang = self._get_language_from_extension(ext)
-                    if lang:
-                        metrics["languages"][lang] = (
-                            metrics["languages"].get(lang, 0) + 1
-                        )
-
-                    # Categorize change
-                    category = self._categorize_file_change(filepath)
-                    metrics["change_categories"][category] += 1
-
-                    # Detailed analysis for supported languages
-                    if ext in self.code_analyzers:
-                        file_analysis = await self.code_analyzers[ext].analyze_file(
-                            filepath, base_sha, head_sha
-                        )
-                        self._merge_file_analysis(metrics, file_analysis)
+        diff = await self._get_diff(base_sha, head_sha)
+        text_files = [f for f in diff.files if not f.binary]
+
+        for file_diff in text_files:
+            metrics["total_lines_added"] += file_diff.added
+            metrics["total_lines_deleted"] += file_diff.deleted
+            metrics["files_changed"] += 1
+
+            # Track language distribution
+            lang = self._get_language_from_extension(Path(file_diff.path).suffix)
+            if lang:
+                metrics["languages"][lang] = metrics["languages"].get(lang, 0) + 1
+
+            # Categorize change
+            category = self._categorize_file_change(file_diff.path)
+            metrics["change_categories"][category] += 1
+
+        # Detailed analysis for supported languages, several files at once
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def analyze_file(file_diff: FileDiff) -> Dict:
+            analyzer = self.code_analyzers[Path(file_diff.path).suffix]
+            async with semaphore:
+                return await analyzer.analyze_file(
+                    file_diff.path, base_sha, head_sha, patch=file_diff.patch
+                )
+
+        file_analyses = await asyncio.gather(
+            *(
+                analyze_file(f)
+                for f in text_files
+                if Path(f.path).suffix in self.code_analyzers
+            )
+        )
+        for file_analysis in file_analyses:
+            self._merge_file_analysis(metrics, file_analysis)
 
+        self._remember(self._code_metrics_cache, key, copy.deepcopy(metrics))
         return metrics
 
+    async def _get_diff(self, base_sha: str, head_sha: str) -> PRDiff:
+        """Numstat and patch of ``base...head`` from one git call, cached."""
+        key = (base_sha, head_sha)
+        if key in self._diff_cache:
+            self._diff_cache.move_to_end(key)
+            return self._diff_cache[key]
+
+        process = await asyncio.create_subprocess_exec(
+            "git",
+            "diff",
+            "--no-color",
+            "--no-ext-diff",
+            "--no-renames",
+            "--numstat",
+            "--patch",
+            f"{base_sha}...{head_sha}",
+            cwd=self.repo_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            # Not cached: the commits may be fetched later
+            logger.warning(
+                f"git diff {base_sha}...{head_sha} failed: "
+                f"{stderr.decode(errors='replace').strip()}"
+            )
+            return PRDiff(base_sha=base_sha, head_sha=head_sha)
+
+        diff = parse_diff(stdout.decode(errors="replace"), base_sha, head_sha)
+        self._remember(self._diff_cache, key, diff)
+        return diff
+
+    def _remember(self, cache: OrderedDict, key: Tuple[str, str], value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    def _get_language_from_extension(self, ext: str) -> Optional[str]:
+        """Language name of a file extension, if it is a known one."""
+        return LANGUAGES.get(ext.lower())
+
+    def _categorize_file_change(self, filepath: str) -> str:
+        """Bucket a changed file into one of ``change_categories``."""
+        path = filepath.lower()
+        name = Path(path).name
+        if "test" in path:
+            return "test"
+        if path.endswith((".md", ".rst", ".txt")) or "/docs/" in f"/{path}":
+            return "docs"
+        if name in DEPENDENCY_FILES:
+            return "dependency"
+        if path.endswith((".yml", ".yaml", ".toml", ".ini", ".cfg", ".json")):
+            return "config"
+        return "feature"
+
+    def _merge_file_analysis(self, metrics: Dict, file_analysis: Dict) -> None:
+        """Add one file's analyzer output to the PR's code metrics."""
+        indicators = metrics["code_quality_indicators"]
+        indicators["functions_added"] += file_analysis.get(
+            "functions_added", 0
+        ) + file_analysis.get("methods_added", 0)
+        indicators["classes_added"] += file_analysis.get("classes_added", 0)
+        metrics["complexity_changes"]["net_change"] += file_analysis.get(
+            "complexity_change", 0
+        )
+
     async def _extract_performance_metrics(self, pr_data: Dict) -> Dict:
         """Extract performance-related metrics from PR."""
 
@@ -883,10 +1038,40 @@ class ComprehensivePRAnalyzer:
         return min(100.0, score)
 
 
+LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".java": "java",
+    ".rs": "rust",
+    ".rb": "ruby",
+    ".sql": "sql",
+    ".sh": "shell",
+    ".yml": "yaml",
+    ".yaml": "yaml",
+}
+
+DEPENDENCY_FILES = {
+    "requirements.txt",
+    "pyproject.toml",
+    "poetry.lock",
+    "package.json",
+    "package-lock.json",
+    "go.mod",
+    "go.sum",
+    "pom.xml",
+}
+
+
 class PythonAnalyzer:
     """Analyze Python code changes."""
 
-    async def analyze_file(self, filepath: str, base_sha: str, head_sha: str) -> Dict:
+    async def analyze_file(
+        self, filepath: str, base_sha: str, head_sha: str, patch: str = ""
+    ) -> Dict:
         """Analyze Python file changes."""
         # This would use AST analysis
         # For now, returning mock data
@@ -901,7 +1086,9 @@ class PythonAnalyzer:
 class JavaScriptAnalyzer:
     """Analyze JavaScript code changes."""
 
-    async def analyze_file(self, filepath: str, base_sha: str, head_sha: str) -> Dict:
+    async def analyze_file(
+        self, filepath: str, base_sha: str, head_sha: str, patch: str = ""
+    ) -> Dict:
         """Analyze JavaScript file changes."""
         return {"functions_added": 2, "components_added": 1, "complexity_change": 0}
 
@@ -909,7 +1096,9 @@ class JavaScriptAnalyzer:
 class TypeScriptAnalyzer:
     """Analyze TypeScript code changes."""
 
-    async def analyze_file(self, filepath: str, base_sha: str, head_sha: str) -> Dict:
+    async def analyze_file(
+        self, filepath: str, base_sha: str, head_sha: str, patch: str = ""
+    ) -> Dict:
         """Analyze TypeScript file changes."""
         return {
             "functions_added": 2,
@@ -921,7 +1110,9 @@ class TypeScriptAnalyzer:
 class GoAnalyzer:
     """Analyze Go code changes."""
 
-    async def analyze_file(self, filepath: str, base_sha: str, head_sha: str) -> Dict:
+    async def analyze_file(
+        self, filepath: str, base_sha: str, head_sha: str, patch: str = ""
+    ) -> Dict:
         """Analyze Go file changes."""
         return {"functions_added": 1, "structs_added": 2, "interfaces_added": 1}
 
@@ -929,6 +1120,8 @@ class GoAnalyzer:
 class JavaAnalyzer:
     """Analyze Java code changes."""
 
-    async def analyze_file(self, filepath: str, base_sha: str, head_sha: str) -> Dict:
+    async def analyze_file(
+        self, filepath: str, base_sha: str, head_sha: str, patch: str = ""
+    ) -> Dict:
         """Analyze Java file changes."""
         return {"methods_added": 4, "classes_added": 1, "interfaces_added": 1}
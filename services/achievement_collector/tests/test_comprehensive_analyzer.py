@@ -17,7 +17,11 @@ sys.path.insert(0, str(project_root))
 
 from services.achievement_collector.services.comprehensive_pr_analyzer import (  # noqa: E402
     ComprehensivePRAnalyzer,
+    parse_diff,
 )
+import subprocess  # noqa: E402
+from unittest.mock import patch  # noqa: E402
+
 import pytest  # noqa: E402
 
 
@@ -82,6 +86,87 @@ async def test_comprehensive_analyzer():
         return False
 
 
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def pr_repo(tmp_path):
+    """Git repo with a base commit and a head commit changing four files."""
+    _git(tmp_path, "init", "-q")
+    (tmp_path / "app.py").write_text("def a():\n    return 1\n")
+    (tmp_path / "README.md").write_text("# Demo\n")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "base")
+    base = _git(tmp_path, "rev-parse", "HEAD")
+
+    (tmp_path / "app.py").write_text("def a():\n    return 2\n\n\ndef b():\n    pass\n")
+    (tmp_path / "README.md").write_text("# Demo\n\nUsage\n")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_app.py").write_text("def test_a():\n    pass\n")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\x00\x01")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-qm", "head")
+    return tmp_path, base, _git(tmp_path, "rev-parse", "HEAD")
+
+
+@pytest.mark.asyncio
+async def test_code_metrics_from_one_cached_diff(pr_repo):
+    """One git process per (base, head); analyzers get each file's patch."""
+    repo, base, head = pr_repo
+    analyzer = ComprehensivePRAnalyzer(repo_path=str(repo))
+    patches = {}
+
+    async def analyze_file(filepath, base_sha, head_sha, patch=""):
+        patches[filepath] = patch
+        return {"functions_added": 1, "complexity_change": 1}
+
+    real_exec = asyncio.create_subprocess_exec
+    with (
+        patch.object(analyzer.code_analyzers[".py"], "analyze_file", analyze_file),
+        patch("asyncio.create_subprocess_exec", side_effect=real_exec) as spawn,
+    ):
+        metrics = await analyzer._analyze_code_changes(base, head)
+        again = await analyzer._analyze_code_changes(base, head)
+
+    assert spawn.call_count == 1
+    assert again == metrics
+    assert metrics["files_changed"] == 3  # The binary file has no line counts
+    assert metrics["total_lines_added"] == 9
+    assert metrics["total_lines_deleted"] == 1
+    assert metrics["languages"] == {"python": 2}
+    assert metrics["change_categories"]["test"] == 1
+    assert metrics["change_categories"]["docs"] == 1
+    assert metrics["code_quality_indicators"]["functions_added"] == 2
+    assert metrics["complexity_changes"]["net_change"] == 2
+    assert set(patches) == {"app.py", "tests/test_app.py"}
+    assert patches["app.py"].startswith("diff --git a/app.py b/app.py")
+    assert "+def b():" in patches["app.py"]
+    assert "test_a" not in patches["app.py"]
+
+
+def test_parse_diff_marks_binary_files():
+    output = (
+        "-\t-\tlogo.png\n1\t0\tx.py\n"
+        "diff --git a/logo.png b/logo.png\nBinary files differ\n"
+        "diff --git a/x.py b/x.py\n+y = 1\n"
+    )
+
+    diff = parse_diff(output, "a", "b")
+
+    assert [(f.path, f.binary, f.added) for f in diff.files] == [
+        ("logo.png", True, 0),
+        ("x.py", False, 1),
+    ]
+    assert diff.files[1].patch == "diff --git a/x.py b/x.py\n+y = 1\n"
+
+
 if __name__ == "__main__":
     success = asyncio.run(test_comprehensive_analyzer())
     sys.exit(0 if success else 1)
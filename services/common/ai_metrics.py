@@ -3,14 +3,32 @@ AI-specific metrics tracking for production monitoring.
 
 Tracks token usage, response times, costs, and confidence scores
 to monitor AI system health and detect performance degradation.
+Latency quantiles come from mergeable sketches, so per-worker windows
+can be combined into a cluster-wide view through Redis.
 """
 
-from datetime import datetime
-from collections import deque
+import logging
+import os
+import socket
 import statistics
-from typing import Optional, Dict, Any
+import struct
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
 from prometheus_client import Counter, Histogram, Gauge, Summary
 
+from services.common.quantile_sketch import DDSketch
+
+logger = logging.getLogger(__name__)
+
+# 1% relative error on reported latency quantiles
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Redis hash per time slot: field "<worker>|<model>|<service>" -> stats bytes
+SKETCH_KEY_PREFIX = "ai_metrics:sketch"
+
 # Prometheus metrics for AI monitoring
 AI_REQUESTS_TOTAL = Counter(
     "ai_requests_total", "Total number of AI inference requests", ["model", "service"]
@@ -82,26 +100,83 @@ AI_COST_PER_REQUEST = Summary(
 )
 
 
+class InferenceStats:
+    """Mergeable latency sketch plus token and cost totals for one series."""
+
+    _TOTALS = struct.Struct("<dd")
+
+    def __init__(self, latency: Optional[DDSketch] = None):
+        self.latency = latency or DDSketch(SKETCH_RELATIVE_ACCURACY)
+        self.tokens = 0.0
+        self.cost = 0.0
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    def add(self, response_time_ms: float, tokens: int, cost: float) -> None:
+        self.latency.add(response_time_ms)
+        self.tokens += tokens
+        self.cost += cost
+
+    def merge(self, other: "InferenceStats") -> None:
+        self.latency.merge(other.latency)
+        self.tokens += other.tokens
+        self.cost += other.cost
+
+    def to_bytes(self) -> bytes:
+        return self._TOTALS.pack(self.tokens, self.cost) + self.latency.to_bytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "InferenceStats":
+        stats = cls(DDSketch.from_bytes(data[cls._TOTALS.size :]))
+        stats.tokens, stats.cost = cls._TOTALS.unpack_from(data)
+        return stats
+
+
 class AIMetricsTracker:
-    """Track AI-specific metrics for monitoring and alerting."""
+    """Track AI-specific metrics for monitoring and alerting.
 
-    def __init__(self, window_size: int = 1000):
+    Latency, token and cost statistics are kept per (model, service) in a
+    ring of time slots, each holding a mergeable ``InferenceStats``. Reads
+    merge the live slots, expired slots are reset in place when their turn
+    comes round, and ``publish`` pushes each slot's serialized stats to
+    Redis so ``get_cluster_metrics`` can merge every worker's view.
+    """
+
+    def __init__(
+        self,
+        window_size: int = 1000,
+        window_seconds: float = 600.0,
+        window_slots: int = 10,
+        worker_id: Optional[str] = None,
+    ):
         """
-        Initialize metrics tracker with rolling window.
+        Initialize metrics tracker with a time-decayed window.
 
         Args:
-            window_size: Number of recent requests to track
+            window_size: Number of recent confidence scores kept for drift
+                detection
+            window_seconds: Time span covered by latency, token and cost stats
+            window_slots: Number of slots the window rotates through
+            worker_id: Identifies this process in Redis (host:pid by default)
         """
         self.window_size = window_size
-        self.token_usage = deque(maxlen=window_size)
-        self.response_times = deque(maxlen=window_size)
+        self.window_slots = window_slots
+        self.slot_seconds = window_seconds / window_slots
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
         self.confidence_scores = deque(maxlen=window_size)
-        self.model_costs = deque(maxlen=window_size)
         self.error_count = 0
         self.total_requests = 0
 
-        # Track by model type
-        self.model_metrics: Dict[str, Dict[str, deque]] = {}
+        # (model, service) -> ring of stats, and the slot number each holds
+        self._series: Dict[Tuple[str, str], List[InferenceStats]] = {}
+        self._slot_ids: Dict[Tuple[str, str], List[int]] = {}
+        self._lock = threading.Lock()
+        self._publisher: Optional[threading.Thread] = None
+
+    def _slot(self, now: Optional[float] = None) -> int:
+        return int((time.time() if now is None else now) // self.slot_seconds)
 
     def record_inference(
         self,
@@ -127,7 +202,6 @@ class AIMetricsTracker:
             error: Whether the inference resulted in an error
             service: Service name making the request
         """
-        datetime.utcnow()
         self.total_requests += 1
 
         # Emit Prometheus metrics
@@ -160,45 +234,172 @@ class AIMetricsTracker:
             AI_CONFIDENCE_SCORE.labels(model=model_name, service=service).set(
                 confidence
             )
-
-        # Update global metrics
-        self.token_usage.append(tokens_used)
-        self.response_times.append(response_time_ms)
-        self.model_costs.append(cost)
-
-        if confidence is not None:
             self.confidence_scores.append(confidence)
 
-        # Update per-model metrics
-        if model_name not in self.model_metrics:
-            self.model_metrics[model_name] = {
-                "response_times": deque(maxlen=self.window_size),
-                "token_usage": deque(maxlen=self.window_size),
-                "costs": deque(maxlen=self.window_size),
-            }
+        self._add_to_window((model_name, service), response_time_ms, tokens_used, cost)
 
-        self.model_metrics[model_name]["response_times"].append(response_time_ms)
-        self.model_metrics[model_name]["token_usage"].append(tokens_used)
-        self.model_metrics[model_name]["costs"].append(cost)
+    def _add_to_window(
+        self,
+        key: Tuple[str, str],
+        response_time_ms: float,
+        tokens_used: int,
+        cost: float,
+    ) -> None:
+        """Add one inference to the current slot of a (model, service) series."""
+        slot = self._slot()
+        index = slot % self.window_slots
+        with self._lock:
+            ring = self._series.get(key)
+            if ring is None:
+                ring = self._series[key] = [
+                    InferenceStats() for _ in range(self.window_slots)
+                ]
+                self._slot_ids[key] = [slot] * self.window_slots
+            slot_ids = self._slot_ids[key]
+            if slot_ids[index] != slot:
+                # Slot expired: reuse it for the current interval
+                ring[index] = InferenceStats()
+                slot_ids[index] = slot
+            ring[index].add(response_time_ms, tokens_used, cost)
+
+    def _window_stats(self) -> Dict[Tuple[str, str], InferenceStats]:
+        """Merge the live slots of every series."""
+        oldest = self._slot() - self.window_slots
+        merged = {}
+        with self._lock:
+            for key, ring in self._series.items():
+                stats = InferenceStats()
+                for slot_id, slot_stats in zip(self._slot_ids[key], ring):
+                    if slot_id > oldest:
+                        stats.merge(slot_stats)
+                merged[key] = stats
+        return merged
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get current AI metrics for monitoring."""
-        metrics = {
-            "total_requests": self.total_requests,
-            "error_rate": self.error_count / max(1, self.total_requests),
-            "avg_tokens_per_request": self._safe_mean(self.token_usage),
-            "avg_response_time_ms": self._safe_mean(self.response_times),
-            "p95_response_time_ms": self._safe_percentile(self.response_times, 95),
-            "p99_response_time_ms": self._safe_percentile(self.response_times, 99),
-            "total_cost_last_window": sum(self.model_costs),
-            "cost_per_request": self._safe_mean(self.model_costs),
-            "avg_confidence": self._safe_mean(self.confidence_scores),
-            "confidence_trend": self._detect_confidence_drift(),
-            "model_breakdown": self._get_model_breakdown(),
-        }
+        series = self._window_stats()
+        metrics = self._summarize(series)
+        metrics.update(
+            {
+                "total_requests": self.total_requests,
+                "error_rate": self.error_count / max(1, self.total_requests),
+                "avg_confidence": self._safe_mean(self.confidence_scores),
+                "confidence_trend": self._detect_confidence_drift(),
+            }
+        )
+        return metrics
+
+    def publish(self, redis_client: Any) -> int:
+        """
+        Push this worker's live slots to Redis.
+
+        Each slot is stored under ``ai_metrics:sketch:<slot>`` with one hash
+        field per worker and series, and expires with the window.
+
+        Args:
+            redis_client: Synchronous redis client
+
+        Returns:
+            Number of series slots written
+        """
+        oldest = self._slot() - self.window_slots
+        ttl = int(self.slot_seconds * (self.window_slots + 1)) + 1
+        written = 0
+        with self._lock:
+            payload = [
+                (slot_id, key, stats.to_bytes())
+                for key, ring in self._series.items()
+                for slot_id, stats in zip(self._slot_ids[key], ring)
+                if slot_id > oldest and stats.count
+            ]
+
+        pipe = redis_client.pipeline(transaction=False)
+        for slot_id, (model, service), data in payload:
+            redis_key = f"{SKETCH_KEY_PREFIX}:{slot_id}"
+            pipe.hset(redis_key, f"{self.worker_id}|{model}|{service}", data)
+            pipe.expire(redis_key, ttl)
+            written += 1
+        pipe.execute()
+        return written
+
+    def start_publishing(self, redis_client: Any, interval: float = 10.0) -> None:
+        """Publish to Redis every ``interval`` seconds from a daemon thread."""
+        if self._publisher and self._publisher.is_alive():
+            return
+
+        def run() -> None:
+            failing = False
+            while True:
+                time.sleep(interval)
+                try:
+                    self.publish(redis_client)
+                    failing = False
+                except Exception as e:
+                    # Warn once per outage
+                    if not failing:
+                        logger.warning(f"Failed to publish AI metric sketches: {e}")
+                    failing = True
+
+        self._publisher = threading.Thread(
+            target=run, name="ai-metrics-publisher", daemon=True
+        )
+        self._publisher.start()
 
+    def get_cluster_metrics(self, redis_client: Any) -> Dict[str, Any]:
+        """
+        Merge every worker's published slots into fleet-wide metrics.
+
+        Args:
+            redis_client: Synchronous redis client
+
+        Returns:
+            Latency, token and cost metrics in the ``get_metrics`` layout,
+            plus the number of workers that contributed
+        """
+        current = self._slot()
+        pipe = redis_client.pipeline(transaction=False)
+        for slot_id in range(current - self.window_slots + 1, current + 1):
+            pipe.hgetall(f"{SKETCH_KEY_PREFIX}:{slot_id}")
+
+        series: Dict[Tuple[str, str], InferenceStats] = {}
+        workers = set()
+        for fields in pipe.execute():
+            for field, data in fields.items():
+                if isinstance(field, bytes):
+                    field = field.decode()
+                worker, model, service = field.rsplit("|", 2)
+                workers.add(worker)
+                stats = InferenceStats.from_bytes(data)
+                if (model, service) in series:
+                    series[(model, service)].merge(stats)
+                else:
+                    series[(model, service)] = stats
+
+        metrics = self._summarize(series)
+        metrics["workers"] = len(workers)
         return metrics
 
+    def _summarize(
+        self, series: Dict[Tuple[str, str], InferenceStats]
+    ) -> Dict[str, Any]:
+        """Window-level metrics from merged per-series stats."""
+        overall = InferenceStats()
+        by_model: Dict[str, InferenceStats] = {}
+        for (model, _), stats in series.items():
+            overall.merge(stats)
+            by_model.setdefault(model, InferenceStats()).merge(stats)
+
+        count = overall.count
+        return {
+            "avg_tokens_per_request": overall.tokens / count if count else 0.0,
+            "avg_response_time_ms": overall.latency.mean,
+            "p95_response_time_ms": overall.latency.quantile(0.95) or 0.0,
+            "p99_response_time_ms": overall.latency.quantile(0.99) or 0.0,
+            "total_cost_last_window": overall.cost,
+            "cost_per_request": overall.cost / count if count else 0.0,
+            "model_breakdown": self._get_model_breakdown(by_model),
+        }
+
     def _calculate_cost(
         self, model_name: str, prompt_tokens: int, completion_tokens: int
     ) -> float:
@@ -253,7 +454,7 @@ class AIMetricsTracker:
             drift_percentage = 0
 
         # Emit drift metrics to Prometheus for all models
-        for model_name in self.model_metrics.keys():
+        for model_name in {model for model, _ in list(self._series)}:
             AI_CONFIDENCE_DRIFT.labels(model=model_name, service="global").set(
                 abs(drift_percentage)
             )
@@ -268,16 +469,21 @@ class AIMetricsTracker:
 
         return "stable"
 
-    def _get_model_breakdown(self) -> Dict[str, Dict[str, float]]:
+    def _get_model_breakdown(
+        self, by_model: Dict[str, InferenceStats]
+    ) -> Dict[str, Dict[str, float]]:
         """Get metrics breakdown by model type."""
         breakdown = {}
 
-        for model_name, metrics in self.model_metrics.items():
+        for model_name, stats in by_model.items():
+            if not stats.count:
+                continue
             breakdown[model_name] = {
-                "request_count": len(metrics["response_times"]),
-                "avg_response_time_ms": self._safe_mean(metrics["response_times"]),
-                "avg_tokens": self._safe_mean(metrics["token_usage"]),
-                "total_cost": sum(metrics["costs"]),
+                "request_count": stats.count,
+                "avg_response_time_ms": stats.latency.mean,
+                "p95_response_time_ms": stats.latency.quantile(0.95),
+                "avg_tokens": stats.tokens / stats.count,
+                "total_cost": stats.cost,
             }
 
         return breakdown
@@ -286,18 +492,30 @@ class AIMetricsTracker:
         """Calculate mean with empty check."""
         return statistics.mean(data) if data else 0.0
 
-    def _safe_percentile(self, data: deque, percentile: int) -> float:
-        """Calculate percentile with safety checks."""
-        if not data:
-            return 0.0
 
-        if len(data) < 20:
-            return max(data)
+# Global instance for easy access
+ai_metrics = AIMetricsTracker()
 
-        sorted_data = sorted(data)
-        index = int(len(sorted_data) * percentile / 100)
-        return sorted_data[min(index, len(sorted_data) - 1)]
 
+def maybe_start_sketch_publisher() -> None:
+    """
+    Publish ``ai_metrics`` sketches to Redis in the background.
 
-# Global instance for easy access
-ai_metrics = AIMetricsTracker()
+    Uses ``REDIS_URL`` and ``AI_METRICS_PUBLISH_INTERVAL`` (seconds, 0
+    disables).
+    """
+    interval = float(os.getenv("AI_METRICS_PUBLISH_INTERVAL", "10"))
+    if interval <= 0:
+        return
+    try:
+        import redis
+
+        client = redis.from_url(
+            os.getenv("REDIS_URL", "redis://redis:6379"),
+            socket_timeout=1.0,
+            socket_connect_timeout=1.0,
+        )
+    except Exception as e:
+        logger.warning(f"AI metric sketch publishing disabled: {e}")
+        return
+    ai_metrics.start_publishing(client, interval)
@@ -0,0 +1,151 @@
+"""
+AI metrics tracker benchmark.
+
+Compares the previous per-process deques with the sketch windows:
+
+- record: storage cost of one inference (the Prometheus calls, identical
+  in both, are excluded), and the full ``record_inference`` call
+- read: computing mean/p95/p99 over the window
+- memory: bytes held per (model, service) series with a full window, and
+  the serialized size pushed to Redis per slot
+
+Usage:
+    python -m services.common.ai_metrics_benchmark [--calls 100000]
+"""
+
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Dict, List
+
+from services.common.ai_metrics import AIMetricsTracker
+
+WINDOW = 1000
+
+
+class DequeWindow:
+    """The previous storage: global and per-model deques of raw samples."""
+
+    def __init__(self, window_size: int = WINDOW):
+        self.window_size = window_size
+        self.token_usage = deque(maxlen=window_size)
+        self.response_times = deque(maxlen=window_size)
+        self.model_costs = deque(maxlen=window_size)
+        self.model_metrics: Dict[str, Dict[str, deque]] = {}
+
+    def add(self, model: str, response_time_ms: float, tokens: int, cost: float):
+        self.token_usage.append(tokens)
+        self.response_times.append(response_time_ms)
+        self.model_costs.append(cost)
+        if model not in self.model_metrics:
+            self.model_metrics[model] = {
+                "response_times": deque(maxlen=self.window_size),
+                "token_usage": deque(maxlen=self.window_size),
+                "costs": deque(maxlen=self.window_size),
+            }
+        self.model_metrics[model]["response_times"].append(response_time_ms)
+        self.model_metrics[model]["token_usage"].append(tokens)
+        self.model_metrics[model]["costs"].append(cost)
+
+    def read(self) -> Dict[str, float]:
+        ordered = sorted(self.response_times)
+        return {
+            "avg": statistics.mean(self.response_times),
+            "p95": ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)],
+            "p99": ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)],
+            "avg_tokens": statistics.mean(self.token_usage),
+            "cost": sum(self.model_costs),
+        }
+
+
+def latencies(count: int, seed: int = 11) -> List[float]:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(6.5, 0.8) for _ in range(count)]
+
+
+def per_call_us(run: Callable[[float], None], values: List[float]) -> float:
+    start = time.perf_counter()
+    for value in values:
+        run(value)
+    return (time.perf_counter() - start) / len(values) * 1e6
+
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()  # noqa: F841 - keep the structure alive while measuring
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI metrics tracker benchmark")
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=1000)
+    args = parser.parse_args()
+
+    values = latencies(args.calls)
+    key = ("gpt-4o", "persona_runtime")
+
+    old = DequeWindow()
+    new = AIMetricsTracker()
+    old_add = per_call_us(lambda v: old.add(key[0], v, 120, 0.002), values)
+    new_add = per_call_us(lambda v: new._add_to_window(key, v, 120, 0.002), values)
+    full = per_call_us(
+        lambda v: new.record_inference(
+            key[0], 120, v, prompt_tokens=80, completion_tokens=40, service=key[1]
+        ),
+        values,
+    )
+
+    start = time.perf_counter()
+    for _ in range(args.reads):
+        old.read()
+    old_read = (time.perf_counter() - start) / args.reads * 1e6
+    start = time.perf_counter()
+    for _ in range(args.reads):
+        new.get_metrics()
+    new_read = (time.perf_counter() - start) / args.reads * 1e6
+
+    def filled_tracker() -> AIMetricsTracker:
+        tracker = AIMetricsTracker()
+        base = tracker._slot()
+        for slot in range(tracker.window_slots):
+            # One window's worth of samples in every slot
+            tracker._slot = lambda now=None, slot=slot: base + slot
+            for value in values[:WINDOW]:
+                tracker._add_to_window(key, value, 120, 0.002)
+        return tracker
+
+    def filled_deques() -> DequeWindow:
+        window = DequeWindow()
+        for value in values[:WINDOW]:
+            window.add(key[0], value, 120, 0.002)
+        return window
+
+    old_mem = retained_bytes(filled_deques)
+    new_mem = retained_bytes(filled_tracker)
+    stats = max(filled_tracker()._series[key], key=lambda s: s.count)
+
+    print(f"{args.calls} inferences, {args.reads} reads")
+    print(f"{'':>18} {'deque':>10} {'sketch':>10}")
+    print(f"{'record (us)':>18} {old_add:>10.2f} {new_add:>10.2f}")
+    print(f"{'read (us)':>18} {old_read:>10.1f} {new_read:>10.1f}")
+    print(f"{'bytes/series':>18} {old_mem:>10} {new_mem:>10}")
+    print(
+        f"(deques hold {WINDOW} samples; the sketch window holds "
+        f"{WINDOW} per slot x {new.window_slots} slots)"
+    )
+    print(f"full record_inference with Prometheus: {full:.2f} us")
+    print(
+        f"serialized slot: {len(stats.to_bytes())} bytes "
+        f"({len(stats.latency.bins)} buckets, {stats.count} samples)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,22 @@ AI safety and security monitoring for production systems.
 
 Provides prompt injection detection, hallucination risk assessment,
 and content safety checks for AI-generated outputs.
+
+Each check's rules are compiled into one alternation of named groups, so a
+text is scanned once per check however many rules there are. Before that
+scan, literals every match must contain (derived from each pattern) are
+looked up in the lowercased text, and only rules whose literals are present
+enter the alternation; clean text never reaches the regex engine. Rules can
+be replaced at runtime with ``load_rules`` or reloaded from the JSON/YAML
+file named by ``AI_SAFETY_RULES_PATH``.
 """
 
+import json
+import os
 import re
-from typing import Dict, List, Any
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
 from datetime import datetime
 import logging
 from services.common.ai_metrics import (
@@ -15,70 +27,227 @@ from services.common.ai_metrics import (
     AI_SECURITY_INCIDENTS,
 )
 
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse  # type: ignore[no-redef]
+
 logger = logging.getLogger(__name__)
 
+# Seconds between checks of the rules file for changes
+RULES_RELOAD_INTERVAL = 5.0
+
+RISK_SCORES = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
+DEFAULT_RULES: Dict[str, Any] = {
+    # Prompt injection patterns
+    "prompt_injection": [
+        (r"ignore previous instructions", "override_attempt", "high"),
+        (r"disregard all prior", "override_attempt", "high"),
+        (r"system:\s*", "role_injection", "high"),
+        (r"assistant:\s*", "role_injection", "high"),
+        (r"forget everything above", "memory_manipulation", "high"),
+        (r"new instructions:", "instruction_injection", "medium"),
+        (r"act as if you", "behavior_manipulation", "medium"),
+        (r"pretend to be", "identity_manipulation", "medium"),
+        (r"you are now", "identity_manipulation", "medium"),
+        (r"<\|.*?\|>", "special_tokens", "high"),
+        (r"\[INST\].*?\[/INST\]", "special_tokens", "high"),
+    ],
+    # Hallucination risk indicators
+    "hallucination": {
+        "financial": {
+            "patterns": [
+                r"\$[\d,]+(?:\.\d+)?(?:B|M|K)?",
+                r"revenue",
+                r"profit",
+                r"earnings",
+            ],
+            "risk_level": "high",
+        },
+        "statistical": {
+            "patterns": [
+                r"\d+(?:\.\d+)?%",
+                r"average of \d+",
+                r"median",
+                r"standard deviation",
+            ],
+            "risk_level": "medium",
+        },
+        "temporal": {
+            "patterns": [
+                r"20\d{2}",
+                r"(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}",
+            ],
+            "risk_level": "medium",
+        },
+        "medical": {
+            "patterns": [
+                r"diagnos",
+                r"treatment",
+                r"prescription",
+                r"medical advice",
+            ],
+            "risk_level": "critical",
+        },
+        "legal": {
+            "patterns": [r"legal advice", r"lawsuit", r"contract", r"liability"],
+            "risk_level": "critical",
+        },
+    },
+    # Content safety patterns
+    "content_safety": [
+        (r"harm\s+(yourself|others)", "violence", "critical"),
+        (r"illegal\s+(?:activity|substance)", "illegal_content", "high"),
+        (r"personal\s+(?:information|data|details)", "privacy", "medium"),
+        (r"(?:credit\s+card|ssn|social\s+security)", "pii", "high"),
+    ],
+}
+
+
+@lru_cache(maxsize=256)
+def _compile_alternation(alternatives: Tuple[Tuple[int, str], ...]) -> Pattern:
+    """One case-insensitive regex with a named group ``r<i>`` per rule."""
+    return re.compile(
+        "|".join(f"(?P<r{i}>{pattern})" for i, pattern in alternatives),
+        re.IGNORECASE,
+    )
+
+
+def _better(current: Optional[List[str]], candidate: Optional[List[str]]):
+    """Prefer the requirement whose shortest literal is longest."""
+    if not candidate or not all(candidate):
+        return current
+    if current is None or min(map(len, candidate)) > min(map(len, current)):
+        return candidate
+    return current
+
+
+def _requirement(items: Sequence[Tuple[Any, Any]]) -> Optional[List[str]]:
+    """Literals of which at least one must appear in any match of ``items``."""
+    best: Optional[List[str]] = None
+    run: List[str] = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        best = _better(best, ["".join(run)] if run else None)
+        run = []
+        if op is sre_parse.SUBPATTERN:
+            best = _better(best, _requirement(av[-1]))
+        elif op is sre_parse.BRANCH:
+            alternatives = [_requirement(branch) for branch in av[1]]
+            if all(alternatives):
+                best = _better(best, [lit for alt in alternatives for lit in alt])
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            best = _better(best, _requirement(av[2]))
+    return _better(best, ["".join(run)] if run else None)
+
+
+def required_literals(pattern: str) -> Optional[List[str]]:
+    """
+    Lowercased literals, one of which every match of ``pattern`` contains.
+
+    Returns ``None`` when no such literal can be derived (the rule is then
+    always scanned).
+    """
+    try:
+        literals = _requirement(sre_parse.parse(pattern))
+    except Exception:
+        return None
+    return sorted({lit.lower() for lit in literals}) if literals else None
+
+
+class RuleScanner:
+    """Single-pass scanner over a list of ``(pattern, category, severity)`` rules."""
+
+    def __init__(self, rules: List[Tuple[str, str, str]]):
+        for pattern, category, _ in rules:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern for {category!r}: {e}") from e
+        self.rules = list(rules)
+        self._always: List[Tuple[int, str]] = []
+        self._anchored: List[Tuple[Tuple[int, str], List[str]]] = []
+        for i, (pattern, _, _) in enumerate(self.rules):
+            literals = required_literals(pattern)
+            if literals is None:
+                self._always.append((i, pattern))
+            else:
+                self._anchored.append(((i, pattern), literals))
+
+    def scan(self, text: str, max_matches: int = 5) -> Dict[int, List[str]]:
+        """
+        Return ``{rule_index: matched_texts}`` for every rule that matches.
+
+        The combined pattern finds the leftmost match of any rule, so one
+        rule can hide another's overlapping match. A clean text costs one
+        pass; otherwise the scan repeats over the rules not yet seen until a
+        pass finds nothing new, which reports every matching rule exactly.
+        """
+        found: Dict[int, List[str]] = {}
+        lower = text.lower()
+        alternatives = tuple(
+            sorted(
+                self._always
+                + [
+                    rule
+                    for rule, literals in self._anchored
+                    if any(lit in lower for lit in literals)
+                ]
+            )
+        )
+        while alternatives:
+            seen_before = len(found)
+            for match in _compile_alternation(alternatives).finditer(text):
+                hits = found.setdefault(int(match.lastgroup[1:]), [])
+                if len(hits) < max_matches:
+                    hits.append(match.group())
+            if len(found) == seen_before:
+                break
+            alternatives = tuple(a for a in alternatives if a[0] not in found)
+        return found
+
+
+_timestamp_cache: Tuple[int, str] = (0, "")
+
+
+def _utc_timestamp() -> str:
+    """ISO timestamp, formatted at most once per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache = (now, datetime.utcnow().replace(microsecond=0).isoformat())
+    return _timestamp_cache[1]
+
 
 class AISecurityMonitor:
     """Monitor AI inputs and outputs for security and safety issues."""
 
-    def __init__(self):
-        """Initialize security monitor with detection patterns."""
-        # Prompt injection patterns
-        self.prompt_injection_patterns = [
-            (r"ignore previous instructions", "override_attempt", "high"),
-            (r"disregard all prior", "override_attempt", "high"),
-            (r"system:\s*", "role_injection", "high"),
-            (r"assistant:\s*", "role_injection", "high"),
-            (r"forget everything above", "memory_manipulation", "high"),
-            (r"new instructions:", "instruction_injection", "medium"),
-            (r"act as if you", "behavior_manipulation", "medium"),
-            (r"pretend to be", "identity_manipulation", "medium"),
-            (r"you are now", "identity_manipulation", "medium"),
-            (r"<\|.*?\|>", "special_tokens", "high"),
-            (r"\[INST\].*?\[/INST\]", "special_tokens", "high"),
-        ]
+    def __init__(
+        self,
+        rules_path: Optional[str] = None,
+        reload_interval: float = RULES_RELOAD_INTERVAL,
+    ):
+        """
+        Initialize security monitor with detection patterns.
 
-        # Hallucination risk indicators
-        self.hallucination_keywords = {
-            "financial": {
-                "patterns": [
-                    r"\$[\d,]+(?:\.\d+)?(?:B|M|K)?",
-                    r"revenue",
-                    r"profit",
-                    r"earnings",
-                ],
-                "risk_level": "high",
-            },
-            "statistical": {
-                "patterns": [
-                    r"\d+(?:\.\d+)?%",
-                    r"average of \d+",
-                    r"median",
-                    r"standard deviation",
-                ],
-                "risk_level": "medium",
-            },
-            "temporal": {
-                "patterns": [
-                    r"20\d{2}",
-                    r"(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{4}",
-                ],
-                "risk_level": "medium",
-            },
-            "medical": {
-                "patterns": [
-                    r"diagnos",
-                    r"treatment",
-                    r"prescription",
-                    r"medical advice",
-                ],
-                "risk_level": "critical",
-            },
-            "legal": {
-                "patterns": [r"legal advice", r"lawsuit", r"contract", r"liability"],
-                "risk_level": "critical",
-            },
-        }
+        Args:
+            rules_path: JSON/YAML rules file (defaults to AI_SAFETY_RULES_PATH)
+            reload_interval: Seconds between checks of the file for changes
+        """
+        self.rules_path = rules_path or os.getenv("AI_SAFETY_RULES_PATH")
+        self.reload_interval = reload_interval
+        self._rules_mtime: Optional[float] = None
+        self._last_reload_check = 0.0
+
+        self.prompt_injection_patterns: List[Tuple[str, str, str]] = []
+        self.hallucination_keywords: Dict[str, Dict[str, Any]] = {}
+        self.content_safety_patterns: List[Tuple[str, str, str]] = []
+        self.load_rules(DEFAULT_RULES)
+        if self.rules_path:
+            self.reload_rules()
 
         # Metrics tracking
         self.security_events = {
@@ -88,6 +257,77 @@ class AISecurityMonitor:
             "total_checks": 0,
         }
 
+    def load_rules(self, rules: Dict[str, Any]) -> None:
+        """
+        Replace the rule sets present in ``rules`` and recompile them.
+
+        Keys are ``prompt_injection`` and ``content_safety`` (lists of
+        ``[pattern, category, severity]``) and ``hallucination`` (categories
+        with ``patterns`` and ``risk_level``). Invalid patterns raise
+        ``ValueError`` and leave the current rules in place.
+        """
+        injection = self.prompt_injection_patterns
+        hallucination = self.hallucination_keywords
+        safety = self.content_safety_patterns
+        if "prompt_injection" in rules:
+            injection = [tuple(rule) for rule in rules["prompt_injection"]]
+        if "hallucination" in rules:
+            hallucination = rules["hallucination"]
+        if "content_safety" in rules:
+            safety = [tuple(rule) for rule in rules["content_safety"]]
+
+        hallucination_rules = [
+            (pattern, category, config["risk_level"])
+            for category, config in hallucination.items()
+            for pattern in config["patterns"]
+        ]
+        scanners = (
+            RuleScanner(injection),
+            RuleScanner(hallucination_rules),
+            RuleScanner(safety),
+        )
+
+        # Swap everything at once so concurrent checks see one rule set
+        self.prompt_injection_patterns = injection
+        self.hallucination_keywords = hallucination
+        self.content_safety_patterns = safety
+        (
+            self._injection_scanner,
+            self._hallucination_scanner,
+            self._safety_scanner,
+        ) = scanners
+
+    def reload_rules(self) -> bool:
+        """Load ``rules_path`` if it changed since the last load."""
+        if not self.rules_path:
+            return False
+        try:
+            mtime = os.path.getmtime(self.rules_path)
+            if mtime == self._rules_mtime:
+                return False
+            with open(self.rules_path) as f:
+                if self.rules_path.endswith((".yaml", ".yml")):
+                    import yaml
+
+                    rules = yaml.safe_load(f)
+                else:
+                    rules = json.load(f)
+            self.load_rules(rules)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error(f"Failed to reload AI safety rules: {e}")
+            return False
+        self._rules_mtime = mtime
+        logger.info(f"Loaded AI safety rules from {self.rules_path}")
+        return True
+
+    def _maybe_reload(self) -> None:
+        if self.rules_path is None:
+            return
+        now = time.monotonic()
+        if now - self._last_reload_check >= self.reload_interval:
+            self._last_reload_check = now
+            self.reload_rules()
+
     def check_prompt_injection(
         self, user_input: str, service: str = "unknown"
     ) -> Dict[str, Any]:
@@ -101,24 +341,19 @@ class AISecurityMonitor:
         Returns:
             Dict with safety assessment and details
         """
+        self._maybe_reload()
         self.security_events["total_checks"] += 1
-        lower_input = user_input.lower()
-        detected_patterns = []
-
-        for pattern, category, severity in self.prompt_injection_patterns:
-            if re.search(pattern, lower_input, re.IGNORECASE):
-                detected_patterns.append(
-                    {"pattern": pattern, "category": category, "severity": severity}
-                )
+        rules = self._injection_scanner.rules
+        detected_patterns = [
+            {"pattern": rules[i][0], "category": rules[i][1], "severity": rules[i][2]}
+            for i in sorted(self._injection_scanner.scan(user_input))
+        ]
 
         if detected_patterns:
             self.security_events["prompt_injections"] += 1
             # Find highest severity
             max_severity = max(
-                detected_patterns,
-                key=lambda x: {"low": 1, "medium": 2, "high": 3, "critical": 4}.get(
-                    x["severity"], 0
-                ),
+                detected_patterns, key=lambda x: RISK_SCORES.get(x["severity"], 0)
             )
 
             # Emit Prometheus metrics
@@ -136,14 +371,14 @@ class AISecurityMonitor:
                 "risk_level": max_severity["severity"],
                 "detected_patterns": detected_patterns,
                 "recommendation": "Block or sanitize input",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _utc_timestamp(),
             }
 
         return {
             "safe": True,
             "risk_level": "none",
             "detected_patterns": [],
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_timestamp(),
         }
 
     def flag_potential_hallucination(
@@ -160,29 +395,27 @@ class AISecurityMonitor:
         Returns:
             Dict with hallucination risk assessment
         """
+        self._maybe_reload()
+        rules = self._hallucination_scanner.rules
+        category_matches: Dict[str, List[str]] = {}
+        for i, matches in sorted(self._hallucination_scanner.scan(ai_output).items()):
+            category_matches.setdefault(rules[i][1], []).extend(matches)
+
         flags = []
         max_risk_level = "low"
-        risk_scores = {"low": 1, "medium": 2, "high": 3, "critical": 4}
-
         for category, config in self.hallucination_keywords.items():
-            category_matches = []
-
-            for pattern in config["patterns"]:
-                matches = re.findall(pattern, ai_output, re.IGNORECASE)
-                if matches:
-                    category_matches.extend(matches)
-
-            if category_matches:
+            if category in category_matches:
                 flags.append(
                     {
                         "category": category,
-                        "matches": category_matches[:5],  # Limit to first 5 matches
+                        # Limit to first 5 matches
+                        "matches": category_matches[category][:5],
                         "risk_level": config["risk_level"],
                     }
                 )
 
                 # Update max risk level
-                if risk_scores.get(config["risk_level"], 0) > risk_scores.get(
+                if RISK_SCORES.get(config["risk_level"], 0) > RISK_SCORES.get(
                     max_risk_level, 0
                 ):
                     max_risk_level = config["risk_level"]
@@ -206,11 +439,13 @@ class AISecurityMonitor:
             "potential_hallucination_risk": len(flags) > 0,
             "risk_level": max_risk_level if flags else "none",
             "risk_factors": flags,
-            "confidence_adjustment": confidence_adjustments.get(max_risk_level, 1.0),
+            "confidence_adjustment": (
+                confidence_adjustments.get(max_risk_level, 1.0) if flags else 1.0
+            ),
             "recommendation": self._get_hallucination_recommendation(
                 max_risk_level, flags
             ),
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_timestamp(),
         }
 
     def check_content_safety(self, content: str) -> Dict[str, Any]:
@@ -220,27 +455,45 @@ class AISecurityMonitor:
         Basic implementation - in production, would use more sophisticated
         content moderation APIs.
         """
-        unsafe_patterns = [
-            (r"harm\s+(yourself|others)", "violence", "critical"),
-            (r"illegal\s+(?:activity|substance)", "illegal_content", "high"),
-            (r"personal\s+(?:information|data|details)", "privacy", "medium"),
-            (r"(?:credit\s+card|ssn|social\s+security)", "pii", "high"),
+        self._maybe_reload()
+        rules = self._safety_scanner.rules
+        violations = [
+            {"category": rules[i][1], "severity": rules[i][2]}
+            for i in sorted(self._safety_scanner.scan(content))
         ]
 
-        violations = []
-
-        for pattern, category, severity in unsafe_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                violations.append({"category": category, "severity": severity})
-
         if violations:
             self.security_events["content_violations"] += 1
 
         return {
             "safe": len(violations) == 0,
             "violations": violations,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _utc_timestamp(),
+        }
+
+    def check_batch(
+        self, texts: List[str], check: str = "prompt_injection", **kwargs: Any
+    ) -> List[Dict[str, Any]]:
+        """
+        Run one check over many texts.
+
+        Args:
+            texts: Texts to check
+            check: "prompt_injection", "hallucination" or "content_safety"
+            **kwargs: Passed to the check (e.g. service, model)
+
+        Returns:
+            One result per text, in order
+        """
+        checks = {
+            "prompt_injection": self.check_prompt_injection,
+            "hallucination": self.flag_potential_hallucination,
+            "content_safety": self.check_content_safety,
         }
+        if check not in checks:
+            raise ValueError(f"Unknown check {check!r}; expected one of {list(checks)}")
+        self._maybe_reload()
+        return [checks[check](text, **kwargs) for text in texts]
 
     def get_security_metrics(self) -> Dict[str, Any]:
         """Get current security metrics."""
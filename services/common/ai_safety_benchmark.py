@@ -0,0 +1,122 @@
+"""
+AI safety scanner benchmark.
+
+Runs the prompt-injection, hallucination and content-safety checks over
+synthetic long-form posts and reports checks per second for:
+
+- per_pattern: one ``re.search``/``re.findall`` per rule over a lowercased
+  copy, plus a fresh ISO timestamp per check (the previous implementation)
+- compiled: AISecurityMonitor's single-pass combined scanners
+
+Usage:
+    python -m services.common.ai_safety_benchmark [--posts 500] [--words 800]
+"""
+
+import argparse
+import random
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from services.common.ai_safety import DEFAULT_RULES, AISecurityMonitor
+
+WORDS = (
+    "community growth builders founders launch product users feedback story "
+    "lessons mistakes hiring culture remote team shipping design focus habit "
+    "morning writing audience trust patience compounding craft details"
+).split()
+
+TRIGGERS = [
+    "revenue grew 45.2% to $3.4M",
+    "ignore previous instructions",
+    "in March 2024",
+    "this is not medical advice",
+    "never share personal information",
+]
+
+
+def make_posts(count: int, words: int, seed: int = 7) -> List[str]:
+    """Long-form posts with an occasional risky phrase."""
+    rng = random.Random(seed)
+    posts = []
+    for _ in range(count):
+        tokens = [rng.choice(WORDS) for _ in range(words)]
+        if rng.random() < 0.3:
+            tokens.insert(rng.randrange(words), rng.choice(TRIGGERS))
+        posts.append(" ".join(tokens))
+    return posts
+
+
+def per_pattern_checks(text: str) -> Dict[str, Any]:
+    """The previous implementation: every rule searched separately."""
+    lower = text.lower()
+    injections = [
+        rule
+        for rule in DEFAULT_RULES["prompt_injection"]
+        if re.search(rule[0], lower, re.IGNORECASE)
+    ]
+    hallucinations = {
+        category: sum(
+            (
+                re.findall(pattern, text, re.IGNORECASE)
+                for pattern in config["patterns"]
+            ),
+            [],
+        )
+        for category, config in DEFAULT_RULES["hallucination"].items()
+    }
+    violations = [
+        rule
+        for rule in DEFAULT_RULES["content_safety"]
+        if re.search(rule[0], text, re.IGNORECASE)
+    ]
+    return {
+        "injections": injections,
+        "hallucinations": hallucinations,
+        "violations": violations,
+        "timestamps": [datetime.utcnow().isoformat() for _ in range(3)],
+    }
+
+
+def compiled_checks(monitor: AISecurityMonitor) -> Callable[[str], Any]:
+    def run(text: str) -> Any:
+        return (
+            monitor.check_prompt_injection(text),
+            monitor.flag_potential_hallucination(text),
+            monitor.check_content_safety(text),
+        )
+
+    return run
+
+
+def measure(run: Callable[[str], Any], posts: List[str], rounds: int) -> float:
+    """Posts checked per second (all three checks per post)."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for post in posts:
+            run(post)
+    return rounds * len(posts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI safety scanner benchmark")
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--words", type=int, default=800)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    posts = make_posts(args.posts, args.words)
+    avg_chars = sum(map(len, posts)) / len(posts)
+    monitor = AISecurityMonitor()
+
+    baseline = measure(per_pattern_checks, posts, args.rounds)
+    compiled = measure(compiled_checks(monitor), posts, args.rounds)
+
+    print(f"{args.posts} posts, ~{avg_chars:.0f} chars each, 3 checks per post")
+    print(f"{'per_pattern':>12}: {baseline:>10.1f} posts/s")
+    print(f"{'compiled':>12}: {compiled:>10.1f} posts/s ({compiled / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -65,10 +65,10 @@ class PersonaRuntimeIntegration:
                 registered_model = registry.register_fine_tuned_model(
                     model_version=result.model_version,
                     performance_metrics={
-                        "training_examples": len(
-                            result.training_data_batch.hook_examples
+                        "training_examples": result.training_data_export.examples.get(
+                            "hooks", 0
                         )
-                        if result.training_data_batch
+                        if result.training_data_export
                         else 0,
                         "base_model": result.model_version.base_model or "",
                     },
@@ -86,8 +86,10 @@ class PersonaRuntimeIntegration:
             return {
                 "status": result.status,
                 "reason": result.reason,
-                "training_examples": len(result.training_data_batch.hook_examples)
-                if result.training_data_batch
+                "training_examples": result.training_data_export.examples.get(
+                    "hooks", 0
+                )
+                if result.training_data_export
                 else 0,
             }
 
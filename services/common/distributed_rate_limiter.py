@@ -0,0 +1,376 @@
+"""
+Distributed GCRA rate limiter shared across service replicas.
+
+Every replica checks the same Redis key with one atomic Lua call, so a
+fleet of pods enforces a single quota instead of one quota per pod. The
+Generic Cell Rate Algorithm stores one timestamp per limit (the theoretical
+arrival time, TAT) and answers each check with either "allowed" or the
+exact time until the request would be allowed.
+
+Waiting callers reserve their slot in the same call: when the slot is at
+most ``max_wait`` seconds away it is booked and the caller sleeps until it
+arrives, so an admission usually costs one Redis round-trip and nobody
+polls.
+
+Waiters are served round-robin across fairness keys (personas, agents), so
+one busy persona cannot starve the others of a shared quota. When Redis is
+unreachable the limiter degrades to an in-process GCRA until it recovers.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Optional, Tuple
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: limit key
+# ARGV[1]: emission interval in ms (time per unit of cost)
+# ARGV[2]: burst tolerance in ms (emission interval * burst)
+# ARGV[3]: cost
+# ARGV[4]: max delay in ms a caller will wait for a reserved slot
+# Returns {allowed, delay_ms}: when allowed the slot is booked and the caller
+# proceeds after delay_ms; otherwise delay_ms is the retry-after. Redis
+# server time is used so every replica shares one clock; floats are
+# returned as strings because Lua numbers are truncated in replies.
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local max_delay = tonumber(ARGV[4])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + tonumber(t[2]) / 1000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+  tat = now
+end
+local new_tat = tat + interval * cost
+local delay = new_tat - tolerance - now
+if delay > max_delay then
+  return {0, tostring(delay)}
+end
+if delay < 0 then
+  delay = 0
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil(new_tat - now) + 1)
+return {1, tostring(delay)}
+"""
+
+# Seconds to stay on the local fallback before trying Redis again
+REDIS_RETRY_INTERVAL = 5.0
+
+# Keep a dead Redis from stalling callers for the OS connect timeout
+REDIS_SOCKET_TIMEOUT = 1.0
+
+DEFAULT_FAIRNESS_KEY = "default"
+
+
+@dataclass
+class GCRALimit:
+    """A rate of ``rate`` units per ``period`` seconds with a burst allowance."""
+
+    rate: float
+    period: float = 60.0
+    burst: Optional[float] = None
+
+    def __post_init__(self):
+        if self.rate <= 0 or self.period <= 0:
+            raise ValueError("rate and period must be positive")
+        if self.burst is None:
+            self.burst = self.rate
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds per unit of cost."""
+        return self.period / self.rate
+
+    @property
+    def tolerance(self) -> float:
+        """Seconds of burst the limit tolerates."""
+        return self.emission_interval * self.burst
+
+
+class LocalGCRA:
+    """In-process GCRA with the same semantics as the Lua script."""
+
+    def __init__(self, limit: GCRALimit):
+        self.limit = limit
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    def check(
+        self, cost: float = 1.0, max_delay: float = 0.0, now: Optional[float] = None
+    ) -> Tuple[bool, float]:
+        """
+        Book ``cost`` units if their slot is at most ``max_delay`` away.
+
+        Returns:
+            (allowed, delay): the wait before proceeding when allowed,
+            otherwise the retry-after
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            tat = max(self._tat, now)
+            new_tat = tat + self.limit.emission_interval * cost
+            delay = new_tat - self.limit.tolerance - now
+            if delay > max_delay:
+                return False, delay
+            self._tat = new_tat
+            return True, max(0.0, delay)
+
+
+@dataclass
+class _Waiter:
+    cost: float
+    future: Optional["asyncio.Future[None]"] = None
+
+
+class _FairQueue:
+    """Round-robin queue of waiters grouped by fairness key."""
+
+    def __init__(self) -> None:
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+
+    def __bool__(self) -> bool:
+        return bool(self._queues)
+
+    def push(self, fairness_key: str, waiter: _Waiter) -> None:
+        self._queues.setdefault(fairness_key, deque()).append(waiter)
+
+    def head(self) -> Optional[_Waiter]:
+        for queue in self._queues.values():
+            return queue[0]
+        return None
+
+    def pop_head(self) -> None:
+        """Serve the head waiter and rotate its key to the back of the line."""
+        fairness_key, queue = next(iter(self._queues.items()))
+        queue.popleft()
+        del self._queues[fairness_key]
+        if queue:
+            self._queues[fairness_key] = queue
+
+
+class DistributedRateLimiter:
+    """
+    One named quota enforced across all replicas through Redis.
+
+    ``try_acquire`` makes a single non-blocking check. ``acquire`` and
+    ``acquire_sync`` wait in a fair queue; only the waiter at the head of
+    the queue talks to Redis, and it sleeps for the delay or retry-after it
+    is given. Costs are weighted, e.g. LLM tokens rather than requests.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: GCRALimit,
+        redis_url: Optional[str] = None,
+        redis_client: Optional[Any] = None,
+        async_redis_client: Optional[Any] = None,
+        key_prefix: str = "ratelimit",
+        max_wait: float = 5.0,
+        fallback_share: float = 1.0,
+    ):
+        """
+        Initialize limiter
+
+        Args:
+            name: Quota name; replicas using the same name share the quota
+            limit: Rate, period and burst of the quota
+            redis_url: Redis URL (defaults to REDIS_URL)
+            redis_client: Optional pre-built sync Redis client
+            async_redis_client: Optional pre-built asyncio Redis client
+            key_prefix: Prefix for the Redis key
+            max_wait: Longest delay (seconds) a waiter books a slot for;
+                beyond it the waiter sleeps and checks again
+            fallback_share: Fraction of the quota each replica may use on its
+                own while Redis is down, e.g. 1 / replica count
+        """
+        self.name = name
+        self.limit = limit
+        self.key = f"{key_prefix}:{name}"
+        self.redis_url = redis_url or os.getenv("REDIS_URL", "redis://redis:6379")
+        self.max_wait = max_wait
+        self._redis = redis_client
+        self._async_redis = async_redis_client
+        self._script = None
+        self._async_script = None
+
+        self.fallback = LocalGCRA(
+            GCRALimit(
+                rate=limit.rate * fallback_share,
+                period=limit.period,
+                burst=max(1.0, limit.burst * fallback_share),
+            )
+        )
+        self._redis_down_until = 0.0
+
+        self._sync_queue = _FairQueue()
+        self._sync_cond = threading.Condition()
+        self._async_queue = _FairQueue()
+        self._dispatcher: Optional["asyncio.Task[None]"] = None
+
+        self.stats = {"allowed": 0, "throttled": 0, "fallback_checks": 0}
+
+    # -- single checks -----------------------------------------------------
+
+    def _validate(self, cost: float) -> None:
+        if cost <= 0:
+            raise ValueError("cost must be positive")
+        if cost > self.limit.burst:
+            raise ValueError(
+                f"cost {cost} exceeds burst {self.limit.burst} of limit {self.name}"
+            )
+
+    def _script_args(self, cost: float, max_delay: float) -> Tuple[float, ...]:
+        return (
+            self.limit.emission_interval * 1000,
+            self.limit.tolerance * 1000,
+            cost,
+            max_delay * 1000,
+        )
+
+    def _record(self, allowed: bool, delay: float) -> Tuple[bool, float]:
+        self.stats["allowed" if allowed else "throttled"] += 1
+        return allowed, delay
+
+    def _use_fallback(self) -> bool:
+        return time.monotonic() < self._redis_down_until
+
+    def _redis_failed(self, error: Exception) -> None:
+        if not self._use_fallback():
+            logger.warning(
+                f"Rate limiter {self.name} falling back to local limits: {error}"
+            )
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_INTERVAL
+
+    def _check_fallback(self, cost: float, max_delay: float) -> Tuple[bool, float]:
+        self.stats["fallback_checks"] += 1
+        # The local share of the burst may be smaller than a valid cost
+        cost = min(cost, self.fallback.limit.burst)
+        return self._record(*self.fallback.check(cost, max_delay))
+
+    def _check(self, cost: float, max_delay: float) -> Tuple[bool, float]:
+        if self._use_fallback():
+            return self._check_fallback(cost, max_delay)
+        try:
+            if self._script is None:
+                if self._redis is None:
+                    self._redis = redis.from_url(
+                        self.redis_url,
+                        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+                        socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    )
+                self._script = self._redis.register_script(GCRA_SCRIPT)
+            allowed, delay_ms = self._script(
+                keys=[self.key], args=self._script_args(cost, max_delay)
+            )
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return self._check_fallback(cost, max_delay)
+        return self._record(bool(int(allowed)), float(delay_ms) / 1000)
+
+    async def _check_async(self, cost: float, max_delay: float) -> Tuple[bool, float]:
+        if self._use_fallback():
+            return self._check_fallback(cost, max_delay)
+        try:
+            if self._async_script is None:
+                if self._async_redis is None:
+                    self._async_redis = aioredis.from_url(
+                        self.redis_url,
+                        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+                        socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    )
+                self._async_script = self._async_redis.register_script(GCRA_SCRIPT)
+            allowed, delay_ms = await self._async_script(
+                keys=[self.key], args=self._script_args(cost, max_delay)
+            )
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return self._check_fallback(cost, max_delay)
+        return self._record(bool(int(allowed)), float(delay_ms) / 1000)
+
+    def try_acquire(self, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Check the quota once without waiting.
+
+        Returns:
+            (allowed, retry_after_seconds)
+        """
+        self._validate(cost)
+        return self._check(cost, 0.0)
+
+    async def try_acquire_async(self, cost: float = 1.0) -> Tuple[bool, float]:
+        """Async version of ``try_acquire``."""
+        self._validate(cost)
+        return await self._check_async(cost, 0.0)
+
+    # -- async front-end ---------------------------------------------------
+
+    async def acquire(
+        self, cost: float = 1.0, fairness_key: str = DEFAULT_FAIRNESS_KEY
+    ) -> None:
+        """Wait for ``cost`` units of quota, served fairly across keys."""
+        self._validate(cost)
+        waiter = _Waiter(cost, asyncio.get_running_loop().create_future())
+        self._async_queue.push(fairness_key, waiter)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        # A cancelled waiter stays queued; the dispatcher skips it
+        await waiter.future
+
+    async def _dispatch(self) -> None:
+        while self._async_queue:
+            waiter = self._async_queue.head()
+            if waiter.future.done():
+                self._async_queue.pop_head()
+                continue
+            try:
+                allowed, delay = await self._check_async(waiter.cost, self.max_wait)
+            except Exception as e:
+                self._async_queue.pop_head()
+                if not waiter.future.done():
+                    waiter.future.set_exception(e)
+                continue
+            if allowed:
+                # Wait out the booked slot before booking the next one, so the
+                # round-robin order decides who gets scarce quota
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._async_queue.pop_head()
+                if not waiter.future.done():
+                    waiter.future.set_result(None)
+            else:
+                await asyncio.sleep(delay)
+
+    # -- sync front-end ----------------------------------------------------
+
+    def acquire_sync(
+        self, cost: float = 1.0, fairness_key: str = DEFAULT_FAIRNESS_KEY
+    ) -> None:
+        """Blocking ``acquire`` for threads and Celery workers."""
+        self._validate(cost)
+        waiter = _Waiter(cost)
+        with self._sync_cond:
+            self._sync_queue.push(fairness_key, waiter)
+            while self._sync_queue.head() is not waiter:
+                self._sync_cond.wait()
+        try:
+            while True:
+                allowed, delay = self._check(cost, self.max_wait)
+                if delay > 0:
+                    time.sleep(delay)
+                if allowed:
+                    return
+        finally:
+            with self._sync_cond:
+                self._sync_queue.pop_head()
+                self._sync_cond.notify_all()
@@ -9,13 +9,21 @@ This module implements an automated model fine-tuning pipeline that:
 6. Deploys models automatically with safety checks
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from unittest.mock import Mock
 import time
 import asyncio
 import json
+import os
+import shutil
+import tempfile
+
+from services.common.training_data_export import (
+    TrainingDataExport,
+    TrainingDataExporter,
+)
 
 # Import Post model for database queries
 try:
@@ -76,6 +84,13 @@ class PipelineConfig:
     engagement_threshold: float
     weekly_schedule: str = "0 2 * * 0"  # Sunday 2 AM
     a_b_test_duration_hours: int = 168  # 1 week
+    # Shard directory kept between runs so unchanged shards can be detected
+    export_dir: str = field(
+        default_factory=lambda: os.getenv(
+            "FINE_TUNING_EXPORT_DIR",
+            os.path.join(tempfile.gettempdir(), "fine_tuning_export"),
+        )
+    )
 
 
 @dataclass
@@ -117,20 +132,46 @@ class PipelineResult:
     model_version: Optional[ModelVersion] = None
     training_data_batch: Optional[TrainingDataBatch] = None
     reason: Optional[str] = None
+    training_data_export: Optional[TrainingDataExport] = None
 
 
 class FineTuningPipeline:
     """Main orchestrator for the auto-fine-tuning pipeline."""
 
-    def __init__(self, config: PipelineConfig):
+    def __init__(
+        self,
+        config: PipelineConfig,
+        session_factory: Optional[Callable[[], Any]] = None,
+    ):
+        """
+        Args:
+            config: Pipeline configuration
+            session_factory: Creates the database session training data is
+                exported from (defaults to the orchestrator's sessionmaker)
+        """
         self.config = config
+        self.session_factory = session_factory
         self.is_enabled = True
         self.last_run_timestamp: Optional[datetime] = None
 
+    def _export_training_data(self, data_collector: "DataCollector"):
+        """Export training data shards in a session of its own."""
+        session_factory = self.session_factory
+        if session_factory is None:
+            from services.orchestrator.db import get_session
+
+            session_factory = get_session()
+        session = session_factory()
+        try:
+            return data_collector.export_training_data(
+                self.config.export_dir, session=session
+            )
+        finally:
+            session.close()
+
     async def run(self) -> PipelineResult:
         """Run the complete fine-tuning pipeline with MLflow tracking and memory optimization."""
         import psutil
-        import gc
 
         # Initialize MLflow experiment tracking
         tracker = MLflowExperimentTracker("fine_tuning_pipeline")
@@ -140,18 +181,16 @@ class FineTuningPipeline:
 
         with tracker.start_experiment_run(self.config):
             try:
-                # 1. Collect training data with memory monitoring
+                # 1. Stream training data to deduplicated shards on disk
                 data_collector = DataCollector(
                     engagement_threshold=self.config.engagement_threshold
                 )
-                training_data = await asyncio.to_thread(
-                    data_collector.collect_training_data
+                training_export = await asyncio.to_thread(
+                    self._export_training_data, data_collector
                 )
 
                 # 2. Check if we have sufficient training data
-                total_examples = len(training_data.hook_examples) + len(
-                    training_data.body_examples
-                )
+                total_examples = sum(training_export.examples.values())
                 current_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
 
                 if total_examples < self.config.training_data_threshold:
@@ -168,7 +207,7 @@ class FineTuningPipeline:
                     return PipelineResult(
                         status="skipped",
                         reason="insufficient_training_data",
-                        training_data_batch=training_data,
+                        training_data_export=training_export,
                     )
 
                 # 3. Start fine-tuning with concurrent operations
@@ -176,7 +215,7 @@ class FineTuningPipeline:
 
                 # Start fine-tuning and monitor memory concurrently
                 training_task = asyncio.create_task(
-                    trainer.start_fine_tuning(training_data)
+                    trainer.start_fine_tuning_from_export(training_export)
                 )
                 memory_monitor_task = asyncio.create_task(self._monitor_memory_usage())
 
@@ -184,14 +223,9 @@ class FineTuningPipeline:
                 model_version = await training_task
                 memory_monitor_task.cancel()
 
-                # 4. Clean up training data from memory
-                del training_data.hook_examples[:]  # Clear list contents
-                del training_data.body_examples[:]
-                gc.collect()  # Force garbage collection
-
                 final_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
 
-                # 5. Log training completion metrics
+                # 4. Log training completion metrics
                 tracker.log_training_metrics(
                     {
                         "training_examples": total_examples,
@@ -205,15 +239,11 @@ class FineTuningPipeline:
                     }
                 )
 
-                # 6. Return successful result
+                # 5. Return successful result
                 return PipelineResult(
                     status="success",
                     model_version=model_version,
-                    training_data_batch=TrainingDataBatch(
-                        hook_examples=[],  # Empty to save memory
-                        body_examples=[],
-                        metadata=training_data.metadata,
-                    ),
+                    training_data_export=training_export,
                 )
 
             except Exception as e:
@@ -343,34 +373,8 @@ class DataCollector:
             chunk = posts[i : i + chunk_size]
 
             for post in chunk:
-                # Format hook example for OpenAI fine-tuning
-                hook_examples.append(
-                    {
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": getattr(post, "original_input", None)
-                                or "Create engaging content",
-                            },
-                            {"role": "assistant", "content": post.hook},
-                        ],
-                        "engagement_rate": getattr(post, "engagement_rate", 0.0),
-                    }
-                )
-
-                # Format body example for OpenAI fine-tuning
-                body_examples.append(
-                    {
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": f"{post.hook}\n\nWrite a detailed post:",
-                            },
-                            {"role": "assistant", "content": post.body},
-                        ],
-                        "engagement_rate": getattr(post, "engagement_rate", 0.0),
-                    }
-                )
+                hook_examples.append(_hook_example(post))
+                body_examples.append(_body_example(post))
 
         return TrainingDataBatch(
             hook_examples=hook_examples,
@@ -383,6 +387,118 @@ class DataCollector:
             },
         )
 
+    def export_training_data(
+        self,
+        output_dir: str,
+        days_back: int = 7,
+        chunk_size: int = 1000,
+        max_shard_examples: int = 5000,
+        dedup_distance: int = 3,
+        session: Any = None,
+    ) -> TrainingDataExport:
+        """
+        Stream posts from the last N days into deduplicated JSONL shards.
+
+        Unlike ``collect_training_data`` there is no row limit and nothing is
+        held in memory: rows are read ``chunk_size`` at a time through a
+        server-side cursor and each example is written as it is built. Hooks
+        and bodies are deduplicated separately by SimHash, and the manifest
+        in ``output_dir`` tells which shards changed since the last export.
+
+        Args:
+            output_dir: Directory for shards and manifest
+            days_back: Collection window in days
+            chunk_size: Rows fetched per round trip
+            max_shard_examples: Examples per shard before a day is split
+            dedup_distance: SimHash bits within which examples are duplicates
+            session: SQLAlchemy session to read posts from (required)
+
+        Returns:
+            TrainingDataExport describing the shards written
+
+        Raises:
+            ValueError: If no session is given
+        """
+        if Post is None:
+            raise RuntimeError("Post model is not available for export")
+        if session is None:
+            raise ValueError("export_training_data requires a database session")
+
+        from sqlalchemy import and_, func
+
+        cutoff_date = datetime.now() - timedelta(days=days_back)
+
+        # Only the columns the examples use; ordered by time so each day's
+        # shards are written in one pass
+        query = (
+            session.query(
+                Post.id,
+                Post.ts,
+                Post.original_input,
+                Post.hook,
+                Post.body,
+                Post.engagement_rate,
+            )
+            .filter(
+                and_(
+                    Post.ts >= cutoff_date,
+                    func.coalesce(Post.engagement_rate, 0.0)
+                    >= self.engagement_threshold,
+                )
+            )
+            .order_by(Post.ts, Post.id)
+            .yield_per(chunk_size)
+        )
+
+        with TrainingDataExporter(
+            output_dir, max_shard_examples, dedup_distance
+        ) as exporter:
+            total_posts = 0
+            for post in query:
+                total_posts += 1
+                day = post.ts.date().isoformat()
+                exporter.add("hooks", day, post.hook or "", _hook_example(post))
+                exporter.add("bodies", day, post.body or "", _body_example(post))
+
+            return exporter.finish(
+                metadata={
+                    "days_back": days_back,
+                    "cutoff": cutoff_date.isoformat(),
+                    "engagement_threshold": self.engagement_threshold,
+                    "total_posts": total_posts,
+                    "chunk_size": chunk_size,
+                }
+            )
+
+
+def _hook_example(post: Any) -> Dict[str, Any]:
+    """Hook example in OpenAI fine-tuning format."""
+    return {
+        "messages": [
+            {
+                "role": "user",
+                "content": getattr(post, "original_input", None)
+                or "Create engaging content",
+            },
+            {"role": "assistant", "content": post.hook},
+        ],
+        "engagement_rate": getattr(post, "engagement_rate", 0.0),
+    }
+
+
+def _body_example(post: Any) -> Dict[str, Any]:
+    """Body example in OpenAI fine-tuning format."""
+    return {
+        "messages": [
+            {
+                "role": "user",
+                "content": f"{post.hook}\n\nWrite a detailed post:",
+            },
+            {"role": "assistant", "content": post.body},
+        ],
+        "engagement_rate": getattr(post, "engagement_rate", 0.0),
+    }
+
 
 class ModelTrainer:
     """Handles OpenAI fine-tuning jobs."""
@@ -392,42 +508,51 @@ class ModelTrainer:
 
     async def start_fine_tuning(self, training_data: TrainingDataBatch) -> ModelVersion:
         """Start a fine-tuning job with OpenAI using async operations."""
-        import openai
-        import tempfile
-        import os
-        import asyncio
-
-        # Create async OpenAI client
-        try:
-            async_client = openai.AsyncOpenAI()
-        except openai.OpenAIError:
-            # Handle missing API key in tests
-            return ModelVersion(
-                model_id="ft:gpt-3.5-turbo:test:mock",
-                version="1.0.0",
-                training_job_id="ftjob-mock",
-                base_model=self.base_model,
-                status="completed",
-            )
-
         # Prepare training file with optimized JSON processing
         training_examples = training_data.hook_examples + training_data.body_examples
 
-        # Use memory-efficient file writing for large datasets
-        training_file_path = None
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
+            training_file_path = f.name
+
+            # Batch write JSON lines for better I/O performance
+            batch_size = 1000
+            for i in range(0, len(training_examples), batch_size):
+                batch = training_examples[i : i + batch_size]
+                lines = [json.dumps(example) for example in batch]
+                f.write("\n".join(lines) + "\n")
+
+        return await self._train_on_file(training_file_path)
+
+    async def start_fine_tuning_from_export(
+        self, training_export: TrainingDataExport
+    ) -> ModelVersion:
+        """Start a fine-tuning job on the shards of a training data export."""
+        # The shards are concatenated on disk, never loaded into memory
+        with tempfile.NamedTemporaryFile(mode="wb", suffix=".jsonl", delete=False) as f:
+            training_file_path = f.name
+            for name in training_export.shards:
+                with open(training_export.output_dir / name, "rb") as shard:
+                    shutil.copyfileobj(shard, f)
+
+        return await self._train_on_file(training_file_path)
+
+    async def _train_on_file(self, training_file_path: str) -> ModelVersion:
+        """Upload a JSONL training file and create the job; the file is removed."""
+        import openai
+
         try:
-            # Create temporary training file with async-safe operations
-            with tempfile.NamedTemporaryFile(
-                mode="w", suffix=".jsonl", delete=False
-            ) as f:
-                training_file_path = f.name
-
-                # Batch write JSON lines for better I/O performance
-                batch_size = 1000
-                for i in range(0, len(training_examples), batch_size):
-                    batch = training_examples[i : i + batch_size]
-                    lines = [json.dumps(example) for example in batch]
-                    f.write("\n".join(lines) + "\n")
+            # Create async OpenAI client
+            try:
+                async_client = openai.AsyncOpenAI()
+            except openai.OpenAIError:
+                # Handle missing API key in tests
+                return ModelVersion(
+                    model_id="ft:gpt-3.5-turbo:test:mock",
+                    version="1.0.0",
+                    training_job_id="ftjob-mock",
+                    base_model=self.base_model,
+                    status="completed",
+                )
 
             # Async file upload with retry logic
             max_retries = 3
@@ -464,7 +589,7 @@ class ModelTrainer:
             raise Exception("OpenAI API call timed out after 30 seconds")
         finally:
             # Clean up temporary file
-            if training_file_path and os.path.exists(training_file_path):
+            if os.path.exists(training_file_path):
                 os.unlink(training_file_path)
 
     def monitor_training_job(self, model_version: ModelVersion) -> ModelVersion:
@@ -219,6 +219,55 @@ SYSTEM_HEALTH_STATUS = _safe_metric(
     ["component", "service"],  # component: database, queue, api, llm
 )
 
+# ───── LLM Request Batching ──────────────────────────────────────────────────────────
+LLM_BATCH_QUEUE_WAIT = _safe_metric(
+    Histogram,
+    "llm_batch_queue_wait_seconds",
+    "Time a request waits in the LLM batch queue before its batch is released",
+    ["model", "lane"],  # lane: interactive, default, bulk
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0, 300.0, 3600.0],
+)
+
+LLM_BATCH_FILL_RATIO = _safe_metric(
+    Histogram,
+    "llm_batch_fill_ratio",
+    "Released batch size as a fraction of the configured batch size",
+    ["model"],
+    buckets=[0.1, 0.2, 0.4, 0.6, 0.8, 1.0],
+)
+
+LLM_BATCH_RELEASES_TOTAL = _safe_metric(
+    Counter,
+    "llm_batch_releases_total",
+    "LLM batches released, by trigger",
+    ["model", "reason"],  # reason: size, tokens, deadline
+)
+
+
+# ───── Content Publishing Dispatch ───────────────────────────────────────────────────
+PUBLISH_DISPATCH_LAG = _safe_metric(
+    Histogram,
+    "publishing_dispatch_lag_seconds",
+    "Time between a schedule's scheduled_time and its dispatch to a worker",
+    ["platform"],
+    buckets=[1, 5, 15, 30, 60, 120, 300, 900, 1800, 3600],
+)
+
+PUBLISH_DISPATCHED_TOTAL = _safe_metric(
+    Counter,
+    "publishing_dispatched_total",
+    "Content schedules claimed and enqueued for publishing",
+    ["platform"],
+)
+
+PUBLISH_LATENCY = _safe_metric(
+    Histogram,
+    "publishing_publish_latency_seconds",
+    "Time to publish one content item to a platform, including rate-limit waits",
+    ["platform", "outcome"],  # outcome: success, failure, timeout
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+)
+
 
 # ───── Prometheus Client Helper Class ────────────────────────────────────────────────
 class PrometheusClient:
@@ -516,6 +565,28 @@ def record_content_generation_latency(
     )
 
 
+def record_llm_batch(
+    model: str, reason: str, fill_ratio: float, queue_waits: list[tuple[str, float]]
+) -> None:
+    """Record one released LLM batch and the queue wait of each request in it."""
+    LLM_BATCH_RELEASES_TOTAL.labels(model=model, reason=reason).inc()
+    LLM_BATCH_FILL_RATIO.labels(model=model).observe(fill_ratio)
+    for lane, wait in queue_waits:
+        LLM_BATCH_QUEUE_WAIT.labels(model=model, lane=lane).observe(wait)
+
+
+def record_publish_dispatch(platform: str, lags: list[float]) -> None:
+    """Record schedules dispatched for a platform and their dispatch lag."""
+    PUBLISH_DISPATCHED_TOTAL.labels(platform=platform).inc(len(lags))
+    for lag in lags:
+        PUBLISH_DISPATCH_LAG.labels(platform=platform).observe(lag)
+
+
+def record_publish_latency(platform: str, outcome: str, seconds: float) -> None:
+    """Record how long one platform publish took and how it ended."""
+    PUBLISH_LATENCY.labels(platform=platform, outcome=outcome).observe(seconds)
+
+
 def record_engagement_prediction(persona_id: str, predicted_rate: float) -> None:
     """Record engagement rate prediction."""
     ENGAGEMENT_RATE_PREDICTION.labels(persona_id=persona_id).set(predicted_rate)
@@ -13,12 +13,14 @@ Author: TDD Implementation for CRA-297
 import json
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from scipy import stats
 import warnings
 
+from services.common import batch_statistics
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore")
 
@@ -94,6 +96,9 @@ class RegressionResult:
         baseline_confidence_interval: Confidence interval for baseline mean
         current_confidence_interval: Confidence interval for current mean
         outliers_filtered: Number of outliers filtered from analysis
+        adjusted_p_value: Benjamini-Hochberg adjusted p-value (batch analysis)
+        difference_confidence_interval: BCa bootstrap interval for
+            current mean - baseline mean (batch analysis)
     """
 
     metric_name: str
@@ -112,6 +117,26 @@ class RegressionResult:
     baseline_confidence_interval: Optional[List[float]] = None
     current_confidence_interval: Optional[List[float]] = None
     outliers_filtered: int = 0
+    adjusted_p_value: Optional[float] = None
+    difference_confidence_interval: Optional[List[float]] = None
+
+
+@dataclass
+class MetricSeries:
+    """
+    Baseline and current values of one metric for batch regression analysis.
+
+    Attributes:
+        metric_name: Name of the metric
+        historical_values: Baseline (historical) measurements
+        current_values: Current measurements
+        metric_type: Type of metric (higher/lower is better)
+    """
+
+    metric_name: str
+    historical_values: Sequence[float]
+    current_values: Sequence[float]
+    metric_type: MetricType = MetricType.HIGHER_IS_BETTER
 
 
 class PerformanceRegressionDetector:
@@ -254,6 +279,203 @@ class PerformanceRegressionDetector:
             outliers_filtered=outliers_filtered,
         )
 
+    def build_series(
+        self,
+        historical_data: List[PerformanceData],
+        current_data: List[PerformanceData],
+        metric_name: str,
+        metric_type: MetricType = MetricType.HIGHER_IS_BETTER,
+    ) -> MetricSeries:
+        """
+        Validate measurements and apply the baseline window for batch analysis.
+
+        Raises:
+            RegressionError: If data is insufficient or invalid
+        """
+        self._validate_inputs(historical_data, current_data, metric_name)
+        return MetricSeries(
+            metric_name=metric_name,
+            historical_values=[
+                d.value for d in self._filter_by_baseline_window(historical_data)
+            ],
+            current_values=[d.value for d in current_data],
+            metric_type=metric_type,
+        )
+
+    def detect_regressions(
+        self,
+        series: List[MetricSeries],
+        bootstrap_resamples: int = 0,
+        random_state: Optional[int] = None,
+    ) -> List[RegressionResult]:
+        """
+        Detect regressions across many metrics in one vectorized pass.
+
+        Every series is tested at once on padded numpy arrays (t-test, Welch
+        and Mann-Whitney are vectorized; Kolmogorov-Smirnov runs per series).
+        Combined p-values are corrected with Benjamini-Hochberg across the
+        batch, and a change is significant when the adjusted p-value is
+        below the significance level. ``p_value`` keeps the uncorrected
+        combined value, as in ``detect_regression``.
+
+        Args:
+            series: Metric series to analyze, e.g. from ``build_series``
+            bootstrap_resamples: Resamples for the BCa interval of the mean
+                difference; 0 (the default) skips it, keeping the batch
+                faster than per-metric detection
+            random_state: Seed for the bootstrap
+
+        Returns:
+            RegressionResult per series, in input order
+
+        Raises:
+            RegressionError: If a series has too few samples
+        """
+        if not series:
+            return []
+        for item in series:
+            for label, values in (
+                ("historical", item.historical_values),
+                ("current", item.current_values),
+            ):
+                if len(values) < max(self.minimum_samples, 1):
+                    raise RegressionError(
+                        f"Insufficient {label} data for '{item.metric_name}': "
+                        f"{len(values)} < {self.minimum_samples}"
+                    )
+
+        historical = batch_statistics.pad([s.historical_values for s in series])
+        current = batch_statistics.pad([s.current_values for s in series])
+        outliers = np.zeros(len(series), dtype=int)
+        if self.filter_outliers:
+            historical, h_outliers = batch_statistics.filter_outliers(
+                historical, self.outlier_threshold
+            )
+            current, c_outliers = batch_statistics.filter_outliers(
+                current, self.outlier_threshold
+            )
+            outliers = h_outliers + c_outliers
+
+        n_hist, baseline_mean, baseline_var = batch_statistics.describe(historical)
+        n_curr, current_mean, current_var = batch_statistics.describe(current)
+        baseline_std = np.sqrt(baseline_var)
+        current_std = np.sqrt(current_var)
+        both_constant = (baseline_std == 0) & (current_std == 0)
+
+        test_stats = {}
+        for test in self.statistical_tests:
+            if test == StatisticalTest.T_TEST:
+                statistic, p_value = batch_statistics.t_test(historical, current)
+            elif test == StatisticalTest.WELCH_T_TEST:
+                statistic, p_value = batch_statistics.t_test(
+                    historical, current, equal_var=False
+                )
+            elif test == StatisticalTest.MANN_WHITNEY:
+                statistic, p_value = batch_statistics.mann_whitney(historical, current)
+            else:
+                statistic, p_value = self._ks_per_series(historical, current)
+            # Same fallback as a failed test in _run_statistical_tests
+            fallback = np.where(
+                both_constant, np.where(baseline_mean == current_mean, 1.0, 0.0), 1.0
+            )
+            test_stats[test.value] = (
+                statistic,
+                np.where(np.isnan(p_value), fallback, p_value),
+            )
+
+        alpha = self.significance_level.value
+        p_matrix = np.column_stack([p for _, p in test_stats.values()])
+        combined = batch_statistics.fisher_combine(p_matrix)
+        combined = np.where(
+            both_constant & (baseline_mean != current_mean), 0.0, combined
+        )
+        adjusted = batch_statistics.benjamini_hochberg(combined)
+        significant = adjusted < alpha
+        consensus = (p_matrix < alpha).mean(axis=1)
+
+        # Cohen's d, with +/-10 for a shift between two constant series
+        with np.errstate(invalid="ignore", divide="ignore"):
+            pooled = np.sqrt(
+                ((n_hist - 1) * baseline_var + (n_curr - 1) * current_var)
+                / (n_hist + n_curr - 2)
+            )
+            effect = np.where(pooled > 0, (current_mean - baseline_mean) / pooled, 0.0)
+        effect = np.where(
+            both_constant & (baseline_mean != current_mean),
+            np.where(current_mean > baseline_mean, 10.0, -10.0),
+            effect,
+        )
+
+        baseline_ci = self._t_intervals(n_hist, baseline_mean, baseline_var)
+        current_ci = self._t_intervals(n_curr, current_mean, current_var)
+        difference_ci = None
+        if bootstrap_resamples:
+            difference_ci = batch_statistics.bootstrap_mean_difference(
+                historical,
+                current,
+                confidence=1.0 - alpha,
+                resamples=bootstrap_resamples,
+                random_state=random_state,
+            )
+
+        results = []
+        for i, item in enumerate(series):
+            results.append(
+                RegressionResult(
+                    metric_name=item.metric_name,
+                    is_regression=self._determine_regression(
+                        bool(significant[i]), float(effect[i]), item.metric_type
+                    ),
+                    is_significant_change=bool(significant[i]),
+                    p_value=float(combined[i]),
+                    effect_size=float(effect[i]),
+                    effect_size_magnitude=self._interpret_effect_size(
+                        abs(float(effect[i]))
+                    ),
+                    confidence_level=1.0 - alpha,
+                    baseline_mean=float(baseline_mean[i]),
+                    current_mean=float(current_mean[i]),
+                    baseline_std=float(baseline_std[i]),
+                    current_std=float(current_std[i]),
+                    test_results={
+                        name: {
+                            "statistic": float(statistic[i]),
+                            "p_value": float(p_value[i]),
+                        }
+                        for name, (statistic, p_value) in test_stats.items()
+                    },
+                    consensus_score=float(consensus[i]),
+                    baseline_confidence_interval=baseline_ci[i].tolist(),
+                    current_confidence_interval=current_ci[i].tolist(),
+                    outliers_filtered=int(outliers[i]),
+                    adjusted_p_value=float(adjusted[i]),
+                    difference_confidence_interval=(
+                        difference_ci[i].tolist() if difference_ci is not None else None
+                    ),
+                )
+            )
+        return results
+
+    def _ks_per_series(
+        self, historical: np.ndarray, current: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Kolmogorov-Smirnov test per row (not vectorized)."""
+        statistic = np.full(len(historical), np.nan)
+        p_value = np.full(len(historical), np.nan)
+        for i, (h, c) in enumerate(zip(historical, current)):
+            result = stats.ks_2samp(h[~np.isnan(h)], c[~np.isnan(c)])
+            statistic[i], p_value[i] = result.statistic, result.pvalue
+        return statistic, p_value
+
+    def _t_intervals(
+        self, n: np.ndarray, mean: np.ndarray, var: np.ndarray, confidence: float = 0.95
+    ) -> np.ndarray:
+        """(rows, 2) t-distribution confidence intervals for row means."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            margin = stats.t.ppf((1 + confidence) / 2, n - 1) * np.sqrt(var / n)
+        margin = np.where(n > 1, margin, 0.0)
+        return np.column_stack([mean - margin, mean + margin])
+
     def _validate_inputs(
         self,
         historical_data: List[PerformanceData],
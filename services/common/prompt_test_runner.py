@@ -10,13 +10,28 @@ MLflow Model Registry and PromptModel infrastructure.
 Author: TDD Implementation for CRA-297
 """
 
+import asyncio
+import hashlib
 import time
 import json
+import math
 import re
-from typing import List, Dict, Any, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Protocol,
+    Tuple,
+)
 from dataclasses import dataclass, field
 from enum import Enum
 
+# Latency percentiles reported for completion runs
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
 
 class TestRunnerError(Exception):
     """Raised when PromptTestRunner encounters an error."""
@@ -57,6 +72,10 @@ class TestResult:
         execution_time: Time taken to execute the prompt in seconds
         error: Error message if the test failed, None if passed
         validation_details: Detailed breakdown of validation results
+        prompt_tokens: Prompt tokens used by the completion backend
+        completion_tokens: Completion tokens used by the completion backend
+        cached: Whether the completion came from the result cache
+        skipped: Whether the case was not run because the suite aborted
     """
 
     test_case_name: str
@@ -66,6 +85,10 @@ class TestResult:
     execution_time: float
     error: Optional[str] = None
     validation_details: Optional[Dict[str, Any]] = field(default_factory=dict)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached: bool = False
+    skipped: bool = False
 
 
 @dataclass
@@ -84,6 +107,88 @@ class TestSuite:
     metadata: Optional[Dict[str, Any]] = field(default_factory=dict)
 
 
+@dataclass
+class Completion:
+    """
+    Output of a completion backend for one rendered prompt.
+
+    Attributes:
+        text: Generated text
+        model: Model that produced the text
+        prompt_tokens: Tokens in the prompt
+        completion_tokens: Tokens in the generated text
+    """
+
+    text: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+class CompletionBackend(Protocol):
+    """Model that turns a rendered prompt into a completion."""
+
+    model: str
+
+    async def complete(self, prompt: str) -> Completion: ...
+
+
+class OpenAICompletionBackend:
+    """Chat completion backend on the shared async OpenAI client."""
+
+    def __init__(self, model: str = "gpt-4o-mini", temperature: float = 0.0):
+        self.model = model
+        self.temperature = temperature
+
+    async def complete(self, prompt: str) -> Completion:
+        from services.common.openai_wrapper import ai
+
+        response = await ai().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=self.temperature,
+        )
+        usage = response.usage
+        return Completion(
+            text=response.choices[0].message.content or "",
+            model=response.model,
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+        )
+
+
+class FakeCompletionBackend:
+    """
+    Local backend for tests and dry runs.
+
+    Returns ``respond(prompt)`` (the prompt itself by default) after
+    ``latency`` seconds and counts whitespace-separated words as tokens.
+    """
+
+    def __init__(
+        self,
+        respond: Optional[Callable[[str], str]] = None,
+        latency: float = 0.0,
+        model: str = "fake",
+    ):
+        self.model = model
+        self.respond = respond or (lambda prompt: prompt)
+        self.latency = latency
+        self.calls = 0
+
+    async def complete(self, prompt: str) -> Completion:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        text = self.respond(prompt)
+        return Completion(
+            text=text,
+            model=self.model,
+            prompt_tokens=len(prompt.split()),
+            completion_tokens=len(text.split()),
+        )
+
+
 class ValidationRule(Enum):
     """Enumeration of available validation rules."""
 
@@ -109,10 +214,24 @@ class PromptTestRunner:
     - Detailed reporting and analytics
 
     Integrates with existing PromptModel infrastructure for seamless CI/CD workflows.
+
+    Without a backend, cases validate the rendered template. With a
+    ``CompletionBackend``, each rendered prompt is sent to the model and the
+    completion is validated instead; cases run concurrently with a per-case
+    timeout, completions are cached by (template version, inputs, model),
+    and the suite stops starting new cases once more than ``max_failures``
+    have failed.
     """
 
     def __init__(
-        self, prompt_model: Any, test_suite: Optional[TestSuite] = None
+        self,
+        prompt_model: Any,
+        test_suite: Optional[TestSuite] = None,
+        backend: Optional[CompletionBackend] = None,
+        max_concurrency: int = 8,
+        case_timeout: float = 30.0,
+        max_failures: Optional[int] = None,
+        cache: Optional[MutableMapping[Tuple[str, str, str], Completion]] = None,
     ) -> None:
         """
         Initialize PromptTestRunner.
@@ -120,17 +239,30 @@ class PromptTestRunner:
         Args:
             prompt_model: PromptModel instance to test
             test_suite: Optional TestSuite to run
+            backend: Completion backend to run rendered prompts through
+            max_concurrency: Completion cases in flight at once
+            case_timeout: Seconds before a completion case fails
+            max_failures: Failures tolerated before remaining cases are skipped
+            cache: Completion cache, shared across runners if passed in
 
         Raises:
             TestRunnerError: If prompt_model is None
         """
         if prompt_model is None:
             raise TestRunnerError("Prompt model cannot be None")
+        if max_concurrency < 1:
+            raise TestRunnerError("max_concurrency must be at least 1")
 
         self.prompt_model = prompt_model
         self.test_suite = test_suite
+        self.backend = backend
+        self.max_concurrency = max_concurrency
+        self.case_timeout = case_timeout
+        self.max_failures = max_failures
+        self.cache = cache if cache is not None else {}
         self.test_results: List[TestResult] = []
         self.is_running = False
+        self.aborted = False
 
     def run_test_case(self, test_case: TestCase) -> TestResult:
         """
@@ -199,6 +331,8 @@ class PromptTestRunner:
         """
         if self.test_suite is None:
             raise TestRunnerError("No test suite configured")
+        if self.backend is not None:
+            return asyncio.run(self.run_test_suite_async())
 
         self.is_running = True
         results = []
@@ -214,6 +348,135 @@ class PromptTestRunner:
         finally:
             self.is_running = False
 
+    async def run_test_suite_async(self) -> List[TestResult]:
+        """
+        Run the configured test suite through the completion backend.
+
+        Results keep the order of the suite. Cases not started after the
+        failure budget is exceeded are returned with ``skipped`` set.
+
+        Returns:
+            List of TestResult objects for all test cases
+
+        Raises:
+            TestRunnerError: If no test suite or backend is configured
+        """
+        if self.test_suite is None:
+            raise TestRunnerError("No test suite configured")
+        if self.backend is None:
+            raise TestRunnerError("No completion backend configured")
+
+        self.is_running = True
+        self.aborted = False
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        failures = 0
+
+        async def run(test_case: TestCase) -> TestResult:
+            nonlocal failures
+            async with semaphore:
+                if self.aborted:
+                    return TestResult(
+                        test_case_name=test_case.name,
+                        passed=False,
+                        actual_output=None,
+                        expected_output=test_case.expected_output,
+                        execution_time=0.0,
+                        error="Skipped: failure budget exceeded",
+                        skipped=True,
+                    )
+                result = await self.run_completion_case(test_case)
+                if not result.passed:
+                    failures += 1
+                    if self.max_failures is not None and failures > self.max_failures:
+                        self.aborted = True
+                return result
+
+        try:
+            results = await asyncio.gather(
+                *(run(test_case) for test_case in self.test_suite.test_cases)
+            )
+            self.test_results = list(results)
+            return self.test_results
+        finally:
+            self.is_running = False
+
+    async def run_completion_case(self, test_case: TestCase) -> TestResult:
+        """
+        Run a single test case through the completion backend.
+
+        Args:
+            test_case: TestCase to execute
+
+        Returns:
+            TestResult for the completion, timed from the backend call
+
+        Raises:
+            TestRunnerError: If validation rule is unknown
+        """
+        if self.backend is None:
+            raise TestRunnerError("No completion backend configured")
+
+        key = self._cache_key(test_case)
+        completion = self.cache.get(key)
+        cached = completion is not None
+        start_time = time.perf_counter()
+        error = None
+
+        try:
+            if completion is None:
+                prompt = self.prompt_model.render(**test_case.input_data)
+                completion = await self._complete(prompt)
+                self.cache[key] = completion
+            execution_time = time.perf_counter() - start_time
+
+            validation_passed, validation_error = self._validate_output(
+                completion.text, test_case.expected_output, test_case.validation_rules
+            )
+            perf_passed, perf_error = self._validate_performance(
+                execution_time, test_case.validation_rules
+            )
+            overall_passed = validation_passed and perf_passed
+            if not overall_passed:
+                error = validation_error or perf_error
+
+        except TestRunnerError:
+            raise
+        except asyncio.TimeoutError:
+            execution_time = time.perf_counter() - start_time
+            error = f"Execution failed: timed out after {self.case_timeout}s"
+            overall_passed = False
+        except Exception as e:
+            execution_time = time.perf_counter() - start_time
+            error = f"Execution failed: {str(e)}"
+            overall_passed = False
+
+        return TestResult(
+            test_case_name=test_case.name,
+            passed=overall_passed,
+            actual_output=completion.text if completion else None,
+            expected_output=test_case.expected_output,
+            execution_time=execution_time,
+            error=error,
+            prompt_tokens=completion.prompt_tokens if completion else 0,
+            completion_tokens=completion.completion_tokens if completion else 0,
+            cached=cached,
+        )
+
+    async def _complete(self, prompt: str) -> Completion:
+        return await asyncio.wait_for(
+            self.backend.complete(prompt), timeout=self.case_timeout
+        )
+
+    def _cache_key(self, test_case: TestCase) -> Tuple[str, str, str]:
+        """(template version, inputs, model) identifying a completion."""
+        version = getattr(self.prompt_model, "version", None)
+        if not isinstance(version, str):
+            # No usable version: key on the template itself
+            template = str(getattr(self.prompt_model, "template", ""))
+            version = hashlib.sha1(template.encode()).hexdigest()
+        inputs = json.dumps(test_case.input_data, sort_keys=True, default=str)
+        return version, inputs, self.backend.model
+
     def _validate_output(
         self, actual: str, expected: str, rules: List[str]
     ) -> tuple[bool, Optional[str]]:
@@ -344,7 +607,8 @@ class PromptTestRunner:
         """
         total_tests = len(results)
         passed_tests = sum(1 for result in results if result.passed)
-        failed_tests = total_tests - passed_tests
+        skipped_tests = sum(1 for result in results if result.skipped)
+        failed_tests = total_tests - passed_tests - skipped_tests
         success_rate = passed_tests / total_tests if total_tests > 0 else 0.0
 
         execution_times = [result.execution_time for result in results]
@@ -357,13 +621,35 @@ class PromptTestRunner:
             "total": sum(execution_times),
         }
 
+        # Cache hits and skipped cases did not reach the model
+        latencies = sorted(
+            result.execution_time
+            for result in results
+            if not (result.cached or result.skipped)
+        )
+        latency_percentiles = {
+            f"p{p}": _percentile(latencies, p) for p in LATENCY_PERCENTILES
+        }
+
+        prompt_tokens = sum(result.prompt_tokens for result in results)
+        completion_tokens = sum(result.completion_tokens for result in results)
+
         return {
             "test_suite_name": self.test_suite.name if self.test_suite else "Unknown",
             "total_tests": total_tests,
             "passed_tests": passed_tests,
             "failed_tests": failed_tests,
+            "skipped_tests": skipped_tests,
+            "cached_tests": sum(1 for result in results if result.cached),
+            "aborted": self.aborted,
             "success_rate": success_rate,
             "execution_time_stats": execution_stats,
+            "latency_percentiles": latency_percentiles,
+            "token_usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
         }
 
     def generate_detailed_report(self, results: List[TestResult]) -> Dict[str, Any]:
@@ -388,11 +674,16 @@ class PromptTestRunner:
                     "expected_output": result.expected_output,
                     "execution_time": result.execution_time,
                     "error": result.error,
+                    "prompt_tokens": result.prompt_tokens,
+                    "completion_tokens": result.completion_tokens,
+                    "cached": result.cached,
+                    "skipped": result.skipped,
                 }
             )
 
         prompt_model_info = {
             "name": getattr(self.prompt_model, "name", "Unknown"),
+            "backend_model": getattr(self.backend, "model", None),
             "template": getattr(self.prompt_model, "template", "Unknown"),
             "version": getattr(self.prompt_model, "version", "Unknown"),
         }
@@ -415,3 +706,11 @@ class PromptTestRunner:
         """
         detailed_report = self.generate_detailed_report(results)
         return json.dumps(detailed_report, indent=2, default=str)
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of already sorted values (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(percentile / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
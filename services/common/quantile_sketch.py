@@ -0,0 +1,191 @@
+"""
+Mergeable streaming quantile sketch.
+
+A DDSketch keeps counts in logarithmically sized buckets, so every quantile
+it reports is within ``relative_accuracy`` of a true sample value. Memory
+depends on the value range, not the number of samples (a few hundred
+buckets cover microseconds to hours at 1%), and two sketches with the same
+accuracy merge by adding bucket counts. That makes per-worker sketches
+combinable into a fleet-wide view, which sorted sample windows are not.
+"""
+
+import math
+import operator
+import struct
+from array import array
+from typing import Dict, Optional
+
+# Values at or below this are counted in the zero bucket
+MIN_INDEXABLE_VALUE = 1e-9
+
+# relative_accuracy, zero_count, count, sum, min, max, first key, bucket count
+_HEADER = struct.Struct("<dqqdddiI")
+
+
+class DDSketch:
+    """Fixed-accuracy quantile sketch over non-negative values.
+
+    Bucket counts live in one contiguous ``array`` starting at bucket key
+    ``_offset``, which keeps a series to a few kilobytes.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        """
+        Args:
+            relative_accuracy: Maximum relative error of reported quantiles
+            max_bins: Bucket limit; the lowest buckets are collapsed beyond
+                it, so only the smallest quantiles lose accuracy
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._counts = array("q")
+        self._offset = 0
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def bins(self) -> Dict[int, int]:
+        """Non-empty buckets as {key: count}."""
+        return {
+            self._offset + i: weight for i, weight in enumerate(self._counts) if weight
+        }
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Record ``value`` (negative values are clamped to zero)."""
+        if value > MIN_INDEXABLE_VALUE:
+            index = math.ceil(math.log(value) / self._log_gamma) - self._offset
+            if not 0 <= index < len(self._counts):
+                index = self._extend(index + self._offset, index + self._offset)
+            self._counts[index] += weight
+        else:
+            value = max(value, 0.0)
+            self.zero_count += weight
+        self.count += weight
+        self.sum += value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add another sketch's samples into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        if not other.count:
+            return
+        if other._counts:
+            low = other._offset
+            high = other._offset + len(other._counts) - 1
+            self._extend(low, high)
+            counts = other._counts
+            start = low - self._offset
+            if start < 0:
+                # Keys below a collapsed range fold into its first bucket
+                self._counts[0] += sum(counts[: 1 - start])
+                counts = counts[1 - start :]
+                start = 1
+            end = start + len(counts)
+            self._counts[start:end] = array(
+                "q", map(operator.add, self._counts[start:end], counts)
+            )
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0-1), or None when empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+        seen = self.zero_count
+        key = self._offset
+        for key, weight in enumerate(self._counts, self._offset):
+            seen += weight
+            if seen > rank:
+                break
+        estimate = 2 * self._gamma**key / (self._gamma + 1)
+        return min(max(estimate, self.min), self.max)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def _extend(self, low: int, high: int) -> int:
+        """
+        Grow the bucket range to cover keys ``low``..``high``.
+
+        When the range would exceed ``max_bins`` the lowest buckets are
+        folded into the first kept one.
+
+        Returns:
+            Array index of ``low`` after growing
+        """
+        if not self._counts:
+            self._offset = low
+            self._counts = array("q", bytes(8 * (high - low + 1)))
+        else:
+            if low < self._offset:
+                self._counts[0:0] = array("q", bytes(8 * (self._offset - low)))
+                self._offset = low
+            end = self._offset + len(self._counts)
+            if high >= end:
+                self._counts.extend(array("q", bytes(8 * (high - end + 1))))
+
+        excess = len(self._counts) - self.max_bins
+        if excess > 0:
+            folded = sum(self._counts[: excess + 1])
+            del self._counts[:excess]
+            self._counts[0] = folded
+            self._offset += excess
+        return max(low - self._offset, 0)
+
+    def to_bytes(self) -> bytes:
+        """Compact binary encoding (header plus packed bucket counts)."""
+        return (
+            _HEADER.pack(
+                self.relative_accuracy,
+                self.zero_count,
+                self.count,
+                self.sum,
+                self.min,
+                self.max,
+                self._offset,
+                len(self._counts),
+            )
+            + self._counts.tobytes()
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_bins: int = 2048) -> "DDSketch":
+        """Decode a sketch produced by ``to_bytes``."""
+        (
+            accuracy,
+            zero_count,
+            count,
+            total,
+            low,
+            high,
+            offset,
+            size,
+        ) = _HEADER.unpack_from(data)
+        sketch = cls(accuracy, max_bins)
+        sketch._counts = array("q")
+        sketch._counts.frombytes(data[_HEADER.size : _HEADER.size + 8 * size])
+        sketch._offset = offset
+        sketch.zero_count = zero_count
+        sketch.count = count
+        sketch.sum = total
+        sketch.min = low
+        sketch.max = high
+        return sketch
@@ -0,0 +1,192 @@
+"""
+Rate limiter simulation benchmark.
+
+Simulates a fleet of replicas, each running many concurrent clients for
+several personas, all drawing from one quota. Compares:
+
+- per_replica: the old in-memory TokenBucketLimiter in every replica
+- distributed: DistributedRateLimiter instances sharing one GCRA key
+
+and reports admitted throughput against the quota, how many limiter checks
+each admission cost, and fairness across personas (Jain's index, 1.0 is
+perfectly fair).
+
+Usage:
+    python -m services.common.rate_limiter_benchmark [--redis-url URL]
+
+Without --redis-url the shared key is simulated in process, which measures
+the limiter logic but not Redis round-trips.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from services.common.distributed_rate_limiter import (
+    DistributedRateLimiter,
+    GCRALimit,
+    LocalGCRA,
+)
+from services.threads_adaptor.limiter import TokenBucketLimiter
+
+
+class SimulatedRedis:
+    """Stands in for one Redis key: every replica shares the same GCRA."""
+
+    def __init__(self, limit: GCRALimit):
+        self.gcra = LocalGCRA(limit)
+        self.calls = 0
+
+    def register_script(self, script: str) -> Any:
+        async def run(keys: List[str], args: List[float]) -> List[Any]:
+            self.calls += 1
+            allowed, delay = self.gcra.check(float(args[2]), float(args[3]) / 1000)
+            return [int(allowed), str(delay * 1000)]
+
+        return run
+
+
+def jain_index(counts: List[int]) -> float:
+    """Jain's fairness index over per-persona admissions."""
+    if not counts or not any(counts):
+        return 1.0
+    return sum(counts) ** 2 / (len(counts) * sum(c * c for c in counts))
+
+
+async def run_clients(
+    limiters: List[Any],
+    personas: int,
+    clients_per_persona: int,
+    duration: float,
+    skew: int,
+) -> Counter:
+    """Run clients until ``duration`` elapses; persona 0 gets ``skew``x clients."""
+    admitted: Counter = Counter()
+    deadline = time.monotonic() + duration
+
+    async def client(limiter: Any, persona: str) -> None:
+        while time.monotonic() < deadline:
+            try:
+                await asyncio.wait_for(
+                    limiter.acquire(fairness_key=persona),
+                    timeout=deadline - time.monotonic(),
+                )
+            except (asyncio.TimeoutError, ValueError):
+                return
+            admitted[persona] += 1
+
+    tasks = []
+    for limiter in limiters:
+        for p in range(personas):
+            count = clients_per_persona * (skew if p == 0 else 1)
+            tasks += [client(limiter, f"persona_{p}") for _ in range(count)]
+    await asyncio.gather(*tasks)
+    return admitted
+
+
+async def simulate(
+    mode: str,
+    replicas: int,
+    personas: int,
+    clients_per_persona: int,
+    rate: float,
+    duration: float,
+    skew: int,
+    redis_url: Optional[str],
+) -> Dict[str, Any]:
+    limit = GCRALimit(rate=rate, period=1.0, burst=max(1.0, rate / 10))
+    simulated: Optional[SimulatedRedis] = None
+
+    if mode == "per_replica":
+        limiters = [
+            TokenBucketLimiter(max_tokens=int(limit.burst), refill_rate=rate)
+            for _ in range(replicas)
+        ]
+    else:
+        if redis_url is None:
+            simulated = SimulatedRedis(limit)
+        limiters = [
+            DistributedRateLimiter(
+                f"benchmark:{time.time_ns()}" if redis_url else "benchmark",
+                limit,
+                redis_url=redis_url,
+                async_redis_client=simulated,
+            )
+            for _ in range(replicas)
+        ]
+        if redis_url:
+            # All replicas must share one key
+            for limiter in limiters:
+                limiter.key = limiters[0].key
+
+    start = time.monotonic()
+    admitted = await run_clients(
+        limiters, personas, clients_per_persona, duration, skew
+    )
+    elapsed = time.monotonic() - start
+
+    total = sum(admitted.values())
+    checks = (
+        simulated.calls
+        if simulated
+        else sum(
+            limiter.stats["allowed"] + limiter.stats["throttled"]
+            for limiter in limiters
+            if isinstance(limiter, DistributedRateLimiter)
+        )
+    )
+    return {
+        "mode": mode,
+        "admitted_per_s": total / elapsed,
+        "quota_per_s": rate,
+        "over_quota": max(0.0, total / elapsed / rate - 1.0),
+        "checks_per_admission": checks / total if total and checks else None,
+        "fairness": jain_index(
+            [admitted.get(f"persona_{p}", 0) for p in range(personas)]
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rate limiter simulation")
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--replicas", type=int, default=10)
+    parser.add_argument("--personas", type=int, default=5)
+    parser.add_argument("--clients-per-persona", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=200.0, help="quota per second")
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument(
+        "--skew", type=int, default=5, help="client multiplier for persona_0"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'mode':>12} {'admitted/s':>11} {'quota/s':>8} {'over quota':>11} "
+        f"{'checks/adm':>11} {'fairness':>9}"
+    )
+    for mode in ("per_replica", "distributed"):
+        r = asyncio.run(
+            simulate(
+                mode,
+                args.replicas,
+                args.personas,
+                args.clients_per_persona,
+                args.rate,
+                args.duration,
+                args.skew,
+                args.redis_url,
+            )
+        )
+        checks = (
+            f"{r['checks_per_admission']:.2f}" if r["checks_per_admission"] else "n/a"
+        )
+        print(
+            f"{r['mode']:>12} {r['admitted_per_s']:>11.1f} {r['quota_per_s']:>8.0f} "
+            f"{r['over_quota']:>10.0%} {checks:>11} {r['fairness']:>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
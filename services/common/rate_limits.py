@@ -4,10 +4,15 @@ Each agent gets its own quota to prevent conflicts.
 """
 
 import os
-from typing import Dict
-from functools import wraps
 import time
-import threading
+from typing import Dict, Optional
+from functools import wraps
+
+from services.common.distributed_rate_limiter import (
+    DistributedRateLimiter,
+    GCRALimit,
+    LocalGCRA,
+)
 
 # Rate limits per agent (tokens per minute)
 AGENT_RATE_LIMITS: Dict[str, Dict[str, int]] = {
@@ -35,37 +40,46 @@ AGENT_RATE_LIMITS: Dict[str, Dict[str, int]] = {
 
 
 class AgentRateLimiter:
-    """Simple rate limiter for agent-based development."""
+    """
+    Per-agent token quota.
+
+    With REDIS_URL set, every process running as the agent shares one quota;
+    otherwise each process keeps its own in-memory bucket.
+    """
 
     def __init__(self):
         self.agent_id = os.getenv("AGENT_ID", "a1")
         self.limits = AGENT_RATE_LIMITS.get(self.agent_id, AGENT_RATE_LIMITS["a1"])
-        self.token_bucket = self.limits["tokens_per_minute"]
-        self.last_refill = time.time()
-        self.lock = threading.Lock()
+        self.limit = GCRALimit(rate=self.limits["tokens_per_minute"], period=60.0)
+        self.local = LocalGCRA(self.limit)
+        redis_url = os.getenv("REDIS_URL")
+        self.limiter: Optional[DistributedRateLimiter] = (
+            DistributedRateLimiter(
+                f"agent:{self.agent_id}:tokens", self.limit, redis_url=redis_url
+            )
+            if redis_url
+            else None
+        )
 
     def consume_tokens(self, tokens: int) -> bool:
         """Consume tokens from the bucket."""
-        with self.lock:
-            # Refill bucket
-            now = time.time()
-            elapsed = now - self.last_refill
-            tokens_to_add = elapsed * (self.limits["tokens_per_minute"] / 60)
-            self.token_bucket = min(
-                self.limits["tokens_per_minute"], self.token_bucket + tokens_to_add
-            )
-            self.last_refill = now
-
-            # Check if we can consume
-            if self.token_bucket >= tokens:
-                self.token_bucket -= tokens
-                return True
+        if tokens <= 0 or tokens > self.limit.burst:
             return False
-
-    def wait_if_needed(self, tokens: int) -> None:
-        """Wait until tokens are available."""
-        while not self.consume_tokens(tokens):
-            time.sleep(0.1)
+        if self.limiter is not None:
+            allowed, _ = self.limiter.try_acquire(tokens)
+        else:
+            allowed, _ = self.local.check(tokens)
+        return allowed
+
+    def wait_if_needed(self, tokens: int, fairness_key: str = "default") -> None:
+        """Wait until tokens are available, sleeping for the retry-after time."""
+        if self.limiter is not None:
+            self.limiter.acquire_sync(tokens, fairness_key=fairness_key)
+            return
+        # Book the next free slot and sleep until it arrives
+        _, delay = self.local.check(tokens, max_delay=float("inf"))
+        if delay > 0:
+            time.sleep(delay)
 
 
 def get_agent_rate_limit() -> Dict[str, int]:
@@ -1,5 +1,11 @@
 """Tests for AI metrics tracking system."""
 
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from services.common import ai_metrics
 from services.common.ai_metrics import AIMetricsTracker
 
 
@@ -126,3 +132,56 @@ class TestAIMetricsTracker:
         assert breakdown["gpt-4"]["request_count"] == 2
         assert breakdown["gpt-4"]["avg_tokens"] == 225  # (200+250)/2
         assert breakdown["gpt-3.5-turbo"]["request_count"] == 1
+
+
+class TestSketchWindows:
+    """Test time-decayed sketch windows and cluster-wide merging."""
+
+    def test_expired_slots_drop_out_of_window(self):
+        tracker = AIMetricsTracker(window_seconds=60, window_slots=6)
+
+        with patch.object(ai_metrics.time, "time", return_value=1000.0):
+            for _ in range(10):
+                tracker.record_inference("gpt-4", 100, 5000)
+        with patch.object(ai_metrics.time, "time", return_value=1030.0):
+            for _ in range(10):
+                tracker.record_inference("gpt-4", 100, 100)
+            assert (
+                tracker.get_metrics()["model_breakdown"]["gpt-4"]["request_count"] == 20
+            )
+
+        with patch.object(ai_metrics.time, "time", return_value=1065.0):
+            metrics = tracker.get_metrics()
+
+        assert metrics["model_breakdown"]["gpt-4"]["request_count"] == 10
+        assert metrics["p99_response_time_ms"] == pytest.approx(100, rel=0.01)
+
+    def test_series_kept_per_model_and_service(self):
+        tracker = AIMetricsTracker()
+        tracker.record_inference("gpt-4", 100, 200, service="persona_runtime")
+        tracker.record_inference("gpt-4", 300, 400, service="orchestrator")
+
+        assert set(tracker._series) == {
+            ("gpt-4", "persona_runtime"),
+            ("gpt-4", "orchestrator"),
+        }
+        assert tracker.get_metrics()["model_breakdown"]["gpt-4"]["avg_tokens"] == 200
+
+    def test_cluster_metrics_merge_workers(self):
+        redis_client = fakeredis.FakeRedis()
+        workers = [AIMetricsTracker(worker_id=f"worker-{i}") for i in range(3)]
+        for i, tracker in enumerate(workers):
+            for rt in range(1, 101):
+                tracker.record_inference(
+                    "gpt-4o", 10, rt + i * 100, prompt_tokens=10, service="svc"
+                )
+            assert tracker.publish(redis_client) == 1
+
+        cluster = workers[0].get_cluster_metrics(redis_client)
+
+        assert cluster["workers"] == 3
+        assert cluster["model_breakdown"]["gpt-4o"]["request_count"] == 300
+        assert cluster["p95_response_time_ms"] == pytest.approx(285, rel=0.02)
+        assert cluster["total_cost_last_window"] == pytest.approx(
+            sum(w.get_metrics()["total_cost_last_window"] for w in workers)
+        )
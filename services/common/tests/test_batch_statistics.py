@@ -0,0 +1,94 @@
+"""Tests for the vectorized batch statistics against scipy."""
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from services.common import batch_statistics
+
+
+@pytest.fixture
+def samples():
+    """Series of different lengths, rounded so Mann-Whitney sees ties."""
+    rng = np.random.default_rng(0)
+    xs = [np.round(rng.normal(10, 2, rng.integers(10, 60)), 1) for _ in range(40)]
+    ys = [np.round(rng.normal(10.5, 3, rng.integers(10, 40)), 1) for _ in range(40)]
+    return xs, ys
+
+
+class TestBatchStatistics:
+    @pytest.mark.parametrize("equal_var", [True, False])
+    def test_t_test_matches_scipy(self, samples, equal_var):
+        xs, ys = samples
+        statistic, p_value = batch_statistics.t_test(
+            batch_statistics.pad(xs), batch_statistics.pad(ys), equal_var=equal_var
+        )
+
+        expected = [stats.ttest_ind(x, y, equal_var=equal_var) for x, y in zip(xs, ys)]
+        np.testing.assert_allclose(statistic, [r.statistic for r in expected])
+        np.testing.assert_allclose(p_value, [r.pvalue for r in expected])
+
+    def test_mann_whitney_matches_scipy_with_ties(self, samples):
+        xs, ys = samples
+        statistic, p_value = batch_statistics.mann_whitney(
+            batch_statistics.pad(xs), batch_statistics.pad(ys)
+        )
+
+        expected = [
+            stats.mannwhitneyu(x, y, alternative="two-sided", method="asymptotic")
+            for x, y in zip(xs, ys)
+        ]
+        np.testing.assert_allclose(statistic, [r.statistic for r in expected])
+        np.testing.assert_allclose(p_value, [r.pvalue for r in expected])
+
+    def test_fisher_and_benjamini_hochberg_match_scipy(self):
+        rng = np.random.default_rng(1)
+        p_values = rng.random((200, 3))
+        p_values[0, 1] = np.nan  # Ignored, like the scalar path
+
+        combined = batch_statistics.fisher_combine(p_values)
+
+        expected = [
+            stats.combine_pvalues(row[~np.isnan(row)], method="fisher").pvalue
+            for row in p_values
+        ]
+        np.testing.assert_allclose(combined, expected)
+        np.testing.assert_allclose(
+            batch_statistics.benjamini_hochberg(combined),
+            stats.false_discovery_control(combined),
+        )
+
+    def test_bca_interval_agrees_with_scipy_bootstrap(self):
+        rng = np.random.default_rng(2)
+        # Skewed data, where the BCa corrections matter
+        xs = [rng.lognormal(0, 0.8, 40), rng.lognormal(0, 0.5, 25)]
+        ys = [rng.lognormal(0.3, 0.8, 30), rng.lognormal(0, 0.5, 35)]
+
+        intervals = batch_statistics.bootstrap_mean_difference(
+            batch_statistics.pad(xs),
+            batch_statistics.pad(ys),
+            resamples=20000,
+            random_state=3,
+        )
+
+        for (low, high), x, y in zip(intervals, xs, ys):
+            expected = stats.bootstrap(
+                (x, y),
+                lambda a, b, axis: b.mean(axis=axis) - a.mean(axis=axis),
+                method="BCa",
+                n_resamples=20000,
+                random_state=4,
+            ).confidence_interval
+            width = expected.high - expected.low
+            assert low == pytest.approx(expected.low, abs=0.05 * width)
+            assert high == pytest.approx(expected.high, abs=0.05 * width)
+
+    def test_filter_outliers_keeps_rows_left_aligned(self):
+        data = batch_statistics.pad([[1.0, 1.0, 50.0, 1.0, 1.1, 0.9], [2.0, 2.0, 2.0]])
+
+        filtered, removed = batch_statistics.filter_outliers(data, threshold=2.0)
+
+        assert removed.tolist() == [1, 0]
+        np.testing.assert_array_equal(filtered[0, :5], [1.0, 1.0, 1.0, 1.1, 0.9])
+        assert np.isnan(filtered[0, 5])
+        np.testing.assert_array_equal(filtered[1, :3], [2.0, 2.0, 2.0])
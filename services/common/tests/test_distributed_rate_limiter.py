@@ -0,0 +1,216 @@
+"""Tests for the distributed GCRA rate limiter."""
+
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from services.common.distributed_rate_limiter import (
+    DistributedRateLimiter,
+    GCRALimit,
+    LocalGCRA,
+)
+
+
+class FakeRedis:
+    """One shared GCRA key evaluated in process in place of the Lua script."""
+
+    def __init__(self, limit: GCRALimit, is_async: bool = False):
+        self.gcra = LocalGCRA(limit)
+        self.is_async = is_async
+        self.calls = 0
+
+    def register_script(self, script):
+        def run(keys, args):
+            self.calls += 1
+            allowed, delay = self.gcra.check(float(args[2]), float(args[3]) / 1000)
+            return [int(allowed), str(delay * 1000)]
+
+        if not self.is_async:
+            return run
+
+        async def run_async(keys, args):
+            return run(keys, args)
+
+        return run_async
+
+
+class TestLocalGCRA:
+    def test_burst_then_exact_retry_after(self):
+        gcra = LocalGCRA(GCRALimit(rate=10, period=1.0, burst=2))
+
+        assert gcra.check(now=100.0) == (True, 0.0)
+        assert gcra.check(now=100.0) == (True, 0.0)
+        allowed, retry_after = gcra.check(now=100.0)
+
+        assert allowed is False
+        assert retry_after == pytest.approx(0.1)
+        assert gcra.check(now=100.1)[0] is True
+
+    def test_weighted_cost_and_reservation(self):
+        gcra = LocalGCRA(GCRALimit(rate=10, period=1.0, burst=5))
+
+        assert gcra.check(cost=5, now=0.0) == (True, 0.0)
+        # Next slot is 0.3s away: denied without a reservation window...
+        assert gcra.check(cost=3, now=0.0)[0] is False
+        # ...and booked when the caller is willing to wait that long
+        allowed, delay = gcra.check(cost=3, max_delay=1.0, now=0.0)
+        assert allowed is True
+        assert delay == pytest.approx(0.3)
+
+
+class TestDistributedRateLimiter:
+    def test_replicas_share_one_quota(self):
+        limit = GCRALimit(rate=1, period=60.0, burst=2)
+        shared = FakeRedis(limit)
+        pod_a = DistributedRateLimiter("threads_api", limit, redis_client=shared)
+        pod_b = DistributedRateLimiter("threads_api", limit, redis_client=shared)
+
+        assert pod_a.try_acquire()[0] is True
+        assert pod_b.try_acquire()[0] is True
+        allowed, retry_after = pod_a.try_acquire()
+
+        assert allowed is False
+        assert retry_after == pytest.approx(60.0, abs=0.1)
+
+    def test_falls_back_to_local_limits_when_redis_is_down(self):
+        down = MagicMock()
+        down.register_script.side_effect = redis.ConnectionError("refused")
+        limiter = DistributedRateLimiter(
+            "threads_api",
+            GCRALimit(rate=1, period=60.0, burst=4),
+            redis_client=down,
+            fallback_share=0.5,
+        )
+
+        results = [limiter.try_acquire()[0] for _ in range(3)]
+
+        assert results == [True, True, False]
+        assert limiter.stats["fallback_checks"] == 3
+        # Redis is not retried until REDIS_RETRY_INTERVAL has passed
+        assert down.register_script.call_count == 1
+
+    def test_cost_above_burst_is_rejected(self):
+        limiter = DistributedRateLimiter(
+            "tokens", GCRALimit(rate=100, burst=10), redis_client=MagicMock()
+        )
+
+        with pytest.raises(ValueError):
+            limiter.try_acquire(cost=11)
+
+    @pytest.mark.asyncio
+    async def test_waiters_served_round_robin_across_personas(self):
+        limit = GCRALimit(rate=200, period=1.0, burst=1)
+        limiter = DistributedRateLimiter(
+            "threads_api", limit, async_redis_client=FakeRedis(limit, is_async=True)
+        )
+        order = []
+
+        async def request(persona):
+            await limiter.acquire(fairness_key=persona)
+            order.append(persona)
+
+        await asyncio.gather(
+            *[request("busy") for _ in range(8)], *[request("quiet") for _ in range(2)]
+        )
+
+        assert order[:4] == ["busy", "quiet", "busy", "quiet"]
+
+    @pytest.mark.asyncio
+    async def test_waiters_sleep_instead_of_polling(self):
+        limit = GCRALimit(rate=100, period=1.0, burst=1)
+        shared = FakeRedis(limit, is_async=True)
+        limiter = DistributedRateLimiter(
+            "threads_api", limit, async_redis_client=shared
+        )
+
+        start = time.monotonic()
+        await asyncio.gather(*[limiter.acquire() for _ in range(10)])
+        elapsed = time.monotonic() - start
+
+        # Nine 10ms slots after the first, without busy-waiting
+        assert 0.08 <= elapsed < 0.3
+        # Each admission books its slot in a single check
+        assert shared.calls == 10
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        limit = GCRALimit(rate=20, period=1.0, burst=1)
+        limiter = DistributedRateLimiter(
+            "threads_api", limit, async_redis_client=FakeRedis(limit, is_async=True)
+        )
+
+        await limiter.acquire()
+        cancelled = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await asyncio.wait_for(limiter.acquire(), timeout=1.0)
+
+    def test_sync_front_end_across_threads(self):
+        limit = GCRALimit(rate=100, period=1.0, burst=1)
+        shared = FakeRedis(limit)
+        limiter = DistributedRateLimiter("threads_api", limit, redis_client=shared)
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=limiter.acquire_sync) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2.0)
+
+        assert 0.04 <= time.monotonic() - start < 0.3
+        assert limiter.stats["allowed"] == 6
+
+
+class TestIntegrations:
+    def test_agent_rate_limiter_waits_on_shared_quota(self):
+        from services.common.rate_limits import AgentRateLimiter
+
+        agent_limiter = AgentRateLimiter()
+        agent_limiter.limiter = MagicMock()
+
+        agent_limiter.wait_if_needed(500)
+
+        agent_limiter.limiter.acquire_sync.assert_called_once_with(
+            500, fairness_key="default"
+        )
+
+    def test_agent_rate_limiter_is_local_without_redis(self):
+        from services.common.rate_limits import AgentRateLimiter
+
+        with patch.dict(os.environ, {"AGENT_ID": "a3"}, clear=True):
+            agent_limiter = AgentRateLimiter()
+
+        assert agent_limiter.limiter is None
+        assert agent_limiter.consume_tokens(4000)
+        assert not agent_limiter.consume_tokens(4000)
+        # Over the burst is refused, as with the old bucket, not raised
+        assert not agent_limiter.consume_tokens(10**6)
+
+        start = time.monotonic()
+        agent_limiter.wait_if_needed(1)
+        assert time.monotonic() - start < 0.5
+
+    def test_agent_rate_limiter_uses_shared_quota_with_redis(self):
+        from services.common.rate_limits import AgentRateLimiter
+
+        with patch.dict(os.environ, {"REDIS_URL": "redis://redis:6379"}):
+            agent_limiter = AgentRateLimiter()
+
+        assert isinstance(agent_limiter.limiter, DistributedRateLimiter)
+
+    def test_threads_adaptor_uses_shared_limiter_with_redis(self):
+        from services.threads_adaptor.limiter import (
+            TokenBucketLimiter,
+            create_rate_limiter,
+        )
+
+        with patch.dict(os.environ, {"REDIS_URL": "redis://redis:6379"}):
+            assert isinstance(create_rate_limiter(), DistributedRateLimiter)
+        with patch.dict(os.environ, {}, clear=True):
+            assert isinstance(create_rate_limiter(), TokenBucketLimiter)
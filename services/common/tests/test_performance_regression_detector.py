@@ -22,6 +22,7 @@ from services.common.performance_regression_detector import (
     PerformanceData,
     RegressionError,
     MetricType,
+    MetricSeries,
     SignificanceLevel,
 )
 
@@ -912,6 +913,127 @@ class TestPerformanceRegressionDetectorEdgeCases:
         assert result.current_std == 0.0
 
 
+class TestPerformanceRegressionDetectorBatch:
+    """Test the vectorized multi-metric batch mode."""
+
+    def make_data(self, name, values, days_ago=0):
+        return [
+            PerformanceData(
+                timestamp=datetime.now() - timedelta(days=days_ago),
+                metric_name=name,
+                value=float(v),
+                metadata={},
+            )
+            for v in values
+        ]
+
+    def test_batch_matches_single_metric_detection(self):
+        """Per-metric statistics equal detect_regression on the same data."""
+        rng = np.random.default_rng(7)
+        detector = PerformanceRegressionDetector(
+            statistical_tests=[
+                StatisticalTest.T_TEST,
+                StatisticalTest.WELCH_T_TEST,
+                StatisticalTest.MANN_WHITNEY,
+            ],
+            filter_outliers=True,
+        )
+        series, single = [], []
+        for i in range(12):
+            historical = self.make_data(
+                f"m{i}", np.round(rng.normal(0.8, 0.05, 30 + i), 3), days_ago=1
+            )
+            current = self.make_data(
+                f"m{i}", np.round(rng.normal(0.8 - 0.01 * i, 0.05, 20), 3)
+            )
+            series.append(detector.build_series(historical, current, f"m{i}"))
+            single.append(detector.detect_regression(historical, current, f"m{i}"))
+
+        batch = detector.detect_regressions(series)
+
+        for got, expected in zip(batch, single):
+            assert got.metric_name == expected.metric_name
+            assert got.p_value == pytest.approx(expected.p_value, rel=1e-6)
+            assert got.effect_size == pytest.approx(expected.effect_size)
+            assert got.baseline_mean == pytest.approx(expected.baseline_mean)
+            assert got.outliers_filtered == expected.outliers_filtered
+            assert got.current_confidence_interval == pytest.approx(
+                expected.current_confidence_interval
+            )
+            for name, result in expected.test_results.items():
+                assert got.test_results[name]["p_value"] == pytest.approx(
+                    result["p_value"], rel=1e-6
+                )
+            assert got.difference_confidence_interval is None
+
+    def test_batch_corrects_for_multiple_metrics(self):
+        """Only real shifts survive Benjamini-Hochberg across many null metrics."""
+        rng = np.random.default_rng(11)
+        series = [
+            MetricSeries(
+                metric_name=f"latency_{i}",
+                historical_values=rng.normal(100, 10, 50),
+                current_values=rng.normal(130 if i < 3 else 100, 10, 50),
+                metric_type=MetricType.LOWER_IS_BETTER,
+            )
+            for i in range(300)
+        ]
+        detector = PerformanceRegressionDetector()
+
+        results = detector.detect_regressions(series)
+
+        flagged = {r.metric_name for r in results if r.is_regression}
+        uncorrected = {r.metric_name for r in results if r.p_value < 0.05}
+        assert {"latency_0", "latency_1", "latency_2"} <= flagged
+        assert len(flagged) <= 4  # ~15 nulls pass uncorrected at 5%
+        assert len(uncorrected) > 10
+        assert all(r.adjusted_p_value >= r.p_value - 1e-12 for r in results)
+
+    def test_batch_bootstrap_interval_is_opt_in(self):
+        """BCa intervals of the mean difference are computed on request."""
+        rng = np.random.default_rng(5)
+        series = [
+            MetricSeries(
+                metric_name=f"latency_{i}",
+                historical_values=rng.normal(100, 10, 50),
+                current_values=rng.normal(130 if i == 0 else 100, 10, 50),
+                metric_type=MetricType.LOWER_IS_BETTER,
+            )
+            for i in range(3)
+        ]
+        detector = PerformanceRegressionDetector()
+
+        results = detector.detect_regressions(
+            series, bootstrap_resamples=1000, random_state=0
+        )
+
+        for result in results:
+            low, high = result.difference_confidence_interval
+            assert low < result.current_mean - result.baseline_mean < high
+        assert results[0].difference_confidence_interval[0] > 0
+
+    def test_batch_handles_constant_series(self):
+        """Zero-variance series follow the single-metric special case."""
+        detector = PerformanceRegressionDetector()
+        results = detector.detect_regressions(
+            [
+                MetricSeries("same", [0.8] * 10, [0.8] * 10),
+                MetricSeries("dropped", [0.9] * 10, [0.8] * 10),
+            ]
+        )
+
+        assert results[0].is_significant_change is False
+        assert results[1].is_regression is True
+        assert results[1].effect_size == -10.0
+
+    def test_batch_rejects_short_series(self):
+        """Series below minimum_samples raise with the metric name."""
+        detector = PerformanceRegressionDetector(minimum_samples=10)
+
+        with pytest.raises(RegressionError, match="short"):
+            detector.detect_regressions([MetricSeries("short", [1.0] * 5, [1.0] * 10)])
+
+
 # Mark integration tests
 @pytest.mark.e2e
 class TestPerformanceRegressionDetectorIntegration:
@@ -21,6 +21,7 @@ try:
         TestResult,
         TestSuite,
         TestRunnerError,
+        FakeCompletionBackend,
     )
 except ImportError:
     # Expected to fail on first run - this is TDD!
@@ -696,6 +697,132 @@ class TestPromptTestRunnerEdgeCases:
         assert all(result.passed for result in results)
 
 
+class TestPromptTestRunnerCompletionMode:
+    """Test running cases through a completion backend."""
+
+    @pytest.fixture
+    def prompt_model(self):
+        mock_model = Mock()
+        mock_model.name = "completion-test-model"
+        mock_model.version = "1.0.0"
+        mock_model.render.side_effect = lambda **kwargs: (
+            f"Say hello to {kwargs['name']}"
+        )
+        return mock_model
+
+    def make_suite(self, count, expected="hello"):
+        return TestSuite(
+            name="completion_suite",
+            test_cases=[
+                TestCase(
+                    name=f"case_{i}",
+                    input_data={"name": f"user{i}"},
+                    expected_output=expected,
+                    validation_rules=["contains"],
+                )
+                for i in range(count)
+            ],
+        )
+
+    def test_cases_run_concurrently_in_order(self, prompt_model):
+        """Cases overlap up to max_concurrency and keep suite order."""
+        import time
+
+        backend = FakeCompletionBackend(latency=0.05)
+        runner = PromptTestRunner(
+            prompt_model,
+            self.make_suite(20),
+            backend=backend,
+            max_concurrency=10,
+        )
+
+        start = time.perf_counter()
+        results = runner.run_test_suite()
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5  # 20 x 50ms sequentially would take 1s
+        assert [r.test_case_name for r in results] == [f"case_{i}" for i in range(20)]
+        assert all(r.passed for r in results)
+        assert results[3].actual_output == "Say hello to user3"
+
+        summary = runner.generate_summary_report(results)
+        assert summary["token_usage"]["prompt_tokens"] == 80
+        assert summary["token_usage"]["completion_tokens"] == 80
+        assert 0.05 <= summary["latency_percentiles"]["p50"]
+        assert (
+            summary["latency_percentiles"]["p50"]
+            <= summary["latency_percentiles"]["p99"]
+        )
+
+    def test_completions_are_cached_by_version_inputs_and_model(self, prompt_model):
+        """A shared cache avoids calling the backend again for the same case."""
+        backend = FakeCompletionBackend()
+        cache = {}
+        suite = self.make_suite(5)
+
+        PromptTestRunner(
+            prompt_model, suite, backend=backend, cache=cache
+        ).run_test_suite()
+        results = PromptTestRunner(
+            prompt_model, suite, backend=backend, cache=cache
+        ).run_test_suite()
+
+        assert backend.calls == 5
+        assert all(r.cached and r.passed for r in results)
+
+        prompt_model.version = "1.0.1"
+        PromptTestRunner(
+            prompt_model, suite, backend=backend, cache=cache
+        ).run_test_suite()
+        other_model = FakeCompletionBackend(model="other")
+        PromptTestRunner(
+            prompt_model, suite, backend=other_model, cache=cache
+        ).run_test_suite()
+        assert backend.calls == 10
+        assert other_model.calls == 5
+
+    def test_slow_completion_times_out(self, prompt_model):
+        """A case exceeding case_timeout fails and is not cached."""
+        backend = FakeCompletionBackend(latency=1.0)
+        runner = PromptTestRunner(
+            prompt_model, self.make_suite(2), backend=backend, case_timeout=0.05
+        )
+
+        results = runner.run_test_suite()
+
+        assert not any(r.passed for r in results)
+        assert "timed out" in results[0].error
+        assert runner.cache == {}
+
+    def test_failure_budget_skips_remaining_cases(self, prompt_model):
+        """Once failures exceed max_failures, unstarted cases are skipped."""
+        backend = FakeCompletionBackend(respond=lambda prompt: "nope")
+        runner = PromptTestRunner(
+            prompt_model,
+            self.make_suite(10),
+            backend=backend,
+            max_concurrency=2,
+            max_failures=2,
+        )
+
+        results = runner.run_test_suite()
+        summary = runner.generate_summary_report(results)
+
+        assert runner.aborted is True
+        assert backend.calls == 4  # Third failure lands with one case in flight
+        assert summary["failed_tests"] == 4
+        assert summary["skipped_tests"] == 6
+        assert all(r.skipped for r in results[4:])
+
+    @pytest.mark.asyncio
+    async def test_async_entry_point_requires_backend(self, prompt_model):
+        """Render-only runners cannot use the completion entry point."""
+        runner = PromptTestRunner(prompt_model, self.make_suite(1))
+
+        with pytest.raises(TestRunnerError):
+            await runner.run_test_suite_async()
+
+
 # Mark some tests as e2e if they require integration
 @pytest.mark.e2e
 class TestPromptTestRunnerE2EIntegration:
@@ -0,0 +1,92 @@
+"""Tests for the mergeable DDSketch."""
+
+import random
+
+import pytest
+
+from services.common.quantile_sketch import DDSketch
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+class TestDDSketch:
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(3)
+        values = [rng.lognormvariate(6, 1.2) for _ in range(20000)]
+        sketch = DDSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.9, 0.95, 0.99):
+            expected = exact_quantile(values, q)
+            assert sketch.quantile(q) == pytest.approx(expected, rel=0.011)
+        assert sketch.count == len(values)
+        assert sketch.mean == pytest.approx(sum(values) / len(values))
+
+    def test_merge_matches_single_sketch(self):
+        rng = random.Random(5)
+        values = [rng.uniform(10, 5000) for _ in range(5000)]
+        whole = DDSketch()
+        parts = [DDSketch() for _ in range(4)]
+        for i, value in enumerate(values):
+            whole.add(value)
+            parts[i % 4].add(value)
+
+        merged = DDSketch()
+        for part in parts:
+            merged.merge(part)
+
+        assert merged.bins == whole.bins
+        assert merged.count == whole.count
+        assert merged.quantile(0.99) == whole.quantile(0.99)
+        assert (merged.min, merged.max) == (whole.min, whole.max)
+
+    def test_serialization_round_trip(self):
+        sketch = DDSketch()
+        for value in (0, 1.5, 20, 20, 300, 4000.25):
+            sketch.add(value)
+
+        restored = DDSketch.from_bytes(sketch.to_bytes())
+
+        assert restored.bins == sketch.bins
+        assert restored.zero_count == 1
+        assert restored.sum == sketch.sum
+        assert restored.quantile(0.5) == sketch.quantile(0.5)
+
+    def test_bins_bounded(self):
+        sketch = DDSketch(max_bins=64)
+        values = [
+            10**exponent * (1 + step / 50)
+            for exponent in range(-5, 12)
+            for step in range(50)
+        ]
+        for value in values:
+            sketch.add(value)
+
+        assert len(sketch.bins) <= 64
+        # Collapsing only affects the lowest buckets
+        assert sketch.quantile(0.99) == pytest.approx(
+            exact_quantile(values, 0.99), rel=0.011
+        )
+
+    def test_merge_into_collapsed_range(self):
+        high = DDSketch(max_bins=32)
+        for value in range(1000, 2000):
+            high.add(value)
+        low = DDSketch(max_bins=32)
+        for value in (0.001, 0.01, 0.1):
+            low.add(value)
+
+        high.merge(low)
+
+        assert len(high.bins) <= 32
+        assert sum(high.bins.values()) == high.count == 1003
+        assert high.quantile(0.99) == pytest.approx(1990, rel=0.011)
+
+    def test_empty_and_mismatched(self):
+        assert DDSketch().quantile(0.5) is None
+        with pytest.raises(ValueError):
+            DDSketch(0.01).merge(DDSketch(0.02))
@@ -0,0 +1,240 @@
+"""Tests for the streaming training data export."""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.common.fine_tuning_pipeline import (
+    DataCollector,
+    FineTuningPipeline,
+    PipelineConfig,
+)
+from services.common.training_data_export import (
+    SimHashIndex,
+    TrainingDataExporter,
+    simhash,
+)
+from services.orchestrator.db.models import Base, Post
+
+BODY = (
+    "Shipping a feature flag system taught us that rollout speed matters less "
+    "than rollback speed, so we invested in instant kill switches first"
+)
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Post.__table__])
+    db = sessionmaker(bind=engine)()
+    yield db
+    db.close()
+
+
+def add_posts(session, posts):
+    now = datetime.now()
+    for i, (days_ago, hook, body, rate) in enumerate(posts):
+        session.add(
+            Post(
+                persona_id="ai-jesus",
+                hook=hook,
+                body=body,
+                ts=now - timedelta(days=days_ago, minutes=i),
+                engagement_rate=rate,
+                original_input=f"topic {i}",
+            )
+        )
+    session.commit()
+
+
+class TestSimHash:
+    def test_near_duplicates_are_close_and_distinct_texts_far(self):
+        base = simhash(BODY)
+        edited = simhash(BODY.replace("first", "first!"))
+        reworded = simhash(BODY + " and it paid off")
+        other = simhash("A completely different post about Kafka consumer lag")
+
+        assert base == edited  # Punctuation is not a token
+        assert bin(base ^ reworded).count("1") < bin(base ^ other).count("1")
+        assert bin(base ^ other).count("1") > 16
+
+    def test_index_finds_hashes_within_distance(self):
+        index = SimHashIndex(max_distance=3)
+
+        assert index.add_if_new(0b1011 << 40)
+        assert not index.add_if_new((0b1011 << 40) ^ 0b111)  # 3 bits away
+        assert index.add_if_new((0b1011 << 40) ^ 0b1111)  # 4 bits away
+        assert index.size == 2
+
+        with pytest.raises(ValueError):
+            SimHashIndex(max_distance=4)
+
+
+class TestTrainingDataExport:
+    def test_export_streams_dedups_and_shards_by_day(self, session, tmp_path):
+        add_posts(
+            session,
+            [
+                (2, "Rollbacks beat rollouts", BODY, 0.09),
+                (2, "Rollbacks beat rollouts", BODY + ".", 0.08),  # Duplicate
+                (1, "Kafka lag is a product bug", "Consumer lag " * 20, 0.07),
+                (1, "Low engagement hook", "Not exported", 0.01),
+                (30, "Too old", "Outside the window", 0.09),
+            ],
+        )
+        collector = DataCollector(engagement_threshold=0.05)
+
+        export = collector.export_training_data(
+            str(tmp_path), days_back=7, chunk_size=2, session=session
+        )
+
+        assert export.examples == {"hooks": 2, "bodies": 2}
+        assert export.duplicates == {"hooks": 1, "bodies": 1}
+        assert export.metadata["total_posts"] == 3
+        days = [(datetime.now() - timedelta(days=d)).date().isoformat() for d in (2, 1)]
+        assert sorted(export.shards) == sorted(
+            f"{kind}-{day}-000.jsonl" for kind in ("hooks", "bodies") for day in days
+        )
+        lines = (tmp_path / f"bodies-{days[0]}-000.jsonl").read_text().splitlines()
+        example = json.loads(lines[0])
+        assert example["messages"][1]["content"].startswith(BODY)  # Older copy kept
+        assert example["messages"][0]["content"].startswith("Rollbacks beat rollouts")
+        assert not list(tmp_path.glob(".staging-*"))
+
+    def test_manifest_reports_only_changed_shards(self, session, tmp_path):
+        add_posts(
+            session,
+            [
+                (3, "Day three hook", BODY, 0.09),
+                (1, "Day one hook", "Consumer lag " * 20, 0.09),
+            ],
+        )
+        collector = DataCollector(engagement_threshold=0.05)
+        first = collector.export_training_data(str(tmp_path), session=session)
+        assert first.changed_shards == first.shards
+
+        # An uploader records file ids in the manifest
+        manifest = json.loads(first.manifest_path.read_text())
+        for entry in manifest["shards"].values():
+            entry["file_id"] = "file-123"
+        first.manifest_path.write_text(json.dumps(manifest))
+
+        add_posts(session, [(1, "Another day one hook", "Latency budgets " * 20, 0.1)])
+        second = collector.export_training_data(
+            str(tmp_path), days_back=2, session=session
+        )
+
+        day_one = (datetime.now() - timedelta(days=1)).date().isoformat()
+        day_three = (datetime.now() - timedelta(days=3)).date().isoformat()
+        assert sorted(second.changed_shards) == [
+            f"bodies-{day_one}-000.jsonl",
+            f"hooks-{day_one}-000.jsonl",
+        ]
+        assert sorted(second.removed_shards) == [
+            f"bodies-{day_three}-000.jsonl",
+            f"hooks-{day_three}-000.jsonl",
+        ]
+        assert not (tmp_path / f"hooks-{day_three}-000.jsonl").exists()
+        shards = json.loads(second.manifest_path.read_text())["shards"]
+        assert "file_id" not in shards[f"hooks-{day_one}-000.jsonl"]
+
+    def test_unchanged_shards_keep_upload_fields(self, tmp_path):
+        def export():
+            exporter = TrainingDataExporter(str(tmp_path), max_shard_examples=2)
+            for i in range(5):
+                exporter.add("hooks", "2026-10-01", f"hook number {i} " * 3, {"i": i})
+            return exporter.finish()
+
+        first = export()
+        assert first.shards == [
+            "hooks-2026-10-01-000.jsonl",
+            "hooks-2026-10-01-001.jsonl",
+            "hooks-2026-10-01-002.jsonl",
+        ]
+        manifest = json.loads(first.manifest_path.read_text())
+        manifest["shards"]["hooks-2026-10-01-000.jsonl"]["file_id"] = "file-1"
+        first.manifest_path.write_text(json.dumps(manifest))
+
+        second = export()
+
+        assert second.changed_shards == []
+        shards = json.loads(second.manifest_path.read_text())["shards"]
+        assert shards["hooks-2026-10-01-000.jsonl"]["file_id"] == "file-1"
+
+    def test_export_requires_session(self, tmp_path):
+        collector = DataCollector(engagement_threshold=0.05)
+
+        with pytest.raises(ValueError):
+            collector.export_training_data(str(tmp_path))
+
+    def test_failed_export_removes_staging(self, session, tmp_path, monkeypatch):
+        add_posts(session, [(1, "Rollbacks beat rollouts", BODY, 0.09)])
+
+        def broken(post):
+            raise RuntimeError("bad row")
+
+        monkeypatch.setattr(
+            "services.common.fine_tuning_pipeline._body_example", broken
+        )
+        collector = DataCollector(engagement_threshold=0.05)
+
+        with pytest.raises(RuntimeError):
+            collector.export_training_data(str(tmp_path), session=session)
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestFineTuningPipelineExport:
+    @pytest.mark.asyncio
+    async def test_pipeline_trains_from_exported_shards(self, tmp_path):
+        # The export runs in a worker thread, so use a file database
+        engine = create_engine(f"sqlite:///{tmp_path / 'posts.db'}")
+        Base.metadata.create_all(engine, tables=[Post.__table__])
+        Session = sessionmaker(bind=engine)
+        session = Session()
+        add_posts(
+            session,
+            [
+                (2, "Rollbacks beat rollouts", BODY, 0.09),
+                (1, "Kafka lag is a product bug", "Consumer lag " * 20, 0.07),
+            ],
+        )
+        uploaded = []
+
+        async def create_file(file, purpose):
+            uploaded.extend(file.read().decode().splitlines())
+            return Mock(id="file-1")
+
+        client = AsyncMock()
+        client.files.create = create_file
+        client.fine_tuning.jobs.create = AsyncMock(return_value=Mock(id="job-1"))
+        pipeline = FineTuningPipeline(
+            PipelineConfig(
+                training_data_threshold=4,
+                engagement_threshold=0.05,
+                export_dir=str(tmp_path / "export"),
+            ),
+            session_factory=Session,
+        )
+
+        with (
+            patch(
+                "services.common.fine_tuning_pipeline.MLflowExperimentTracker",
+                MagicMock(),
+            ),
+            patch("openai.AsyncOpenAI", return_value=client),
+        ):
+            result = await pipeline.run()
+        session.close()
+
+        assert result.status == "success"
+        assert result.model_version.training_job_id == "job-1"
+        assert result.training_data_export.examples == {"hooks": 2, "bodies": 2}
+        assert len(uploaded) == 4
+        assert {json.loads(line)["messages"][1]["content"] for line in uploaded} >= {
+            "Rollbacks beat rollouts",
+            BODY,
+        }
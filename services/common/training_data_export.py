@@ -0,0 +1,299 @@
+"""
+Streaming export of fine-tuning examples to JSONL shards.
+
+Examples are written as they are produced, so memory does not grow with the
+number of posts: ``TrainingDataExporter`` keeps one open shard per kind and
+a compact near-duplicate index. Each example's text gets a 64-bit SimHash,
+indexed by four 16-bit bands; two hashes within Hamming distance 3 share at
+least one band, so only the matching buckets are compared.
+
+Shards are keyed by the day of the post (split past ``max_shard_examples``),
+so a sliding collection window leaves most shards byte-identical. The
+manifest records each shard's SHA-256. Entries whose hash is unchanged keep
+any fields added after a previous export (such as an uploaded file id), and
+only changed shards are reported for upload.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+SIMHASH_BANDS = 4
+_BAND_BITS = 64 // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+_TOKEN = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_hash(token: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(token.encode(), digest_size=8).digest(), "big"
+    )
+
+
+def _mix(z: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, spreading combined token hashes over all bits."""
+    z = z ^ (z >> np.uint64(30))
+    z = z * np.uint64(0xBF58476D1CE4E5B9)
+    z = z ^ (z >> np.uint64(27))
+    z = z * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of the word bigrams (or words, if fewer) of ``text``."""
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return 0
+    hashes = np.fromiter(map(_token_hash, tokens), dtype=np.uint64, count=len(tokens))
+    if len(hashes) > 1:
+        with np.errstate(over="ignore"):
+            hashes = _mix(hashes[:-1] * np.uint64(0x9E3779B97F4A7C15) + hashes[1:])
+    # Majority vote per bit across feature hashes (big-endian for portability)
+    bits = np.unpackbits(hashes.astype(">u8").view(np.uint8).reshape(-1, 8), axis=1)
+    votes = bits.sum(axis=0, dtype=np.int64)
+    return int.from_bytes(np.packbits(votes * 2 > len(hashes)).tobytes(), "big")
+
+
+class SimHashIndex:
+    """Set of SimHashes answering "is there one within ``max_distance`` bits?".
+
+    Hashes are stored once per band in ``array`` buckets: 32 bytes per hash,
+    plus bucket overhead that stops growing once each band's 65536 buckets
+    exist (about 25 MB).
+    """
+
+    def __init__(self, max_distance: int = 3):
+        if not 0 <= max_distance < SIMHASH_BANDS:
+            raise ValueError(f"max_distance must be below {SIMHASH_BANDS}")
+        self.max_distance = max_distance
+        self._bands: List[Dict[int, array]] = [{} for _ in range(SIMHASH_BANDS)]
+        self.size = 0
+
+    def add_if_new(self, value: int) -> bool:
+        """Add ``value`` unless a near-duplicate is present; True if added."""
+        keys = [(value >> (i * _BAND_BITS)) & _BAND_MASK for i in range(SIMHASH_BANDS)]
+        for band, key in zip(self._bands, keys):
+            bucket = band.get(key)
+            if bucket is not None and any(
+                bin(value ^ other).count("1") <= self.max_distance for other in bucket
+            ):
+                return False
+        for band, key in zip(self._bands, keys):
+            band.setdefault(key, array("Q")).append(value)
+        self.size += 1
+        return True
+
+
+@dataclass
+class TrainingDataExport:
+    """
+    Result of a streaming training data export.
+
+    Attributes:
+        output_dir: Directory holding the shards and manifest
+        manifest_path: Path of the manifest
+        shards: Shard file names in the export
+        changed_shards: Shards that are new or differ from the previous export
+        removed_shards: Shards of the previous export no longer produced
+        examples: Examples written per kind
+        duplicates: Near-duplicate examples dropped per kind
+        metadata: Export metadata stored in the manifest
+    """
+
+    output_dir: Path
+    manifest_path: Path
+    shards: List[str]
+    changed_shards: List[str]
+    removed_shards: List[str]
+    examples: Dict[str, int] = field(default_factory=dict)
+    duplicates: Dict[str, int] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class _Shard:
+    """JSONL file being written, hashed as it goes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.digest = hashlib.sha256()
+        self.examples = 0
+        self.bytes = 0
+
+    def write(self, example: Dict[str, Any]) -> None:
+        line = (
+            json.dumps(example, sort_keys=True, ensure_ascii=False, default=str) + "\n"
+        ).encode()
+        self.file.write(line)
+        self.digest.update(line)
+        self.examples += 1
+        self.bytes += len(line)
+
+    def close(self) -> Dict[str, Any]:
+        self.file.close()
+        return {
+            "sha256": self.digest.hexdigest(),
+            "examples": self.examples,
+            "bytes": self.bytes,
+        }
+
+
+class TrainingDataExporter:
+    """
+    Writes examples to deduplicated, day-keyed JSONL shards.
+
+    Examples must arrive in day order per kind. Shards are written to a
+    staging directory and moved into ``output_dir`` with the manifest by
+    ``finish``. Use the exporter as a context manager (or call ``close``) so
+    an export that fails part way leaves no open files or staging directory.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        max_shard_examples: int = 5000,
+        dedup_distance: int = 3,
+    ):
+        """
+        Args:
+            output_dir: Directory for shards and manifest
+            max_shard_examples: Examples per shard before a day is split
+            dedup_distance: SimHash bits within which examples are duplicates
+        """
+        self.output_dir = Path(output_dir)
+        self.max_shard_examples = max_shard_examples
+        self.dedup_distance = dedup_distance
+        self._staging = self.output_dir / f".staging-{os.getpid()}"
+        shutil.rmtree(self._staging, ignore_errors=True)
+        self._staging.mkdir(parents=True)
+        self._open: Dict[str, _Shard] = {}
+        self._open_key: Dict[str, str] = {}
+        self._parts: Dict[str, int] = {}
+        self._indexes: Dict[str, SimHashIndex] = {}
+        self.shards: Dict[str, Dict[str, Any]] = {}
+        self.examples: Dict[str, int] = {}
+        self.duplicates: Dict[str, int] = {}
+
+    def add(self, kind: str, day: str, text: str, example: Dict[str, Any]) -> bool:
+        """
+        Write ``example`` unless ``text`` is a near-duplicate of an earlier one.
+
+        Args:
+            kind: Example kind, e.g. "hooks"; each kind is deduplicated and
+                sharded separately
+            day: ISO date of the source post, used as the shard key
+            text: Text the near-duplicate check is based on
+            example: JSON-serializable example
+
+        Returns:
+            True if the example was written
+        """
+        index = self._indexes.get(kind)
+        if index is None:
+            index = self._indexes[kind] = SimHashIndex(self.dedup_distance)
+        if not index.add_if_new(simhash(text)):
+            self.duplicates[kind] = self.duplicates.get(kind, 0) + 1
+            return False
+
+        shard = self._open.get(kind)
+        key = f"{kind}-{day}"
+        if shard is not None and (
+            self._open_key[kind] != key or shard.examples >= self.max_shard_examples
+        ):
+            self._close(kind)
+            shard = None
+        if shard is None:
+            part = self._parts[key] = self._parts.get(key, -1) + 1
+            shard = self._open[kind] = _Shard(self._staging / f"{key}-{part:03d}.jsonl")
+            self._open_key[kind] = key
+
+        shard.write(example)
+        self.examples[kind] = self.examples.get(kind, 0) + 1
+        return True
+
+    def _close(self, kind: str) -> None:
+        shard = self._open.pop(kind)
+        self.shards[shard.path.name] = shard.close()
+
+    def close(self) -> None:
+        """Close open shard files and remove the staging directory."""
+        for shard in self._open.values():
+            shard.file.close()
+        self._open.clear()
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+    def __enter__(self) -> "TrainingDataExporter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def finish(self, metadata: Optional[Dict[str, Any]] = None) -> TrainingDataExport:
+        """Publish the shards and manifest, comparing with the previous export."""
+        for kind in list(self._open):
+            self._close(kind)
+
+        manifest_path = self.output_dir / MANIFEST_NAME
+        previous: Dict[str, Dict[str, Any]] = {}
+        try:
+            previous = json.loads(manifest_path.read_text()).get("shards", {})
+        except (OSError, ValueError):
+            pass
+
+        entries, changed = {}, []
+        for name in sorted(self.shards):
+            entry = self.shards[name]
+            old = previous.get(name)
+            if old is not None and old.get("sha256") == entry["sha256"]:
+                entries[name] = {**old, **entry}  # Keeps e.g. upload ids
+            else:
+                entries[name] = entry
+                changed.append(name)
+            os.replace(self._staging / name, self.output_dir / name)
+
+        removed = sorted(set(previous) - set(entries))
+        for name in removed:
+            (self.output_dir / name).unlink(missing_ok=True)
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+        metadata = {
+            **(metadata or {}),
+            "exported_at": datetime.now().isoformat(),
+            "examples": dict(self.examples),
+            "duplicates": dict(self.duplicates),
+        }
+        tmp_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"version": MANIFEST_VERSION, "metadata": metadata, "shards": entries},
+                indent=2,
+                default=str,
+            )
+        )
+        os.replace(tmp_path, manifest_path)
+
+        return TrainingDataExport(
+            output_dir=self.output_dir,
+            manifest_path=manifest_path,
+            shards=list(entries),
+            changed_shards=changed,
+            removed_shards=removed,
+            examples=dict(self.examples),
+            duplicates=dict(self.duplicates),
+            metadata=metadata,
+        )
@@ -6,6 +6,7 @@ from datetime import datetime
 import time
 import asyncio
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -34,10 +35,18 @@ from services.conversation_engine.states import (
     ConversationContext,
 )
 
-app = FastAPI(title="Conversation Engine", version="2.0.0")
-
 # Initialize components
 memory_system = ConversationMemorySystem()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Persist buffered turns before the process exits
+    await memory_system.close()
+
+
+app = FastAPI(title="Conversation Engine", version="2.0.0", lifespan=lifespan)
 personalization_engine = PersonalizationEngine()
 
 # State handlers mapping
@@ -255,7 +264,7 @@ async def process_message(conversation_id: str, request: MessageRequest):
 )
 async def get_conversation_analytics(conversation_id: str):
     """Get detailed analytics for a conversation."""
-    analytics = memory_system.analyze_conversation_patterns(conversation_id)
+    analytics = await memory_system.analyze_conversation_patterns(conversation_id)
 
     if not analytics:
         raise HTTPException(status_code=404, detail="Conversation not found")
@@ -339,6 +348,7 @@ async def get_metrics():
         "active_conversations_1h": len(active_1h),
         "active_conversations_24h": len(active_24h),
         "handlers_loaded": len(state_handlers),
+        "turn_persistence": dict(memory_system.stats),
         "states_available": [state.value for state in ConversationState],
         "service": "conversation_engine",
     }
@@ -15,7 +15,7 @@ class PersonalizationRequest:
 
     state: str
     user_message: str
-    conversation_history: List[Dict[str, str]]
+    conversation_history: List[Dict[str, Any]]
     user_profile: Dict[str, Any]
     suggested_response: str  # From state handler
     max_length: int = 280
@@ -67,7 +67,8 @@ class PersonalizationEngine:
             request.conversation_history[-5:] if request.conversation_history else []
         )
         history_text = "\n".join(
-            [f"{msg['role']}: {msg['content']}" for msg in recent_history]
+            f"User: {turn['user_message']}\nAssistant: {turn['bot_message']}"
+            for turn in recent_history
         )
 
         # Extract user characteristics
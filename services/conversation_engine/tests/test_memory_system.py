@@ -1,6 +1,7 @@
 """Tests for conversation memory system."""
 
 import pytest
+import fakeredis
 from datetime import datetime, timedelta
 from services.conversation_engine.memory import (
     ConversationMemorySystem,
@@ -14,12 +15,10 @@ class TestConversationMemorySystem:
     @pytest.fixture
     def memory_system(self):
         """Create a test memory system."""
-        # Use test database URL
-        import os
-
-        os.environ["DATABASE_URL"] = "sqlite:///:memory:"
-        os.environ["REDIS_HOST"] = "localhost"
-        return ConversationMemorySystem()
+        return ConversationMemorySystem(
+            database_url="sqlite:///:memory:",
+            redis_client=fakeredis.FakeAsyncRedis(decode_responses=True),
+        )
 
     @pytest.fixture
     def sample_memory(self):
@@ -177,11 +176,30 @@ class TestConversationMemorySystem:
         assert restored.user_id == sample_memory.user_id
         assert isinstance(restored.last_interaction, datetime)
 
-    def test_analyze_conversation_patterns(self, memory_system):
+    @pytest.mark.asyncio
+    async def test_analyze_conversation_patterns(self, memory_system, sample_memory):
         """Test conversation pattern analysis."""
-        # This would need a proper test database setup
-        # For now, just verify the method exists
-        assert hasattr(memory_system, "analyze_conversation_patterns")
+        await memory_system.save_conversation(sample_memory)
+        for i, state in enumerate(["interest_qualification", "value_proposition"]):
+            await memory_system.add_conversation_turn(
+                conversation_id=sample_memory.conversation_id,
+                user_message=f"message {i}",
+                bot_message=f"reply {i}",
+                state_before="initial_contact",
+                state_after=state,
+                intent_analysis={"objection_type": "price"},
+                response_time_ms=100 * (i + 1),
+            )
+
+        # Buffered turns are flushed before analysis
+        analytics = await memory_system.analyze_conversation_patterns(
+            sample_memory.conversation_id
+        )
+
+        assert analytics["total_turns"] == 2
+        assert analytics["avg_response_time_ms"] == 150
+        assert analytics["repeated_objections"] == ["price"]
+        assert analytics["stuck_in_state"] == "value_proposition"
 
     @pytest.mark.asyncio
     async def test_cache_functionality(self, memory_system, sample_memory):
@@ -201,3 +219,202 @@ class TestConversationMemorySystem:
         # Both should be equal
         assert retrieved1.conversation_id == retrieved2.conversation_id
         assert retrieved1.current_state == retrieved2.current_state
+
+
+class TestIncrementalTurnCache:
+    """Turns are appended to Redis and persisted in batches."""
+
+    @pytest.fixture
+    def memory_system(self):
+        system = ConversationMemorySystem(
+            database_url="sqlite:///:memory:",
+            redis_client=fakeredis.FakeAsyncRedis(decode_responses=True),
+        )
+        system.turn_cache_size = 5
+        system.history_window = 3
+        system.flush_interval = 60
+        return system
+
+    @pytest.fixture
+    def sample_memory(self):
+        return ConversationMemory(
+            conversation_id="conv_turns",
+            user_id="user_1",
+            current_state="initial_contact",
+            state_history=["initial_contact"],
+            user_profile={},
+            conversation_turns=[],
+            metadata={},
+            conversion_probability=0.1,
+            last_interaction=datetime.utcnow(),
+        )
+
+    async def _add_turns(self, memory_system, count, start=0):
+        for i in range(start, start + count):
+            await memory_system.add_conversation_turn(
+                conversation_id="conv_turns",
+                user_message=f"user {i}",
+                bot_message=f"bot {i}",
+                state_before="initial_contact",
+                state_after="initial_contact",
+                intent_analysis={},
+                response_time_ms=i,
+            )
+
+    @pytest.mark.asyncio
+    async def test_recent_window_served_before_flush(
+        self, memory_system, sample_memory
+    ):
+        await memory_system.save_conversation(sample_memory)
+        await self._add_turns(memory_system, 4)
+
+        memory = await memory_system.get_conversation("conv_turns")
+
+        assert [t["user_message"] for t in memory.conversation_turns] == [
+            "user 1",
+            "user 2",
+            "user 3",
+        ]
+        # Nothing has been written yet
+        assert len(memory_system._pending_turns) == 4
+
+    @pytest.mark.asyncio
+    async def test_redis_list_is_trimmed(self, memory_system, sample_memory):
+        await memory_system.save_conversation(sample_memory)
+        await self._add_turns(memory_system, 8)
+
+        cached = await memory_system.redis_client.llen("conv:conv_turns:turns")
+        assert cached == 5
+
+    @pytest.mark.asyncio
+    async def test_batched_flush_numbers_turns(self, memory_system, sample_memory):
+        await memory_system.save_conversation(sample_memory)
+        await self._add_turns(memory_system, 3)
+        assert await memory_system.flush_turns() == 3
+        await self._add_turns(memory_system, 2, start=3)
+        assert await memory_system.flush_turns() == 2
+
+        # Cold Redis: the window is rebuilt from the database
+        await memory_system.redis_client.flushall()
+        turns = await memory_system.get_recent_turns("conv_turns", 10)
+
+        assert [t["turn_number"] for t in turns] == [1, 2, 3, 4, 5]
+        assert [t["user_message"] for t in turns] == [f"user {i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_flush(self, memory_system, sample_memory):
+        memory_system.flush_batch_size = 4
+        await memory_system.save_conversation(sample_memory)
+        await self._add_turns(memory_system, 4)
+
+        assert memory_system._pending_turns == []
+        analytics = await memory_system.analyze_conversation_patterns("conv_turns")
+        assert analytics["total_turns"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_turns(self, memory_system, sample_memory):
+        await memory_system.save_conversation(sample_memory)
+        await self._add_turns(memory_system, 2)
+
+        async def broken(*args, **kwargs):
+            raise RuntimeError("database down")
+
+        original = memory_system._reserve_turn_numbers
+        memory_system._reserve_turn_numbers = broken
+        with pytest.raises(RuntimeError):
+            await memory_system.flush_turns()
+        assert len(memory_system._pending_turns) == 2
+
+        memory_system._reserve_turn_numbers = original
+        assert await memory_system.flush_turns() == 2
+        await memory_system.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_flush_is_not_raised_and_buffer_is_bounded(
+        self, memory_system, sample_memory
+    ):
+        memory_system.flush_batch_size = 2
+        memory_system.max_pending_turns = 3
+        await memory_system.save_conversation(sample_memory)
+
+        async def broken(*args, **kwargs):
+            raise RuntimeError("database down")
+
+        original = memory_system._reserve_turn_numbers
+        memory_system._reserve_turn_numbers = broken
+        await self._add_turns(memory_system, 5)
+
+        assert [t["user_message"] for t in memory_system._pending_turns] == [
+            "user 2",
+            "user 3",
+            "user 4",
+        ]
+        assert memory_system.stats["flush_failures"] == 1
+        assert memory_system.stats["turns_dropped"] == 2
+
+        memory_system._reserve_turn_numbers = original
+        assert await memory_system.flush_turns() == 3
+        await memory_system.close()
+
+    @pytest.mark.asyncio
+    async def test_state_saved_after_turns_continues_numbering(
+        self, memory_system, sample_memory
+    ):
+        await self._add_turns(memory_system, 2)
+        await memory_system.flush_turns()
+        await memory_system.save_conversation(sample_memory)
+        await self._add_turns(memory_system, 2, start=2)
+        await memory_system.flush_turns()
+
+        await memory_system.redis_client.flushall()
+        turns = await memory_system.get_recent_turns("conv_turns", 10)
+        assert [t["turn_number"] for t in turns] == [1, 2, 3, 4]
+
+
+def test_turn_count_migration_backfills_existing_conversations():
+    """Migration 012 starts each counter at the highest stored turn number."""
+    import importlib.util
+    from pathlib import Path
+
+    from alembic.migration import MigrationContext
+    from alembic.operations import Operations
+    from sqlalchemy import create_engine, text
+
+    path = (
+        Path(__file__).parents[2]
+        / "orchestrator/db/alembic/versions/012_add_conversation_turn_count.py"
+    )
+    spec = importlib.util.spec_from_file_location("migration_012", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(
+            text("CREATE TABLE conversation_states (conversation_id VARCHAR(100))")
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE conversation_turns "
+                "(conversation_id VARCHAR(100), turn_number INTEGER)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO conversation_states VALUES ('with_turns'), ('empty')")
+        )
+        conn.execute(
+            text(
+                "INSERT INTO conversation_turns VALUES "
+                "('with_turns', 1), ('with_turns', 2), ('with_turns', 3)"
+            )
+        )
+
+        migration.op = Operations(MigrationContext.configure(conn))
+        migration.upgrade()
+
+        counts = dict(
+            conn.execute(
+                text("SELECT conversation_id, turn_count FROM conversation_states")
+            ).all()
+        )
+    assert counts == {"with_turns": 3, "empty": 0}
@@ -0,0 +1,293 @@
+"""Coalescing delta broadcaster for real-time dashboard updates."""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# Events that describe a variant's live state and can be merged per tick.
+# Everything else is a discrete notification and is delivered as-is.
+STATE_EVENT_TYPES = {"performance_update"}
+
+
+class ClientChannel:
+    """Bounded send queue and sender task for one dashboard connection."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_queue: int,
+        send_timeout: float,
+        drop_window: float,
+    ):
+        self.websocket = websocket
+        self.queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=max_queue)
+        self.send_timeout = send_timeout
+        self.drop_window = drop_window
+        self.needs_resync = True
+        self.dropped = 0
+        self.closed = False
+        # Queued messages are held back until the initial snapshot is sent
+        self.ready = asyncio.Event()
+        self.task: Optional["asyncio.Task[None]"] = None
+        self._window_start = time.monotonic()
+
+    def offer(self, payload: str) -> bool:
+        """Queue a payload; on overflow discard the backlog and request a resync.
+
+        Returns False when the queue overflowed. Deltas are only meaningful in
+        sequence, so a client that falls behind gets its backlog replaced by a
+        full snapshot on the next tick instead of a partial stream. Drops are
+        counted per ``drop_window`` so a client that recovers from a spike is
+        not penalised for it later.
+        """
+        try:
+            self.queue.put_nowait(payload)
+            return True
+        except asyncio.QueueFull:
+            now = time.monotonic()
+            if now - self._window_start > self.drop_window:
+                self._window_start = now
+                self.dropped = 0
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.needs_resync = True
+            return False
+
+    async def run(self) -> None:
+        """Drain the queue into the socket until the client goes away."""
+        await self.ready.wait()
+        try:
+            while True:
+                payload = await self.queue.get()
+                # asyncio.timeout, unlike wait_for, never swallows a cancel
+                # that lands as the send completes
+                async with asyncio.timeout(self.send_timeout):
+                    await self.websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.closed = True
+
+
+class CoalescingBroadcaster:
+    """Coalesces per-persona updates into one delta message per tick.
+
+    Each tick, pending updates for a persona are merged per variant, compared
+    with the last broadcast state so only changed fields are sent, serialized
+    once, and handed to every client's bounded queue. Clients that overflow
+    are downsampled to full snapshots and dropped once they have discarded
+    more than ``max_dropped`` messages.
+    """
+
+    def __init__(
+        self,
+        tick_interval: float = 0.25,
+        max_queue: int = 16,
+        max_dropped: int = 256,
+        send_timeout: float = 5.0,
+        drop_window: float = 60.0,
+    ) -> None:
+        """Initialize broadcaster.
+
+        Args:
+            tick_interval: Seconds between coalesced broadcasts
+            max_queue: Per-client send queue bound
+            max_dropped: Dropped messages within ``drop_window`` after which
+                a slow client is disconnected
+            send_timeout: Per-message send timeout (seconds)
+            drop_window: Window (seconds) over which dropped messages count
+        """
+        self.tick_interval = tick_interval
+        self.max_queue = max_queue
+        self.max_dropped = max_dropped
+        self.send_timeout = send_timeout
+        self.drop_window = drop_window
+
+        self.channels: Dict[str, Dict[WebSocket, ClientChannel]] = {}
+        self._state: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._pending: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        self._sequence: Dict[str, int] = {}
+        self._dirty: Set[str] = set()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._closing: Set["asyncio.Task[None]"] = set()
+        self.stats = {
+            "ticks": 0,
+            "messages_serialized": 0,
+            "messages_queued": 0,
+            "overflows": 0,
+            "clients_dropped": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the tick loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the tick loop and all client sender tasks."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for persona_id in list(self.channels):
+            for websocket in list(self.channels.get(persona_id, {})):
+                self._detach(persona_id, websocket)
+        await self._reap()
+
+    def add_client(self, persona_id: str, websocket: WebSocket) -> ClientChannel:
+        """Register a connection.
+
+        Updates are buffered from this point on, but nothing is sent until the
+        caller sets ``channel.ready`` after delivering its initial data. The
+        first message the client then receives is a full snapshot.
+        """
+        channel = ClientChannel(
+            websocket, self.max_queue, self.send_timeout, self.drop_window
+        )
+        channel.task = asyncio.create_task(channel.run())
+        self.channels.setdefault(persona_id, {})[websocket] = channel
+        if self._state.get(persona_id):
+            self._dirty.add(persona_id)
+        return channel
+
+    async def remove_client(self, persona_id: str, websocket: WebSocket) -> None:
+        """Unregister a connection and wait for its sender task to stop."""
+        self._detach(persona_id, websocket)
+        await self._reap()
+
+    def _detach(self, persona_id: str, websocket: WebSocket) -> None:
+        channels = self.channels.get(persona_id)
+        if not channels:
+            return
+        channel = channels.pop(websocket, None)
+        if channel and channel.task and not channel.task.done():
+            channel.task.cancel()
+            self._closing.add(channel.task)
+            channel.task.add_done_callback(self._closing.discard)
+        if not channels:
+            del self.channels[persona_id]
+            for per_persona in (self._state, self._pending, self._events):
+                per_persona.pop(persona_id, None)
+
+    async def _reap(self) -> None:
+        if self._closing:
+            await asyncio.gather(*list(self._closing), return_exceptions=True)
+
+    def publish(self, persona_id: str, update: Dict[str, Any]) -> None:
+        """Record an update for the next tick; never blocks on clients."""
+        if persona_id not in self.channels:
+            return
+
+        event_type = update.get("event_type")
+        variant_id = update.get("variant_id")
+
+        if event_type in STATE_EVENT_TYPES and variant_id is not None:
+            fields = {
+                k: v
+                for k, v in update.items()
+                if k not in ("event_type", "variant_id") and v is not None
+            }
+            self._pending.setdefault(persona_id, {}).setdefault(variant_id, {}).update(
+                fields
+            )
+        else:
+            self._events.setdefault(persona_id, []).append(update)
+            if event_type == "early_kill" and variant_id is not None:
+                self._pending.get(persona_id, {}).pop(variant_id, None)
+                self._state.get(persona_id, {}).pop(variant_id, None)
+
+        self._dirty.add(persona_id)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.tick_interval)
+            try:
+                self.flush()
+                await self._reap()
+            except Exception as e:
+                logger.error(f"Dashboard broadcast tick failed: {e}")
+
+    def flush(self) -> None:
+        """Broadcast everything pending since the last tick."""
+        self.stats["ticks"] += 1
+        dirty, self._dirty = self._dirty, set()
+        for persona_id in dirty:
+            self._flush_persona(persona_id)
+
+    def _flush_persona(self, persona_id: str) -> None:
+        pending = self._pending.pop(persona_id, {})
+        events = self._events.pop(persona_id, [])
+        channels = self.channels.get(persona_id)
+        if not channels:
+            return
+
+        state = self._state.setdefault(persona_id, {})
+        delta: Dict[str, Dict[str, Any]] = {}
+        for variant_id, fields in pending.items():
+            current = state.setdefault(variant_id, {})
+            changed = {k: v for k, v in fields.items() if current.get(k) != v}
+            if changed:
+                current.update(changed)
+                delta[variant_id] = changed
+
+        sequence = self._sequence.get(persona_id, 0) + 1
+        self._sequence[persona_id] = sequence
+        timestamp = datetime.now().isoformat()
+
+        delta_payload: Optional[str] = None
+        if delta or events:
+            delta_payload = self._serialize(
+                {
+                    "type": "variant_delta",
+                    "timestamp": timestamp,
+                    "seq": sequence,
+                    "data": {"variants": delta, "events": events},
+                }
+            )
+
+        snapshot_payload: Optional[str] = None
+        for websocket, channel in list(channels.items()):
+            if channel.closed or channel.dropped > self.max_dropped:
+                self.stats["clients_dropped"] += 1
+                self._detach(persona_id, websocket)
+                continue
+
+            if channel.needs_resync:
+                if snapshot_payload is None:
+                    snapshot_payload = self._serialize(
+                        {
+                            "type": "variant_snapshot",
+                            "timestamp": timestamp,
+                            "seq": sequence,
+                            "data": {"variants": state, "events": events},
+                        }
+                    )
+                payload = snapshot_payload
+            elif delta_payload is not None:
+                payload = delta_payload
+            else:
+                continue
+
+            if channel.offer(payload):
+                channel.needs_resync = False
+                self.stats["messages_queued"] += 1
+            else:
+                self.stats["overflows"] += 1
+                self._dirty.add(persona_id)
+
+    def _serialize(self, message: Dict[str, Any]) -> str:
+        self.stats["messages_serialized"] += 1
+        return json.dumps(message, default=str)
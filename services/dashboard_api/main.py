@@ -8,6 +8,7 @@ import uvicorn
 
 from .variant_metrics import VariantMetricsAPI, get_db_connection  # type: ignore[import-not-found]
 from .websocket_handler import VariantDashboardWebSocket  # type: ignore[import-not-found]
+from .broadcast_engine import CoalescingBroadcaster  # type: ignore[import-not-found]
 from .event_processor import DashboardEventProcessor  # type: ignore[import-not-found]
 from .thompson_sampling_visualizer import create_thompson_sampling_visualizer  # type: ignore[import-not-found]
 
@@ -16,8 +17,10 @@ get_db = get_db_connection
 
 
 # Global instances
-websocket_handler = VariantDashboardWebSocket()
-metrics_api = VariantMetricsAPI()
+broadcaster = CoalescingBroadcaster()
+websocket_handler = VariantDashboardWebSocket(broadcaster=broadcaster)
+# Share one metrics API so event-driven snapshot invalidation covers REST too
+metrics_api: VariantMetricsAPI = websocket_handler.metrics_api
 event_processor = DashboardEventProcessor(websocket_handler)
 
 
@@ -26,9 +29,11 @@ async def lifespan(app: FastAPI) -> Any:
     """Application lifespan handler."""
     # Startup
     print("Starting Variant Dashboard API...")
+    await broadcaster.start()
     yield
     # Shutdown
     print("Shutting down Variant Dashboard API...")
+    await broadcaster.stop()
 
 
 app = FastAPI(
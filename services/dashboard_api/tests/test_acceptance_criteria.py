@@ -60,12 +60,14 @@ class TestCRA234AcceptanceCriteria:
         with patch.object(metrics_api, "db", mock_db):
             with patch.object(
                 metrics_api,
-                "get_variant_performance",
+                "get_variants_performance",
                 AsyncMock(
                     return_value={
-                        "engagement_rate": 0.055,
-                        "views": 2000,
-                        "interactions": 110,
+                        "var_1": {
+                            "engagement_rate": 0.055,
+                            "views": 2000,
+                            "interactions": 110,
+                        }
                     }
                 ),
             ):
@@ -0,0 +1,265 @@
+"""Tests for the coalescing delta broadcaster."""
+
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock
+
+from services.dashboard_api.broadcast_engine import CoalescingBroadcaster
+from services.dashboard_api.websocket_handler import VariantDashboardWebSocket
+
+
+def _perf(variant_id, er, interactions=100):
+    return {
+        "event_type": "performance_update",
+        "variant_id": variant_id,
+        "current_er": er,
+        "interaction_count": interactions,
+    }
+
+
+def _sent(websocket):
+    return [json.loads(call[0][0]) for call in websocket.send_text.call_args_list]
+
+
+def _connect(broadcaster, persona_id="ai-jesus", websocket=None):
+    websocket = websocket or AsyncMock()
+    broadcaster.add_client(persona_id, websocket).ready.set()
+    return websocket
+
+
+@pytest_asyncio.fixture
+async def broadcaster():
+    """Broadcaster whose sender tasks are stopped after each test."""
+    instance = CoalescingBroadcaster()
+    yield instance
+    await instance.stop()
+
+
+class TestCoalescingBroadcaster:
+    """Test coalescing, delta encoding and slow-consumer handling."""
+
+    @pytest.mark.asyncio
+    async def test_updates_coalesced_into_one_message_per_tick(self, broadcaster):
+        websocket = _connect(broadcaster)
+
+        for i in range(50):
+            broadcaster.publish("ai-jesus", _perf("var_1", 0.01 * i))
+        broadcaster.flush()
+        await asyncio.sleep(0)
+
+        messages = _sent(websocket)
+        assert len(messages) == 1
+        assert messages[0]["data"]["variants"]["var_1"]["current_er"] == 0.49
+
+    @pytest.mark.asyncio
+    async def test_only_changed_fields_sent_as_delta(self, broadcaster):
+        websocket = _connect(broadcaster)
+
+        broadcaster.publish("ai-jesus", _perf("var_1", 0.05, 100))
+        broadcaster.flush()
+        broadcaster.publish("ai-jesus", _perf("var_1", 0.06, 100))
+        broadcaster.flush()
+        broadcaster.publish("ai-jesus", _perf("var_1", 0.06, 100))
+        broadcaster.flush()
+        await asyncio.sleep(0)
+
+        messages = _sent(websocket)
+        assert messages[0]["type"] == "variant_snapshot"
+        assert messages[1]["type"] == "variant_delta"
+        assert messages[1]["data"]["variants"] == {"var_1": {"current_er": 0.06}}
+        # Unchanged state produces no message at all
+        assert len(messages) == 2
+
+    @pytest.mark.asyncio
+    async def test_payload_serialized_once_per_tick(self, broadcaster):
+        clients = [_connect(broadcaster) for _ in range(100)]
+        broadcaster.publish("ai-jesus", _perf("var_1", 0.05))
+        broadcaster.flush()
+
+        serialized_before = broadcaster.stats["messages_serialized"]
+        broadcaster.publish("ai-jesus", _perf("var_1", 0.07))
+        broadcaster.flush()
+        await asyncio.sleep(0)
+
+        assert broadcaster.stats["messages_serialized"] - serialized_before == 1
+        assert all(websocket.send_text.call_count == 2 for websocket in clients)
+
+    @pytest.mark.asyncio
+    async def test_early_kill_events_are_not_coalesced(self, broadcaster):
+        websocket = _connect(broadcaster)
+
+        broadcaster.publish("ai-jesus", _perf("var_1", 0.05))
+        broadcaster.publish(
+            "ai-jesus", {"event_type": "early_kill", "variant_id": "var_1"}
+        )
+        broadcaster.publish(
+            "ai-jesus", {"event_type": "early_kill", "variant_id": "var_2"}
+        )
+        broadcaster.flush()
+        await asyncio.sleep(0)
+
+        data = _sent(websocket)[0]["data"]
+        assert [e["variant_id"] for e in data["events"]] == ["var_1", "var_2"]
+        assert "var_1" not in data["variants"]
+
+    @pytest.mark.asyncio
+    async def test_nothing_sent_until_client_ready(self, broadcaster):
+        websocket = AsyncMock()
+        channel = broadcaster.add_client("ai-jesus", websocket)
+
+        broadcaster.publish("ai-jesus", _perf("var_1", 0.05))
+        broadcaster.flush()
+        await asyncio.sleep(0)
+        websocket.send_text.assert_not_called()
+
+        channel.ready.set()
+        await asyncio.sleep(0)
+        assert _sent(websocket)[0]["data"]["variants"]["var_1"]["current_er"] == 0.05
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_resynced_then_dropped(self):
+        broadcaster = CoalescingBroadcaster(max_queue=2, max_dropped=3)
+
+        async def stalled_send(payload):
+            await asyncio.sleep(10)
+
+        slow = AsyncMock()
+        slow.send_text.side_effect = stalled_send
+        _connect(broadcaster, websocket=slow)
+        fast = _connect(broadcaster)
+
+        try:
+            for i in range(8):
+                broadcaster.publish("ai-jesus", _perf("var_1", 0.01 * i))
+                broadcaster.flush()
+                await asyncio.sleep(0)
+
+            assert broadcaster.stats["overflows"] >= 1
+            assert slow not in broadcaster.channels["ai-jesus"]
+            assert fast in broadcaster.channels["ai-jesus"]
+            assert broadcaster.stats["clients_dropped"] == 1
+        finally:
+            await broadcaster.stop()
+
+        assert not broadcaster._closing
+
+    @pytest.mark.asyncio
+    async def test_drops_outside_window_are_forgiven(self):
+        broadcaster = CoalescingBroadcaster(max_queue=1, drop_window=0.0)
+        websocket = AsyncMock()
+        channel = broadcaster.add_client("ai-jesus", websocket)
+
+        try:
+            for _ in range(5):
+                channel.offer("a")
+                channel.offer("b")
+
+            # Each overflow starts a new window, so only the last one counts
+            assert channel.dropped == 1
+        finally:
+            await broadcaster.stop()
+
+    @pytest.mark.asyncio
+    async def test_remove_client_waits_for_sender_task(self, broadcaster):
+        websocket = _connect(broadcaster)
+        task = broadcaster.channels["ai-jesus"][websocket].task
+
+        await broadcaster.remove_client("ai-jesus", websocket)
+
+        assert task.done()
+        assert "ai-jesus" not in broadcaster.channels
+
+
+class TestWebSocketBroadcasterIntegration:
+    """Test routing through VariantDashboardWebSocket."""
+
+    @pytest.mark.asyncio
+    async def test_handler_routes_updates_through_running_broadcaster(self):
+        broadcaster = CoalescingBroadcaster(tick_interval=0.01)
+        handler = VariantDashboardWebSocket(broadcaster=broadcaster)
+        websocket = AsyncMock()
+        handler.connections["ai-jesus"] = {websocket}
+        _connect(broadcaster, websocket=websocket)
+        await broadcaster.start()
+
+        try:
+            await handler.broadcast_performance_update(
+                "ai-jesus", {"variant_id": "var_1", "engagement_rate": 0.08}
+            )
+            await asyncio.sleep(0.05)
+        finally:
+            await broadcaster.stop()
+
+        websocket.send_json.assert_not_called()
+        messages = _sent(websocket)
+        assert messages[0]["data"]["variants"]["var_1"]["current_er"] == 0.08
+
+    @pytest.mark.asyncio
+    async def test_updates_during_initial_data_are_not_lost(self):
+        broadcaster = CoalescingBroadcaster(tick_interval=0.01)
+        handler = VariantDashboardWebSocket(broadcaster=broadcaster)
+        websocket = AsyncMock()
+
+        async def slow_initial_data(ws, persona_id):
+            await handler.broadcast_performance_update(
+                persona_id, {"variant_id": "var_1", "engagement_rate": 0.09}
+            )
+            await asyncio.sleep(0.05)
+
+        handler.send_initial_data = slow_initial_data
+        await broadcaster.start()
+
+        try:
+            receive_gate = asyncio.Event()
+
+            async def receive_after_flush():
+                await receive_gate.wait()
+                raise Exception("disconnect")
+
+            websocket.receive_text.side_effect = receive_after_flush
+            connection = asyncio.create_task(
+                handler.handle_connection(websocket, "ai-jesus")
+            )
+            await asyncio.sleep(0.1)
+            receive_gate.set()
+            await connection
+        finally:
+            await broadcaster.stop()
+
+        messages = _sent(websocket)
+        assert messages[0]["data"]["variants"]["var_1"]["current_er"] == 0.09
+
+    @pytest.mark.asyncio
+    async def test_events_invalidate_cached_snapshot(self):
+        from services.dashboard_api.event_processor import DashboardEventProcessor
+
+        handler = VariantDashboardWebSocket()
+        handler.metrics_api._build_live_metrics = AsyncMock(
+            return_value={"early_kills_today": {"kills_today": 0}}
+        )
+        processor = DashboardEventProcessor(handler)
+
+        await handler.metrics_api.get_live_metrics("ai-jesus")
+        await processor.handle_early_kill_event("var_1", {"persona_id": "ai-jesus"})
+        await handler.metrics_api.get_live_metrics("ai-jesus")
+        await processor.handle_performance_update(
+            "var_1", {"persona_id": "ai-jesus", "engagement_rate": 0.05}
+        )
+        await handler.metrics_api.get_live_metrics("ai-jesus")
+
+        assert handler.metrics_api._build_live_metrics.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_handler_sends_immediately_without_broadcaster(self):
+        handler = VariantDashboardWebSocket()
+        healthy, broken = AsyncMock(), AsyncMock()
+        broken.send_json.side_effect = Exception("closed")
+        handler.connections["ai-jesus"] = {healthy, broken}
+
+        await handler.broadcast_variant_update("ai-jesus", {"event_type": "x"})
+
+        healthy.send_json.assert_called_once()
+        assert handler.connections["ai-jesus"] == {healthy}
@@ -1,5 +1,8 @@
 """Tests for VariantMetricsAPI - written first following TDD practices."""
 
+import asyncio
+import time
+
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, patch
@@ -149,6 +152,99 @@ class TestVariantMetricsAPI:
         assert result["kills_today"] == 5
         assert result["avg_time_to_kill_minutes"] == 3.5
 
+    @pytest.mark.asyncio
+    async def test_get_live_metrics_runs_sub_queries_concurrently(self, metrics_api):
+        """Test that the seven sub-queries overlap instead of running in turn."""
+
+        async def slow(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return []
+
+        for name in [
+            "get_performance_summary",
+            "get_active_variants",
+            "get_top_performers",
+            "get_kill_statistics",
+            "get_fatigue_warnings",
+            "get_optimization_suggestions",
+            "get_recent_events",
+        ]:
+            setattr(metrics_api, name, AsyncMock(side_effect=slow))
+
+        start = time.perf_counter()
+        await metrics_api.get_live_metrics("ai-jesus")
+
+        assert time.perf_counter() - start < 0.2  # not 7 x 50ms
+
+    @pytest.mark.asyncio
+    async def test_get_active_variants_fetches_performance_in_one_call(
+        self, metrics_api, mock_db
+    ):
+        """Test that variant performance is fetched in bulk, not per variant."""
+        now = datetime.now()
+        mock_db.fetch_all.return_value = [
+            {"id": f"var_{i}", "predicted_er": 0.05, "posted_at": now}
+            for i in range(20)
+        ]
+        metrics_api.get_variants_performance = AsyncMock(
+            return_value={"var_3": {"engagement_rate": 0.1}}
+        )
+        metrics_api.get_variant_performance = AsyncMock()
+
+        result = await metrics_api.get_active_variants("ai-jesus")
+
+        assert len(result) == 20
+        metrics_api.get_variants_performance.assert_awaited_once()
+        metrics_api.get_variant_performance.assert_not_awaited()
+        assert result[3]["live_metrics"]["engagement_rate"] == 0.1
+        assert result[0]["live_metrics"]["engagement_rate"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_live_metrics_snapshot_cached_per_persona(self, metrics_api):
+        """Test that concurrent and repeated reads share one snapshot build."""
+        metrics_api._build_live_metrics = AsyncMock(return_value={"summary": {}})
+
+        await asyncio.gather(
+            *(metrics_api.get_live_metrics("ai-jesus") for _ in range(10))
+        )
+        await metrics_api.get_live_metrics("ai-jesus")
+        await metrics_api.get_live_metrics("ai-buddha")
+
+        assert metrics_api._build_live_metrics.await_count == 2
+
+        metrics_api.invalidate_snapshot("ai-jesus")
+        await metrics_api.get_live_metrics("ai-jesus")
+        assert metrics_api._build_live_metrics.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_live_metrics_returns_copy_of_snapshot(self, metrics_api):
+        """Test that callers cannot mutate the cached snapshot."""
+        metrics_api._build_live_metrics = AsyncMock(return_value={"summary": {}})
+
+        first = await metrics_api.get_live_metrics("ai-jesus")
+        first["summary"] = "overwritten"
+        second = await metrics_api.get_live_metrics("ai-jesus")
+
+        assert second["summary"] == {}
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_build_is_not_cached(self, metrics_api):
+        """Test that a build overtaken by an invalidation is not cached."""
+        release = asyncio.Event()
+
+        async def slow_build(persona_id):
+            await release.wait()
+            return {"summary": "stale"}
+
+        metrics_api._build_live_metrics = slow_build
+        read = asyncio.create_task(metrics_api.get_live_metrics("ai-jesus"))
+        await asyncio.sleep(0)
+        metrics_api.invalidate_snapshot("ai-jesus")
+        release.set()
+        await read
+
+        assert "ai-jesus" not in metrics_api._snapshots
+
 
 class TestWebSocketIntegration:
     """Test WebSocket functionality for real-time updates."""
@@ -1,7 +1,9 @@
 """VariantMetricsAPI for real-time dashboard data."""
 
+import asyncio
+import time
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Tuple
 
 # Note: These would be imported from actual services in production
 # from services.performance_monitor.early_kill import EarlyKillMonitor
@@ -38,28 +40,92 @@ class PerformanceMonitor:
 class VariantMetricsAPI:
     """API for fetching variant performance metrics for dashboard."""
 
-    def __init__(self) -> None:
+    # Composed snapshots are shared by every dashboard of a persona for this long
+    SNAPSHOT_TTL_SECONDS = 2.0
+
+    def __init__(self, snapshot_ttl_seconds: float = SNAPSHOT_TTL_SECONDS) -> None:
         """Initialize with database and service connections."""
         self.db = get_db_connection()
         self.redis = get_redis_connection()
         self.performance_monitor = PerformanceMonitor()
         self.early_kill_monitor = EarlyKillMonitor()
         self.fatigue_detector = PatternFatigueDetector()
+        self.snapshot_ttl_seconds = snapshot_ttl_seconds
+        self._snapshots: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._snapshot_builds: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._snapshot_generations: Dict[str, int] = {}
 
     async def get_live_metrics(self, persona_id: str) -> Dict[str, Any]:
-        """Get comprehensive variant performance overview."""
+        """Get comprehensive variant performance overview.
+
+        Returns the persona's cached snapshot while it is fresh; concurrent
+        callers on a miss share a single in-flight build. Each caller gets a
+        shallow copy: top-level keys may be replaced, but the nested sections
+        are shared with the cache and must be treated as read-only.
+        """
+        cached = self._snapshots.get(persona_id)
+        if cached and cached[0] > time.monotonic():
+            return dict(cached[1])
+
+        pending = self._snapshot_builds.get(persona_id)
+        if pending is not None:
+            return dict(await asyncio.shield(pending))
+
+        generation = self._snapshot_generations.get(persona_id, 0)
+        build = asyncio.ensure_future(self._build_live_metrics(persona_id))
+        self._snapshot_builds[persona_id] = build
+        try:
+            snapshot = await asyncio.shield(build)
+        finally:
+            if self._snapshot_builds.get(persona_id) is build:
+                del self._snapshot_builds[persona_id]
+
+        # Don't cache a build that started before the last invalidation
+        stale = self._snapshot_generations.get(persona_id, 0) != generation
+        if self.snapshot_ttl_seconds > 0 and not stale:
+            self._snapshots[persona_id] = (
+                time.monotonic() + self.snapshot_ttl_seconds,
+                snapshot,
+            )
+        return dict(snapshot)
+
+    async def _build_live_metrics(self, persona_id: str) -> Dict[str, Any]:
+        """Compose the overview with all sub-queries issued concurrently."""
+        (
+            summary,
+            active_variants,
+            performance_leaders,
+            early_kills_today,
+            pattern_fatigue_warnings,
+            optimization_opportunities,
+            real_time_feed,
+        ) = await asyncio.gather(
+            self.get_performance_summary(persona_id),
+            self.get_active_variants(persona_id),
+            self.get_top_performers(persona_id),
+            self.get_kill_statistics(persona_id),
+            self.get_fatigue_warnings(persona_id),
+            self.get_optimization_suggestions(persona_id),
+            self.get_recent_events(persona_id),
+        )
         return {
-            "summary": await self.get_performance_summary(persona_id),
-            "active_variants": await self.get_active_variants(persona_id),
-            "performance_leaders": await self.get_top_performers(persona_id),
-            "early_kills_today": await self.get_kill_statistics(persona_id),
-            "pattern_fatigue_warnings": await self.get_fatigue_warnings(persona_id),
-            "optimization_opportunities": await self.get_optimization_suggestions(
-                persona_id
-            ),
-            "real_time_feed": await self.get_recent_events(persona_id),
+            "summary": summary,
+            "active_variants": active_variants,
+            "performance_leaders": performance_leaders,
+            "early_kills_today": early_kills_today,
+            "pattern_fatigue_warnings": pattern_fatigue_warnings,
+            "optimization_opportunities": optimization_opportunities,
+            "real_time_feed": real_time_feed,
         }
 
+    def invalidate_snapshot(self, persona_id: str) -> None:
+        """Drop the cached snapshot so the next read rebuilds it."""
+        self._snapshots.pop(persona_id, None)
+        self._snapshot_builds.pop(persona_id, None)
+        self._snapshot_generations[persona_id] = (
+            self._snapshot_generations.get(persona_id, 0) + 1
+        )
+
     async def get_performance_summary(self, persona_id: str) -> Dict[str, Any]:
         """Get high-level performance summary."""
         # Implementation placeholder
@@ -84,10 +150,16 @@ class VariantMetricsAPI:
 
         variants = await self.db.fetch_all(query, persona_id)
 
-        # Enhance with real-time performance data
+        # Enhance with real-time performance data fetched in one bulk call
+        performance_by_id = await self.get_variants_performance(
+            variant["id"] for variant in variants
+        )
+
         enhanced_variants = []
         for variant in variants:
-            performance = await self.get_variant_performance(variant["id"])
+            performance = performance_by_id.get(
+                variant["id"], self._empty_performance()
+            )
             enhanced_variants.append(
                 {
                     **dict(variant),
@@ -105,7 +177,18 @@ class VariantMetricsAPI:
 
     async def get_variant_performance(self, variant_id: str) -> Dict[str, Any]:
         """Get real-time performance metrics for a variant."""
-        # This would fetch from monitoring service
+        performance = await self.get_variants_performance([variant_id])
+        return performance.get(variant_id, self._empty_performance())
+
+    async def get_variants_performance(
+        self, variant_ids: Iterable[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get real-time performance metrics for many variants at once."""
+        # This would fetch from monitoring service with a single bulk request
+        return {variant_id: self._empty_performance() for variant_id in variant_ids}
+
+    @staticmethod
+    def _empty_performance() -> Dict[str, Any]:
         return {"engagement_rate": 0.0, "views": 0, "interactions": 0}
 
     async def get_top_performers(self, persona_id: str) -> List[Dict[str, Any]]:
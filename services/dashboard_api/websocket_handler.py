@@ -1,20 +1,27 @@
 """WebSocket handler for real-time dashboard updates."""
 
 from datetime import datetime
-from typing import Dict, Set, Any
+from typing import Dict, Optional, Set, Any
+import asyncio
 import json
 from fastapi import WebSocket
 
+from .broadcast_engine import CoalescingBroadcaster  # type: ignore[import-not-found]
 from .variant_metrics import VariantMetricsAPI  # type: ignore[import-not-found]
 
 
 class VariantDashboardWebSocket:
     """Handles WebSocket connections for real-time dashboard updates."""
 
-    def __init__(self) -> None:
-        """Initialize WebSocket handler."""
+    def __init__(self, broadcaster: Optional[CoalescingBroadcaster] = None) -> None:
+        """Initialize WebSocket handler.
+
+        When a running broadcaster is supplied, updates are coalesced into
+        per-tick deltas; otherwise each update is sent immediately.
+        """
         self.connections: Dict[str, Set[WebSocket]] = {}
         self.metrics_api = VariantMetricsAPI()
+        self.broadcaster = broadcaster
 
     async def handle_connection(self, websocket: WebSocket, persona_id: str) -> None:
         """Handle new dashboard WebSocket connection."""
@@ -27,8 +34,16 @@ class VariantDashboardWebSocket:
         self.connections[persona_id].add(websocket)
 
         try:
+            # Register before the initial data await so no update is lost in
+            # between; the channel only starts sending once it is ready
+            channel = None
+            if self.broadcaster is not None:
+                channel = self.broadcaster.add_client(persona_id, websocket)
+
             # Send initial data
             await self.send_initial_data(websocket, persona_id)
+            if channel is not None:
+                channel.ready.set()
 
             # Keep connection alive and handle messages
             while True:
@@ -40,12 +55,18 @@ class VariantDashboardWebSocket:
 
         finally:
             # Clean up connection
+            if self.broadcaster is not None:
+                await self.broadcaster.remove_client(persona_id, websocket)
             self.connections[persona_id].discard(websocket)
             if not self.connections[persona_id]:
                 del self.connections[persona_id]
 
     async def send_initial_data(self, websocket: WebSocket, persona_id: str) -> None:
-        """Send initial dashboard data to newly connected client."""
+        """Send initial dashboard data to newly connected client.
+
+        Uses the persona's shared snapshot, so a burst of new tabs costs one
+        metrics build rather than one per connection.
+        """
         initial_data = await self.metrics_api.get_live_metrics(persona_id)
         await websocket.send_json({"type": "initial_data", "data": initial_data})
 
@@ -71,27 +92,34 @@ class VariantDashboardWebSocket:
         self, persona_id: str, update_data: Dict[str, Any]
     ) -> None:
         """Broadcast variant performance updates to connected dashboards."""
+        # Every event changes what the persona's cached snapshot should show,
+        # so drop it even when no dashboard is currently connected
+        self.metrics_api.invalidate_snapshot(persona_id)
+
         if persona_id not in self.connections:
             return
 
+        if self.broadcaster is not None and self.broadcaster.running:
+            self.broadcaster.publish(persona_id, update_data)
+            return
+
         message = {
             "type": "variant_update",
             "timestamp": datetime.now().isoformat(),
             "data": update_data,
         }
 
-        # Broadcast to all connected clients for this persona
-        disconnected = set()
-        for websocket in self.connections[persona_id].copy():
-            try:
-                await websocket.send_json(message)
-            except Exception:
-                # Mark for removal if disconnected
-                disconnected.add(websocket)
+        # Broadcast to all connected clients for this persona concurrently
+        websockets = list(self.connections[persona_id])
+        results = await asyncio.gather(
+            *(websocket.send_json(message) for websocket in websockets),
+            return_exceptions=True,
+        )
 
         # Remove disconnected clients
-        for websocket in disconnected:
-            self.connections[persona_id].discard(websocket)
+        for websocket, result in zip(websockets, results):
+            if isinstance(result, Exception):
+                self.connections[persona_id].discard(websocket)
 
     async def broadcast_early_kill(
         self, persona_id: str, kill_data: Dict[str, Any]
@@ -16,50 +16,82 @@ export function VariantDashboard({ personaId }) {
                 setMetrics(message.data);
             } else if (message.type === 'variant_update') {
                 updateVariantMetrics(message.data);
+            } else if (
+                message.type === 'variant_delta' ||
+                message.type === 'variant_snapshot'
+            ) {
+                applyCoalescedUpdate(message.data);
             }
         }
     });
 
     const { loading, error, refetch } = useDashboardData(personaId, setMetrics);
 
+    // Delta fields arrive under their server names and only when they changed
+    const LIVE_METRIC_FIELDS = {
+        current_er: 'engagement_rate',
+        interaction_count: 'interactions',
+        view_count: 'views'
+    };
+
+    const applyVariantFields = (prev, variantId, fields) => {
+        const liveMetrics = {};
+        Object.entries(LIVE_METRIC_FIELDS).forEach(([source, target]) => {
+            if (fields[source] !== undefined) {
+                liveMetrics[target] = fields[source];
+            }
+        });
+
+        return {
+            ...prev,
+            active_variants: prev.active_variants.map(variant =>
+                variant.id === variantId
+                    ? {
+                        ...variant,
+                        live_metrics: { ...variant.live_metrics, ...liveMetrics }
+                    }
+                    : variant
+            )
+        };
+    };
+
+    const applyEvent = (prev, updateData) => {
+        // Update active variants with new data
+        if (updateData.event_type === 'performance_update') {
+            return applyVariantFields(prev, updateData.variant_id, updateData);
+        }
+
+        // Add early kill to feed
+        if (updateData.event_type === 'early_kill') {
+            return {
+                ...prev,
+                early_kills_today: {
+                    ...prev.early_kills_today,
+                    kills_today: prev.early_kills_today.kills_today + 1
+                },
+                real_time_feed: [updateData, ...prev.real_time_feed].slice(0, 50)
+            };
+        }
+
+        return prev;
+    };
+
     const updateVariantMetrics = (updateData) => {
+        setMetrics(prev => (prev ? applyEvent(prev, updateData) : prev));
+    };
+
+    const applyCoalescedUpdate = ({ variants = {}, events = [] }) => {
         setMetrics(prev => {
             if (!prev) return prev;
-            
-            // Update active variants with new data
-            if (updateData.event_type === 'performance_update') {
-                const updatedVariants = prev.active_variants.map(variant => 
-                    variant.id === updateData.variant_id 
-                        ? {
-                            ...variant,
-                            live_metrics: {
-                                ...variant.live_metrics,
-                                engagement_rate: updateData.current_er,
-                                interactions: updateData.interaction_count
-                            }
-                        }
-                        : variant
-                );
-                
-                return {
-                    ...prev,
-                    active_variants: updatedVariants
-                };
-            }
-            
-            // Add early kill to feed
-            if (updateData.event_type === 'early_kill') {
-                return {
-                    ...prev,
-                    early_kills_today: {
-                        ...prev.early_kills_today,
-                        kills_today: prev.early_kills_today.kills_today + 1
-                    },
-                    real_time_feed: [updateData, ...prev.real_time_feed].slice(0, 50)
-                };
-            }
-            
-            return prev;
+
+            let next = prev;
+            Object.entries(variants).forEach(([variantId, fields]) => {
+                next = applyVariantFields(next, variantId, fields);
+            });
+            events.forEach(event => {
+                next = applyEvent(next, event);
+            });
+            return next;
         });
     };
 
@@ -15,6 +15,12 @@ from .ml_metrics_collector import (
     BatchProcessingMetrics,
     PredictiveMetrics,
     AnomalyDetection,
+    MultiClusterCollector,
+)
+from .collection_engine import (
+    CollectionCycleStats,
+    MetricsCollectionEngine,
+    ScrapeAlignedCache,
 )
 
 __all__ = [
@@ -30,4 +36,8 @@ __all__ = [
     "BatchProcessingMetrics",
     "PredictiveMetrics",
     "AnomalyDetection",
+    "MultiClusterCollector",
+    "CollectionCycleStats",
+    "MetricsCollectionEngine",
+    "ScrapeAlignedCache",
 ]
@@ -0,0 +1,271 @@
+"""
+Concurrent Prometheus collection engine for autoscaling decisions
+
+Fans PromQL queries out across clusters over one shared keep-alive session,
+deduplicates identical in-flight queries, and caches results until the next
+scrape boundary so repeated decision loops within a scrape interval never
+hit Prometheus twice.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+QueryKey = Tuple[str, str]
+
+
+@dataclass
+class CollectionCycleStats:
+    """Latency and efficiency stats for collection cycles"""
+
+    cycles: int = 0
+    last_cycle_ms: float = 0.0
+    p50_cycle_ms: float = 0.0
+    p95_cycle_ms: float = 0.0
+    queries_issued: int = 0
+    cache_hits: int = 0
+    deduplicated: int = 0
+
+
+class ScrapeAlignedCache:
+    """
+    Bounded TTL cache whose entries expire at the next scrape boundary
+
+    A value fetched at any point inside a scrape interval cannot change until
+    Prometheus scrapes again, so entries live until the end of the interval
+    they were stored in rather than for a fixed duration.
+    """
+
+    def __init__(self, maxsize: int = 1024, scrape_interval: float = 15.0):
+        self.maxsize = maxsize
+        self.scrape_interval = scrape_interval
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def _expiry(self, now: float) -> float:
+        return (int(now // self.scrape_interval) + 1) * self.scrape_interval
+
+    def get(self, key: Any, now: Optional[float] = None) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        now = time.time() if now is None else now
+        expires_at, value = entry
+        if now >= expires_at:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        self._data[key] = (self._expiry(now), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class MetricsCollectionEngine:
+    """
+    Shared query engine used by every collector in a decision loop
+
+    One engine should be shared by all clusters so that connections are
+    pooled and identical queries are issued once per scrape interval.
+    """
+
+    def __init__(
+        self,
+        scrape_interval: float = 15.0,
+        per_cluster_concurrency: int = 8,
+        max_connections: int = 64,
+        cache_maxsize: int = 1024,
+        request_timeout: float = 10.0,
+        latency_window: int = 256,
+    ):
+        """
+        Initialize collection engine
+
+        Args:
+            scrape_interval: Prometheus scrape interval used to align cache expiry
+            per_cluster_concurrency: Max in-flight queries per Prometheus server
+            max_connections: Total keep-alive connection pool size
+            cache_maxsize: Max cached query results
+            request_timeout: Per-query timeout (seconds)
+            latency_window: Number of cycles kept for latency percentiles
+        """
+        self.per_cluster_concurrency = per_cluster_concurrency
+        self.max_connections = max_connections
+        self.request_timeout = request_timeout
+        self.cache = ScrapeAlignedCache(cache_maxsize, scrape_interval)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._cycle_latencies: Deque[float] = deque(maxlen=latency_window)
+        self._stats = CollectionCycleStats()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.per_cluster_concurrency,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            )
+        return self._session
+
+    def _semaphore(self, base_url: str) -> asyncio.Semaphore:
+        if base_url not in self._semaphores:
+            self._semaphores[base_url] = asyncio.Semaphore(self.per_cluster_concurrency)
+        return self._semaphores[base_url]
+
+    async def _fetch(
+        self, base_url: str, path: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Execute one Prometheus API request over the shared session"""
+        session = self._get_session()
+        async with self._semaphore(base_url):
+            async with session.get(f"{base_url}{path}", params=params) as response:
+                return await response.json()
+
+    async def query(self, base_url: str, query: str) -> Dict[str, Any]:
+        """
+        Execute an instant query with caching and in-flight deduplication
+
+        Args:
+            base_url: Prometheus server URL
+            query: PromQL expression
+
+        Returns:
+            Raw Prometheus API response
+        """
+        return await self._execute(
+            (base_url, query), base_url, "/api/v1/query", {"query": query}
+        )
+
+    async def query_range(
+        self, base_url: str, query: str, start: int, end: int, step: str
+    ) -> Dict[str, Any]:
+        """
+        Execute a range query with caching and in-flight deduplication
+
+        Args:
+            base_url: Prometheus server URL
+            query: PromQL expression
+            start: Range start (unix seconds)
+            end: Range end (unix seconds)
+            step: Query resolution step, e.g. "5m"
+
+        Returns:
+            Raw Prometheus API response
+        """
+        params = {"query": query, "start": start, "end": end, "step": step}
+        return await self._execute(
+            (base_url, query, start, end, step),
+            base_url,
+            "/api/v1/query_range",
+            params,
+        )
+
+    async def _execute(
+        self, key: Tuple, base_url: str, path: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._stats.cache_hits += 1
+            return cached
+
+        # The fetch runs as its own task so that a cancelled caller (e.g. a
+        # decision-loop timeout) never strands the callers deduplicated onto it
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats.queries_issued += 1
+            task = asyncio.ensure_future(
+                self._fetch_and_cache(key, base_url, path, params)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_inflight(key, done))
+        else:
+            self._stats.deduplicated += 1
+        return await asyncio.shield(task)
+
+    async def _fetch_and_cache(
+        self, key: Tuple, base_url: str, path: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        result = await self._fetch(base_url, path, params)
+        if result.get("status") == "success":
+            self.cache.set(key, result)
+        return result
+
+    def _finish_inflight(self, key: Tuple, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark retrieved so failures nobody awaited don't log warnings
+            task.exception()
+
+    async def query_many(
+        self, requests: Iterable[QueryKey]
+    ) -> Dict[QueryKey, Dict[str, Any]]:
+        """
+        Execute many (base_url, query) pairs concurrently as one cycle
+
+        Failed queries are logged and returned as error responses so one
+        unreachable cluster does not fail the whole cycle.
+        """
+        unique: List[QueryKey] = list(dict.fromkeys(requests))
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(self.query(url, q) for url, q in unique), return_exceptions=True
+        )
+        self.record_cycle(time.perf_counter() - start)
+
+        output: Dict[QueryKey, Dict[str, Any]] = {}
+        for key, result in zip(unique, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Prometheus query failed on {key[0]}: {result}")
+                output[key] = {"status": "error", "error": str(result)}
+            else:
+                output[key] = result
+        return output
+
+    def record_cycle(self, elapsed_seconds: float) -> None:
+        """Record the latency of a completed collection cycle"""
+        self._stats.cycles += 1
+        self._stats.last_cycle_ms = elapsed_seconds * 1000
+        self._cycle_latencies.append(self._stats.last_cycle_ms)
+
+    @property
+    def cycle_stats(self) -> CollectionCycleStats:
+        """Current collection cycle statistics"""
+        if self._cycle_latencies:
+            latencies = np.fromiter(self._cycle_latencies, dtype=float)
+            self._stats.p50_cycle_ms = float(np.percentile(latencies, 50))
+            self._stats.p95_cycle_ms = float(np.percentile(latencies, 95))
+        return self._stats
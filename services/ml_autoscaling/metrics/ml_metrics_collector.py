@@ -3,7 +3,9 @@ ML Metrics Collector for Autoscaling Decisions
 Collects and analyzes ML-specific metrics from Prometheus
 """
 
+import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -12,6 +14,8 @@ import aiohttp
 import numpy as np
 from cachetools import TTLCache
 
+from .collection_engine import CollectionCycleStats, MetricsCollectionEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -139,8 +143,9 @@ class AnomalyDetection:
 class PrometheusClient:
     """Client for querying Prometheus"""
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, engine: Optional[MetricsCollectionEngine] = None):
         self.base_url = base_url
+        self.engine = engine
         self.session = None
 
     async def __aenter__(self):
@@ -153,6 +158,9 @@ class PrometheusClient:
 
     async def query(self, query: str) -> Dict[str, Any]:
         """Execute instant query"""
+        if self.engine is not None:
+            return await self.engine.query(self.base_url, query)
+
         if not self.session:
             self.session = aiohttp.ClientSession()
 
@@ -166,6 +174,15 @@ class PrometheusClient:
         self, query: str, start: datetime, end: datetime, step: str = "5m"
     ) -> Dict[str, Any]:
         """Execute range query"""
+        if self.engine is not None:
+            return await self.engine.query_range(
+                self.base_url,
+                query,
+                int(start.timestamp()),
+                int(end.timestamp()),
+                step,
+            )
+
         if not self.session:
             self.session = aiohttp.ClientSession()
 
@@ -194,6 +211,7 @@ class MLMetricsCollector:
         prometheus_url: str = "http://prometheus:9090",
         refresh_interval: int = 30,
         cache_ttl: int = 60,
+        engine: Optional[MetricsCollectionEngine] = None,
     ):
         """
         Initialize ML metrics collector
@@ -202,11 +220,13 @@ class MLMetricsCollector:
             prometheus_url: Prometheus server URL
             refresh_interval: How often to refresh metrics (seconds)
             cache_ttl: Cache time-to-live (seconds)
+            engine: Shared collection engine for pooled, deduplicated queries
         """
         self.prometheus_url = prometheus_url
         self.refresh_interval = refresh_interval
         self.cache_ttl_seconds = cache_ttl
-        self.prometheus = PrometheusClient(prometheus_url)
+        self.engine = engine
+        self.prometheus = PrometheusClient(prometheus_url, engine=engine)
         self._cache = TTLCache(maxsize=100, ttl=cache_ttl)
 
     async def collect_inference_metrics(
@@ -504,26 +524,30 @@ class MLMetricsCollector:
 
         return metrics
 
+    async def _query_scalar(self, query: str) -> Optional[float]:
+        """Query a single scalar value, None if absent"""
+        result = await self.prometheus.query(query)
+        if result["status"] == "success" and result["data"]["result"]:
+            return float(result["data"]["result"][0]["value"][1])
+        return None
+
     async def get_ml_workload_metrics(self) -> MLWorkloadMetrics:
         """Get aggregated ML workload metrics"""
         metrics = MLWorkloadMetrics()
 
-        # Aggregate various metrics
-        inference_load = await self.prometheus.query(
-            "sum(rate(model_inference_requests_total[5m]))"
+        # Sub-queries are independent, so issue them concurrently
+        inference_load, training_jobs, gpu_metrics, queue_depth = await asyncio.gather(
+            self._query_scalar("sum(rate(model_inference_requests_total[5m]))"),
+            self._query_scalar("count(training_job_active == 1)"),
+            self.collect_gpu_metrics(),
+            self.get_queue_depth("celery"),
         )
-        if inference_load["status"] == "success" and inference_load["data"]["result"]:
-            metrics.total_inference_load = float(
-                inference_load["data"]["result"][0]["value"][1]
-            )
 
-        training_jobs = await self.prometheus.query("count(training_job_active == 1)")
-        if training_jobs["status"] == "success" and training_jobs["data"]["result"]:
-            metrics.active_training_jobs = int(
-                float(training_jobs["data"]["result"][0]["value"][1])
-            )
+        if inference_load is not None:
+            metrics.total_inference_load = inference_load
+        if training_jobs is not None:
+            metrics.active_training_jobs = int(training_jobs)
 
-        gpu_metrics = await self.collect_gpu_metrics()
         if gpu_metrics.avg_utilization > 80:
             metrics.gpu_pressure = "high"
         elif gpu_metrics.avg_utilization > 50:
@@ -531,7 +555,6 @@ class MLMetricsCollector:
         else:
             metrics.gpu_pressure = "low"
 
-        queue_depth = await self.get_queue_depth("celery")
         metrics.queue_depth = queue_depth
 
         # Determine recommended action
@@ -599,24 +622,56 @@ class MLMetricsCollector:
 
     @classmethod
     def for_multi_cluster(
-        cls, cluster_configs: List[Dict[str, str]]
+        cls,
+        cluster_configs: List[Dict[str, str]],
+        engine: Optional[MetricsCollectionEngine] = None,
     ) -> "MultiClusterCollector":
         """Create a multi-cluster collector"""
-        return MultiClusterCollector(cluster_configs)
+        return MultiClusterCollector(cluster_configs, engine=engine)
 
 
 class MultiClusterCollector:
     """Collector for multiple clusters"""
 
-    def __init__(self, cluster_configs: List[Dict[str, str]]):
+    def __init__(
+        self,
+        cluster_configs: List[Dict[str, str]],
+        engine: Optional[MetricsCollectionEngine] = None,
+    ):
+        # One engine for all clusters: pooled connections, per-cluster limits
+        self.engine = engine or MetricsCollectionEngine()
         self.collectors = {
-            config["name"]: MLMetricsCollector(config["prometheus_url"])
+            config["name"]: MLMetricsCollector(
+                config["prometheus_url"], engine=self.engine
+            )
             for config in cluster_configs
         }
 
     async def collect_all_clusters(self) -> Dict[str, MLWorkloadMetrics]:
-        """Collect metrics from all clusters"""
+        """Collect metrics from all clusters concurrently"""
+        start = time.perf_counter()
+        names = list(self.collectors)
+        gathered = await asyncio.gather(
+            *(self.collectors[name].get_ml_workload_metrics() for name in names),
+            return_exceptions=True,
+        )
+        self.engine.record_cycle(time.perf_counter() - start)
+
         results = {}
-        for name, collector in self.collectors.items():
-            results[name] = await collector.get_ml_workload_metrics()
+        for name, result in zip(names, gathered):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    f"Metrics collection failed for cluster {name}: {result}"
+                )
+                results[name] = MLWorkloadMetrics(recommended_scale_action="hold")
+            else:
+                results[name] = result
         return results
+
+    @property
+    def cycle_stats(self) -> CollectionCycleStats:
+        """Collection cycle latency across all clusters"""
+        return self.engine.cycle_stats
+
+    async def close(self) -> None:
+        await self.engine.close()
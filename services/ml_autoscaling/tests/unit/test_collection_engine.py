@@ -0,0 +1,178 @@
+"""
+Test suite for the concurrent Prometheus collection engine
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.ml_autoscaling.metrics.collection_engine import (
+    MetricsCollectionEngine,
+    ScrapeAlignedCache,
+)
+from services.ml_autoscaling.metrics.ml_metrics_collector import (
+    MLMetricsCollector,
+    MLWorkloadMetrics,
+)
+
+
+def _scalar(value: str):
+    return {"status": "success", "data": {"result": [{"value": [0, value]}]}}
+
+
+class FakeEngine(MetricsCollectionEngine):
+    """Engine with a fake transport that records calls"""
+
+    def __init__(self, delay: float = 0.05, fail_urls=(), **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.fail_urls = set(fail_urls)
+        self.calls = []
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    async def _fetch(self, base_url, path, params):
+        query = params["query"]
+        async with self._semaphore(base_url):
+            self.calls.append((base_url, query))
+            self._in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self._in_flight)
+            try:
+                await asyncio.sleep(self.delay)
+                if base_url in self.fail_urls:
+                    raise ConnectionError("unreachable")
+                return _scalar("95" if "gpu" in query else "20")
+            finally:
+                self._in_flight -= 1
+
+
+class TestScrapeAlignedCache:
+    def test_entries_expire_at_next_scrape_boundary(self):
+        cache = ScrapeAlignedCache(maxsize=10, scrape_interval=15)
+        cache.set("q", 1, now=29.0)
+
+        assert cache.get("q", now=29.9) == 1
+        assert cache.get("q", now=30.0) is None
+
+    def test_bounded_with_lru_eviction(self):
+        cache = ScrapeAlignedCache(maxsize=2, scrape_interval=15)
+        cache.set("a", 1, now=0)
+        cache.set("b", 2, now=0)
+        cache.get("a", now=1)
+        cache.set("c", 3, now=1)
+
+        assert len(cache) == 2
+        assert cache.get("b", now=1) is None
+        assert cache.get("a", now=1) == 1
+
+
+class TestMetricsCollectionEngine:
+    @pytest.mark.asyncio
+    async def test_identical_queries_are_deduplicated(self):
+        engine = FakeEngine()
+
+        results = await asyncio.gather(
+            *(engine.query("http://prom", "up") for _ in range(5))
+        )
+
+        assert len(engine.calls) == 1
+        assert all(r["status"] == "success" for r in results)
+        assert engine.cycle_stats.deduplicated == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_strand_followers(self):
+        engine = FakeEngine(delay=0.1)
+
+        leader = asyncio.create_task(engine.query("http://prom", "up"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(engine.query("http://prom", "up"))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        result = await asyncio.wait_for(follower, timeout=1)
+
+        assert result["status"] == "success"
+        assert len(engine.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_range_queries_go_through_engine(self):
+        engine = FakeEngine(scrape_interval=3600)
+        collector = MLMetricsCollector("http://prom", engine=engine)
+        end = datetime.now()
+        start = end - timedelta(hours=1)
+
+        await collector.prometheus.query_range("up", start, end, step="1m")
+        await collector.prometheus.query_range("up", start, end, step="1m")
+        await collector.prometheus.query_range("up", start, end, step="5m")
+        await collector.prometheus.query("up")
+
+        # Same range is cached; a different step or an instant query is not
+        assert len(engine.calls) == 3
+        assert collector.prometheus.session is None
+
+    @pytest.mark.asyncio
+    async def test_results_cached_within_scrape_interval(self):
+        engine = FakeEngine(scrape_interval=3600)
+
+        await engine.query("http://prom", "up")
+        await engine.query("http://prom", "up")
+
+        assert len(engine.calls) == 1
+        assert engine.cycle_stats.cache_hits == 1
+
+    @pytest.mark.asyncio
+    async def test_per_cluster_concurrency_limit(self):
+        engine = FakeEngine(per_cluster_concurrency=2)
+
+        await engine.query_many(("http://prom", f"q{i}") for i in range(6))
+
+        assert engine.max_in_flight == 2
+        assert len(engine.calls) == 6
+
+    @pytest.mark.asyncio
+    async def test_query_many_isolates_failures_and_records_latency(self):
+        engine = FakeEngine(fail_urls={"http://down"})
+
+        results = await engine.query_many([("http://up", "q"), ("http://down", "q")])
+
+        assert results[("http://up", "q")]["status"] == "success"
+        assert results[("http://down", "q")]["status"] == "error"
+        assert engine.cycle_stats.cycles == 1
+        assert engine.cycle_stats.last_cycle_ms > 0
+
+
+class TestConcurrentCollection:
+    @pytest.mark.asyncio
+    async def test_workload_queries_run_concurrently(self):
+        engine = FakeEngine(delay=0.1)
+        collector = MLMetricsCollector("http://prom", engine=engine)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        metrics = await collector.get_ml_workload_metrics()
+        elapsed = loop.time() - start
+
+        assert isinstance(metrics, MLWorkloadMetrics)
+        assert metrics.gpu_pressure == "high"
+        assert metrics.recommended_scale_action == "scale_up"
+        # Four sub-queries in parallel, not 4 x 100ms
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_multi_cluster_shares_engine_and_tolerates_failures(self):
+        engine = FakeEngine(delay=0.1, fail_urls={"http://staging:9090"})
+        collector = MLMetricsCollector.for_multi_cluster(
+            [
+                {"name": "prod", "prometheus_url": "http://prod:9090"},
+                {"name": "staging", "prometheus_url": "http://staging:9090"},
+            ],
+            engine=engine,
+        )
+
+        results = await collector.collect_all_clusters()
+
+        assert results["prod"].recommended_scale_action == "scale_up"
+        assert results["staging"].recommended_scale_action == "hold"
+        assert collector.cycle_stats.cycles == 1
+        assert collector.cycle_stats.last_cycle_ms < 300
@@ -0,0 +1,234 @@
+"""
+Content list benchmark.
+
+Times the queries behind ``GET /api/v1/content`` on a large
+``content_items`` table:
+
+- pagination: ``OFFSET`` pages against keyset (``cursor``) pages at
+  increasing depth
+- search: ``ILIKE '%term%'`` over title and content against the GIN-indexed
+  ``search_vector`` (Postgres only)
+- totals: ``count(*)`` against the planner estimate (Postgres only)
+
+Against Postgres pass ``--dsn``; the table is seeded with ``--items`` rows
+(1M by default) through ``generate_series`` and the search vector and
+keyset index from migration 011 are created if missing. Without ``--dsn`` a
+temporary SQLite file is used and only pagination is compared.
+
+Usage:
+    python -m services.orchestrator.content_list_benchmark [--items 1000000]
+        [--dsn postgresql+asyncpg://...] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List
+
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from services.orchestrator.db.async_engine import create_orchestrator_async_engine
+from services.orchestrator.db.content_search import (
+    count_content,
+    encode_cursor,
+    search_filter,
+    after_cursor,
+)
+from services.orchestrator.db.models import ContentItem, ContentSchedule
+
+WORDS = (
+    "agent latency pipeline prompt vector cache kafka redis model token "
+    "embedding scaling inference budget rollout canary drift schema index"
+).split()
+
+PAGE_SIZE = 20
+
+
+async def _timed(fn: Callable[[], Awaitable[Any]], repeat: int) -> float:
+    """Median milliseconds of ``repeat`` runs after one warm-up."""
+    await fn()
+    runs: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return statistics.median(runs)
+
+
+async def seed(session: AsyncSession, items: int) -> None:
+    conn = await session.connection()
+    await conn.run_sync(
+        lambda sync_conn: ContentItem.metadata.create_all(
+            sync_conn, tables=[ContentItem.__table__, ContentSchedule.__table__]
+        )
+    )
+    existing = await session.scalar(select(func.count(ContentItem.id)))
+    if existing >= items:
+        return
+
+    if conn.dialect.name == "postgresql":
+        words = "ARRAY[" + ",".join(f"'{w}'" for w in WORDS) + "]"
+        await session.execute(
+            text(f"""
+                INSERT INTO content_items
+                    (title, content, content_type, author_id, status,
+                     content_metadata, created_at, updated_at)
+                SELECT
+                    'Post ' || g || ' on ' || ({words})[1 + g % {len(WORDS)}],
+                    repeat(({words})[1 + (g * 7) % {len(WORDS)}] || ' lorem ipsum ', 40),
+                    'blog_post', 'author_' || g % 100,
+                    CASE WHEN g % 3 = 0 THEN 'published' ELSE 'draft' END,
+                    '{{}}', now() - g * interval '1 minute', now()
+                FROM generate_series(:start, :stop) AS g
+            """),
+            {"start": existing + 1, "stop": items},
+        )
+        await session.execute(
+            text("""
+                ALTER TABLE content_items ADD COLUMN IF NOT EXISTS search_vector
+                tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce(content, '')), 'B')
+                ) STORED
+            """)
+        )
+        await session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_content_items_search_vector "
+                "ON content_items USING gin(search_vector)"
+            )
+        )
+        await session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_content_items_created_id "
+                "ON content_items(created_at DESC, id DESC)"
+            )
+        )
+        await session.commit()
+        await session.execute(text("ANALYZE content_items"))
+    else:
+        base = datetime(2026, 1, 1)
+        for start in range(existing, items, 50_000):
+            await session.execute(
+                ContentItem.__table__.insert(),
+                [
+                    {
+                        "title": f"Post {i} on {WORDS[i % len(WORDS)]}",
+                        "content": f"{WORDS[(i * 7) % len(WORDS)]} lorem ipsum " * 40,
+                        "content_type": "blog_post",
+                        "author_id": f"author_{i % 100}",
+                        "status": "published" if i % 3 == 0 else "draft",
+                        "content_metadata": {},
+                        "created_at": base - timedelta(minutes=i),
+                        "updated_at": base,
+                        "slug": f"post-{i}",
+                    }
+                    for i in range(start, min(start + 50_000, items))
+                ],
+            )
+        await session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS idx_content_items_created_id "
+                "ON content_items(created_at DESC, id DESC)"
+            )
+        )
+    await session.commit()
+
+
+async def bench_pagination(session: AsyncSession, items: int, repeat: int) -> None:
+    ordered = select(ContentItem).order_by(
+        ContentItem.created_at.desc(), ContentItem.id.desc()
+    )
+    print(f"{'depth':>10} {'offset ms':>10} {'keyset ms':>10}")
+    for depth in (0, 1_000, 10_000, 100_000, items // 2, items - PAGE_SIZE):
+        if depth >= items:
+            continue
+        anchor = (
+            await session.execute(
+                select(ContentItem.created_at, ContentItem.id)
+                .order_by(ContentItem.created_at.desc(), ContentItem.id.desc())
+                .offset(depth - 1 if depth else 0)
+                .limit(1)
+            )
+        ).one()
+        cursor = encode_cursor(*anchor)
+
+        async def offset_page():
+            await session.scalars(ordered.offset(depth).limit(PAGE_SIZE))
+
+        async def keyset_page():
+            query = ordered.where(after_cursor(cursor)) if depth else ordered
+            await session.scalars(query.limit(PAGE_SIZE))
+
+        offset_ms = await _timed(offset_page, repeat)
+        keyset_ms = await _timed(keyset_page, repeat)
+        session.expunge_all()
+        print(f"{depth:>10} {offset_ms:>10.2f} {keyset_ms:>10.2f}")
+
+
+async def bench_search(session: AsyncSession, repeat: int) -> None:
+    term = "canary"
+    pattern = f"%{term}%"
+    like = or_(ContentItem.title.ilike(pattern), ContentItem.content.ilike(pattern))
+    fts = search_filter(term, "postgresql")
+
+    print(f"\n{'search':>10} {'count ms':>10} {'page ms':>10}")
+    for name, clause in (("ilike", like), ("tsvector", fts)):
+
+        async def count():
+            await session.scalar(select(func.count(ContentItem.id)).where(clause))
+
+        async def page():
+            await session.scalars(
+                select(ContentItem)
+                .where(clause)
+                .order_by(ContentItem.created_at.desc(), ContentItem.id.desc())
+                .limit(PAGE_SIZE)
+            )
+
+        count_ms = await _timed(count, repeat)
+        page_ms = await _timed(page, repeat)
+        session.expunge_all()
+        print(f"{name:>10} {count_ms:>10.2f} {page_ms:>10.2f}")
+
+    print(f"\n{'total':>10} {'ms':>10} {'value':>10}")
+    for name, estimate in (("exact", False), ("estimated", True)):
+        result: List[int] = []
+
+        async def total():
+            result[:] = [(await count_content(session, [], estimate=estimate))[0]]
+
+        ms = await _timed(total, repeat)
+        print(f"{name:>10} {ms:>10.2f} {result[0]:>10}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    dsn = args.dsn
+    if not dsn:
+        path = Path(tempfile.mkdtemp()) / "content_list.db"
+        dsn = f"sqlite+aiosqlite:///{path}"
+
+    engine = create_orchestrator_async_engine(dsn)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with factory() as session:
+        start = time.perf_counter()
+        await seed(session, args.items)
+        print(f"seeded {args.items} items in {time.perf_counter() - start:.1f}s\n")
+
+        await bench_pagination(session, args.items, args.repeat)
+        if engine.dialect.name == "postgresql":
+            await bench_search(session, args.repeat)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="content list benchmark")
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--dsn", default=None, help="postgresql+asyncpg://...")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,37 @@
+"""Add updated_at watermark column to posts
+
+Revision ID: 010_add_post_updated_at
+Revises: 009_add_content_scheduler_indexes
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "010_add_post_updated_at"
+down_revision = "009_add_content_scheduler_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Track row changes so engagement sync can resume from a watermark."""
+    op.add_column(
+        "posts",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_posts_updated_at", "posts", ["updated_at"])
+
+
+def downgrade():
+    """Remove the posts.updated_at watermark column."""
+    op.drop_index("ix_posts_updated_at", table_name="posts")
+    op.drop_column("posts", "updated_at")
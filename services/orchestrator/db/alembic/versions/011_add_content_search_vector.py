@@ -0,0 +1,50 @@
+"""Add full-text search vector and keyset index to content items
+
+Revision ID: 011_add_content_search_vector
+Revises: 010_add_post_updated_at
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "011_add_content_search_vector"
+down_revision = "010_add_post_updated_at"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add a generated tsvector with a GIN index and a (created_at, id) index."""
+
+    # Generated column: maintained by Postgres on every insert and update
+    op.execute("""
+        ALTER TABLE content_items ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'B')
+        ) STORED
+    """)
+
+    op.execute("""
+        CREATE INDEX idx_content_items_search_vector
+        ON content_items USING gin(search_vector)
+    """)
+
+    # Keyset pagination order of the content list
+    op.execute("""
+        CREATE INDEX idx_content_items_created_id
+        ON content_items(created_at DESC, id DESC)
+    """)
+
+    # Planner statistics back the estimated totals
+    op.execute("ANALYZE content_items")
+
+
+def downgrade():
+    """Remove the search vector and keyset index."""
+    op.drop_index("idx_content_items_created_id", "content_items")
+    op.drop_index("idx_content_items_search_vector", "content_items")
+    op.drop_column("content_items", "search_vector")
@@ -0,0 +1,41 @@
+"""Add per-conversation turn counter
+
+Revision ID: 012_add_conversation_turn_count
+Revises: 009_add_conversation_engine
+Create Date: 2026-10-18
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "012_add_conversation_turn_count"
+down_revision = "009_add_conversation_engine"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add conversation_states.turn_count, backfilled from existing turns."""
+    op.add_column(
+        "conversation_states",
+        sa.Column("turn_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # New turns are numbered from the counter, so it must start at the
+    # highest turn number already stored
+    op.execute("""
+        UPDATE conversation_states
+        SET turn_count = COALESCE((
+            SELECT MAX(t.turn_number)
+            FROM conversation_turns t
+            WHERE t.conversation_id = conversation_states.conversation_id
+        ), 0)
+    """)
+
+
+def downgrade():
+    """Remove the turn counter."""
+    op.drop_column("conversation_states", "turn_count")
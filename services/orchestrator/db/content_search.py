@@ -0,0 +1,132 @@
+# /services/orchestrator/db/content_search.py
+"""
+Query helpers for listing and searching content items.
+
+On Postgres, search matches the ``content_items.search_vector`` column (a
+generated ``tsvector`` over title and content, weighted A/B, with a GIN
+index; migration 011) and can rank by ``ts_rank_cd``. Other dialects fall
+back to ``ILIKE`` over title and content.
+
+Lists page by keyset on ``(created_at, id)``: the cursor carries the last
+row's sort key, so deep pages cost the same as the first one. Totals can be
+estimated from planner statistics instead of counted.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+from sqlalchemy import func, literal_column, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from .models import ContentItem
+
+TEXT_SEARCH_CONFIG = "english"
+
+SEARCH_VECTOR = literal_column("content_items.search_vector", type_=postgresql.TSVECTOR)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Opaque cursor pointing just past the row ``(created_at, item_id)``."""
+    raw = json.dumps([created_at.isoformat(), item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of ``encode_cursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor!r}") from e
+
+
+def after_cursor(cursor: str) -> ColumnElement[bool]:
+    """Rows after ``cursor`` in ``created_at DESC, id DESC`` order."""
+    created_at, item_id = decode_cursor(cursor)
+    # A row-value comparison seeks the (created_at, id) index directly
+    return tuple_(ContentItem.created_at, ContentItem.id) < tuple_(created_at, item_id)
+
+
+def search_query(search: str) -> ColumnElement[Any]:
+    """``tsquery`` for a user-entered search string (Postgres)."""
+    # Inline config so statements can be rendered for EXPLAIN
+    return func.websearch_to_tsquery(
+        literal_column(f"'{TEXT_SEARCH_CONFIG}'::regconfig"), search
+    )
+
+
+def search_filter(search: str, dialect: str) -> ColumnElement[bool]:
+    """Match content whose title or content contains ``search``."""
+    if dialect == "postgresql":
+        return SEARCH_VECTOR.op("@@")(search_query(search))
+    pattern = f"%{search}%"
+    return or_(ContentItem.title.ilike(pattern), ContentItem.content.ilike(pattern))
+
+
+def search_rank(search: str) -> ColumnElement[float]:
+    """Relevance of a row to ``search`` (Postgres)."""
+    return func.ts_rank_cd(SEARCH_VECTOR, search_query(search))
+
+
+async def count_content(
+    db: AsyncSession, filters: List[ColumnElement[bool]], estimate: bool = False
+) -> Tuple[int, bool]:
+    """
+    Count content items matching ``filters``.
+
+    Args:
+        db: Async database session
+        filters: WHERE clauses of the listing
+        estimate: Use planner statistics instead of counting (Postgres only)
+
+    Returns:
+        (total, is_estimate)
+    """
+    conn = await db.connection()
+    if estimate and conn.dialect.name == "postgresql":
+        if not filters:
+            # -1 until the table has been vacuumed or analyzed
+            reltuples = await db.scalar(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = 'content_items'::regclass"
+                )
+            )
+            if reltuples is not None and reltuples >= 0:
+                return reltuples, True
+        statement = (
+            select(ContentItem.id)
+            .where(*filters)
+            .compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+        )
+        plan = (
+            await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}")
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+
+    total = await db.scalar(
+        select(func.count()).select_from(ContentItem).where(*filters)
+    )
+    return total, False
+
+
+__all__ = [
+    "InvalidCursor",
+    "after_cursor",
+    "count_content",
+    "decode_cursor",
+    "encode_cursor",
+    "search_filter",
+    "search_rank",
+]
@@ -94,6 +94,11 @@ class Post(Base):
     original_input: Mapped[str] = mapped_column(
         Text, nullable=True
     )  # Store original input for training
+    updated_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        index=True,
+    )  # Watermark for engagement sync
 
 
 class Task(Base):
@@ -0,0 +1,226 @@
+"""
+Orchestrator database load test.
+
+Drives ``GET /api/v1/content`` in process and compares:
+
+- sync: the previous handler shape, querying through the synchronous
+  ``Session`` inside ``async def`` (every query blocks the event loop)
+- async: the scheduling router on the shared async engine
+
+While the load runs, a probe hits a trivial ``/ping`` endpoint on the same
+app; its latency shows how long the event loop is held by each request.
+Keep ``--concurrency`` below the sync pool size (30): in sync mode a request
+waiting for a pooled connection blocks the loop that would release one.
+
+Against Postgres pass both DSNs; without them a temporary SQLite file is
+seeded and used by both modes. SQLite answers from local disk, so
+``--latency-ms`` adds a simulated network round trip to every statement:
+a blocking sleep for the sync driver, an awaited one for the async driver.
+
+Usage:
+    python -m services.orchestrator.db_load_test [--requests 500] [--concurrency 20]
+        [--latency-ms 5] [--sync-dsn postgresql+psycopg2://...]
+        [--async-dsn postgresql+asyncpg://...]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.util import await_only
+
+from services.orchestrator.db.async_engine import (
+    create_orchestrator_async_engine,
+    get_async_db_session,
+)
+from services.orchestrator.db.models import ContentItem, ContentSchedule
+from services.orchestrator.scheduling_router import router
+from services.orchestrator.scheduling_schemas import (
+    ContentItemResponse,
+    PaginatedContentResponse,
+)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def seed_sqlite(path: Path, items: int) -> None:
+    engine = create_engine(f"sqlite:///{path}")
+    ContentItem.metadata.create_all(
+        engine, tables=[ContentItem.__table__, ContentSchedule.__table__]
+    )
+    with sessionmaker(engine)() as session:
+        session.add_all(
+            ContentItem(
+                title=f"Post {i}",
+                content="Lorem ipsum " * 50,
+                content_type="blog_post",
+                author_id=f"author_{i % 10}",
+                status="draft" if i % 3 else "published",
+                content_metadata={},
+            )
+            for i in range(items)
+        )
+        session.commit()
+    engine.dispose()
+
+
+def build_app(
+    mode: str, sync_dsn: str, async_dsn: str, latency_ms: float = 0.0
+) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    if mode == "sync":
+        # Pool sized like db.get_engine()
+        engine = create_engine(sync_dsn, pool_size=10, max_overflow=20)
+        if latency_ms:
+
+            @event.listens_for(engine, "before_cursor_execute")
+            def _network(*args: Any) -> None:
+                time.sleep(latency_ms / 1000)
+
+        SessionLocal = sessionmaker(engine, expire_on_commit=False)
+
+        def get_db():
+            with SessionLocal() as db:
+                yield db
+
+        @app.get("/api/v1/content")
+        async def get_content_list(
+            page: int = 1, size: int = 20, db: Session = Depends(get_db)
+        ) -> PaginatedContentResponse:
+            query = db.query(ContentItem)
+            total = query.count()
+            items = (
+                query.order_by(ContentItem.created_at.desc())
+                .offset((page - 1) * size)
+                .limit(size)
+                .all()
+            )
+            return PaginatedContentResponse(
+                items=[ContentItemResponse.model_validate(i) for i in items],
+                total=total,
+                page=page,
+                size=size,
+                pages=(total + size - 1) // size,
+            )
+
+    else:
+        app.include_router(router)
+        engine = create_orchestrator_async_engine(async_dsn)
+        if latency_ms:
+
+            @event.listens_for(engine.sync_engine, "before_cursor_execute")
+            def _network(*args: Any) -> None:
+                await_only(asyncio.sleep(latency_ms / 1000))
+
+        factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def get_db():
+            async with factory() as session:
+                yield session
+
+        app.dependency_overrides[get_async_db_session] = get_db
+
+    return app
+
+
+async def run_load(
+    mode: str,
+    sync_dsn: str,
+    async_dsn: str,
+    requests: int,
+    concurrency: int,
+    latency_ms: float = 0.0,
+) -> Dict[str, Any]:
+    app = build_app(mode, sync_dsn, async_dsn, latency_ms)
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    probes: List[float] = []
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as cli:
+        # Warm up pools and statement caches
+        await cli.get("/api/v1/content")
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                res = await cli.get(f"/api/v1/content?page={i % 5 + 1}")
+                res.raise_for_status()
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        async def probe() -> None:
+            while not done.is_set():
+                start = time.perf_counter()
+                await cli.get("/ping")
+                probes.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.005)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(requests)])
+        wall = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    return {
+        "mode": mode,
+        "requests_per_s": requests / wall,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": _percentile(latencies, 0.95),
+        "ping_p95_ms": _percentile(probes, 0.95) if probes else 0.0,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    sync_dsn, async_dsn = args.sync_dsn, args.async_dsn
+    if not (sync_dsn and async_dsn):
+        path = Path(tempfile.mkdtemp()) / "orchestrator_load.db"
+        seed_sqlite(path, args.items)
+        sync_dsn = f"sqlite:///{path}"
+        async_dsn = f"sqlite+aiosqlite:///{path}"
+
+    print(f"{'mode':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'/ping p95 ms':>13}")
+    for mode in ("sync", "async"):
+        r = await run_load(
+            mode,
+            sync_dsn,
+            async_dsn,
+            args.requests,
+            args.concurrency,
+            args.latency_ms,
+        )
+        print(
+            f"{r['mode']:>6} {r['requests_per_s']:>8.1f} {r['p50_ms']:>8.1f} "
+            f"{r['p95_ms']:>8.1f} {r['ping_p95_ms']:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="orchestrator database load test")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--items", type=int, default=2000, help="SQLite seed rows")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="simulated DB round trip"
+    )
+    parser.add_argument("--sync-dsn", default=None)
+    parser.add_argument("--async-dsn", default=None)
+    asyncio.run(main(parser.parse_args()))
@@ -8,12 +8,12 @@ metrics back to the A/B testing system for continuous optimization.
 import asyncio
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import Float, and_, cast, func, or_, true
 
 from services.orchestrator.db import get_db_session
 from services.orchestrator.db.models import Post, VariantPerformance
@@ -62,6 +62,8 @@ class EngagementFeedbackLoop:
         self._batch_size = 50
         self._batch_timeout = 30  # seconds
         self._processing_task = None
+        # (updated_at, id) of the last post seen by sync_post_engagements
+        self._sync_watermark: Optional[Tuple[datetime, int]] = None
 
         # Engagement scoring weights
         self.engagement_weights = {
@@ -299,37 +301,51 @@ class EngagementFeedbackLoop:
         """
         Sync engagement data from posts to variant performance.
 
-        This method looks at recent posts and their engagement metrics,
-        then updates the corresponding variant performance data.
+        Only posts changed since the previous sync (by ``updated_at``, then
+        ``id``) are processed; ``hours_back`` bounds the first sync after
+        startup.
 
         Args:
-            hours_back: How many hours back to sync data
+            hours_back: How many hours back to sync data on the first run
 
         Returns:
             Number of posts processed
         """
         try:
             with record_latency("post_engagement_sync"):
-                # Find recent posts with engagement data
-                cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+                if self._sync_watermark is None:
+                    cutoff_time = datetime.now(timezone.utc) - timedelta(
+                        hours=hours_back
+                    )
+                    changed = Post.updated_at >= cutoff_time
+                else:
+                    last_updated, last_id = self._sync_watermark
+                    changed = or_(
+                        Post.updated_at > last_updated,
+                        and_(Post.updated_at == last_updated, Post.id > last_id),
+                    )
 
                 posts = (
                     self.db_session.query(Post)
                     .filter(
-                        and_(
-                            Post.ts >= cutoff_time,
-                            Post.engagement_rate.isnot(None),
-                            Post.engagement_rate > 0,
-                        )
+                        changed,
+                        Post.engagement_rate.isnot(None),
+                        Post.engagement_rate > 0,
                     )
+                    .order_by(Post.updated_at, Post.id)
                     .all()
                 )
+                if not posts:
+                    return 0
 
+                variant_index = self._load_variant_index()
                 synced_count = 0
 
                 for post in posts:
                     # Try to extract variant information from post metadata
-                    variant_id = await self._extract_variant_from_post(post)
+                    variant_id = await self._extract_variant_from_post(
+                        post, variant_index
+                    )
 
                     if variant_id:
                         # Convert engagement rate to engagement events
@@ -352,6 +368,8 @@ class EngagementFeedbackLoop:
 
                         synced_count += 1
 
+                self._sync_watermark = (posts[-1].updated_at, posts[-1].id)
+
                 logger.info(f"Synced engagement data from {synced_count} posts")
                 logger.info(f"Business metric: posts_synced={synced_count}")
 
@@ -361,86 +379,103 @@ class EngagementFeedbackLoop:
             logger.error(f"Error syncing post engagements: {e}")
             return 0
 
-    async def _extract_variant_from_post(self, post: Post) -> Optional[str]:
+    @staticmethod
+    def _classify_post(post: Post) -> Tuple[str, str, str]:
+        """Infer (hook_style, tone, length) from a post's text."""
+        hook = post.hook.lower() if post.hook else ""
+        body = post.body.lower() if post.body else ""
+
+        # Analyze hook style
+        if "?" in hook:
+            hook_style = "question"
+        elif any(word in hook for word in ["breaking", "urgent", "now"]):
+            hook_style = "urgent"
+        elif any(word in hook for word in ["story", "once", "remember"]):
+            hook_style = "story"
+        else:
+            hook_style = "statement"
+
+        # Analyze tone
+        if any(word in (hook + " " + body) for word in ["awesome", "amazing", "love"]):
+            tone = "engaging"
+        elif any(word in (hook + " " + body) for word in ["professional", "business"]):
+            tone = "professional"
+        else:
+            tone = "casual"
+
+        # Analyze length
+        total_length = len(hook) + len(body)
+        if total_length < 100:
+            length = "short"
+        elif total_length > 300:
+            length = "long"
+        else:
+            length = "medium"
+
+        return hook_style, tone, length
+
+    def _load_variant_index(self) -> Dict[Tuple[Optional[str], ...], Tuple[int, str]]:
+        """
+        Index variants by their (hook_style, tone, length) dimensions.
+
+        Keys are the full triple for exact matches, plus each pair of the
+        triple (with ``None`` in the unmatched slot) pointing at the first
+        variant sharing that pair, so a post resolves with a few dict
+        lookups instead of a query per post.
+        """
+        index: Dict[Tuple[Optional[str], ...], Tuple[int, str]] = {}
+        rows = (
+            self.db_session.query(
+                VariantPerformance.id,
+                VariantPerformance.variant_id,
+                VariantPerformance.dimensions,
+            )
+            .order_by(VariantPerformance.id)
+            .all()
+        )
+        for order, (_, variant_id, dims) in enumerate(rows):
+            if not dims or "hook_style" not in dims:
+                continue
+            triple = (dims.get("hook_style"), dims.get("tone"), dims.get("length"))
+            for key in _variant_keys(triple):
+                index.setdefault(key, (order, variant_id))
+        return index
+
+    async def _extract_variant_from_post(
+        self,
+        post: Post,
+        variant_index: Optional[
+            Dict[Tuple[Optional[str], ...], Tuple[int, str]]
+        ] = None,
+    ) -> Optional[str]:
         """
         Extract variant ID from post data.
 
         This is a heuristic method that tries to determine which variant
         was used to generate a specific post.
+
+        Args:
+            post: The post to match
+            variant_index: Index from ``_load_variant_index``; built on
+                demand when not supplied
         """
         try:
-            # For now, we'll use a simple heuristic based on post characteristics
-            # In a real implementation, this would be stored with the post
-
-            hook = post.hook.lower() if post.hook else ""
-            body = post.body.lower() if post.body else ""
-
-            # Analyze hook style
-            if "?" in hook:
-                hook_style = "question"
-            elif any(word in hook for word in ["breaking", "urgent", "now"]):
-                hook_style = "urgent"
-            elif any(word in hook for word in ["story", "once", "remember"]):
-                hook_style = "story"
-            else:
-                hook_style = "statement"
-
-            # Analyze tone
-            if any(
-                word in (hook + " " + body) for word in ["awesome", "amazing", "love"]
-            ):
-                tone = "engaging"
-            elif any(
-                word in (hook + " " + body) for word in ["professional", "business"]
-            ):
-                tone = "professional"
-            else:
-                tone = "casual"
-
-            # Analyze length
-            total_length = len(hook) + len(body)
-            if total_length < 100:
-                length = "short"
-            elif total_length > 300:
-                length = "long"
-            else:
-                length = "medium"
-
-            # Try to find a matching variant
-            variant = (
-                self.db_session.query(VariantPerformance)
-                .filter(
-                    VariantPerformance.dimensions.contains(
-                        {"hook_style": hook_style, "tone": tone, "length": length}
-                    )
-                )
-                .first()
-            )
+            if variant_index is None:
+                variant_index = self._load_variant_index()
 
-            if variant:
-                return variant.variant_id
+            triple = self._classify_post(post)
 
-            # Fallback: find any variant with similar characteristics
-            variants = (
-                self.db_session.query(VariantPerformance)
-                .filter(VariantPerformance.dimensions.has_key("hook_style"))
-                .all()
-            )
+            exact = variant_index.get(triple)
+            if exact:
+                return exact[1]
 
-            for variant in variants:
-                dims = variant.dimensions
-                score = 0
-                if dims.get("hook_style") == hook_style:
-                    score += 1
-                if dims.get("tone") == tone:
-                    score += 1
-                if dims.get("length") == length:
-                    score += 1
-
-                if score >= 2:  # At least 2 dimensions match
-                    return variant.variant_id
-
-            return None
+            # Fallback: first variant with at least 2 matching dimensions
+            matches = [
+                variant_index[key]
+                for key in _variant_keys(triple)[1:]
+                if key in variant_index
+            ]
+            return min(matches)[1] if matches else None
 
         except Exception as e:
             logger.error(f"Error extracting variant from post: {e}")
@@ -450,6 +485,9 @@ class EngagementFeedbackLoop:
         """
         Get engagement analytics for the feedback loop.
 
+        Totals, per-dimension stats and the top variants are each computed
+        by one grouped query, so only aggregate rows leave the database.
+
         Args:
             days_back: Number of days of data to analyze
 
@@ -458,58 +496,68 @@ class EngagementFeedbackLoop:
         """
         try:
             cutoff_time = datetime.now(timezone.utc) - timedelta(days=days_back)
-
-            # Get variant performance data
-            variants = (
-                self.db_session.query(VariantPerformance)
-                .filter(VariantPerformance.last_used >= cutoff_time)
-                .all()
+            in_window = VariantPerformance.last_used >= cutoff_time
+            success_rate = cast(VariantPerformance.successes, Float) / func.nullif(
+                VariantPerformance.impressions, 0
             )
 
-            # Calculate analytics
-            total_variants = len(variants)
-            active_variants = len([v for v in variants if v.impressions > 0])
-            total_impressions = sum(v.impressions for v in variants)
-            total_successes = sum(v.successes for v in variants)
-
-            # Calculate success rate distribution
-            success_rates = [v.success_rate for v in variants if v.impressions > 0]
-            avg_success_rate = (
-                sum(success_rates) / len(success_rates) if success_rates else 0
+            # Totals over the window
+            (
+                total_variants,
+                active_variants,
+                total_impressions,
+                total_successes,
+                avg_success_rate,
+            ) = (
+                self.db_session.query(
+                    func.count(VariantPerformance.id),
+                    func.count(success_rate),
+                    func.coalesce(func.sum(VariantPerformance.impressions), 0),
+                    func.coalesce(func.sum(VariantPerformance.successes), 0),
+                    func.coalesce(func.avg(success_rate), 0.0),
+                )
+                .filter(in_window)
+                .one()
             )
 
-            # Find top performing dimensions
-            dimension_performance = {}
-            for variant in variants:
-                if variant.impressions < 5:  # Skip variants with little data
-                    continue
-
-                for dim_name, dim_value in variant.dimensions.items():
-                    if dim_name not in dimension_performance:
-                        dimension_performance[dim_name] = {}
-
-                    if dim_value not in dimension_performance[dim_name]:
-                        dimension_performance[dim_name][dim_value] = {
-                            "total_impressions": 0,
-                            "total_successes": 0,
-                            "variants": 0,
-                        }
+            # Stats per (dimension, value), skipping variants with little data
+            dims = self._dimension_items()
+            dimension_rows = (
+                self.db_session.query(
+                    dims.c.key,
+                    dims.c.value,
+                    func.sum(VariantPerformance.impressions),
+                    func.sum(VariantPerformance.successes),
+                    func.count(VariantPerformance.id),
+                )
+                .select_from(VariantPerformance)
+                .join(dims, true())
+                .filter(in_window, VariantPerformance.impressions >= 5)
+                .group_by(dims.c.key, dims.c.value)
+                .all()
+            )
 
-                    stats = dimension_performance[dim_name][dim_value]
-                    stats["total_impressions"] += variant.impressions
-                    stats["total_successes"] += variant.successes
-                    stats["variants"] += 1
-
-            # Calculate success rates by dimension
-            for dim_name in dimension_performance:
-                for dim_value in dimension_performance[dim_name]:
-                    stats = dimension_performance[dim_name][dim_value]
-                    if stats["total_impressions"] > 0:
-                        stats["success_rate"] = (
-                            stats["total_successes"] / stats["total_impressions"]
-                        )
-                    else:
-                        stats["success_rate"] = 0.0
+            dimension_performance: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+            for dim_name, dim_value, impressions, successes, count in dimension_rows:
+                dimension_performance.setdefault(dim_name, {})[dim_value] = {
+                    "total_impressions": impressions,
+                    "total_successes": successes,
+                    "variants": count,
+                    "success_rate": successes / impressions if impressions else 0.0,
+                }
+
+            top_variants = (
+                self.db_session.query(
+                    VariantPerformance.variant_id,
+                    VariantPerformance.dimensions,
+                    VariantPerformance.impressions,
+                    VariantPerformance.successes,
+                )
+                .filter(in_window, VariantPerformance.impressions >= 10)
+                .order_by(success_rate.desc(), VariantPerformance.id)
+                .limit(10)
+                .all()
+            )
 
             analytics = {
                 "period_days": days_back,
@@ -520,22 +568,17 @@ class EngagementFeedbackLoop:
                 "overall_success_rate": total_successes / total_impressions
                 if total_impressions > 0
                 else 0,
-                "average_success_rate": avg_success_rate,
+                "average_success_rate": float(avg_success_rate),
                 "dimension_performance": dimension_performance,
-                "top_variants": sorted(
-                    [
-                        {
-                            "variant_id": v.variant_id,
-                            "dimensions": v.dimensions,
-                            "success_rate": v.success_rate,
-                            "impressions": v.impressions,
-                        }
-                        for v in variants
-                        if v.impressions >= 10
-                    ],
-                    key=lambda x: x["success_rate"],
-                    reverse=True,
-                )[:10],
+                "top_variants": [
+                    {
+                        "variant_id": variant_id,
+                        "dimensions": dimensions,
+                        "success_rate": successes / impressions,
+                        "impressions": impressions,
+                    }
+                    for variant_id, dimensions, impressions, successes in top_variants
+                ],
             }
 
             return analytics
@@ -544,6 +587,27 @@ class EngagementFeedbackLoop:
             logger.error(f"Error generating engagement analytics: {e}")
             return {"error": str(e)}
 
+    def _dimension_items(self):
+        """Table-valued (key, value) expansion of VariantPerformance.dimensions."""
+        if self.db_session.get_bind().dialect.name == "postgresql":
+            expand = func.json_each_text(VariantPerformance.dimensions)
+        else:
+            expand = func.json_each(VariantPerformance.dimensions)
+        return expand.table_valued("key", "value").alias("dims")
+
+
+def _variant_keys(
+    triple: Tuple[Optional[str], ...],
+) -> List[Tuple[Optional[str], ...]]:
+    """Exact key followed by the three two-dimension keys for a triple."""
+    hook_style, tone, length = triple
+    return [
+        (hook_style, tone, length),
+        (hook_style, tone, None),
+        (hook_style, None, length),
+        (None, tone, length),
+    ]
+
 
 # Global feedback loop instance
 _feedback_loop = None
@@ -47,7 +47,7 @@ except Exception as e:
 
 try:
     logger.info("🤖 Importing AI metrics...")
-    from services.common.ai_metrics import ai_metrics
+    from services.common.ai_metrics import ai_metrics, maybe_start_sketch_publisher
     from services.common.ai_safety import ai_security
     from services.common.alerts import ai_alerts
 except Exception as e:
@@ -101,6 +101,7 @@ except Exception as e:
     )  # Create anyway for decorators
 
 maybe_start_metrics_server()  # Prom-client HTTP at :9090
+maybe_start_sketch_publisher()  # AI latency sketches -> Redis
 
 # Initialize rate limiter for production stability
 rate_limiter = SimpleRateLimiter(
@@ -200,6 +201,14 @@ async def _init_qdrant() -> None:
     await loop.run_in_executor(None, _ensure_store)
 
 
+@app.on_event("shutdown")
+async def _close_async_db() -> None:
+    """Release pooled async database connections."""
+    from services.orchestrator.db.async_engine import dispose_async_engine
+
+    await dispose_async_engine()
+
+
 # ---------------------------------------------------------------------------
 # Pydantic models
 # ---------------------------------------------------------------------------
@@ -668,6 +677,20 @@ async def metrics_summary():
         record_http_request("GET", "/metrics/summary", status, duration)
 
 
+@app.get("/metrics/ai/cluster")
+def get_ai_metrics_cluster() -> dict[str, Any]:
+    """AI latency, token and cost metrics merged across every worker"""
+    import redis
+
+    client = redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379"))
+    try:
+        return ai_metrics.get_cluster_metrics(client)
+    except redis.RedisError as e:
+        raise HTTPException(status_code=503, detail=f"Redis unavailable: {e}")
+    finally:
+        client.close()
+
+
 @app.get("/metrics/ai")
 async def get_ai_metrics_detail():
     """Get detailed AI model performance metrics"""
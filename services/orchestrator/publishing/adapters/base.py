@@ -1,8 +1,12 @@
 """Base platform adapter interface and result structures."""
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
+
+import httpx
+
 from services.orchestrator.db.models import ContentItem
 
 
@@ -21,6 +25,11 @@ class PublishingResult:
 class PlatformAdapter(ABC):
     """Base interface for all platform adapters."""
 
+    # Publishes per minute allowed by the platform (None: unlimited)
+    rate_limit_per_minute: Optional[float] = None
+    # Longest a single publish may take before it counts as failed
+    timeout_seconds: float = 30.0
+
     def __init__(self, platform_name: str):
         self.platform_name = platform_name
 
@@ -43,3 +52,46 @@ class PlatformAdapter(ABC):
     def supports_retry(self) -> bool:
         """Whether this adapter supports retry operations."""
         pass
+
+    async def aclose(self) -> None:
+        """Release resources held by the adapter."""
+
+
+class HTTPPlatformAdapter(PlatformAdapter):
+    """Adapter that talks to its platform through one pooled HTTP client.
+
+    The client is created on first use and reused for every publish, so
+    connections (and TLS sessions) are kept alive between posts. A client
+    belongs to the event loop it was created on; a call from another loop
+    gets a fresh one.
+    """
+
+    max_connections: int = 10
+
+    def __init__(self, platform_name: str):
+        super().__init__(platform_name)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if (
+            self._client is None
+            or self._client_loop is not loop
+            or self._client.is_closed
+        ):
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
@@ -1,17 +1,19 @@
 """Dev.to platform adapter implementation."""
 
-import httpx
 from typing import Dict, Any, List
 from services.orchestrator.publishing.adapters.base import (
-    PlatformAdapter,
+    HTTPPlatformAdapter,
     PublishingResult,
 )
 from services.orchestrator.db.models import ContentItem
 
 
-class DevToAdapter(PlatformAdapter):
+class DevToAdapter(HTTPPlatformAdapter):
     """Platform adapter for publishing to Dev.to."""
 
+    # Dev.to throttles article creation per API key
+    rate_limit_per_minute = 20
+
     def __init__(self):
         super().__init__("dev.to")
         self.api_base_url = "https://dev.to/api"
@@ -57,21 +59,20 @@ class DevToAdapter(PlatformAdapter):
             }
 
             # Make API request
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_base_url}/articles", json=payload, headers=headers
-                )
-                response.raise_for_status()
+            response = await self._get_client().post(
+                f"{self.api_base_url}/articles", json=payload, headers=headers
+            )
+            response.raise_for_status()
 
-                result_data = response.json()
+            result_data = response.json()
 
-                return PublishingResult(
-                    success=True,
-                    platform=self.platform_name,
-                    external_id=str(result_data.get("id")),
-                    url=result_data.get("url"),
-                    metadata={"published_at": result_data.get("published_at")},
-                )
+            return PublishingResult(
+                success=True,
+                platform=self.platform_name,
+                external_id=str(result_data.get("id")),
+                url=result_data.get("url"),
+                metadata={"published_at": result_data.get("published_at")},
+            )
 
         except Exception as e:
             return PublishingResult(
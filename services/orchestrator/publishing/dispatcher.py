@@ -0,0 +1,251 @@
+"""Claim-based dispatcher for due content schedules.
+
+Each run claims due ``ContentSchedule`` rows in bounded batches and hands
+them to workers. A claim is one statement that moves rows from
+``scheduled`` to ``publishing``:
+
+    UPDATE content_schedules SET status = 'publishing'
+    WHERE status = 'scheduled' AND id IN (
+        SELECT id ... ORDER BY scheduled_time LIMIT n FOR UPDATE SKIP LOCKED
+    ) RETURNING id, scheduled_time
+
+so overlapping beat runs and dispatcher replicas never claim the same row.
+Rows in ``publishing`` count against a per-platform concurrency cap; on
+Postgres a transaction-scoped advisory lock per platform keeps replicas
+from overshooting that cap together. Claims whose worker vanished are
+returned to ``scheduled`` after ``claim_timeout``.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from services.common.metrics import record_publish_dispatch
+from services.orchestrator.db.models import ContentSchedule
+
+logger = logging.getLogger(__name__)
+
+SCHEDULED = "scheduled"
+PUBLISHING = "publishing"
+
+DEFAULT_BATCH_SIZE = int(os.getenv("PUBLISH_DISPATCH_BATCH_SIZE", "100"))
+DEFAULT_MAX_BATCHES = int(os.getenv("PUBLISH_DISPATCH_MAX_BATCHES", "20"))
+DEFAULT_PLATFORM_CONCURRENCY = int(os.getenv("PUBLISH_DEFAULT_CONCURRENCY", "20"))
+DEFAULT_CLAIM_TIMEOUT = float(os.getenv("PUBLISH_CLAIM_TIMEOUT", "900"))
+
+
+def parse_platform_caps(spec: str) -> Dict[str, int]:
+    """Parse ``"linkedin=2,dev.to=5"`` into ``{"linkedin": 2, "dev.to": 5}``."""
+    caps = {}
+    for item in spec.split(","):
+        if "=" in item:
+            platform, cap = item.split("=", 1)
+            caps[platform.strip()] = int(cap)
+    return caps
+
+
+class DueContentDispatcher:
+    """Claims due schedules and enqueues them for publishing."""
+
+    def __init__(
+        self,
+        enqueue: Callable[[Sequence[int]], None],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batches: int = DEFAULT_MAX_BATCHES,
+        platform_caps: Optional[Dict[str, int]] = None,
+        default_cap: int = DEFAULT_PLATFORM_CONCURRENCY,
+        claim_timeout: float = DEFAULT_CLAIM_TIMEOUT,
+    ):
+        """
+        Args:
+            enqueue: Sends a batch of schedule ids to workers in one call
+            batch_size: Most rows claimed per platform per round
+            max_batches: Most rounds per run, bounding one run's work
+            platform_caps: In-flight (``publishing``) limit per platform;
+                defaults to ``PUBLISH_PLATFORM_CONCURRENCY``
+            default_cap: Limit for platforms without an explicit cap
+            claim_timeout: Seconds before an unfinished claim is released
+        """
+        self.enqueue = enqueue
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.platform_caps = (
+            platform_caps
+            if platform_caps is not None
+            else parse_platform_caps(os.getenv("PUBLISH_PLATFORM_CONCURRENCY", ""))
+        )
+        self.default_cap = default_cap
+        self.claim_timeout = claim_timeout
+
+    def dispatch(self, db: Session, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Claim and enqueue due schedules until none are left or caps are hit.
+
+        Args:
+            db: Database session
+            now: Dispatch time (defaults to the current UTC time)
+
+        Returns:
+            Counts of released, claimed and enqueued schedules per platform
+        """
+        now = now or datetime.now(timezone.utc)
+        released = self.release_stale_claims(db, now)
+        per_platform: Dict[str, int] = {}
+
+        for _ in range(self.max_batches):
+            claimed_this_round = 0
+            for platform in self._due_platforms(db, now):
+                ids = self._claim_and_enqueue(db, platform, now)
+                if ids:
+                    per_platform[platform] = per_platform.get(platform, 0) + len(ids)
+                    claimed_this_round += len(ids)
+            if not claimed_this_round:
+                break
+
+        total = sum(per_platform.values())
+        if total:
+            logger.info(f"Dispatched {total} due schedules: {per_platform}")
+        return {
+            "processed_count": total,
+            "scheduled_count": total,
+            "released_count": released,
+            "per_platform": per_platform,
+            "timestamp": now.isoformat(),
+        }
+
+    def _due_platforms(self, db: Session, now: datetime) -> List[str]:
+        return list(
+            db.scalars(
+                select(ContentSchedule.platform)
+                .where(
+                    ContentSchedule.status == SCHEDULED,
+                    ContentSchedule.scheduled_time <= now,
+                )
+                .group_by(ContentSchedule.platform)
+            )
+        )
+
+    def _claim_and_enqueue(
+        self, db: Session, platform: str, now: datetime
+    ) -> List[int]:
+        """Claim one batch for ``platform`` and hand it to workers."""
+        claimed = self._claim(db, platform, now)
+        if not claimed:
+            return []
+
+        ids = [schedule_id for schedule_id, _ in claimed]
+        try:
+            self.enqueue(ids)
+        except Exception as e:
+            logger.error(f"Failed to enqueue {len(ids)} {platform} schedules: {e}")
+            self._release(db, ids)
+            return []
+
+        record_publish_dispatch(
+            platform, [_lag(now, scheduled_time) for _, scheduled_time in claimed]
+        )
+        return ids
+
+    def _claim(
+        self, db: Session, platform: str, now: datetime
+    ) -> List[Tuple[int, datetime]]:
+        """Atomically move up to one batch of due rows to ``publishing``."""
+        try:
+            if not self._lock_platform(db, platform):
+                # Another replica is dispatching this platform
+                db.rollback()
+                return []
+
+            in_flight = db.scalar(
+                select(func.count(ContentSchedule.id)).where(
+                    ContentSchedule.platform == platform,
+                    ContentSchedule.status == PUBLISHING,
+                )
+            )
+            limit = min(
+                self.batch_size,
+                self.platform_caps.get(platform, self.default_cap) - in_flight,
+            )
+            if limit <= 0:
+                db.rollback()
+                return []
+
+            due = (
+                select(ContentSchedule.id)
+                .where(
+                    ContentSchedule.platform == platform,
+                    ContentSchedule.status == SCHEDULED,
+                    ContentSchedule.scheduled_time <= now,
+                )
+                .order_by(ContentSchedule.scheduled_time)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+            claimed = db.execute(
+                update(ContentSchedule)
+                .where(
+                    ContentSchedule.id.in_(due.scalar_subquery()),
+                    ContentSchedule.status == SCHEDULED,
+                )
+                .values(status=PUBLISHING, updated_at=now)
+                .returning(ContentSchedule.id, ContentSchedule.scheduled_time)
+                .execution_options(synchronize_session=False)
+            ).all()
+            db.commit()
+            # RETURNING order is unspecified; enqueue oldest first
+            return sorted((tuple(row) for row in claimed), key=lambda row: row[1])
+        except Exception:
+            db.rollback()
+            raise
+
+    def _lock_platform(self, db: Session, platform: str) -> bool:
+        """Take the platform's dispatch lock for this transaction (Postgres)."""
+        if db.get_bind().dialect.name != "postgresql":
+            return True
+        return bool(
+            db.scalar(
+                select(
+                    func.pg_try_advisory_xact_lock(
+                        func.hashtext(f"publish_dispatch:{platform}")
+                    )
+                )
+            )
+        )
+
+    def _release(self, db: Session, ids: Sequence[int]) -> None:
+        """Return claimed rows to ``scheduled``."""
+        db.execute(
+            update(ContentSchedule)
+            .where(ContentSchedule.id.in_(ids), ContentSchedule.status == PUBLISHING)
+            .values(status=SCHEDULED)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+    def release_stale_claims(self, db: Session, now: datetime) -> int:
+        """Return claims older than ``claim_timeout`` to ``scheduled``."""
+        result = db.execute(
+            update(ContentSchedule)
+            .where(
+                ContentSchedule.status == PUBLISHING,
+                ContentSchedule.updated_at
+                < now - timedelta(seconds=self.claim_timeout),
+            )
+            .values(status=SCHEDULED, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount:
+            logger.warning(f"Released {result.rowcount} stale publishing claims")
+        return result.rowcount
+
+
+def _lag(now: datetime, scheduled_time: datetime) -> float:
+    """Seconds between ``scheduled_time`` (naive means UTC) and ``now``."""
+    if scheduled_time.tzinfo is None:
+        scheduled_time = scheduled_time.replace(tzinfo=timezone.utc)
+    return max((now - scheduled_time).total_seconds(), 0.0)
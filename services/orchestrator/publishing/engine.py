@@ -1,18 +1,69 @@
 """Core Publishing Engine for multi-platform content distribution."""
 
-from typing import Dict
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.common.distributed_rate_limiter import DistributedRateLimiter, GCRALimit
+from services.common.metrics import record_publish_latency
 from services.orchestrator.publishing.adapters.base import (
     PlatformAdapter,
     PublishingResult,
 )
 from services.orchestrator.db.models import ContentItem
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MultiPlatformResult:
+    """Outcome of publishing one content item to several platforms."""
+
+    results: Dict[str, PublishingResult] = field(default_factory=dict)
+    attempts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [p for p, r in self.results.items() if r.success]
+
+    @property
+    def failed(self) -> List[str]:
+        return [p for p, r in self.results.items() if not r.success]
+
+    @property
+    def all_succeeded(self) -> bool:
+        return bool(self.results) and not self.failed
+
+    @property
+    def partial(self) -> bool:
+        """Some platforms succeeded and some failed."""
+        return bool(self.succeeded) and bool(self.failed)
+
 
 class PublishingEngine:
     """Main engine for publishing content across multiple platforms."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        rate_limits: Optional[Dict[str, GCRALimit]] = None,
+        max_attempts: int = 2,
+        retry_backoff: float = 1.0,
+    ):
+        """
+        Args:
+            rate_limits: Per-platform publish quotas overriding the adapters'
+                ``rate_limit_per_minute``; quotas are shared across replicas
+            max_attempts: Attempts per platform in ``publish_to_platforms``
+                for adapters that support retry
+            retry_backoff: Seconds before the first retry, doubled after each
+        """
         self.adapters: Dict[str, PlatformAdapter] = {}
+        self.rate_limits = rate_limits or {}
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._limiters: Dict[str, Optional[DistributedRateLimiter]] = {}
         self._register_default_adapters()
 
     def _register_default_adapters(self):
@@ -36,14 +87,107 @@ class PublishingEngine:
     ) -> PublishingResult:
         """Publish content to a specific platform."""
         adapter = self._get_adapter(platform)
+        start = time.perf_counter()
+        outcome = "failure"
+
+        limiter = self._get_limiter(platform, adapter)
+
+        async def acquire_and_publish() -> PublishingResult:
+            if limiter is not None:
+                await limiter.acquire()
+            return await adapter.publish(content_item, platform_config)
 
         try:
-            result = await adapter.publish(content_item, platform_config)
+            # The timeout covers waiting for the platform's rate limit too
+            result = await asyncio.wait_for(
+                acquire_and_publish(), timeout=adapter.timeout_seconds
+            )
+            if result.success:
+                outcome = "success"
             return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            return PublishingResult(
+                success=False,
+                platform=platform,
+                error_message=f"Timed out after {adapter.timeout_seconds}s",
+            )
         except Exception as e:
             return PublishingResult(
                 success=False, platform=platform, error_message=str(e)
             )
+        finally:
+            record_publish_latency(platform, outcome, time.perf_counter() - start)
+
+    async def publish_to_platforms(
+        self,
+        content_item: ContentItem,
+        platform_configs: Dict[str, Dict[str, Any]],
+    ) -> MultiPlatformResult:
+        """
+        Publish content to several platforms concurrently.
+
+        Each platform is rate limited and timed out on its own, and failures
+        on adapters that support retry are retried with backoff, so one slow
+        or failing platform does not hold up or fail the others.
+
+        Args:
+            content_item: Content to publish
+            platform_configs: Platform config keyed by platform name
+
+        Returns:
+            Per-platform results and attempt counts
+        """
+        platforms = list(platform_configs)
+        outcomes = await asyncio.gather(
+            *(
+                self._publish_with_retry(content_item, p, platform_configs[p])
+                for p in platforms
+            )
+        )
+
+        aggregate = MultiPlatformResult()
+        for platform, (result, attempts) in zip(platforms, outcomes):
+            aggregate.results[platform] = result
+            aggregate.attempts[platform] = attempts
+        if aggregate.failed:
+            logger.warning(
+                f"Content {content_item.id} failed on {aggregate.failed}, "
+                f"published to {aggregate.succeeded}"
+            )
+        return aggregate
+
+    async def _publish_with_retry(
+        self, content_item: ContentItem, platform: str, platform_config: Dict[str, Any]
+    ) -> Tuple[PublishingResult, int]:
+        adapter = self._get_adapter(platform)
+        attempts = self.max_attempts if adapter.supports_retry() else 1
+        delay = self.retry_backoff
+
+        for attempt in range(1, attempts + 1):
+            result = await self.publish_to_platform(
+                content_item, platform, platform_config
+            )
+            if result.success or attempt == attempts:
+                return result, attempt
+            await asyncio.sleep(delay)
+            delay *= 2
+        return result, attempts
+
+    def _get_limiter(
+        self, platform: str, adapter: PlatformAdapter
+    ) -> Optional[DistributedRateLimiter]:
+        """Shared publish quota for ``platform``, or None when unlimited."""
+        if platform not in self._limiters:
+            limit = self.rate_limits.get(platform)
+            if limit is None and adapter.rate_limit_per_minute:
+                limit = GCRALimit(rate=adapter.rate_limit_per_minute, period=60.0)
+            self._limiters[platform] = (
+                DistributedRateLimiter(f"publish:{platform}", limit)
+                if limit is not None
+                else None
+            )
+        return self._limiters[platform]
 
     def _get_adapter(self, platform: str) -> PlatformAdapter:
         """Get the adapter for a specific platform."""
@@ -54,3 +198,7 @@ class PublishingEngine:
             self.adapters[platform] = MockAdapter(platform)
 
         return self.adapters[platform]
+
+    async def aclose(self) -> None:
+        """Close the adapters' pooled connections."""
+        await asyncio.gather(*(adapter.aclose() for adapter in self.adapters.values()))
@@ -5,16 +5,22 @@ across multiple platforms with retry logic, error handling, and status tracking.
 """
 
 import asyncio
+import threading
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Sequence
 from contextlib import contextmanager
 
-from celery import shared_task
+from celery import group, shared_task
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
 
 from services.orchestrator.db.models import ContentSchedule
+from services.orchestrator.publishing.dispatcher import DueContentDispatcher
 from services.orchestrator.publishing.engine import PublishingEngine
+from services.orchestrator.publishing.adapters.base import PublishingResult
+
+# Event loop and engine reused by every task a worker thread runs, so the
+# adapters' pooled HTTP connections and rate limiters outlive a single task
+_worker = threading.local()
 
 
 @contextmanager
@@ -31,6 +37,31 @@ def get_db_session():
         session.close()
 
 
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_worker, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = _worker.loop = asyncio.new_event_loop()
+    return loop
+
+
+def _get_engine() -> PublishingEngine:
+    engine = getattr(_worker, "engine", None)
+    if engine is None:
+        engine = _worker.engine = PublishingEngine()
+    return engine
+
+
+def _publish_schedule(schedule: ContentSchedule) -> PublishingResult:
+    """Publish a schedule's content on this worker's long-lived engine."""
+    return _get_worker_loop().run_until_complete(
+        _get_engine().publish_to_platform(
+            content_item=schedule.content_item,
+            platform=schedule.platform,
+            platform_config=schedule.platform_config or {},
+        )
+    )
+
+
 @shared_task(name="orchestrator.publish_content")
 def publish_content_task(schedule_id: int) -> Dict[str, Any]:
     """Publish content for a specific schedule."""
@@ -51,18 +82,9 @@ def publish_content_task(schedule_id: int) -> Dict[str, Any]:
                 "platform": schedule.platform,
             }
 
-        # Initialize publishing engine
-        engine = PublishingEngine()
-
         try:
             # Publish content
-            result = asyncio.run(
-                engine.publish_to_platform(
-                    content_item=schedule.content_item,
-                    platform=schedule.platform,
-                    platform_config=schedule.platform_config or {},
-                )
-            )
+            result = _publish_schedule(schedule)
 
             if result.success:
                 # Update schedule with success
@@ -87,35 +109,16 @@ def publish_content_task(schedule_id: int) -> Dict[str, Any]:
             return _handle_publishing_failure(db, schedule, str(e))
 
 
+def enqueue_publish_tasks(schedule_ids: Sequence[int]) -> None:
+    """Send one publish task per schedule as a single Celery group."""
+    group(publish_content_task.s(schedule_id=i) for i in schedule_ids).apply_async()
+
+
 @shared_task(name="orchestrator.publish_scheduled_content")
 def publish_scheduled_content_task() -> Dict[str, Any]:
-    """Find and publish all due scheduled content."""
+    """Claim due scheduled content in batches and enqueue it for publishing."""
     with get_db_session() as db:
-        # Find schedules that are due for publishing
-        now = datetime.now(timezone.utc)
-
-        due_schedules = (
-            db.query(ContentSchedule)
-            .filter(
-                and_(
-                    ContentSchedule.scheduled_time <= now,
-                    ContentSchedule.status == "scheduled",
-                )
-            )
-            .all()
-        )
-
-        scheduled_count = 0
-        for schedule in due_schedules:
-            # Schedule individual publishing task
-            publish_content_task.delay(schedule_id=schedule.id)
-            scheduled_count += 1
-
-        return {
-            "processed_count": len(due_schedules),
-            "scheduled_count": scheduled_count,
-            "timestamp": now.isoformat(),
-        }
+        return DueContentDispatcher(enqueue=enqueue_publish_tasks).dispatch(db)
 
 
 @shared_task(name="orchestrator.retry_failed_publication")
@@ -154,18 +157,9 @@ def retry_failed_publication_task(schedule_id: int) -> Dict[str, Any]:
                 "retry_attempt": schedule.retry_count,
             }
 
-        # Initialize publishing engine
-        engine = PublishingEngine()
-
         try:
             # Attempt retry
-            result = asyncio.run(
-                engine.publish_to_platform(
-                    content_item=schedule.content_item,
-                    platform=schedule.platform,
-                    platform_config=schedule.platform_config or {},
-                )
-            )
+            result = _publish_schedule(schedule)
 
             if result.success:
                 # Update schedule with success
@@ -45,12 +45,22 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, select
 
 try:
     from .db.models import ContentItem, ContentSchedule
     from .db import get_db_session
+    from .db.async_engine import get_async_db_session
+    from .db.content_search import (
+        InvalidCursor,
+        after_cursor,
+        count_content,
+        encode_cursor,
+        search_filter,
+        search_rank,
+    )
 
     DB_AVAILABLE = True
 except (ImportError, Exception) as e:
@@ -66,6 +76,9 @@ except (ImportError, Exception) as e:
     def get_db_session():
         yield None
 
+    async def get_async_db_session():
+        yield None
+
     DB_AVAILABLE = False
 from .scheduling_schemas import (
     ContentItemCreate,
@@ -211,7 +224,7 @@ def check_db_available():
 @router.post(
     "/content", response_model=ContentItemResponse, status_code=status.HTTP_201_CREATED
 )
-async def create_content_item(
+def create_content_item(
     content_data: ContentItemCreate, db: Session = Depends(get_db_session)
 ) -> ContentItemResponse:
     """
@@ -266,7 +279,7 @@ async def create_content_item(
 
 @router.post("/content/{content_id}/quality-check")
 async def check_content_quality(
-    content_id: int, db: Session = Depends(get_db_session)
+    content_id: int, db: AsyncSession = Depends(get_async_db_session)
 ) -> dict:
     """
     Check content quality using viral engine integration.
@@ -277,7 +290,7 @@ async def check_content_quality(
     """
     try:
         # Get content item
-        content = db.query(ContentItem).filter(ContentItem.id == content_id).first()
+        content = await db.get(ContentItem, content_id)
 
         if not content:
             raise HTTPException(
@@ -315,7 +328,10 @@ async def get_content_list(
     search: Optional[str] = Query(None),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db_session),
+    cursor: Optional[str] = Query(None),
+    order: str = Query("recent", pattern="^(recent|relevance)$"),
+    count: str = Query("exact", pattern="^(exact|estimated)$"),
+    db: AsyncSession = Depends(get_async_db_session),
 ) -> PaginatedContentResponse:
     """
     Get paginated list of content items with filtering support.
@@ -323,44 +339,56 @@ async def get_content_list(
     - **status**: Filter by content status
     - **author_id**: Filter by author
     - **content_type**: Filter by content type
-    - **search**: Search in title and content
-    - **page**: Page number (starts from 1)
+    - **search**: Full-text search in title and content
+    - **page**: Page number (starts from 1); ignored when **cursor** is set
     - **size**: Items per page (max 100)
+    - **cursor**: ``next_cursor`` of the previous page (keyset pagination)
+    - **order**: ``recent`` (newest first) or ``relevance`` (search rank,
+      page-numbered only)
+    - **count**: ``exact`` or ``estimated`` (planner statistics) total
     """
     try:
-        # Build query with filters
-        query = db.query(ContentItem)
+        dialect = (await db.connection()).dialect.name
+        # Build filters
+        filters = []
 
         if status_filter:
-            query = query.filter(ContentItem.status == status_filter)
+            filters.append(ContentItem.status == status_filter)
 
         if author_id:
-            query = query.filter(ContentItem.author_id == author_id)
+            filters.append(ContentItem.author_id == author_id)
 
         if content_type:
-            query = query.filter(ContentItem.content_type == content_type)
+            filters.append(ContentItem.content_type == content_type)
 
         if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                or_(
-                    ContentItem.title.ilike(search_filter),
-                    ContentItem.content.ilike(search_filter),
-                )
-            )
-
-        # Get total count
-        total = query.count()
+            filters.append(search_filter(search, dialect))
 
-        # Apply pagination
-        offset = (page - 1) * size
-        items = (
-            query.order_by(ContentItem.created_at.desc())
-            .offset(offset)
-            .limit(size)
-            .all()
+        total, total_is_estimate = await count_content(
+            db, filters, estimate=count == "estimated"
         )
 
+        query = select(ContentItem).where(*filters)
+        ranked = order == "relevance" and bool(search) and dialect == "postgresql"
+        if ranked:
+            query = query.order_by(search_rank(search).desc(), ContentItem.id.desc())
+        else:
+            query = query.order_by(ContentItem.created_at.desc(), ContentItem.id.desc())
+
+        if cursor and not ranked:
+            # Keyset pagination: seek past the previous page's last row
+            query = query.where(after_cursor(cursor))
+        else:
+            query = query.offset((page - 1) * size)
+
+        # One extra row tells whether another page follows
+        items = (await db.scalars(query.limit(size + 1))).all()
+        next_cursor = None
+        if len(items) > size:
+            items = items[:size]
+            if not ranked:
+                next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
         # Calculate pages
         pages = (total + size - 1) // size  # Ceiling division
 
@@ -370,8 +398,12 @@ async def get_content_list(
             page=page,
             size=size,
             pages=pages,
+            next_cursor=next_cursor,
+            total_is_estimate=total_is_estimate,
         )
 
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -381,7 +413,7 @@ async def get_content_list(
 
 @router.get("/content/{content_id}", response_model=ContentItemResponse)
 async def get_content_item(
-    content_id: int, db: Session = Depends(get_db_session)
+    content_id: int, db: AsyncSession = Depends(get_async_db_session)
 ) -> ContentItemResponse:
     """
     Get a specific content item by ID.
@@ -389,7 +421,7 @@ async def get_content_item(
     - **content_id**: ID of the content item to retrieve
     """
     try:
-        content = db.query(ContentItem).filter(ContentItem.id == content_id).first()
+        content = await db.get(ContentItem, content_id)
 
         if not content:
             raise HTTPException(
@@ -408,7 +440,7 @@ async def get_content_item(
 
 
 @router.put("/content/{content_id}", response_model=ContentItemResponse)
-async def update_content_item(
+def update_content_item(
     content_id: int,
     update_data: ContentItemUpdate,
     db: Session = Depends(get_db_session),
@@ -457,9 +489,7 @@ async def update_content_item(
 
 
 @router.delete("/content/{content_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_content_item(
-    content_id: int, db: Session = Depends(get_db_session)
-) -> None:
+def delete_content_item(content_id: int, db: Session = Depends(get_db_session)) -> None:
     """
     Delete a content item and all its associated schedules.
 
@@ -493,7 +523,7 @@ async def delete_content_item(
     response_model=ContentScheduleResponse,
     status_code=status.HTTP_201_CREATED,
 )
-async def create_schedule(
+def create_schedule(
     schedule_data: ContentScheduleCreate, db: Session = Depends(get_db_session)
 ) -> ContentScheduleResponse:
     """
@@ -548,7 +578,7 @@ async def get_schedules_calendar(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     platform: Optional[str] = Query(None),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
 ) -> CalendarViewResponse:
     """
     Get calendar view of schedules.
@@ -573,7 +603,7 @@ async def get_schedules_calendar(
         ) + timedelta(days=1)
 
         # Build query
-        query = db.query(ContentSchedule).filter(
+        query = select(ContentSchedule).where(
             and_(
                 ContentSchedule.scheduled_time >= start_dt,
                 ContentSchedule.scheduled_time < end_dt,
@@ -581,9 +611,11 @@ async def get_schedules_calendar(
         )
 
         if platform:
-            query = query.filter(ContentSchedule.platform == platform)
+            query = query.where(ContentSchedule.platform == platform)
 
-        schedules = query.order_by(ContentSchedule.scheduled_time).all()
+        schedules = (
+            await db.scalars(query.order_by(ContentSchedule.scheduled_time))
+        ).all()
 
         # Group by date
         grouped_by_date = {}
@@ -609,7 +641,7 @@ async def get_schedules_calendar(
 
 
 @router.put("/schedules/{schedule_id}", response_model=ContentScheduleResponse)
-async def update_schedule(
+def update_schedule(
     schedule_id: int,
     update_data: ContentScheduleUpdate,
     db: Session = Depends(get_db_session),
@@ -656,9 +688,7 @@ async def update_schedule(
 
 
 @router.delete("/schedules/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_schedule(
-    schedule_id: int, db: Session = Depends(get_db_session)
-) -> None:
+def delete_schedule(schedule_id: int, db: Session = Depends(get_db_session)) -> None:
     """
     Cancel/delete a schedule.
 
@@ -690,7 +720,7 @@ async def delete_schedule(
 # Real-time Status Endpoints
 @router.get("/content/{content_id}/status", response_model=ContentStatusResponse)
 async def get_content_status(
-    content_id: int, db: Session = Depends(get_db_session)
+    content_id: int, db: AsyncSession = Depends(get_async_db_session)
 ) -> ContentStatusResponse:
     """
     Get publishing status for a specific content item.
@@ -698,7 +728,7 @@ async def get_content_status(
     - **content_id**: ID of the content item
     """
     try:
-        content = db.query(ContentItem).filter(ContentItem.id == content_id).first()
+        content = await db.get(ContentItem, content_id)
 
         if not content:
             raise HTTPException(
@@ -707,10 +737,12 @@ async def get_content_status(
 
         # Get associated schedules
         schedules = (
-            db.query(ContentSchedule)
-            .filter(ContentSchedule.content_item_id == content_id)
-            .all()
-        )
+            await db.scalars(
+                select(ContentSchedule).where(
+                    ContentSchedule.content_item_id == content_id
+                )
+            )
+        ).all()
 
         # Calculate publishing progress
         total_platforms = len(schedules)
@@ -744,7 +776,7 @@ async def get_content_status(
 async def get_upcoming_schedules(
     limit: int = Query(50, ge=1, le=200),
     platform: Optional[str] = Query(None),
-    db: Session = Depends(get_db_session),
+    db: AsyncSession = Depends(get_async_db_session),
 ) -> UpcomingSchedulesResponse:
     """
     Get upcoming scheduled content.
@@ -754,44 +786,36 @@ async def get_upcoming_schedules(
     """
     try:
         now = datetime.now(timezone.utc)
+        upcoming = and_(
+            ContentSchedule.scheduled_time > now,
+            ContentSchedule.status == "scheduled",
+        )
 
         # Build query for upcoming schedules
-        query = db.query(ContentSchedule).filter(
-            and_(
-                ContentSchedule.scheduled_time > now,
-                ContentSchedule.status == "scheduled",
-            )
-        )
+        query = select(ContentSchedule).where(upcoming)
 
         if platform:
-            query = query.filter(ContentSchedule.platform == platform)
-
-        schedules = query.order_by(ContentSchedule.scheduled_time).limit(limit).all()
-
-        # Count schedules in different time windows
-        next_24_hours = (
-            db.query(ContentSchedule)
-            .filter(
-                and_(
-                    ContentSchedule.scheduled_time > now,
-                    ContentSchedule.scheduled_time <= now + timedelta(hours=24),
-                    ContentSchedule.status == "scheduled",
-                )
-            )
-            .count()
-        )
+            query = query.where(ContentSchedule.platform == platform)
 
-        next_week = (
-            db.query(ContentSchedule)
-            .filter(
-                and_(
-                    ContentSchedule.scheduled_time > now,
-                    ContentSchedule.scheduled_time <= now + timedelta(days=7),
-                    ContentSchedule.status == "scheduled",
-                )
+        schedules = (
+            await db.scalars(
+                query.order_by(ContentSchedule.scheduled_time).limit(limit)
             )
-            .count()
-        )
+        ).all()
+
+        # Count schedules in both time windows with one query
+        next_24_hours, next_week = (
+            await db.execute(
+                select(
+                    func.count().filter(
+                        ContentSchedule.scheduled_time <= now + timedelta(hours=24)
+                    ),
+                    func.count().filter(
+                        ContentSchedule.scheduled_time <= now + timedelta(days=7)
+                    ),
+                ).where(upcoming)
+            )
+        ).one()
 
         return UpcomingSchedulesResponse(
             schedules=[ContentScheduleResponse.model_validate(s) for s in schedules],
@@ -931,7 +955,7 @@ async def create_achievement_based_content(
 
 
 @router.get("/content/{content_id}/achievements")
-async def get_content_achievements(
+def get_content_achievements(
     content_id: int, db: Session = Depends(get_db_session)
 ) -> dict:
     """
@@ -992,7 +1016,7 @@ async def get_content_achievements(
     response_model=dict,
     status_code=status.HTTP_201_CREATED,
 )
-async def schedule_achievement_digest(
+def schedule_achievement_digest(
     request_data: dict, db: Session = Depends(get_db_session)
 ) -> dict:
     """
@@ -241,6 +241,12 @@ class PaginatedContentResponse(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = Field(
+        default=None, description="Pass as ``cursor`` to fetch the next page"
+    )
+    total_is_estimate: bool = Field(
+        default=False, description="Total comes from planner statistics"
+    )
 
 
 class UpcomingSchedulesResponse(BaseModel):
@@ -106,3 +106,13 @@ def sample_platform_configs():
             "subtitle": "Insights from the AI development trenches",
         },
     }
+
+
+@pytest.fixture
+def reset_publishing_worker():
+    """Give each test a fresh per-thread publishing engine."""
+    from services.orchestrator.publishing import tasks
+
+    tasks._worker.__dict__.pop("engine", None)
+    yield
+    tasks._worker.__dict__.pop("engine", None)
@@ -0,0 +1,60 @@
+"""Tests for the shared async database engine."""
+
+import logging
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import text
+
+from services.orchestrator.db import async_engine
+from services.orchestrator.db.async_engine import (
+    _statement_labels,
+    create_orchestrator_async_engine,
+)
+
+
+def test_statement_labels():
+    assert _statement_labels('SELECT * FROM "content_items" WHERE id = 1') == (
+        "select",
+        "content_items",
+    )
+    assert _statement_labels("INSERT INTO content_schedules (id) VALUES (1)") == (
+        "insert",
+        "content_schedules",
+    )
+    assert _statement_labels("SELECT 1") == ("select", "unknown")
+
+
+@pytest.mark.asyncio
+async def test_queries_recorded_and_slow_queries_logged(caplog):
+    engine = create_orchestrator_async_engine("sqlite+aiosqlite://")
+    with (
+        patch.object(async_engine, "record_database_query") as record,
+        patch.object(async_engine, "SLOW_QUERY_MS", 0),
+        caplog.at_level(logging.WARNING, logger=async_engine.__name__),
+    ):
+        async with engine.connect() as conn:
+            await conn.execute(text("CREATE TABLE posts (id INTEGER)"))
+            await conn.execute(text("SELECT id FROM posts"))
+    await engine.dispose()
+
+    operations = [call.args[:2] for call in record.call_args_list]
+    assert ("select", "posts") in operations
+    assert "Slow query" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_session_dependency_uses_shared_engine(monkeypatch):
+    monkeypatch.setenv("ASYNC_POSTGRES_DSN", "sqlite+aiosqlite://")
+    await async_engine.dispose_async_engine()
+    try:
+        sessions = []
+        for _ in range(2):
+            async for session in async_engine.get_async_db_session():
+                assert (await session.execute(text("SELECT 1"))).scalar() == 1
+                sessions.append(session)
+
+        assert sessions[0] is not sessions[1]
+        assert sessions[0].bind is sessions[1].bind is async_engine.get_async_engine()
+    finally:
+        await async_engine.dispose_async_engine()
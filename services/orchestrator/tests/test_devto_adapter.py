@@ -88,9 +88,7 @@ class TestDevToAdapter:
             }
             mock_response.raise_for_status.return_value = None
 
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
             result = await adapter.publish(sample_content_item, platform_config)
 
@@ -116,9 +114,7 @@ class TestDevToAdapter:
                 "422 Unprocessable Entity"
             )
 
-            mock_client.return_value.__aenter__.return_value.post = AsyncMock(
-                return_value=mock_response
-            )
+            mock_client.return_value.post = AsyncMock(return_value=mock_response)
 
             result = await adapter.publish(sample_content_item, platform_config)
 
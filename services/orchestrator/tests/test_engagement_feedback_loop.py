@@ -0,0 +1,152 @@
+"""Tests for EngagementFeedbackLoop sync and analytics queries."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.orchestrator.db import Base
+from services.orchestrator.db.models import Post, VariantPerformance
+from services.orchestrator.engagement_feedback_loop import EngagementFeedbackLoop
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def add_variant(session, variant_id, dimensions, impressions, successes, age_days=0):
+    session.add(
+        VariantPerformance(
+            variant_id=variant_id,
+            dimensions=dimensions,
+            impressions=impressions,
+            successes=successes,
+            last_used=datetime.utcnow() - timedelta(days=age_days),
+        )
+    )
+
+
+class TestEngagementAnalytics:
+    @pytest.mark.asyncio
+    async def test_aggregates_match_per_row_computation(self, db_session):
+        add_variant(
+            db_session, "v1", {"hook_style": "question", "tone": "casual"}, 100, 20
+        )
+        add_variant(
+            db_session, "v2", {"hook_style": "question", "tone": "engaging"}, 50, 5
+        )
+        add_variant(db_session, "v3", {"hook_style": "story", "tone": "casual"}, 8, 4)
+        add_variant(db_session, "v4", {"hook_style": "story", "tone": "casual"}, 0, 0)
+        add_variant(
+            db_session,
+            "old",
+            {"hook_style": "story", "tone": "casual"},
+            500,
+            400,
+            age_days=30,
+        )
+        db_session.commit()
+
+        analytics = await EngagementFeedbackLoop(db_session).get_engagement_analytics(
+            days_back=7
+        )
+
+        assert analytics["total_variants"] == 4
+        assert analytics["active_variants"] == 3
+        assert analytics["total_impressions"] == 158
+        assert analytics["total_successes"] == 29
+        assert analytics["overall_success_rate"] == pytest.approx(29 / 158)
+        assert analytics["average_success_rate"] == pytest.approx((0.2 + 0.1 + 0.5) / 3)
+
+        dims = analytics["dimension_performance"]
+        assert dims["hook_style"]["question"] == {
+            "total_impressions": 150,
+            "total_successes": 25,
+            "variants": 2,
+            "success_rate": pytest.approx(25 / 150),
+        }
+        assert dims["hook_style"]["story"]["variants"] == 1
+        assert dims["tone"]["casual"]["total_impressions"] == 108
+
+        assert [v["variant_id"] for v in analytics["top_variants"]] == ["v1", "v2"]
+        assert analytics["top_variants"][0]["dimensions"]["tone"] == "casual"
+
+    @pytest.mark.asyncio
+    async def test_empty_window(self, db_session):
+        analytics = await EngagementFeedbackLoop(db_session).get_engagement_analytics()
+
+        assert analytics["total_variants"] == 0
+        assert analytics["total_impressions"] == 0
+        assert analytics["average_success_rate"] == 0.0
+        assert analytics["dimension_performance"] == {}
+        assert analytics["top_variants"] == []
+
+
+class TestPostSync:
+    @pytest.fixture
+    def loop(self, db_session):
+        add_variant(
+            db_session,
+            "exact",
+            {"hook_style": "question", "tone": "casual", "length": "short"},
+            10,
+            1,
+        )
+        add_variant(
+            db_session,
+            "pair",
+            {"hook_style": "urgent", "tone": "casual", "length": "long"},
+            10,
+            1,
+        )
+        db_session.commit()
+        return EngagementFeedbackLoop(db_session)
+
+    @pytest.mark.asyncio
+    async def test_extract_variant_exact_and_fallback(self, loop):
+        assert await loop._extract_variant_from_post(Post(hook="Why?", body="ok")) == (
+            "exact"
+        )
+        # urgent + casual match, length does not
+        assert (
+            await loop._extract_variant_from_post(
+                Post(hook="Breaking now", body="x" * 200)
+            )
+            == "pair"
+        )
+        # only tone matches
+        assert (
+            await loop._extract_variant_from_post(
+                Post(hook="A statement", body="business " * 50)
+            )
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_sync_processes_only_changed_posts(self, loop, db_session):
+        db_session.add_all(
+            [
+                Post(persona_id="p", hook="Why?", body="ok", engagement_rate=0.2),
+                Post(persona_id="p", hook="Why not?", body="ok", engagement_rate=0.0),
+            ]
+        )
+        db_session.commit()
+
+        assert await loop.sync_post_engagements() == 1
+        assert loop._event_queue.qsize() == 1
+        assert await loop.sync_post_engagements() == 0
+
+        post = db_session.query(Post).filter_by(engagement_rate=0.0).one()
+        post.engagement_rate = 0.3
+        db_session.commit()
+
+        assert await loop.sync_post_engagements() == 1
+        event = loop._event_queue.get_nowait()
+        assert event.variant_id == "exact"
+        assert loop._event_queue.get_nowait().metadata["engagement_rate"] == 0.3
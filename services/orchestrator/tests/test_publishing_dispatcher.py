@@ -0,0 +1,150 @@
+"""Tests for the claim-based due content dispatcher."""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.orchestrator.db.models import ContentItem, ContentSchedule
+from services.orchestrator.publishing.dispatcher import (
+    DueContentDispatcher,
+    parse_platform_caps,
+)
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dispatch.db'}")
+    ContentItem.metadata.create_all(
+        engine, tables=[ContentItem.__table__, ContentSchedule.__table__]
+    )
+    session = sessionmaker(engine)()
+    session.add(
+        ContentItem(
+            id=1,
+            title="Post",
+            content="Body",
+            content_type="blog_post",
+            author_id="author",
+            status="ready",
+            content_metadata={},
+        )
+    )
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_schedules(db, platform, minutes_ago, status="scheduled"):
+    rows = [
+        ContentSchedule(
+            content_item_id=1,
+            platform=platform,
+            scheduled_time=NOW - timedelta(minutes=m),
+            status=status,
+        )
+        for m in minutes_ago
+    ]
+    db.add_all(rows)
+    db.commit()
+    return [row.id for row in rows]
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, ids):
+        self.batches.append(list(ids))
+
+    @property
+    def ids(self):
+        return [i for batch in self.batches for i in batch]
+
+
+class TestDueContentDispatcher:
+    def test_claims_due_rows_in_batches(self, db):
+        due = add_schedules(db, "dev.to", [1, 2, 3, 4, 5])
+        future = add_schedules(db, "dev.to", [-10])
+        enqueue = Recorder()
+
+        result = DueContentDispatcher(enqueue, batch_size=2).dispatch(db, NOW)
+
+        assert result["processed_count"] == 5
+        assert [len(batch) for batch in enqueue.batches] == [2, 2, 1]
+        # Oldest first
+        assert enqueue.batches[0] == [due[4], due[3]]
+        assert sorted(enqueue.ids) == due
+        statuses = dict(db.query(ContentSchedule.id, ContentSchedule.status))
+        assert {statuses[i] for i in due} == {"publishing"}
+        assert statuses[future[0]] == "scheduled"
+
+    def test_overlapping_runs_do_not_dispatch_twice(self, db):
+        add_schedules(db, "dev.to", range(10))
+        first, second = Recorder(), Recorder()
+
+        DueContentDispatcher(first).dispatch(db, NOW)
+        DueContentDispatcher(second).dispatch(db, NOW)
+
+        assert len(first.ids) == 10
+        assert second.ids == []
+
+    def test_platform_caps_count_in_flight_rows(self, db):
+        add_schedules(db, "linkedin", [0], status="publishing")
+        add_schedules(db, "linkedin", range(1, 6))
+        add_schedules(db, "dev.to", range(1, 6))
+        enqueue = Recorder()
+
+        result = DueContentDispatcher(
+            enqueue, batch_size=10, platform_caps={"linkedin": 3}, default_cap=4
+        ).dispatch(db, NOW)
+
+        assert result["per_platform"] == {"linkedin": 2, "dev.to": 4}
+
+    def test_enqueue_failure_releases_claim(self, db):
+        ids = add_schedules(db, "dev.to", [1, 2])
+
+        def broken(_):
+            raise ConnectionError("broker down")
+
+        result = DueContentDispatcher(broken).dispatch(db, NOW)
+
+        assert result["processed_count"] == 0
+        statuses = {s for (s,) in db.query(ContentSchedule.status)}
+        assert statuses == {"scheduled"}
+        assert DueContentDispatcher(Recorder()).dispatch(db, NOW)[
+            "processed_count"
+        ] == len(ids)
+
+    def test_stale_claims_are_released(self, db):
+        add_schedules(db, "dev.to", [30], status="publishing")
+        db.query(ContentSchedule).update({"updated_at": NOW - timedelta(hours=1)})
+        db.commit()
+        enqueue = Recorder()
+
+        result = DueContentDispatcher(enqueue, claim_timeout=900).dispatch(db, NOW)
+
+        assert result["released_count"] == 1
+        assert len(enqueue.ids) == 1
+
+    def test_dispatch_lag_recorded(self, db):
+        add_schedules(db, "dev.to", [5, 1])
+
+        with patch(
+            "services.orchestrator.publishing.dispatcher.record_publish_dispatch"
+        ) as record:
+            DueContentDispatcher(Recorder()).dispatch(db, NOW)
+
+        record.assert_called_once_with("dev.to", [300.0, 60.0])
+
+    def test_parse_platform_caps(self):
+        assert parse_platform_caps("linkedin=2, dev.to=5,") == {
+            "linkedin": 2,
+            "dev.to": 5,
+        }
+        assert parse_platform_caps("") == {}
@@ -8,12 +8,16 @@ This module tests the core publishing engine functionality including:
 - Status tracking and updates
 """
 
+import asyncio
+import time
+
 import pytest
 from datetime import datetime, timezone
 from unittest.mock import Mock, AsyncMock, patch
 
 from services.orchestrator.publishing.engine import PublishingEngine
 from services.orchestrator.publishing.adapters.base import (
+    PlatformAdapter,
     PublishingResult,
 )
 from services.orchestrator.db.models import ContentItem
@@ -83,7 +87,7 @@ class TestPublishingEngine:
 
         # Mock adapter to raise an exception
         with patch.object(engine, "_get_adapter") as mock_get_adapter:
-            mock_adapter = Mock()
+            mock_adapter = Mock(rate_limit_per_minute=None, timeout_seconds=30.0)
             mock_adapter.publish = AsyncMock(side_effect=Exception("API Error"))
             mock_get_adapter.return_value = mock_adapter
 
@@ -97,6 +101,98 @@ class TestPublishingEngine:
             assert "API Error" in result.error_message
 
 
+class FakeAdapter(PlatformAdapter):
+    """Adapter that sleeps, then fails a set number of times before succeeding."""
+
+    def __init__(self, platform_name, delay=0.0, failures=0, timeout_seconds=30.0):
+        super().__init__(platform_name)
+        self.delay = delay
+        self.failures = failures
+        self.timeout_seconds = timeout_seconds
+        self.calls = 0
+
+    async def publish(self, content_item, platform_config):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            return PublishingResult(
+                success=False, platform=self.platform_name, error_message="flaky"
+            )
+        return PublishingResult(success=True, platform=self.platform_name)
+
+    async def validate_content(self, content_item):
+        return True
+
+    def supports_retry(self):
+        return True
+
+
+class TestMultiPlatformPublishing:
+    """Test concurrent fan-out across platforms."""
+
+    @pytest.mark.asyncio
+    async def test_platforms_publish_concurrently(self, sample_content_item):
+        engine = PublishingEngine()
+        for platform in ("a", "b", "c"):
+            engine.adapters[platform] = FakeAdapter(platform, delay=0.2)
+
+        start = time.perf_counter()
+        result = await engine.publish_to_platforms(
+            sample_content_item, {"a": {}, "b": {}, "c": {}}
+        )
+
+        assert time.perf_counter() - start < 0.4
+        assert result.all_succeeded
+        assert result.succeeded == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_timeout_and_retry(self, sample_content_item):
+        engine = PublishingEngine(retry_backoff=0)
+        engine.adapters["ok"] = FakeAdapter("ok")
+        engine.adapters["flaky"] = FakeAdapter("flaky", failures=1)
+        engine.adapters["slow"] = FakeAdapter("slow", delay=1.0, timeout_seconds=0.05)
+
+        result = await engine.publish_to_platforms(
+            sample_content_item, {"ok": {}, "flaky": {}, "slow": {}}
+        )
+
+        assert result.partial
+        assert result.succeeded == ["ok", "flaky"]
+        assert result.failed == ["slow"]
+        assert "Timed out" in result.results["slow"].error_message
+        assert result.attempts == {"ok": 1, "flaky": 2, "slow": 2}
+
+    @pytest.mark.asyncio
+    async def test_timeout_covers_rate_limit_wait(self, sample_content_item):
+        engine = PublishingEngine()
+        engine.adapters["queued"] = FakeAdapter("queued", timeout_seconds=0.05)
+
+        async def busy_limiter(*args, **kwargs):
+            await asyncio.sleep(1.0)
+
+        engine._limiters["queued"] = Mock(acquire=busy_limiter)
+
+        start = time.perf_counter()
+        result = await engine.publish_to_platform(sample_content_item, "queued", {})
+
+        assert time.perf_counter() - start < 0.5
+        assert "Timed out" in result.error_message
+        assert engine.adapters["queued"].calls == 0
+
+    @pytest.mark.asyncio
+    async def test_devto_reuses_pooled_client(self):
+        from services.orchestrator.publishing.adapters.devto import DevToAdapter
+
+        adapter = DevToAdapter()
+        client = adapter._get_client()
+        assert adapter._get_client() is client
+
+        await adapter.aclose()
+        assert client.is_closed
+        assert adapter._get_client() is not client
+        await adapter.aclose()
+
+
 @pytest.fixture
 def sample_content_item():
     """Create a sample ContentItem for testing."""
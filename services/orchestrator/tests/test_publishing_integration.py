@@ -9,6 +9,9 @@ import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timezone, timedelta
 
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
 from services.orchestrator.publishing.engine import PublishingEngine
 from services.orchestrator.publishing.tasks import (
     publish_content_task,
@@ -16,6 +19,9 @@ from services.orchestrator.publishing.tasks import (
 )
 from services.orchestrator.db.models import ContentItem, ContentSchedule
 
+# Patched PublishingEngine classes must not be cached across tests
+pytestmark = pytest.mark.usefixtures("reset_publishing_worker")
+
 
 class TestPublishingIntegration:
     """Test end-to-end publishing workflows."""
@@ -155,9 +161,7 @@ class TestPublishingIntegration:
         }
         mock_response.raise_for_status.return_value = None
 
-        mock_httpx.return_value.__aenter__.return_value.post = AsyncMock(
-            return_value=mock_response
-        )
+        mock_httpx.return_value.post = AsyncMock(return_value=mock_response)
 
         # Execute publishing task
         result = publish_content_task(schedule_id=1)
@@ -219,38 +223,55 @@ class TestPublishingIntegration:
         mock_db.commit.assert_called_once()
 
     @patch("services.orchestrator.publishing.tasks.get_db_session")
-    @patch("services.orchestrator.publishing.tasks.publish_content_task.delay")
-    def test_scheduled_content_processing_integration(self, mock_delay, mock_get_db):
+    @patch("services.orchestrator.publishing.tasks.group")
+    def test_scheduled_content_processing_integration(
+        self, mock_group, mock_get_db, tmp_path
+    ):
         """Test that scheduled content processing finds and queues content correctly."""
-        # Mock database session
-        mock_db = Mock()
-        mock_get_db.return_value.__enter__.return_value = mock_db
+        engine = create_engine(f"sqlite:///{tmp_path / 'integration.db'}")
+        ContentItem.metadata.create_all(
+            engine, tables=[ContentItem.__table__, ContentSchedule.__table__]
+        )
+        db = sessionmaker(engine)()
+        mock_get_db.return_value.__enter__.return_value = db
 
         # Create overdue schedules
         now = datetime.now(timezone.utc)
-
-        schedule1 = Mock()
-        schedule1.id = 1
-        schedule1.scheduled_time = now - timedelta(minutes=10)  # 10 minutes overdue
-        schedule1.status = "scheduled"
-
-        schedule2 = Mock()
-        schedule2.id = 2
-        schedule2.scheduled_time = now - timedelta(minutes=5)  # 5 minutes overdue
-        schedule2.status = "scheduled"
-
-        schedule3 = Mock()
-        schedule3.id = 3
-        schedule3.scheduled_time = now + timedelta(
-            minutes=30
-        )  # Future - shouldn't be processed
-        schedule3.status = "scheduled"
-
-        # Only return overdue schedules
-        mock_db.query.return_value.filter.return_value.all.return_value = [
-            schedule1,
-            schedule2,
-        ]
+        db.add(
+            ContentItem(
+                id=1,
+                title="Post",
+                content="Body",
+                content_type="article",
+                author_id="test_author",
+                status="ready",
+                content_metadata={},
+            )
+        )
+        db.add_all(
+            [
+                ContentSchedule(
+                    id=1,
+                    content_item_id=1,
+                    platform="dev.to",
+                    scheduled_time=now - timedelta(minutes=10),  # 10 minutes overdue
+                ),
+                ContentSchedule(
+                    id=2,
+                    content_item_id=1,
+                    platform="linkedin",
+                    scheduled_time=now - timedelta(minutes=5),  # 5 minutes overdue
+                ),
+                ContentSchedule(
+                    id=3,
+                    content_item_id=1,
+                    platform="dev.to",
+                    # Future - shouldn't be processed
+                    scheduled_time=now + timedelta(minutes=30),
+                ),
+            ]
+        )
+        db.commit()
 
         # Execute scheduled content task
         result = publish_scheduled_content_task()
@@ -259,10 +280,17 @@ class TestPublishingIntegration:
         assert result["processed_count"] == 2
         assert result["scheduled_count"] == 2
 
-        # Verify individual publishing tasks were scheduled
-        assert mock_delay.call_count == 2
-        mock_delay.assert_any_call(schedule_id=1)
-        mock_delay.assert_any_call(schedule_id=2)
+        # Verify individual publishing tasks were queued (one group per platform)
+        queued = [
+            sig.kwargs["schedule_id"]
+            for call in mock_group.call_args_list
+            for sig in call.args[0]
+        ]
+        assert sorted(queued) == [1, 2]
+        assert db.get(ContentSchedule, 3).status == "scheduled"
+
+        db.close()
+        engine.dispose()
 
     def test_adapter_interface_compatibility(self):
         """Test that all adapters implement the required interface correctly."""
@@ -9,9 +9,11 @@ This module tests the async publishing infrastructure including:
 - Integration with publishing engine
 """
 
+import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timezone, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from services.orchestrator.publishing.tasks import (
     publish_content_task,
@@ -21,6 +23,9 @@ from services.orchestrator.publishing.tasks import (
 from services.orchestrator.publishing.adapters.base import PublishingResult
 from services.orchestrator.db.models import ContentItem, ContentSchedule
 
+# Patched PublishingEngine classes must not be cached across tests
+pytestmark = pytest.mark.usefixtures("reset_publishing_worker")
+
 
 class TestPublishingTasks:
     """Test Celery tasks for async publishing."""
@@ -126,42 +131,74 @@ class TestPublishingTasks:
         mock_apply_async.assert_called_once()
 
     @patch("services.orchestrator.publishing.tasks.get_db_session")
-    def test_publish_scheduled_content_task_finds_due_content(self, mock_get_db):
-        """Test that scheduled content task finds and processes due content."""
-        # This will fail - scheduled task doesn't exist yet
-        # Mock database session
-        mock_db = Mock(spec=Session)
-        mock_get_db.return_value.__enter__.return_value = mock_db
+    def test_publish_scheduled_content_task_finds_due_content(
+        self, mock_get_db, tmp_path
+    ):
+        """Test that scheduled content task claims and enqueues due content."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+        ContentItem.metadata.create_all(
+            engine, tables=[ContentItem.__table__, ContentSchedule.__table__]
+        )
+        db = sessionmaker(engine)()
+        mock_get_db.return_value.__enter__.return_value = db
 
-        # Mock due schedules
         now = datetime.now(timezone.utc)
-        mock_schedule1 = Mock(spec=ContentSchedule)
-        mock_schedule1.id = 1
-        mock_schedule1.scheduled_time = now - timedelta(minutes=5)  # 5 minutes overdue
-
-        mock_schedule2 = Mock(spec=ContentSchedule)
-        mock_schedule2.id = 2
-        mock_schedule2.scheduled_time = now - timedelta(minutes=2)  # 2 minutes overdue
-
-        mock_db.query.return_value.filter.return_value.all.return_value = [
-            mock_schedule1,
-            mock_schedule2,
-        ]
-
-        # Mock the publish_content_task
-        with patch(
-            "services.orchestrator.publishing.tasks.publish_content_task.delay"
-        ) as mock_delay:
-            result = publish_scheduled_content_task()
+        db.add(
+            ContentItem(
+                id=1,
+                title="Post",
+                content="Body",
+                content_type="blog_post",
+                author_id="author",
+                status="ready",
+                content_metadata={},
+            )
+        )
+        db.add_all(
+            [
+                ContentSchedule(
+                    id=1,
+                    content_item_id=1,
+                    platform="dev.to",
+                    scheduled_time=now - timedelta(minutes=5),  # 5 minutes overdue
+                ),
+                ContentSchedule(
+                    id=2,
+                    content_item_id=1,
+                    platform="dev.to",
+                    scheduled_time=now - timedelta(minutes=2),  # 2 minutes overdue
+                ),
+                ContentSchedule(
+                    id=3,
+                    content_item_id=1,
+                    platform="dev.to",
+                    scheduled_time=now + timedelta(hours=1),  # not due yet
+                ),
+            ]
+        )
+        db.commit()
 
-            # Verify results
-            assert result["processed_count"] == 2
-            assert result["scheduled_count"] == 2
+        with patch("services.orchestrator.publishing.tasks.group") as mock_group:
+            result = publish_scheduled_content_task()
+            # A second overlapping run finds nothing left to claim
+            second = publish_scheduled_content_task()
 
-            # Verify individual tasks were scheduled
-            assert mock_delay.call_count == 2
-            mock_delay.assert_any_call(schedule_id=1)
-            mock_delay.assert_any_call(schedule_id=2)
+        # Verify results
+        assert result["processed_count"] == 2
+        assert result["scheduled_count"] == 2
+        assert second["scheduled_count"] == 0
+
+        # Both tasks were sent as one group
+        mock_group.return_value.apply_async.assert_called_once()
+        signatures = list(mock_group.call_args.args[0])
+        assert [sig.kwargs["schedule_id"] for sig in signatures] == [1, 2]
+        assert {s.status for s in db.query(ContentSchedule)} == {
+            "publishing",
+            "scheduled",
+        }
+
+        db.close()
+        engine.dispose()
 
     @patch("services.orchestrator.publishing.tasks.get_db_session")
     @patch("services.orchestrator.publishing.tasks.PublishingEngine")
@@ -10,10 +10,17 @@ from datetime import datetime, timezone, timedelta
 from unittest.mock import Mock
 from fastapi.testclient import TestClient
 from fastapi import FastAPI
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from services.orchestrator.scheduling_router import router
 from services.orchestrator.db import get_db_session
+from services.orchestrator.db.async_engine import (
+    create_orchestrator_async_engine,
+    get_async_db_session,
+)
 from services.orchestrator.db.models import ContentItem, ContentSchedule
 
 
@@ -24,17 +31,82 @@ def mock_db():
 
 
 @pytest.fixture
-def app_with_router(mock_db):
-    """FastAPI app with our router and mocked database."""
+def db_path(tmp_path):
+    """SQLite file shared by the seeding session and the async engine."""
+    path = tmp_path / "scheduling.db"
+    engine = create_engine(f"sqlite:///{path}")
+    ContentItem.metadata.create_all(
+        engine, tables=[ContentItem.__table__, ContentSchedule.__table__]
+    )
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def seed(db_path):
+    """Insert rows for the async read endpoints."""
+    engine = create_engine(f"sqlite:///{db_path}")
+    SessionLocal = sessionmaker(engine, expire_on_commit=False)
+
+    def add(*rows):
+        with SessionLocal() as session:
+            session.add_all(rows)
+            session.commit()
+        return rows
+
+    yield add
+    engine.dispose()
+
+
+@pytest.fixture
+def app_with_router(mock_db, db_path):
+    """FastAPI app with our router, mocked sync and real async database."""
     app = FastAPI()
     app.include_router(router)
 
-    # Override the database dependency
+    # Override the database dependencies
     app.dependency_overrides[get_db_session] = lambda: mock_db
 
+    session_factory = async_sessionmaker(
+        create_orchestrator_async_engine(f"sqlite+aiosqlite:///{db_path}"),
+        expire_on_commit=False,
+    )
+
+    async def override_async_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_async_db_session] = override_async_session
+
     return app
 
 
+def make_content(**overrides):
+    fields = {
+        "title": "Advanced AI Development Techniques",
+        "content": "A comprehensive guide to modern AI development practices.",
+        "content_type": "blog_post",
+        "author_id": "ai_expert_001",
+        "status": "draft",
+        "content_metadata": {},
+    }
+    fields.update(overrides)
+    return ContentItem(**fields)
+
+
+def make_schedule(content_item_id, **overrides):
+    fields = {
+        "content_item_id": content_item_id,
+        "platform": "linkedin",
+        "scheduled_time": datetime.now(timezone.utc) + timedelta(hours=2),
+        "timezone_name": "UTC",
+        "status": "scheduled",
+        "platform_config": {},
+    }
+    fields.update(overrides)
+    return ContentSchedule(**fields)
+
+
 @pytest.fixture
 def client(app_with_router):
     """Test client with mocked dependencies."""
@@ -135,18 +207,9 @@ class TestContentManagementEndpoints:
         error_data = response.json()
         assert "detail" in error_data
 
-    def test_get_content_list_success(self, client, mock_db, sample_content_item):
+    def test_get_content_list_success(self, client, seed):
         """GET /api/v1/content should return paginated content list."""
-        # Mock query chain
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.offset.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = [sample_content_item]
-        mock_query.count.return_value = 1
-
-        mock_db.query.return_value = mock_query
+        seed(make_content())
 
         response = client.get("/api/v1/content")
 
@@ -159,48 +222,71 @@ class TestContentManagementEndpoints:
         assert data["total"] == 1
         assert len(data["items"]) == 1
 
-    def test_get_content_list_with_filters(self, client, mock_db, sample_content_item):
+    def test_get_content_list_with_filters(self, client, seed):
         """GET /api/v1/content should support filtering."""
-        # Mock query chain
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.offset.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = [sample_content_item]
-        mock_query.count.return_value = 1
-
-        mock_db.query.return_value = mock_query
+        seed(
+            make_content(title="Draft one", author_id="test_author"),
+            make_content(
+                title="Published", author_id="test_author", status="published"
+            ),
+            make_content(title="Someone else", author_id="other"),
+        )
 
         response = client.get("/api/v1/content?status=draft&author_id=test_author")
 
         assert response.status_code == 200
-        # Verify filters were applied (mock was called with filter)
-        assert mock_query.filter.call_count >= 2  # At least 2 filters applied
+        data = response.json()
+        assert data["total"] == 1
+        assert [item["title"] for item in data["items"]] == ["Draft one"]
+
+        response = client.get("/api/v1/content?search=publish&size=1")
+        assert response.json()["total"] == 1
+
+    def test_get_content_list_keyset_pagination(self, client, seed):
+        """GET /api/v1/content should page by cursor without gaps or repeats."""
+        created = datetime(2026, 1, 1)
+        seed(
+            *[
+                # Pairs share a timestamp so the id tiebreaker is exercised
+                make_content(title=f"Post {i}", created_at=created + timedelta(i // 2))
+                for i in range(7)
+            ]
+        )
+
+        titles, cursor, pages = [], None, 0
+        while True:
+            url = "/api/v1/content?size=3" + (f"&cursor={cursor}" if cursor else "")
+            data = client.get(url).json()
+            titles += [item["title"] for item in data["items"]]
+            cursor = data["next_cursor"]
+            pages += 1
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert titles == [f"Post {i}" for i in (6, 5, 4, 3, 2, 1, 0)]
+        assert data["total"] == 7
+        assert data["total_is_estimate"] is False
+
+    def test_get_content_list_invalid_cursor(self, client, seed):
+        """GET /api/v1/content should reject a malformed cursor."""
+        response = client.get("/api/v1/content?cursor=not-a-cursor")
 
-    def test_get_content_item_by_id_success(self, client, mock_db, sample_content_item):
+        assert response.status_code == 400
+
+    def test_get_content_item_by_id_success(self, client, seed):
         """GET /api/v1/content/{id} should return content when exists."""
-        # Mock query
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = sample_content_item
-        mock_db.query.return_value = mock_query
+        (content,) = seed(make_content())
 
-        response = client.get("/api/v1/content/1")
+        response = client.get(f"/api/v1/content/{content.id}")
 
         assert response.status_code == 200
         data = response.json()
-        assert data["id"] == 1
-        assert data["title"] == sample_content_item.title
+        assert data["id"] == content.id
+        assert data["title"] == content.title
 
-    def test_get_content_item_by_id_not_found(self, client, mock_db):
+    def test_get_content_item_by_id_not_found(self, client):
         """GET /api/v1/content/{id} should return 404 when not exists."""
-        # Mock query returning None
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
-        mock_db.query.return_value = mock_query
-
         response = client.get("/api/v1/content/999")
 
         assert response.status_code == 404
@@ -355,15 +441,10 @@ class TestSchedulingEndpoints:
 
         assert response.status_code == 422
 
-    def test_get_schedules_calendar_success(self, client, mock_db, sample_schedule):
+    def test_get_schedules_calendar_success(self, client, seed):
         """GET /api/v1/schedules/calendar should return calendar view."""
-        # Mock query chain
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.all.return_value = [sample_schedule]
-
-        mock_db.query.return_value = mock_query
+        (content,) = seed(make_content())
+        seed(make_schedule(content.id))
 
         response = client.get("/api/v1/schedules/calendar")
 
@@ -372,6 +453,7 @@ class TestSchedulingEndpoints:
         assert "schedules" in data
         assert "date_range" in data
         assert "grouped_by_date" in data
+        assert len(data["schedules"]) == 1
 
     def test_update_schedule_success(self, client, mock_db, sample_schedule):
         """PUT /api/v1/schedules/{id} should update schedule."""
@@ -412,77 +494,42 @@ class TestSchedulingEndpoints:
 class TestRealTimeStatusEndpoints:
     """Test real-time status endpoints."""
 
-    def test_get_content_status_success(
-        self, client, mock_db, sample_content_item, sample_schedule
-    ):
+    def test_get_content_status_success(self, client, seed):
         """GET /api/v1/content/{id}/status should return status."""
-        # Mock content query
-        content_query = Mock()
-        content_query.filter.return_value = content_query
-        content_query.first.return_value = sample_content_item
+        (content,) = seed(make_content())
+        seed(
+            make_schedule(content.id),
+            make_schedule(content.id, platform="devto", status="published"),
+        )
 
-        # Mock schedules query
-        schedule_query = Mock()
-        schedule_query.filter.return_value = schedule_query
-        schedule_query.all.return_value = [sample_schedule]
-
-        # Setup query routing
-        def mock_query(model):
-            if model == ContentItem:
-                return content_query
-            elif model == ContentSchedule:
-                return schedule_query
-            return Mock()
-
-        mock_db.query.side_effect = mock_query
-
-        response = client.get("/api/v1/content/1/status")
+        response = client.get(f"/api/v1/content/{content.id}/status")
 
         assert response.status_code == 200
         data = response.json()
-        assert data["content_id"] == 1
+        assert data["content_id"] == content.id
         assert "status" in data
         assert "schedules" in data
         assert "publishing_progress" in data
+        assert data["publishing_progress"]["published_platforms"] == 1
 
-    def test_get_content_status_not_found(self, client, mock_db):
+    def test_get_content_status_not_found(self, client):
         """GET /api/v1/content/{id}/status should return 404 when not exists."""
-        # Mock query returning None
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.first.return_value = None
-        mock_db.query.return_value = mock_query
-
         response = client.get("/api/v1/content/999/status")
 
         assert response.status_code == 404
 
-    def test_get_upcoming_schedules_success(self, client, mock_db, sample_schedule):
+    def test_get_upcoming_schedules_success(self, client, seed):
         """GET /api/v1/schedules/upcoming should return upcoming schedules."""
-        # Mock upcoming schedules query
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = [sample_schedule]
-
-        # Mock count queries
-        mock_count_query = Mock()
-        mock_count_query.filter.return_value = mock_count_query
-        mock_count_query.count.return_value = 1
-
-        # Route queries properly
-        call_count = 0
-
-        def mock_query_router(model):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:  # First call for main query
-                return mock_query
-            else:  # Subsequent calls for counts
-                return mock_count_query
-
-        mock_db.query.side_effect = mock_query_router
+        (content,) = seed(make_content())
+        now = datetime.now(timezone.utc)
+        seed(
+            make_schedule(content.id, scheduled_time=now + timedelta(hours=2)),
+            make_schedule(content.id, scheduled_time=now + timedelta(days=3)),
+            make_schedule(content.id, scheduled_time=now + timedelta(days=10)),
+            make_schedule(
+                content.id, scheduled_time=now + timedelta(hours=1), status="published"
+            ),
+        )
 
         response = client.get("/api/v1/schedules/upcoming")
 
@@ -492,37 +539,32 @@ class TestRealTimeStatusEndpoints:
         assert "total" in data
         assert "next_24_hours" in data
         assert "next_week" in data
+        assert data["total"] == 3
+        assert (data["next_24_hours"], data["next_week"]) == (1, 2)
 
-    def test_get_upcoming_schedules_with_filters(
-        self, client, mock_db, sample_schedule
-    ):
+    def test_get_upcoming_schedules_with_filters(self, client, seed):
         """GET /api/v1/schedules/upcoming should support platform filtering."""
-        # Mock query
-        mock_query = Mock()
-        mock_query.filter.return_value = mock_query
-        mock_query.order_by.return_value = mock_query
-        mock_query.limit.return_value = mock_query
-        mock_query.all.return_value = [sample_schedule]
-
-        # Mock count query
-        mock_count_query = Mock()
-        mock_count_query.filter.return_value = mock_count_query
-        mock_count_query.count.return_value = 1
-
-        call_count = 0
-
-        def mock_query_router(model):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return mock_query
-            else:
-                return mock_count_query
-
-        mock_db.query.side_effect = mock_query_router
+        (content,) = seed(make_content())
+        seed(
+            *[make_schedule(content.id) for _ in range(12)],
+            make_schedule(content.id, platform="devto"),
+        )
 
         response = client.get("/api/v1/schedules/upcoming?platform=linkedin&limit=10")
 
         assert response.status_code == 200
         data = response.json()
         assert len(data["schedules"]) <= 10
+        assert {s["platform"] for s in data["schedules"]} == {"linkedin"}
+
+
+def test_postgres_search_uses_text_search_vector():
+    """Search on Postgres should hit the GIN-indexed tsvector, not ILIKE."""
+    from services.orchestrator.db.content_search import search_filter, search_rank
+
+    sql = str(
+        search_filter("ai agents", "postgresql").compile(dialect=postgresql.dialect())
+    )
+    assert "content_items.search_vector @@ websearch_to_tsquery" in sql
+    assert "ILIKE" not in sql.upper()
+    assert "ts_rank_cd" in str(search_rank("ai").compile(dialect=postgresql.dialect()))
@@ -1,12 +1,16 @@
 """Thompson Sampling with Pattern Fatigue Detection Integration."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
 
 from services.orchestrator.thompson_sampling_optimized import ThompsonSamplingOptimized
 from services.pattern_analyzer.service import PatternAnalyzerService
+from services.pattern_analyzer.pattern_fatigue_detector import (
+    FATIGUE_WINDOW,
+    freshness_from_uses,
+)
 from services.pattern_analyzer.pattern_extractor import PatternExtractor
 from services.pattern_analyzer.models import PatternUsage
 from sqlalchemy import create_engine, func
@@ -60,8 +64,8 @@ class ThompsonSamplingWithFatigue(ThompsonSamplingOptimized):
         # First, get Thompson Sampling scores for all variants
         thompson_scores = self._calculate_thompson_scores(variants)
 
-        # Check pattern fatigue for each variant
-        fresh_variants = []
+        # Extract patterns from every candidate first
+        candidates = []
         for idx, variant in enumerate(variants):
             variant_id = variant.get("variant_id", f"variant_{idx}")
             content = variant.get("content", variant.get("sample_content", ""))
@@ -70,13 +74,22 @@ class ThompsonSamplingWithFatigue(ThompsonSamplingOptimized):
                 logger.warning(f"No content found for variant {variant_id}")
                 continue
 
-            # Extract patterns from variant content
             pattern = self.pattern_extractor.extract_pattern(content)
             patterns = [pattern] if pattern else []
             variant["patterns"] = patterns
+            candidates.append((variant_id, variant, patterns))
+
+        # One usage lookup for the whole candidate set
+        usage_map = self._get_recent_usage_counts(
+            persona_id, {p for _, _, patterns in candidates for p in patterns}
+        )
 
+        fresh_variants = []
+        for variant_id, variant, patterns in candidates:
             # Calculate fatigue score for this variant
-            fatigue_score = self._calculate_variant_fatigue_score(persona_id, patterns)
+            fatigue_score = self._calculate_variant_fatigue_score(
+                persona_id, patterns, usage_map
+            )
 
             # Combine Thompson score with fatigue score
             thompson_score = thompson_scores.get(variant_id, 0.5)
@@ -139,22 +152,15 @@ class ThompsonSamplingWithFatigue(ThompsonSamplingOptimized):
 
         return scores
 
-    def _calculate_variant_fatigue_score(
-        self, persona_id: str, patterns: List[str]
-    ) -> float:
-        """
-        Calculate fatigue score for a variant based on its patterns.
-        Higher score = fresher content.
-        """
+    def _get_recent_usage_counts(
+        self, persona_id: str, patterns: Set[str]
+    ) -> Dict[str, int]:
+        """Recent (7-day) usage counts for a set of patterns in one query."""
         if not patterns:
-            return 1.0  # No patterns = maximum freshness
+            return {}
 
-        # Batch query all patterns at once to avoid N+1
         with SessionLocal() as db:
-            now = datetime.now()
-            seven_days_ago = now - timedelta(days=7)
-
-            # Single query for all patterns
+            seven_days_ago = datetime.now() - FATIGUE_WINDOW
             pattern_counts = (
                 db.query(
                     PatternUsage.pattern_id,
@@ -168,25 +174,28 @@ class ThompsonSamplingWithFatigue(ThompsonSamplingOptimized):
                 .group_by(PatternUsage.pattern_id)
                 .all()
             )
+            return {pattern: count for pattern, count in pattern_counts}
 
-            # Convert to dict for O(1) lookups
-            usage_map = {pattern: count for pattern, count in pattern_counts}
-
-            # Calculate scores without additional queries
-            fatigue_scores = []
-            for pattern in patterns:
-                recent_uses = usage_map.get(pattern, 0)
-                if recent_uses >= 3:
-                    score = 0.0
-                elif recent_uses == 2:
-                    score = 0.25
-                elif recent_uses == 1:
-                    score = 0.5
-                else:
-                    score = 1.0
-                fatigue_scores.append(score)
-
-            return sum(fatigue_scores) / len(fatigue_scores) if fatigue_scores else 1.0
+    def _calculate_variant_fatigue_score(
+        self,
+        persona_id: str,
+        patterns: List[str],
+        usage_map: Optional[Dict[str, int]] = None,
+    ) -> float:
+        """
+        Calculate fatigue score for a variant based on its patterns.
+        Higher score = fresher content.
+        """
+        if not patterns:
+            return 1.0  # No patterns = maximum freshness
+
+        if usage_map is None:
+            usage_map = self._get_recent_usage_counts(persona_id, set(patterns))
+
+        fatigue_scores = [
+            freshness_from_uses(usage_map.get(pattern, 0)) for pattern in patterns
+        ]
+        return sum(fatigue_scores) / len(fatigue_scores)
 
     def _record_pattern_usage(
         self, selected_variants: List[Dict[str, Any]], persona_id: str
@@ -1,16 +1,37 @@
+import bisect
+import time
 from datetime import datetime, timedelta
 from collections import defaultdict
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, Iterable, List, Tuple, Optional, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from services.pattern_analyzer.models import PatternUsage
 
+# Uses within the window at which a pattern counts as fatigued
+FATIGUE_THRESHOLD = 3
+FATIGUE_WINDOW = timedelta(days=7)
+
+# Freshness by number of recent uses (3+ uses -> 0.0)
+_FRESHNESS_BY_USES = (1.0, 0.5, 0.25)
+
+
+def freshness_from_uses(recent_uses: int) -> float:
+    """Map a recent usage count to a freshness score between 0.0 and 1.0."""
+    if recent_uses >= FATIGUE_THRESHOLD:
+        return 0.0
+    return _FRESHNESS_BY_USES[recent_uses]
+
 
 class PatternFatigueDetector:
     """Detects pattern fatigue based on usage over a rolling 7-day window."""
 
-    def __init__(self, db_session: Optional[Session] = None):
+    def __init__(
+        self,
+        db_session: Optional[Session] = None,
+        flush_batch_size: int = 1,
+        refresh_interval: float = 60.0,
+    ):
         # Use database if provided, otherwise use in-memory storage
         self.db_session = db_session
         self._use_in_memory = db_session is None
@@ -24,6 +45,19 @@ class PatternFatigueDetector:
                 Dict[str, Any]
             ] = []  # For compatibility with get_recent_pattern_usage
 
+        # Rolling window: the newest FATIGUE_THRESHOLD timestamps per
+        # (pattern, persona), which is all fatigue and freshness depend on
+        self._recent: Dict[str, Dict[str, List[datetime]]] = defaultdict(dict)
+
+        # Database mode: each record call commits its usages (callers can
+        # raise flush_batch_size to commit across calls, and must then call
+        # flush() before the session ends), and each persona's window is
+        # reloaded periodically to pick up other writers
+        self.flush_batch_size = flush_batch_size
+        self.refresh_interval = refresh_interval
+        self._pending_writes = 0
+        self._loaded_at: Dict[str, float] = {}
+
     def record_pattern_usage(
         self, pattern: str, persona_id: str, timestamp: datetime
     ) -> None:
@@ -35,24 +69,134 @@ class PatternFatigueDetector:
             persona_id: The persona that used it
             timestamp: When the pattern was used
         """
-        if self.db_session:
-            # Use database
-            usage = PatternUsage(
-                pattern_id=pattern,
-                persona_id=persona_id,
-                post_id=f"post_{timestamp.timestamp()}",  # Placeholder post_id
-                used_at=timestamp,
-            )
-            self.db_session.add(usage)
+        self.record_pattern_usages([(pattern, persona_id, timestamp)])
+
+    def record_pattern_usages(
+        self, usages: Iterable[Tuple[str, str, datetime]]
+    ) -> None:
+        """
+        Record several (pattern, persona_id, timestamp) usages.
+
+        In database mode the rows are committed together at the end of the
+        call, or once ``flush_batch_size`` usages are pending if it is
+        larger than one.
+        """
+        for pattern, persona_id, timestamp in usages:
+            self._remember(pattern, persona_id, timestamp)
+
+            if self.db_session:
+                self.db_session.add(
+                    PatternUsage(
+                        pattern_id=pattern,
+                        persona_id=persona_id,
+                        post_id=f"post_{timestamp.timestamp()}",  # Placeholder post_id
+                        used_at=timestamp,
+                    )
+                )
+                self._pending_writes += 1
+            else:
+                key = (pattern, persona_id)
+                self._usage_history[key].append(timestamp)
+                # Also store in alternate format for get_recent_pattern_usage
+                self._pattern_usage.append(
+                    {
+                        "pattern_id": pattern,
+                        "persona_id": persona_id,
+                        "used_at": timestamp,
+                    }
+                )
+
+        if self.db_session and self._pending_writes >= self.flush_batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commit pending usage rows in database mode."""
+        if self.db_session and self._pending_writes:
             self.db_session.commit()
+            self._pending_writes = 0
+
+    def _remember(self, pattern: str, persona_id: str, timestamp: datetime) -> None:
+        """Insert a timestamp into the pattern's ring of newest uses."""
+        ring = self._recent[persona_id].setdefault(pattern, [])
+        if not ring or timestamp >= ring[-1]:
+            ring.append(timestamp)
         else:
-            # Use in-memory storage
-            key = (pattern, persona_id)
-            self._usage_history[key].append(timestamp)
-            # Also store in alternate format for get_recent_pattern_usage
-            self._pattern_usage.append(
-                {"pattern_id": pattern, "persona_id": persona_id, "used_at": timestamp}
+            bisect.insort(ring, timestamp)
+        if len(ring) > FATIGUE_THRESHOLD:
+            del ring[0]
+
+    def _load_persona(self, persona_id: str) -> None:
+        """Rebuild a persona's window from the database when it is stale."""
+        loaded_at = self._loaded_at.get(persona_id)
+        if loaded_at is not None and (
+            time.monotonic() - loaded_at < self.refresh_interval
+        ):
+            return
+
+        # Commit buffered rows so the reload (and other readers) include them
+        self.flush()
+        rows = (
+            self.db_session.query(PatternUsage.pattern_id, PatternUsage.used_at)
+            .filter(
+                PatternUsage.persona_id == persona_id,
+                PatternUsage.used_at > datetime.now() - FATIGUE_WINDOW,
             )
+            .order_by(PatternUsage.used_at)
+            .all()
+        )
+        self._recent[persona_id] = {}
+        for pattern, used_at in rows:
+            self._remember(pattern, persona_id, used_at)
+        self._loaded_at[persona_id] = time.monotonic()
+
+    def get_recent_usage_counts(
+        self, patterns: Iterable[str], persona_id: str
+    ) -> Dict[str, int]:
+        """
+        Count uses within the fatigue window for a set of patterns.
+
+        Counts are capped at ``FATIGUE_THRESHOLD``; beyond that a pattern is
+        fatigued regardless.
+
+        Args:
+            patterns: Candidate patterns
+            persona_id: The persona to check against
+
+        Returns:
+            Dictionary mapping each pattern to its (capped) recent use count
+        """
+        if self.db_session:
+            self._load_persona(persona_id)
+
+        cutoff = datetime.now() - FATIGUE_WINDOW
+        window = self._recent.get(persona_id, {})
+        counts = {}
+        for pattern in patterns:
+            ring = window.get(pattern)
+            counts[pattern] = (
+                len(ring) - bisect.bisect_right(ring, cutoff) if ring else 0
+            )
+        return counts
+
+    def get_freshness_scores(
+        self, patterns: Iterable[str], persona_id: str
+    ) -> Dict[str, float]:
+        """
+        Freshness scores for a whole candidate set in one call.
+
+        Args:
+            patterns: Candidate patterns
+            persona_id: The persona to check against
+
+        Returns:
+            Dictionary mapping each pattern to a score between 0.0 and 1.0
+        """
+        return {
+            pattern: freshness_from_uses(uses)
+            for pattern, uses in self.get_recent_usage_counts(
+                patterns, persona_id
+            ).items()
+        }
 
     def is_pattern_fatigued(self, pattern: str, persona_id: str) -> bool:
         """
@@ -65,33 +209,8 @@ class PatternFatigueDetector:
         Returns:
             True if the pattern is fatigued, False otherwise
         """
-        now = datetime.now()
-        seven_days_ago = now - timedelta(days=7)
-
-        if self.db_session:
-            # Query database
-            recent_uses = (
-                self.db_session.query(PatternUsage)
-                .filter(
-                    PatternUsage.pattern_id == pattern,
-                    PatternUsage.persona_id == persona_id,
-                    PatternUsage.used_at > seven_days_ago,
-                )
-                .count()
-            )
-        else:
-            # Use in-memory storage
-            key = (pattern, persona_id)
-            if key not in self._usage_history:
-                return False
-
-            recent_uses = sum(
-                1
-                for timestamp in self._usage_history[key]
-                if timestamp > seven_days_ago
-            )
-
-        return recent_uses >= 3
+        recent_uses = self.get_recent_usage_counts([pattern], persona_id)[pattern]
+        return recent_uses >= FATIGUE_THRESHOLD
 
     def get_freshness_score(self, pattern: str, persona_id: str) -> float:
         """
@@ -107,41 +226,7 @@ class PatternFatigueDetector:
         Returns:
             Freshness score between 0.0 (heavily used) and 1.0 (never used)
         """
-        now = datetime.now()
-        seven_days_ago = now - timedelta(days=7)
-
-        if self.db_session:
-            # Query database
-            recent_uses = (
-                self.db_session.query(PatternUsage)
-                .filter(
-                    PatternUsage.pattern_id == pattern,
-                    PatternUsage.persona_id == persona_id,
-                    PatternUsage.used_at > seven_days_ago,
-                )
-                .count()
-            )
-        else:
-            # Use in-memory storage
-            key = (pattern, persona_id)
-            if key not in self._usage_history:
-                return 1.0  # Maximum freshness for never-used patterns
-
-            recent_uses = sum(
-                1
-                for timestamp in self._usage_history[key]
-                if timestamp > seven_days_ago
-            )
-
-        # Calculate score: 1.0 for 0 uses, 0.0 for 3+ uses
-        if recent_uses >= 3:
-            return 0.0
-        elif recent_uses == 2:
-            return 0.25
-        elif recent_uses == 1:
-            return 0.5
-        else:
-            return 1.0
+        return self.get_freshness_scores([pattern], persona_id)[pattern]
 
     def get_recent_pattern_usage(
         self, persona_id: str, days: int = 7
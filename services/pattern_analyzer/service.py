@@ -1,4 +1,4 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
 
 from services.pattern_analyzer.pattern_fatigue_detector import PatternFatigueDetector
@@ -33,6 +33,29 @@ class PatternAnalyzerService:
             "freshness_score": freshness_score,
         }
 
+    def check_patterns_fatigue(
+        self, patterns: List[str], persona_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Check fatigue and freshness for a set of candidate patterns at once.
+
+        Args:
+            patterns: The patterns to check
+            persona_id: The persona to check against
+
+        Returns:
+            Dictionary mapping each pattern to its fatigue status and freshness score
+        """
+        scores = self.detector.get_freshness_scores(patterns, persona_id)
+        return {
+            pattern: {
+                "pattern": pattern,
+                "is_fatigued": score == 0.0,
+                "freshness_score": score,
+            }
+            for pattern, score in scores.items()
+        }
+
     def get_pattern_freshness(self, persona_id: str, pattern: str) -> float:
         """
         Get freshness score for a pattern.
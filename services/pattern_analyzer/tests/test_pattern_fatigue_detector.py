@@ -125,3 +125,22 @@ class TestPatternFatigueDetector:
         latency_ms = (end_time - start_time) * 1000
         assert latency_ms < 100, f"Latency {latency_ms:.2f}ms exceeds 100ms limit"
         assert is_fatigued is True  # Should be fatigued with 3 uses
+
+    def test_candidate_set_scored_in_one_call(self) -> None:
+        """Test freshness for a whole candidate set, including out-of-order usage."""
+        detector = PatternFatigueDetector()
+        persona_id = "test_persona_123"
+        now = datetime.now()
+
+        detector.record_pattern_usage("a", persona_id, now - timedelta(days=1))
+        detector.record_pattern_usage("b", persona_id, now - timedelta(hours=1))
+        detector.record_pattern_usage("b", persona_id, now - timedelta(days=9))
+        detector.record_pattern_usage("b", persona_id, now - timedelta(days=2))
+        for hours in (5, 3, 4, 1):
+            detector.record_pattern_usage("c", persona_id, now - timedelta(hours=hours))
+
+        scores = detector.get_freshness_scores(["a", "b", "c", "d"], persona_id)
+
+        assert scores == {"a": 0.5, "b": 0.25, "c": 0.0, "d": 1.0}
+        # Other personas are unaffected
+        assert detector.get_freshness_scores(["c"], "other") == {"c": 1.0}
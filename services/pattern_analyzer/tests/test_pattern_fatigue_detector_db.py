@@ -50,3 +50,75 @@ class TestPatternFatigueDetectorWithDB:
             .count()
         )
         assert usage_count == 3
+
+    def test_usages_committed_per_call_by_default(self, db_session):
+        """Test that each record call commits, with one commit for a batch."""
+        detector = PatternFatigueDetector(db_session=db_session)
+        now = datetime.now()
+        commits = []
+        original_commit = db_session.commit
+
+        def counting_commit():
+            commits.append(1)
+            original_commit()
+
+        db_session.commit = counting_commit
+        detector.record_pattern_usage("p0", "persona", now)
+        detector.record_pattern_usages((f"p{i}", "persona", now) for i in range(1, 5))
+        assert len(commits) == 2
+
+        db_session.rollback()
+        assert db_session.query(PatternUsage).count() == 5
+
+    def test_usage_committed_in_batches(self, db_session):
+        """Test that usages are committed once per batch, not per usage."""
+        detector = PatternFatigueDetector(db_session=db_session, flush_batch_size=3)
+        now = datetime.now()
+        commits = []
+        original_commit = db_session.commit
+
+        def counting_commit():
+            commits.append(1)
+            original_commit()
+
+        db_session.commit = counting_commit
+        for i in range(7):
+            detector.record_pattern_usage(f"p{i}", "persona", now)
+        assert len(commits) == 2
+
+        detector.flush()
+        assert len(commits) == 3
+        assert db_session.query(PatternUsage).count() == 7
+
+    def test_window_loaded_once_per_persona(self, db_session):
+        """Test that candidate checks reuse the loaded window until it is stale."""
+        now = datetime.now()
+        for days in (1, 2, 3):
+            db_session.add(
+                PatternUsage(
+                    pattern_id="hot",
+                    persona_id="persona",
+                    post_id=f"post_{days}",
+                    used_at=now - timedelta(days=days),
+                )
+            )
+        db_session.commit()
+
+        detector = PatternFatigueDetector(db_session=db_session, refresh_interval=60)
+        queries = []
+        original_query = db_session.query
+
+        def counting_query(*args, **kwargs):
+            queries.append(args)
+            return original_query(*args, **kwargs)
+
+        db_session.query = counting_query
+        for _ in range(5):
+            scores = detector.get_freshness_scores(["hot", "cold"], "persona")
+        assert scores == {"hot": 0.0, "cold": 1.0}
+        assert len(queries) == 1
+
+        # New usage is reflected without another query
+        detector.record_pattern_usage("cold", "persona", now)
+        assert detector.get_freshness_score("cold", "persona") == 0.5
+        assert len(queries) == 1
@@ -0,0 +1,177 @@
+"""Vectorized early-kill evaluation across all active monitoring sessions."""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from services.performance_monitor.early_kill import (
+    KILL_REASON,
+    KILL_THRESHOLD,
+    MIN_INTERACTIONS,
+    MONITORING_TIMEOUT_MINUTES,
+)
+from services.performance_monitor.models import VariantMonitoring
+
+
+@dataclass
+class SessionColumns:
+    """Active monitoring sessions as column arrays."""
+
+    ids: np.ndarray
+    variant_ids: np.ndarray
+    post_ids: np.ndarray
+    expected_engagement_rate: np.ndarray
+    kill_threshold: np.ndarray
+    min_interactions: np.ndarray
+    timeout_minutes: np.ndarray
+    started_at: np.ndarray  # datetime64[us]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: List[Tuple]) -> "SessionColumns":
+        """Build columns from (id, variant_id, post_id, expected_er,
+        kill_threshold, min_interactions, timeout_minutes, started_at) rows."""
+        columns = list(zip(*rows)) if rows else [()] * 8
+
+        def numeric(values, default, dtype):
+            return np.array([default if v is None else v for v in values], dtype=dtype)
+
+        return cls(
+            ids=np.array(columns[0], dtype=np.int64),
+            variant_ids=np.array(columns[1], dtype=object),
+            post_ids=np.array(columns[2], dtype=object),
+            expected_engagement_rate=numeric(columns[3], 0.0, np.float64),
+            kill_threshold=numeric(columns[4], KILL_THRESHOLD, np.float64),
+            min_interactions=numeric(columns[5], MIN_INTERACTIONS, np.int64),
+            timeout_minutes=numeric(columns[6], MONITORING_TIMEOUT_MINUTES, np.float64),
+            started_at=np.array(columns[7], dtype="datetime64[us]"),
+        )
+
+    def timed_out(self, now: datetime) -> np.ndarray:
+        """Mask of sessions whose monitoring window has expired."""
+        elapsed_minutes = (np.datetime64(now, "us") - self.started_at) / np.timedelta64(
+            1, "m"
+        )
+        return elapsed_minutes >= self.timeout_minutes
+
+
+@dataclass
+class BatchDecisions:
+    """Kill and timeout decisions for every session in a SessionColumns."""
+
+    timed_out: np.ndarray
+    killed: np.ndarray
+    missing_data: np.ndarray
+    views: np.ndarray
+    interactions: np.ndarray
+    engagement_rate: np.ndarray
+
+
+def load_active_sessions(db: Session) -> SessionColumns:
+    """Load all active monitoring sessions as column arrays in one query."""
+    rows = (
+        db.query(
+            VariantMonitoring.id,
+            VariantMonitoring.variant_id,
+            VariantMonitoring.post_id,
+            VariantMonitoring.expected_engagement_rate,
+            VariantMonitoring.kill_threshold,
+            VariantMonitoring.min_interactions,
+            VariantMonitoring.timeout_minutes,
+            VariantMonitoring.started_at,
+        )
+        .filter(VariantMonitoring.is_active.is_(True))
+        .all()
+    )
+    return SessionColumns.from_rows(rows)
+
+
+def evaluate_sessions(
+    sessions: SessionColumns,
+    performances: Dict[str, Optional[Dict[str, Any]]],
+    now: datetime,
+) -> BatchDecisions:
+    """Apply the EarlyKillMonitor rules to every session at once.
+
+    A session times out once its window has elapsed; otherwise it is killed
+    when it has at least ``min_interactions`` interactions and an engagement
+    rate below ``kill_threshold`` times the expected rate. Sessions without
+    usable performance data are left running.
+    """
+    count = len(sessions)
+    views = np.zeros(count, dtype=np.int64)
+    interactions = np.zeros(count, dtype=np.int64)
+    engagement_rate = np.zeros(count, dtype=np.float64)
+    has_data = np.zeros(count, dtype=bool)
+
+    for i, post_id in enumerate(sessions.post_ids):
+        perf = performances.get(post_id)
+        if perf and not perf.get("error"):
+            views[i] = perf["views"]
+            interactions[i] = perf["interactions"]
+            engagement_rate[i] = perf["engagement_rate"]
+            has_data[i] = True
+
+    timed_out = sessions.timed_out(now)
+    live = ~timed_out
+    killed = (
+        live
+        & has_data
+        & (interactions >= sessions.min_interactions)
+        & (
+            engagement_rate
+            < sessions.expected_engagement_rate * sessions.kill_threshold
+        )
+    )
+
+    return BatchDecisions(
+        timed_out=timed_out,
+        killed=killed,
+        missing_data=live & ~has_data,
+        views=views,
+        interactions=interactions,
+        engagement_rate=engagement_rate,
+    )
+
+
+def apply_decisions(
+    db: Session, sessions: SessionColumns, decisions: BatchDecisions, now: datetime
+) -> None:
+    """Persist decisions with one bulk UPDATE per outcome and commit."""
+    timed_out_ids = sessions.ids[decisions.timed_out].tolist()
+    if timed_out_ids:
+        db.execute(
+            update(VariantMonitoring)
+            .where(VariantMonitoring.id.in_(timed_out_ids))
+            .values(is_active=False, ended_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    killed = np.flatnonzero(decisions.killed)
+    if killed.size:
+        # ORM bulk UPDATE by primary key: a single executemany
+        db.execute(
+            update(VariantMonitoring),
+            [
+                {
+                    "id": int(sessions.ids[i]),
+                    "is_active": False,
+                    "was_killed": True,
+                    "kill_reason": KILL_REASON,
+                    "ended_at": now,
+                    "updated_at": now,
+                    "final_engagement_rate": float(decisions.engagement_rate[i]),
+                    "final_interaction_count": int(decisions.interactions[i]),
+                    "final_view_count": int(decisions.views[i]),
+                }
+                for i in killed
+            ],
+        )
+
+    db.commit()
@@ -0,0 +1,151 @@
+"""
+Early-kill evaluation benchmark.
+
+Compares the per-session ORM path (load objects, EarlyKillMonitor per row,
+flush dirty objects) with the vectorized path (column load, one numpy pass,
+bulk UPDATE) against an in-memory SQLite database.
+
+Usage:
+    python -m services.performance_monitor.benchmark [--sizes 100 1000 10000]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from services.performance_monitor.batch_evaluator import (
+    apply_decisions,
+    evaluate_sessions,
+    load_active_sessions,
+)
+from services.performance_monitor.early_kill import EarlyKillMonitor, VariantPerformance
+from services.performance_monitor.models import Base, VariantMonitoring
+
+
+def seed(db: Session, size: int, now: datetime) -> Dict[str, Dict[str, Any]]:
+    """Insert ``size`` active sessions and return synthetic performance."""
+    rng = random.Random(size)
+    rows = []
+    performances = {}
+    for i in range(size):
+        post_id = f"post_{i}"
+        rows.append(
+            {
+                "variant_id": f"variant_{i}",
+                "persona_id": f"persona_{i % 10}",
+                "post_id": post_id,
+                "expected_engagement_rate": 0.06,
+                "kill_threshold": 0.5,
+                "min_interactions": 10,
+                "timeout_minutes": 10,
+                "started_at": now - timedelta(minutes=rng.uniform(0, 12)),
+                "is_active": True,
+            }
+        )
+        performances[post_id] = {
+            "views": rng.randint(100, 1000),
+            "interactions": rng.randint(5, 50),
+            "engagement_rate": rng.uniform(0.01, 0.10),
+        }
+    db.bulk_insert_mappings(VariantMonitoring, rows)
+    db.commit()
+    return performances
+
+
+def run_per_session(
+    db: Session, performances: Dict[str, Optional[Dict[str, Any]]], now: datetime
+) -> int:
+    """The original path: one ORM object and monitor evaluation per session."""
+    monitor = EarlyKillMonitor(max_sessions=len(performances) + 1)
+    killed = 0
+    for session in db.query(VariantMonitoring).filter_by(is_active=True).all():
+        elapsed_minutes = (now - session.started_at).total_seconds() / 60
+        if elapsed_minutes >= session.timeout_minutes:
+            session.is_active = False
+            session.ended_at = now
+            continue
+
+        perf = performances[session.post_id]
+        perf_data = VariantPerformance(
+            variant_id=session.variant_id,
+            total_views=perf["views"],
+            total_interactions=perf["interactions"],
+            engagement_rate=perf["engagement_rate"],
+            last_updated=now,
+        )
+        monitor.start_monitoring(
+            variant_id=session.variant_id,
+            persona_id=session.persona_id,
+            expected_engagement_rate=session.expected_engagement_rate,
+            post_timestamp=session.started_at,
+        )
+        decision = monitor.evaluate_performance(session.variant_id, perf_data)
+        if decision and decision.should_kill:
+            killed += 1
+            session.is_active = False
+            session.was_killed = True
+            session.kill_reason = decision.reason
+            session.ended_at = now
+            session.final_engagement_rate = perf_data.engagement_rate
+            session.final_interaction_count = perf_data.total_interactions
+            session.final_view_count = perf_data.total_views
+    db.commit()
+    return killed
+
+
+def run_vectorized(
+    db: Session, performances: Dict[str, Optional[Dict[str, Any]]], now: datetime
+) -> int:
+    """The batch path used by batch_check_performance_task."""
+    sessions = load_active_sessions(db)
+    decisions = evaluate_sessions(sessions, performances, now)
+    apply_decisions(db, sessions, decisions, now)
+    return int(decisions.killed.sum())
+
+
+def benchmark(size: int) -> Dict[str, Any]:
+    """Time both paths on identical fresh databases."""
+    result: Dict[str, Any] = {"sessions": size}
+    for name, runner in (
+        ("per_session", run_per_session),
+        ("vectorized", run_vectorized),
+    ):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        now = datetime.utcnow()
+        performances = seed(db, size, now)
+
+        start = time.perf_counter()
+        killed = runner(db, performances, now)
+        result[f"{name}_ms"] = (time.perf_counter() - start) * 1000
+        result[f"{name}_killed"] = killed
+        db.close()
+        engine.dispose()
+
+    assert result["per_session_killed"] == result["vectorized_killed"]
+    result["speedup"] = result["per_session_ms"] / result["vectorized_ms"]
+    return result
+
+
+def main(sizes: List[int]) -> None:
+    print(
+        f"{'sessions':>10} {'per-session ms':>15} {'vectorized ms':>14} {'speedup':>8}"
+    )
+    for size in sizes:
+        r = benchmark(size)
+        print(
+            f"{r['sessions']:>10} {r['per_session_ms']:>15.1f} "
+            f"{r['vectorized_ms']:>14.1f} {r['speedup']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    main(parser.parse_args().sizes)
@@ -5,6 +5,12 @@ from datetime import datetime, timedelta
 from typing import Optional
 from collections import OrderedDict
 
+# Kill rules shared by EarlyKillMonitor and the vectorized batch evaluator
+MIN_INTERACTIONS = 10
+KILL_THRESHOLD = 0.5  # Fraction of expected engagement rate
+KILL_REASON = "Below 50% of expected engagement rate"
+MONITORING_TIMEOUT_MINUTES = 10
+
 
 @dataclass
 class VariantPerformance:
@@ -109,17 +115,17 @@ class EarlyKillMonitor:
         session = self.active_sessions[variant_id]
 
         # Check if we have enough interactions
-        if performance_data.total_interactions < 10:
+        if performance_data.total_interactions < MIN_INTERACTIONS:
             return None
 
         # Calculate if performance is below 50% of expected
-        threshold = session.expected_engagement_rate * 0.5
+        threshold = session.expected_engagement_rate * KILL_THRESHOLD
 
         if performance_data.engagement_rate < threshold:
             evaluation_time = time.time() - start_time
             return KillDecision(
                 should_kill=True,
-                reason="Below 50% of expected engagement rate",
+                reason=KILL_REASON,
                 evaluation_time=evaluation_time,
             )
 
@@ -133,7 +139,7 @@ class EarlyKillMonitor:
         session = self.active_sessions[variant_id]
         elapsed_time = datetime.now() - session.started_at
 
-        if elapsed_time > timedelta(minutes=10):
+        if elapsed_time > timedelta(minutes=MONITORING_TIMEOUT_MINUTES):
             session.is_active = False
             return TimeoutStatus(
                 timed_out=True, reason="10-minute monitoring window expired"
@@ -1,14 +1,23 @@
 """Celery tasks for performance monitoring."""
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 from contextlib import contextmanager
 
 from celery import Celery, shared_task
-from sqlalchemy import and_
-
-from services.performance_monitor.early_kill import EarlyKillMonitor, VariantPerformance
+from services.performance_monitor.batch_evaluator import (
+    apply_decisions,
+    evaluate_sessions,
+    load_active_sessions,
+)
+from services.performance_monitor.early_kill import (
+    KILL_REASON,
+    EarlyKillMonitor,
+    VariantPerformance,
+)
+from services.performance_monitor.metrics import EVALUATION_LATENCY
 from services.performance_monitor.models import VariantMonitoring
 from services.performance_monitor.cache import PerformanceCache
 
@@ -198,141 +207,89 @@ def check_performance_task(variant_id: str) -> Dict[str, Any]:
             return {"status": "error", "error": str(e)}
 
 
+# Killed variants per cleanup task message
+CLEANUP_BATCH_SIZE = 100
+
+
+def _get_performances(
+    cache: PerformanceCache, post_ids: List[str]
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Resolve performance for posts: one Redis pipeline, then one bulk call."""
+    performances = cache.bulk_get_performance(post_ids)
+    to_fetch = [post_id for post_id, perf in performances.items() if perf is None]
+
+    if to_fetch:
+        with ThreadsClientSync() as threads_client:
+            fresh_performances = threads_client.bulk_get_performance(to_fetch)
+
+        # Cache fresh data
+        to_cache = {}
+        for post_id, perf in zip(to_fetch, fresh_performances):
+            performances[post_id] = perf
+            if not perf.get("error"):
+                to_cache[post_id] = perf
+
+        if to_cache:
+            cache.bulk_set_performance(to_cache)
+
+    return performances
+
+
 @shared_task(name="performance_monitor.batch_check_performance")
 def batch_check_performance_task() -> Dict[str, Any]:
-    """Check all active variants in batches for better performance."""
+    """Check all active variants in one vectorized pass."""
     logger.info("Starting batch performance check")
 
     cache = PerformanceCache()
-    processed_count = 0
-    killed_count = 0
+    now = datetime.utcnow()
 
     with get_db_session() as db:
-        # Get all active monitoring sessions
-        active_sessions = (
-            db.query(VariantMonitoring)
-            .filter(
-                and_(
-                    VariantMonitoring.is_active.is_(True),
-                    VariantMonitoring.started_at
-                    >= datetime.utcnow() - timedelta(minutes=10),
-                )
-            )
-            .all()
-        )
+        sessions = load_active_sessions(db)
 
-        if not active_sessions:
+        if not len(sessions):
             logger.info("No active monitoring sessions")
             return {"status": "no_active_sessions"}
 
-        # Process in batches
-        batch_size = 50
-        monitor = EarlyKillMonitor()
+        # Only sessions still inside their window need performance data
+        live_post_ids = [
+            post_id
+            for post_id in sessions.post_ids[~sessions.timed_out(now)]
+            if post_id is not None
+        ]
+        performances = _get_performances(cache, list(dict.fromkeys(live_post_ids)))
 
-        with ThreadsClientSync() as threads_client:
-            for i in range(0, len(active_sessions), batch_size):
-                batch = active_sessions[i : i + batch_size]
-                post_ids = [s.post_id for s in batch]
-
-                # Check cache first
-                cached_performances = cache.bulk_get_performance(post_ids)
-
-                # Fetch missing data
-                to_fetch = [
-                    post_id
-                    for post_id, perf in cached_performances.items()
-                    if perf is None
-                ]
-
-                if to_fetch:
-                    fresh_performances = threads_client.bulk_get_performance(to_fetch)
-
-                    # Cache fresh data
-                    to_cache = {}
-                    for post_id, perf in zip(to_fetch, fresh_performances):
-                        if not perf.get("error"):
-                            to_cache[post_id] = perf
-                            cached_performances[post_id] = perf
-
-                    if to_cache:
-                        cache.bulk_set_performance(to_cache)
-
-                # Process each monitoring session
-                for session in batch:
-                    processed_count += 1
-
-                    # Check timeout first
-                    elapsed_minutes = (
-                        datetime.utcnow() - session.started_at
-                    ).total_seconds() / 60
-                    if elapsed_minutes >= session.timeout_minutes:
-                        session.is_active = False
-                        session.ended_at = datetime.utcnow()
-                        logger.info(
-                            f"Monitoring timed out for variant {session.variant_id}"
-                        )
-                        continue
-
-                    # Get performance data
-                    perf = cached_performances.get(session.post_id)
-                    if not perf or perf.get("error"):
-                        logger.warning(
-                            f"No performance data for variant {session.variant_id}"
-                        )
-                        continue
-
-                    # Create performance data object
-                    perf_data = VariantPerformance(
-                        variant_id=session.variant_id,
-                        total_views=perf["views"],
-                        total_interactions=perf["interactions"],
-                        engagement_rate=perf["engagement_rate"],
-                        last_updated=datetime.utcnow(),
-                    )
-
-                    # Evaluate performance
-                    monitor.start_monitoring(
-                        variant_id=session.variant_id,
-                        persona_id=session.persona_id,
-                        expected_engagement_rate=session.expected_engagement_rate,
-                        post_timestamp=session.started_at,
-                    )
-
-                    decision = monitor.evaluate_performance(
-                        session.variant_id, perf_data
-                    )
-
-                    if decision and decision.should_kill:
-                        killed_count += 1
-                        logger.info(
-                            f"Killing variant {session.variant_id}: {decision.reason}"
-                        )
-
-                        # Update monitoring record
-                        session.is_active = False
-                        session.was_killed = True
-                        session.kill_reason = decision.reason
-                        session.ended_at = datetime.utcnow()
-                        session.final_engagement_rate = perf_data.engagement_rate
-                        session.final_interaction_count = perf_data.total_interactions
-                        session.final_view_count = perf_data.total_views
-
-                        # Trigger cleanup
-                        cleanup_killed_variant_task.delay(
-                            session.variant_id, session.post_id
-                        )
-
-                        # Invalidate cache
-                        cache.invalidate(session.post_id)
-
-            # Commit all changes
-            db.commit()
+        start = time.perf_counter()
+        decisions = evaluate_sessions(sessions, performances, now)
+        EVALUATION_LATENCY.observe(time.perf_counter() - start)
+
+        apply_decisions(db, sessions, decisions, now)
+
+    killed_variants = list(
+        zip(
+            sessions.variant_ids[decisions.killed].tolist(),
+            sessions.post_ids[decisions.killed].tolist(),
+        )
+    )
+    if killed_variants:
+        logger.info(f"Killing {len(killed_variants)} variants: {KILL_REASON}")
+        cache.invalidate_many([post_id for _, post_id in killed_variants if post_id])
+        for i in range(0, len(killed_variants), CLEANUP_BATCH_SIZE):
+            cleanup_killed_variants_task.delay(
+                killed_variants[i : i + CLEANUP_BATCH_SIZE]
+            )
+
+    missing = int(decisions.missing_data.sum())
+    if missing:
+        logger.warning(f"No performance data for {missing} variants")
 
     # Schedule next batch check
     schedule_batch_check()
 
+    processed_count = len(sessions)
+    killed_count = len(killed_variants)
     logger.info(
-        f"Batch check complete: {processed_count} processed, {killed_count} killed"
+        f"Batch check complete: {processed_count} processed, {killed_count} killed, "
+        f"{int(decisions.timed_out.sum())} timed out"
     )
 
     return {"status": "complete", "processed": processed_count, "killed": killed_count}
@@ -359,24 +316,48 @@ def schedule_batch_check():
         batch_check_performance_task.apply_async(countdown=30)
 
 
+def _cleanup_variant(variant_id: str, post_id: str) -> None:
+    """Remove a killed variant from circulation."""
+    # Remove from variant pool
+    # This would integrate with your variant pool management
+
+    # Cancel scheduled posts if any
+    # This would integrate with your scheduling system
+
+    # Delete from Threads (if configured)
+    # TODO: Implement actual Threads deletion
+    logger.info(f"Would delete post {post_id} from Threads (not implemented)")
+
+
 @shared_task(name="performance_monitor.cleanup_killed_variant")
 def cleanup_killed_variant_task(variant_id: str, post_id: str) -> Dict[str, Any]:
     """Clean up a killed variant."""
     logger.info(f"Cleaning up killed variant {variant_id}")
 
     try:
-        # Remove from variant pool
-        # This would integrate with your variant pool management
-
-        # Cancel scheduled posts if any
-        # This would integrate with your scheduling system
-
-        # Delete from Threads (if configured)
-        # TODO: Implement actual Threads deletion
-        logger.info(f"Would delete post {post_id} from Threads (not implemented)")
-
+        _cleanup_variant(variant_id, post_id)
         return {"status": "cleaned_up", "variant_id": variant_id, "post_id": post_id}
 
     except Exception as e:
         logger.error(f"Error cleaning up variant {variant_id}: {e}")
         return {"status": "error", "error": str(e)}
+
+
+@shared_task(name="performance_monitor.cleanup_killed_variants")
+def cleanup_killed_variants_task(variants: List[List[str]]) -> Dict[str, Any]:
+    """Clean up a batch of killed variants given as (variant_id, post_id) pairs."""
+    logger.info(f"Cleaning up {len(variants)} killed variants")
+
+    failed = []
+    for variant_id, post_id in variants:
+        try:
+            _cleanup_variant(variant_id, post_id)
+        except Exception as e:
+            logger.error(f"Error cleaning up variant {variant_id}: {e}")
+            failed.append(variant_id)
+
+    return {
+        "status": "cleaned_up" if not failed else "partial",
+        "cleaned_up": len(variants) - len(failed),
+        "failed": failed,
+    }
@@ -0,0 +1,162 @@
+"""Tests for vectorized early-kill evaluation."""
+
+import random
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from services.performance_monitor.batch_evaluator import (
+    apply_decisions,
+    evaluate_sessions,
+    load_active_sessions,
+)
+from services.performance_monitor.early_kill import (
+    KILL_REASON,
+    EarlyKillMonitor,
+    VariantPerformance,
+)
+from services.performance_monitor.models import Base, VariantMonitoring
+
+
+@pytest.fixture
+def db():
+    """In-memory database session."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _add_session(db, i, started_at, **overrides):
+    fields = {
+        "variant_id": f"variant_{i}",
+        "persona_id": "persona_abc",
+        "post_id": f"post_{i}",
+        "expected_engagement_rate": 0.06,
+        "started_at": started_at,
+    }
+    fields.update(overrides)
+    db.add(VariantMonitoring(**fields))
+
+
+class TestEvaluateSessions:
+    """Test that the vectorized rules match EarlyKillMonitor."""
+
+    def test_decisions_match_early_kill_monitor(self, db) -> None:
+        rng = random.Random(42)
+        now = datetime.utcnow()
+        performances = {}
+        for i in range(200):
+            _add_session(db, i, now - timedelta(minutes=rng.uniform(0, 9)))
+            performances[f"post_{i}"] = {
+                "views": rng.randint(100, 1000),
+                "interactions": rng.randint(5, 20),
+                "engagement_rate": rng.uniform(0.0, 0.08),
+            }
+        db.commit()
+
+        sessions = load_active_sessions(db)
+        decisions = evaluate_sessions(sessions, performances, now)
+
+        monitor = EarlyKillMonitor()
+        for i, variant_id in enumerate(sessions.variant_ids):
+            perf = performances[sessions.post_ids[i]]
+            monitor.start_monitoring(variant_id, "persona_abc", 0.06, now)
+            decision = monitor.evaluate_performance(
+                variant_id,
+                VariantPerformance(
+                    variant_id=variant_id,
+                    total_views=perf["views"],
+                    total_interactions=perf["interactions"],
+                    engagement_rate=perf["engagement_rate"],
+                    last_updated=now,
+                ),
+            )
+            assert bool(decisions.killed[i]) == bool(decision and decision.should_kill)
+
+    def test_timeouts_and_missing_data_are_never_killed(self, db) -> None:
+        now = datetime.utcnow()
+        _add_session(db, 0, now - timedelta(minutes=11))
+        _add_session(db, 1, now - timedelta(minutes=3), timeout_minutes=2)
+        _add_session(db, 2, now)
+        db.commit()
+        low = {"views": 500, "interactions": 20, "engagement_rate": 0.001}
+
+        sessions = load_active_sessions(db)
+        decisions = evaluate_sessions(
+            sessions,
+            {"post_0": low, "post_1": low, "post_2": {"error": "not found"}},
+            now,
+        )
+
+        assert decisions.timed_out.tolist() == [True, True, False]
+        assert not decisions.killed.any()
+        assert decisions.missing_data.tolist() == [False, False, True]
+
+
+class TestApplyDecisions:
+    """Test bulk persistence of decisions."""
+
+    def test_bulk_updates_killed_and_timed_out_sessions(self, db) -> None:
+        now = datetime.utcnow()
+        _add_session(db, 0, now - timedelta(minutes=12))
+        _add_session(db, 1, now)
+        _add_session(db, 2, now)
+        db.commit()
+        performances = {
+            "post_1": {"views": 400, "interactions": 12, "engagement_rate": 0.01},
+            "post_2": {"views": 400, "interactions": 40, "engagement_rate": 0.09},
+        }
+
+        sessions = load_active_sessions(db)
+        apply_decisions(
+            db, sessions, evaluate_sessions(sessions, performances, now), now
+        )
+        db.expire_all()
+
+        rows = {r.variant_id: r for r in db.query(VariantMonitoring).all()}
+        assert rows["variant_0"].is_active is False
+        assert rows["variant_0"].was_killed is False
+        assert rows["variant_1"].is_active is False
+        assert rows["variant_1"].was_killed is True
+        assert rows["variant_1"].kill_reason == KILL_REASON
+        assert rows["variant_1"].final_interaction_count == 12
+        assert rows["variant_2"].is_active is True
+        assert len(load_active_sessions(db)) == 1
+
+
+class TestGetPerformances:
+    """Test performance lookup for the batch check."""
+
+    def test_one_pipeline_and_one_bulk_call_for_misses(self) -> None:
+        from services.performance_monitor import tasks
+
+        cache = MagicMock()
+        cache.bulk_get_performance.return_value = {
+            "post_0": {"views": 300, "interactions": 15, "engagement_rate": 0.01},
+            "post_1": None,
+            "post_2": None,
+        }
+        threads_client = MagicMock()
+        threads_client.__enter__.return_value = threads_client
+        threads_client.bulk_get_performance.return_value = [
+            {"views": 100, "interactions": 5, "engagement_rate": 0.05},
+            {"views": 0, "interactions": 0, "engagement_rate": 0.0, "error": "x"},
+        ]
+
+        with patch.object(tasks, "ThreadsClientSync", return_value=threads_client):
+            performances = tasks._get_performances(
+                cache, ["post_0", "post_1", "post_2"]
+            )
+
+        threads_client.bulk_get_performance.assert_called_once_with(
+            ["post_1", "post_2"]
+        )
+        cache.bulk_set_performance.assert_called_once_with(
+            {"post_1": performances["post_1"]}
+        )
+        assert performances["post_2"]["error"] == "x"
@@ -2,14 +2,27 @@
 # MLOps Interview Asset: Demonstrates 40% cost reduction through intelligent batching
 
 import asyncio
+import json
 import time
-from typing import List, Dict, Any
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from collections import deque
+from uuid import uuid4
+
+from services.common.metrics import record_llm_batch
 
 logger = logging.getLogger(__name__)
 
+# Lanes in the order batches are filled from
+ONLINE_LANES = ("interactive", "default")
+BULK_LANE = "bulk"
+LANES = ONLINE_LANES + (BULK_LANE,)
+
+# Rough prompt-token estimate used for the token budget
+CHARS_PER_TOKEN = 4
+
 
 @dataclass
 class BatchRequest:
@@ -22,6 +35,223 @@ class BatchRequest:
     max_tokens: int
     timestamp: float
     future: asyncio.Future
+    lane: str = "default"
+    deadline: float = 0.0  # monotonic time by which its batch must be released
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def tokens(self) -> int:
+        """Estimated prompt plus completion tokens."""
+        return len(self.prompt) // CHARS_PER_TOKEN + self.max_tokens
+
+
+class BatchBackend(ABC):
+    """Sends one released batch to a provider."""
+
+    @abstractmethod
+    async def complete(self, model: str, batch: List[BatchRequest]) -> List[Any]:
+        """
+        Return one result per request, in order.
+
+        An ``Exception`` in place of a result fails only that request.
+        """
+
+
+class PackedPromptBackend(BatchBackend):
+    """Packs the batch into one prompt and splits the reply on a separator."""
+
+    def __init__(self, call_llm: Callable[[str, str, int], Awaitable[str]]):
+        self.call_llm = call_llm
+
+    async def complete(self, model: str, batch: List[BatchRequest]) -> List[Any]:
+        if len(batch) == 1:
+            return [await self.call_llm(batch[0].prompt, model, batch[0].max_tokens)]
+
+        separator = f"---BATCH_SEPARATOR_{uuid4().hex}---"
+        combined_prompt = f"\n{separator}\n".join(req.prompt for req in batch)
+
+        # Add batch instructions
+        batch_prompt = f"""Process the following {len(batch)} independent requests.
+Separate each response with: {separator}
+
+{combined_prompt}"""
+
+        response = await self.call_llm(
+            batch_prompt, model, sum(req.max_tokens for req in batch)
+        )
+        responses = response.split(separator)
+        if len(responses) == len(batch):
+            return [text.strip() for text in responses]
+
+        # The model did not keep the separators; answer each prompt on its own
+        logger.warning(
+            f"Packed reply for {model} had {len(responses)} parts for "
+            f"{len(batch)} requests, falling back to individual calls"
+        )
+        return await asyncio.gather(
+            *[self.call_llm(req.prompt, model, req.max_tokens) for req in batch],
+            return_exceptions=True,
+        )
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """
+    Submits bulk batches as one OpenAI Batch API job (50% cheaper, async).
+
+    Suited to the bulk lane only: jobs complete within ``completion_window``,
+    not within an interactive request timeout.
+    """
+
+    TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    def __init__(
+        self,
+        client: Any = None,
+        poll_interval: float = 30.0,
+        completion_window: str = "24h",
+    ):
+        if client is None:
+            import openai
+
+            client = openai.AsyncOpenAI()
+        self.client = client
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    async def complete(self, model: str, batch: List[BatchRequest]) -> List[Any]:
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": req.request_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": model,
+                        "messages": [{"role": "user", "content": req.prompt}],
+                        "temperature": req.temperature,
+                        "max_tokens": req.max_tokens,
+                    },
+                }
+            )
+            for req in batch
+        ]
+        upload = await self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch"
+        )
+        job = await self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window=self.completion_window,
+        )
+        while job.status not in self.TERMINAL_STATUSES:
+            await asyncio.sleep(self.poll_interval)
+            job = await self.client.batches.retrieve(job.id)
+
+        if job.status != "completed" or not job.output_file_id:
+            raise RuntimeError(f"OpenAI batch {job.id} ended with status {job.status}")
+
+        content = await self.client.files.content(job.output_file_id)
+        outputs: Dict[str, Any] = {}
+        for line in content.text.splitlines():
+            item = json.loads(line)
+            choices = ((item.get("response") or {}).get("body") or {}).get("choices")
+            if choices:
+                outputs[item["custom_id"]] = choices[0]["message"]["content"]
+            else:
+                outputs[item["custom_id"]] = RuntimeError(
+                    str(item.get("error") or "no completion returned")
+                )
+
+        return [
+            outputs.get(req.request_id, RuntimeError("missing from batch output"))
+            for req in batch
+        ]
+
+
+class _ModelScheduler:
+    """Single event-driven release loop for one model's online or bulk queue."""
+
+    def __init__(
+        self,
+        processor: "BatchProcessor",
+        model: str,
+        lanes: tuple,
+        batch_size: int,
+        token_budget: float,
+        backend: BatchBackend,
+    ):
+        self.processor = processor
+        self.model = model
+        self.lanes: Dict[str, deque] = {lane: deque() for lane in lanes}
+        self.batch_size = batch_size
+        self.token_budget = token_budget
+        self.backend = backend
+        self.pending_tokens = 0
+        self.wakeup = asyncio.Event()
+        self.task = asyncio.create_task(self._run())
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self.lanes.values())
+
+    def submit(self, request: BatchRequest) -> None:
+        self.lanes[request.lane].append(request)
+        self.pending_tokens += request.tokens
+        self.wakeup.set()
+
+    def _next_deadline(self) -> Optional[float]:
+        deadlines = [req.deadline for queue in self.lanes.values() for req in queue]
+        return min(deadlines) if deadlines else None
+
+    def _release_reason(self, now: float) -> Optional[str]:
+        """Whichever trigger fires first: size, token budget or a deadline."""
+        if not len(self):
+            return None
+        if len(self) >= self.batch_size:
+            return "size"
+        if self.pending_tokens >= self.token_budget:
+            return "tokens"
+        if now >= self._next_deadline():
+            return "deadline"
+        return None
+
+    def _take_batch(self) -> List[BatchRequest]:
+        """Fill a batch from the highest-priority lanes within the budgets."""
+        batch: List[BatchRequest] = []
+        tokens = 0
+        for queue in self.lanes.values():
+            while queue and len(batch) < self.batch_size:
+                request = queue[0]
+                if batch and tokens + request.tokens > self.token_budget:
+                    return batch
+                queue.popleft()
+                self.pending_tokens -= request.tokens
+                if request.future.done():
+                    continue  # caller timed out or was cancelled
+                batch.append(request)
+                tokens += request.tokens
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            reason = self._release_reason(now)
+            if reason is None:
+                self.wakeup.clear()
+                deadline = self._next_deadline()
+                timeout = None if deadline is None else max(0.0, deadline - now)
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Back-pressure: while batches are in flight the queue keeps filling
+            await self.processor._inflight.acquire()
+            batch = self._take_batch()
+            if not batch:
+                self.processor._inflight.release()
+                continue
+            self.processor._dispatch(self, batch, reason)
 
 
 class BatchProcessor:
@@ -29,10 +259,12 @@ class BatchProcessor:
     Production-grade LLM request batcher achieving 40% cost reduction.
 
     Key optimizations:
-    - Intelligent batching with configurable size and wait time
-    - Model-aware grouping (GPT-4 vs GPT-3.5 batches)
-    - Priority queue for time-sensitive requests
-    - Automatic fallback for timeout prevention
+    - One event-driven scheduler per model (any model name), no polling
+    - Batches release on size, oldest deadline or token budget, whichever
+      comes first
+    - Priority lanes: interactive, default and bulk (bulk batches can go to
+      the OpenAI Batch API)
+    - One provider call per batch, falling back to per-prompt calls
 
     Interview metrics:
     - Cost reduction: 40% ($0.014 → $0.008 per 1k tokens)
@@ -42,38 +274,68 @@ class BatchProcessor:
     """
 
     def __init__(
-        self, batch_size: int = 5, wait_time_ms: int = 100, max_wait_time_ms: int = 500
+        self,
+        batch_size: int = 5,
+        wait_time_ms: int = 100,
+        max_wait_time_ms: int = 500,
+        token_budget: int = 12000,
+        bulk_batch_size: int = 500,
+        bulk_max_wait_ms: int = 60000,
+        max_inflight_batches: int = 10,
+        request_timeout: float = 10.0,
+        backend: Optional[BatchBackend] = None,
+        bulk_backend: Optional[BatchBackend] = None,
     ):
         """
         Initialize batch processor with production settings.
 
         Args:
             batch_size: Maximum requests per batch
-            wait_time_ms: Time to wait for batch to fill
-            max_wait_time_ms: Maximum wait before forcing batch
+            wait_time_ms: Maximum queue wait for interactive (priority) requests
+            max_wait_time_ms: Maximum queue wait for default requests
+            token_budget: Estimated tokens that release a batch early
+            bulk_batch_size: Maximum requests per bulk batch
+            bulk_max_wait_ms: Maximum queue wait for bulk requests
+            max_inflight_batches: Concurrent provider calls across all models
+            request_timeout: Seconds to wait for a response once released
+            backend: Provider for online batches (packed prompt by default)
+            bulk_backend: Provider for bulk batches (defaults to ``backend``)
         """
         self.batch_size = batch_size
-        self.wait_time = wait_time_ms / 1000  # Convert to seconds
-        self.max_wait_time = max_wait_time_ms / 1000
-
-        # Separate queues for different models
-        self.queues = {"gpt-4": deque(), "gpt-3.5-turbo": deque(), "gpt-4o": deque()}
+        self.token_budget = token_budget
+        self.bulk_batch_size = bulk_batch_size
+        self.request_timeout = request_timeout
+        self.lane_max_wait = {
+            "interactive": wait_time_ms / 1000,  # Convert to seconds
+            "default": max_wait_time_ms / 1000,
+            BULK_LANE: bulk_max_wait_ms / 1000,
+        }
+        self.backend = backend or PackedPromptBackend(self._call_llm)
+        self.bulk_backend = bulk_backend or self.backend
 
-        # Processing locks for each model
-        self.locks = {model: asyncio.Lock() for model in self.queues}
+        # One scheduler per (model, online|bulk), created on first request
+        self.schedulers: Dict[tuple, _ModelScheduler] = {}
+        self._max_inflight_batches = max_inflight_batches
+        self._inflight_semaphore: Optional[asyncio.Semaphore] = None
+        self._batch_tasks: set = set()
 
         # Metrics tracking
         self.metrics = {
             "total_requests": 0,
             "total_batches": 0,
+            "batched_requests": 0,
             "total_tokens_saved": 0,
             "total_cost_saved_usd": 0,
-            "avg_batch_size": 0,
             "avg_wait_time_ms": 0,
+            "avg_fill_ratio": 0,
+            "release_reasons": {"size": 0, "tokens": 0, "deadline": 0},
         }
 
-        # Start background processor
-        self.processor_task = None
+    @property
+    def _inflight(self) -> asyncio.Semaphore:
+        if self._inflight_semaphore is None:
+            self._inflight_semaphore = asyncio.Semaphore(self._max_inflight_batches)
+        return self._inflight_semaphore
 
     async def add_request(
         self,
@@ -82,6 +344,7 @@ class BatchProcessor:
         temperature: float = 0.7,
         max_tokens: int = 500,
         priority: bool = False,
+        lane: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Add request to batch queue and await response.
@@ -91,93 +354,99 @@ class BatchProcessor:
             model: Model to use
             temperature: Generation temperature
             max_tokens: Maximum tokens
-            priority: If True, process immediately
+            priority: Shorthand for the interactive lane
+            lane: "interactive", "default" or "bulk"
 
         Returns:
             Generated response
         """
+        lane = lane or ("interactive" if priority else "default")
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane {lane!r}; expected one of {LANES}")
+
         # Create future for this request
-        future = asyncio.Future()
+        future = asyncio.get_running_loop().create_future()
+        max_wait = self.lane_max_wait[lane]
 
         # Create request object
         request = BatchRequest(
-            request_id=f"{model}_{time.time()}",
+            request_id=f"{model}_{uuid4().hex[:12]}",
             prompt=prompt,
             model=model,
             temperature=temperature,
             max_tokens=max_tokens,
             timestamp=time.time(),
             future=future,
+            lane=lane,
+            deadline=time.monotonic() + max_wait,
         )
 
-        # Add to appropriate queue
-        model_key = self._get_model_key(model)
-
-        if priority:
-            # Priority requests go to front
-            self.queues[model_key].appendleft(request)
-        else:
-            self.queues[model_key].append(request)
-
+        self._scheduler(model, bulk=lane == BULK_LANE).submit(request)
         self.metrics["total_requests"] += 1
 
-        # Trigger processing
-        asyncio.create_task(self._process_queue(model_key))
-
-        # Wait for result
+        # Bulk jobs can legitimately take hours; online requests get a bound
+        timeout = None if lane == BULK_LANE else max_wait + self.request_timeout
         try:
-            result = await asyncio.wait_for(future, timeout=10.0)
-            return result
+            return await asyncio.wait_for(future, timeout=timeout)
         except asyncio.TimeoutError:
             logger.error(f"Request timeout for {request.request_id}")
             return {"error": "Request timeout", "request_id": request.request_id}
 
-    def _get_model_key(self, model: str) -> str:
-        """Map model to queue key."""
-        if "gpt-4" in model.lower():
-            return "gpt-4o" if "gpt-4o" in model.lower() else "gpt-4"
-        return "gpt-3.5-turbo"
-
-    async def _process_queue(self, model_key: str):
-        """Process requests for a specific model queue."""
-        async with self.locks[model_key]:
-            queue = self.queues[model_key]
-
-            if not queue:
-                return
-
-            # Wait for batch to fill or timeout
-            start_wait = time.time()
-
-            while len(queue) < self.batch_size:
-                if time.time() - start_wait > self.max_wait_time:
-                    break
-
-                await asyncio.sleep(self.wait_time)
-
-                # Check if oldest request is about to timeout
-                if queue and time.time() - queue[0].timestamp > 8.0:
-                    break
-
-            # Process batch
-            batch_size = min(len(queue), self.batch_size)
-            if batch_size == 0:
-                return
-
-            batch = [queue.popleft() for _ in range(batch_size)]
-
-            # Update metrics
-            wait_time_ms = (time.time() - batch[0].timestamp) * 1000
-            self.metrics["total_batches"] += 1
-            self.metrics["avg_wait_time_ms"] = (
-                self.metrics["avg_wait_time_ms"] * (self.metrics["total_batches"] - 1)
-                + wait_time_ms
-            ) / self.metrics["total_batches"]
-
-            # Process batch
-            await self._process_batch(batch, model_key)
+    def _scheduler(self, model: str, bulk: bool) -> _ModelScheduler:
+        key = (model, bulk)
+        scheduler = self.schedulers.get(key)
+        if scheduler is None:
+            if bulk:
+                scheduler = _ModelScheduler(
+                    self,
+                    model,
+                    (BULK_LANE,),
+                    self.bulk_batch_size,
+                    float("inf"),
+                    self.bulk_backend,
+                )
+            else:
+                scheduler = _ModelScheduler(
+                    self,
+                    model,
+                    ONLINE_LANES,
+                    self.batch_size,
+                    self.token_budget,
+                    self.backend,
+                )
+            self.schedulers[key] = scheduler
+        return scheduler
+
+    def _dispatch(
+        self, scheduler: _ModelScheduler, batch: List[BatchRequest], reason: str
+    ) -> None:
+        """Record release metrics and send the batch without blocking the loop."""
+        now = time.monotonic()
+        waits = [(req.lane, now - req.enqueued_at) for req in batch]
+        fill_ratio = len(batch) / scheduler.batch_size
+
+        self.metrics["total_batches"] += 1
+        self.metrics["batched_requests"] += len(batch)
+        self.metrics["release_reasons"][reason] += 1
+        batches = self.metrics["total_batches"]
+        self.metrics["avg_wait_time_ms"] += (
+            sum(wait for _, wait in waits) / len(waits) * 1000
+            - self.metrics["avg_wait_time_ms"]
+        ) / batches
+        self.metrics["avg_fill_ratio"] += (
+            fill_ratio - self.metrics["avg_fill_ratio"]
+        ) / batches
+        record_llm_batch(scheduler.model, reason, fill_ratio, waits)
+
+        task = asyncio.create_task(
+            self._process_batch(batch, scheduler.model, scheduler.backend)
+        )
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
 
-    async def _process_batch(self, batch: List[BatchRequest], model_key: str):
+    async def _process_batch(
+        self, batch: List[BatchRequest], model: str, backend: BatchBackend
+    ):
         """
         Process a batch of requests with a single LLM call.
 
@@ -185,31 +454,10 @@ class BatchProcessor:
         intelligent request batching while maintaining <100ms overhead"
         """
         try:
-            # Combine prompts with separator
-            separator = "\n---BATCH_SEPARATOR_" + str(time.time()) + "---\n"
-            combined_prompt = separator.join([req.prompt for req in batch])
-
-            # Add batch instructions
-            batch_prompt = f"""Process the following {len(batch)} independent requests.
-Separate each response with: {separator}
-
-{combined_prompt}"""
-
-            # Single API call for entire batch
             start_time = time.time()
-
-            # Mock API call (replace with actual OpenAI call)
-            response = await self._call_llm(
-                prompt=batch_prompt,
-                model=model_key,
-                max_tokens=sum(req.max_tokens for req in batch),
-            )
-
+            results = await backend.complete(model, batch)
             api_time = time.time() - start_time
 
-            # Split responses
-            responses = response.split(separator)
-
             # Calculate cost savings
             tokens_saved = self._calculate_tokens_saved(batch)
             cost_saved = tokens_saved * 0.000002  # Approximate cost per token
@@ -218,20 +466,27 @@ Separate each response with: {separator}
             self.metrics["total_cost_saved_usd"] += cost_saved
 
             # Resolve futures
-            for request, response_text in zip(batch, responses):
+            for request, result in zip(batch, results):
+                if request.future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    request.future.set_result(
+                        {"error": str(result), "request_id": request.request_id}
+                    )
+                    continue
                 request.future.set_result(
                     {
-                        "response": response_text.strip(),
+                        "response": result,
                         "request_id": request.request_id,
                         "batch_size": len(batch),
                         "api_time_ms": api_time * 1000,
                         "tokens_saved": tokens_saved // len(batch),
-                        "model": model_key,
+                        "model": model,
                     }
                 )
 
             logger.info(
-                f"Processed batch of {len(batch)} requests for {model_key} "
+                f"Processed batch of {len(batch)} requests for {model} "
                 f"in {api_time:.2f}s, saved {tokens_saved} tokens (${cost_saved:.4f})"
             )
 
@@ -239,9 +494,12 @@ Separate each response with: {separator}
             logger.error(f"Batch processing error: {e}")
             # Fallback: resolve all futures with error
             for request in batch:
-                request.future.set_result(
-                    {"error": str(e), "request_id": request.request_id}
-                )
+                if not request.future.done():
+                    request.future.set_result(
+                        {"error": str(e), "request_id": request.request_id}
+                    )
+        finally:
+            self._inflight.release()
 
     async def _call_llm(self, prompt: str, model: str, max_tokens: int) -> str:
         """
@@ -251,6 +509,9 @@ Separate each response with: {separator}
         # This is a mock - replace with actual implementation
         await asyncio.sleep(0.5)  # Simulate API latency
 
+        if "---BATCH_SEPARATOR_" not in prompt:
+            return f"Generated response 1 for {model}"
+
         # Mock response
         responses = []
         for i in range(prompt.count("---BATCH_SEPARATOR_")):
@@ -281,22 +542,35 @@ Separate each response with: {separator}
 
         return max(0, individual_tokens - batch_tokens)
 
+    async def close(self) -> None:
+        """Stop the schedulers and wait for in-flight batches."""
+        for scheduler in self.schedulers.values():
+            scheduler.task.cancel()
+        await asyncio.gather(
+            *[s.task for s in self.schedulers.values()], return_exceptions=True
+        )
+        await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        self.schedulers.clear()
+
     def get_metrics(self) -> Dict[str, Any]:
         """Get batch processor performance metrics."""
         return {
             "total_requests": self.metrics["total_requests"],
             "total_batches": self.metrics["total_batches"],
             "avg_batch_size": (
-                self.metrics["total_requests"] / self.metrics["total_batches"]
+                self.metrics["batched_requests"] / self.metrics["total_batches"]
                 if self.metrics["total_batches"] > 0
                 else 0
             ),
+            "avg_fill_ratio": self.metrics["avg_fill_ratio"],
+            "release_reasons": dict(self.metrics["release_reasons"]),
+            "queued_requests": sum(len(s) for s in self.schedulers.values()),
             "total_tokens_saved": self.metrics["total_tokens_saved"],
             "total_cost_saved_usd": self.metrics["total_cost_saved_usd"],
             "avg_wait_time_ms": self.metrics["avg_wait_time_ms"],
             "efficiency_ratio": (
-                1 - (self.metrics["total_batches"] / self.metrics["total_requests"])
-                if self.metrics["total_requests"] > 0
+                1 - (self.metrics["total_batches"] / self.metrics["batched_requests"])
+                if self.metrics["batched_requests"] > 0
                 else 0
             ),
         }
@@ -316,12 +590,12 @@ def get_batch_processor() -> BatchProcessor:
 
 # Interview showcase metrics
 BATCH_OPTIMIZATION_METRICS = {
-    "implementation": "Intelligent request batching with model-aware queues",
+    "implementation": "Event-driven per-model scheduler with priority lanes",
     "batch_size": "5 requests per batch (configurable)",
-    "wait_strategy": "100ms wait with 500ms max timeout",
+    "wait_strategy": "Release on size, oldest deadline or token budget",
     "cost_reduction": "40% ($0.014 → $0.008 per 1k tokens)",
     "api_call_reduction": "80% (5 requests → 1 call)",
     "latency_overhead": "<100ms for 5x cost savings",
     "monthly_savings": "$15,000 at 1M requests/month",
-    "fallback": "Automatic single-request processing on timeout",
+    "fallback": "Per-prompt calls when a packed reply cannot be split",
 }
@@ -0,0 +1,163 @@
+"""
+Persona runtime load test.
+
+Drives ``POST /run`` in process with the LLM and moderation calls replaced
+by fixed-latency stubs, so everything measured beyond the stub latency is
+the runtime's own per-request overhead (DAG build/compile, graph execution,
+SSE framing). Compares:
+
+- uncached: the DAG is rebuilt and compiled on every request (old behaviour)
+- cached: the compiled sequential DAG is reused per persona
+- parallel: the cached parallel DAG (overlapped guard-rail, speculative body)
+
+End-to-end percentiles are read back from ``GET /latency``.
+
+It also times creating an ``httpx.AsyncClient`` per viral-engine call against
+reusing the shared pooled client.
+
+Usage:
+    python -m services.persona_runtime.load_test [--requests 200] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+from services.persona_runtime import runtime
+from services.persona_runtime.main import app, latency_tracker
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def run_load(
+    mode: str,
+    requests: int,
+    concurrency: int,
+    llm_latency: float,
+    moderation_latency: float,
+) -> Dict[str, Any]:
+    """Send ``requests`` runs and return overhead percentiles in ms."""
+
+    async def fake_llm(model: str, prompt: str, content_type: str = "unknown") -> str:
+        await asyncio.sleep(llm_latency)
+        return f"{content_type} from {model}"
+
+    async def fake_moderate(content: str) -> bool:
+        await asyncio.sleep(moderation_latency)
+        return True
+
+    runtime._llm = fake_llm
+    runtime._moderate = fake_moderate
+    runtime.invalidate_dag_cache()
+
+    dag_mode = "parallel" if mode == "parallel" else "sequential"
+    if dag_mode == "parallel":
+        # Hook and speculative body overlap, then both checks run together
+        llm_time = llm_latency + moderation_latency
+    else:
+        # Hook, body and both moderation calls run back to back
+        llm_time = 2 * llm_latency + 2 * moderation_latency
+    overheads: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as cli:
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                if mode == "uncached":
+                    runtime.invalidate_dag_cache()
+                start = time.perf_counter()
+                res = await cli.post(
+                    "/run",
+                    json={
+                        "persona_id": "ai-jesus",
+                        "input": f"topic {i}",
+                        "mode": dag_mode,
+                    },
+                    headers={"accept": "text/event-stream"},
+                )
+                elapsed = time.perf_counter() - start
+                if '"draft"' not in res.text:
+                    raise RuntimeError(f"unexpected response: {res.text[:200]}")
+                overheads.append((elapsed - llm_time) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[one(i) for i in range(requests)])
+        wall = time.perf_counter() - start
+
+    return {
+        "mode": mode,
+        "requests_per_s": requests / wall,
+        "overhead_p50_ms": statistics.median(overheads),
+        "overhead_p95_ms": _percentile(overheads, 0.95),
+    }
+
+
+async def time_http_clients(calls: int) -> Dict[str, float]:
+    """Per-call cost of a fresh AsyncClient vs the shared pooled client (ms)."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        async with httpx.AsyncClient():
+            pass
+    per_call = (time.perf_counter() - start) / calls * 1000
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        runtime.get_http_client()
+    shared = (time.perf_counter() - start) / calls * 1000
+    await runtime.close_http_client()
+    return {"client_per_call_ms": per_call, "shared_client_ms": shared}
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(f"{'mode':>9} {'req/s':>8} {'overhead p50 ms':>16} {'overhead p95 ms':>16}")
+    for mode in ("uncached", "cached", "parallel"):
+        r = await run_load(
+            mode,
+            args.requests,
+            args.concurrency,
+            args.llm_latency,
+            args.moderation_latency,
+        )
+        print(
+            f"{r['mode']:>9} {r['requests_per_s']:>8.1f} "
+            f"{r['overhead_p50_ms']:>16.2f} {r['overhead_p95_ms']:>16.2f}"
+        )
+
+    print("\nend-to-end latency (GET /latency):")
+    for mode, stats in latency_tracker.snapshot()["ai-jesus"].items():
+        print(
+            f"{mode:>11}: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+            f"p99 {stats['p99_ms']:.1f} ms over {stats['count']} runs"
+        )
+
+    clients = await time_http_clients(50)
+    print(
+        f"\nviral-engine client setup: {clients['client_per_call_ms']:.2f} ms "
+        f"per call with a new AsyncClient, "
+        f"{clients['shared_client_ms']:.4f} ms with the shared pool"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="persona_runtime load test")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument(
+        "--llm-latency", type=float, default=0.05, help="stub LLM latency (s)"
+    )
+    parser.add_argument(
+        "--moderation-latency",
+        type=float,
+        default=0.02,
+        help="stub moderation latency (s)",
+    )
+    asyncio.run(main(parser.parse_args()))
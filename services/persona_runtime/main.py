@@ -3,35 +3,82 @@ from __future__ import annotations
 
 import json
 import time
-from typing import Any, AsyncIterator
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Literal
 
 from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel, Field
 from sse_starlette.sse import EventSourceResponse
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
+from services.common.ai_metrics import maybe_start_sketch_publisher
 from services.common.metrics import (
     maybe_start_metrics_server,
     record_content_generation_latency,
     record_business_metric,
 )
 
-from .runtime import build_dag_from_persona
+from .runtime import DAG_MODE, close_http_client, get_dag
 
 maybe_start_metrics_server()
+maybe_start_sketch_publisher()
 
-api = FastAPI(title="persona-runtime")
+
+class PersonaLatencyTracker:
+    """Rolling end-to-end latency percentiles per persona and DAG mode."""
+
+    def __init__(self, window_size: int = 1000):
+        self.window_size = window_size
+        self._samples: dict[tuple[str, str], deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.window_size)
+        )
+
+    def record(self, persona_id: str, mode: str, seconds: float) -> None:
+        self._samples[(persona_id, mode)].append(seconds * 1000)
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float]]]:
+        """Return ``{persona_id: {mode: {count, p50_ms, p95_ms, p99_ms}}}``."""
+        result: dict[str, dict[str, dict[str, float]]] = defaultdict(dict)
+        for (persona_id, mode), samples in self._samples.items():
+            ordered = sorted(samples)
+            result[persona_id][mode] = {
+                "count": len(ordered),
+                **{
+                    f"p{pct}_ms": ordered[
+                        min(len(ordered) - 1, len(ordered) * pct // 100)
+                    ]
+                    for pct in (50, 95, 99)
+                },
+            }
+        return dict(result)
+
+
+latency_tracker = PersonaLatencyTracker()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    await close_http_client()
+
+
+api = FastAPI(title="persona-runtime", lifespan=lifespan)
 app = api
 
 
 class RunRequest(BaseModel):
     persona_id: str = Field(..., examples=["ai-jesus"])
     input: str = Field(..., examples=["Write me a tweet about hope"])
+    mode: Literal["sequential", "parallel"] | None = Field(
+        None, description="DAG execution mode (defaults to PERSONA_DAG_MODE)"
+    )
 
 
 @api.post("/run")
 async def run(req: RunRequest) -> EventSourceResponse:
-    dag = build_dag_from_persona(req.persona_id)
+    mode = req.mode or DAG_MODE
+    dag = get_dag(req.persona_id, mode)
     if dag is None:
         raise HTTPException(
             status_code=404, detail=f"persona {req.persona_id!r} not found"
@@ -42,6 +89,7 @@ async def run(req: RunRequest) -> EventSourceResponse:
         start_time = time.time()
         hook_start = None
         body_start = None
+        body_end = None
 
         def _extract_json(state: Any) -> str | None:
             """
@@ -68,23 +116,26 @@ async def run(req: RunRequest) -> EventSourceResponse:
             return None
 
         async for st in dag.astream({"text": req.input}):
-            # Track phase transitions
-            if hook_start is None and "hook" in str(st):
+            # Each chunk is {node_name: update}; time phases on node completion
+            if "ingest" in st:
                 hook_start = time.time()
-            if body_start is None and "body" in str(st):
+            elif "hook_llm" in st:
                 body_start = time.time()
                 if hook_start:
                     record_content_generation_latency(
                         req.persona_id, "hook", body_start - hook_start
                     )
+            elif "body_llm" in st:
+                body_end = time.time()
 
             if (msg := _extract_json(st)) is not None:
                 # Record final metrics
                 total_time = time.time() - start_time
                 record_content_generation_latency(req.persona_id, "total", total_time)
+                latency_tracker.record(req.persona_id, mode, total_time)
                 if body_start:
                     record_content_generation_latency(
-                        req.persona_id, "body", time.time() - body_start
+                        req.persona_id, "body", (body_end or time.time()) - body_start
                     )
 
                 # Track successful generation
@@ -103,6 +154,12 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@api.get("/latency")
+async def latency() -> dict[str, Any]:
+    """End-to-end latency percentiles per persona and DAG mode."""
+    return latency_tracker.snapshot()
+
+
 @api.get("/metrics")
 async def metrics() -> Response:
     """Expose Prometheus metrics."""
@@ -12,8 +12,10 @@ Extras for unit/CI
 
 from __future__ import annotations
 
+import asyncio
 import os
 import re
+import time
 from types import SimpleNamespace
 from typing import Any, NotRequired, TypedDict
 
@@ -24,6 +26,7 @@ from langgraph.graph import END, START, StateGraph
 
 from services.common.metrics import (
     LLM_TOKENS_TOTAL,
+    record_content_generation_latency,
     record_error,
     record_hourly_openai_cost,
     record_latency,
@@ -36,6 +39,13 @@ from services.common.ai_safety import ai_security
 VIRAL_ENGINE_URL = os.getenv("VIRAL_ENGINE_URL")
 VIRAL_ENGINE_AVAILABLE = bool(VIRAL_ENGINE_URL)
 
+# Shared pool for calls to the viral engine; keep-alive avoids a TCP/TLS
+# handshake per request
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+HTTP_TIMEOUT = 5.0
+
 if VIRAL_ENGINE_AVAILABLE:
     print(f"[VIRAL] ViralHookEngine HTTP client available at {VIRAL_ENGINE_URL}")
 else:
@@ -84,6 +94,12 @@ openai_client = openai.AsyncOpenAI(api_key=OFFLINE_MARKER if _OFFLINE else _RAW_
 HOOK_MODEL = os.getenv("HOOK_MODEL", "gpt-4o")
 BODY_MODEL = os.getenv("BODY_MODEL", "gpt-3.5-turbo-0125")
 
+# "sequential" keeps one node per step; "parallel" overlaps hook, body and
+# guard-rail (see build_dag_from_persona)
+DAG_MODES = ("sequential", "parallel")
+DAG_MODE = os.getenv("PERSONA_DAG_MODE", "sequential")
+SPECULATIVE_BODY = os.getenv("SPECULATIVE_BODY", "1") == "1"
+
 GUARD_REGEX = re.compile(r"\b(suicide|bomb|kill)\b", re.I)
 
 _PERSONA_DB = {
@@ -92,6 +108,13 @@ _PERSONA_DB = {
 }
 
 
+_http_client: httpx.AsyncClient | None = None
+
+# Compiled DAGs per (persona, mode), built on first use, with the persona
+# config they were built from
+_DAG_CACHE: dict[tuple[str, str], tuple[dict[str, Any], Any]] = {}
+
+
 # ───────────────────────────── state type ──────────────────────────────
 class FlowState(TypedDict, total=False):
     text: str
@@ -99,6 +122,22 @@ class FlowState(TypedDict, total=False):
 
 
 # ─────────────────────────── helper funcs ──────────────────────────────
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled HTTP client (created on first use)."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client on shutdown."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 async def _llm(model: str, prompt: str, content_type: str = "unknown") -> str:
     """One-shot OpenAI call with enhanced metrics (returns stub when offline)."""
     if _MOCK_MODE:
@@ -261,11 +300,135 @@ async def _moderate(content: str) -> bool:
     return not any(cats.values())
 
 
+# ───────────────────────── shared node steps ───────────────────────────
+async def _viral_hook(persona_id: str, base_content: str) -> str | None:
+    """Return a viral-engine hook above the quality threshold, else ``None``."""
+    if not (VIRAL_ENGINE_AVAILABLE and VIRAL_ENGINE_URL):
+        return None
+    try:
+        with record_latency("viral_hook_optimization"):
+            response = await get_http_client().post(
+                f"{VIRAL_ENGINE_URL}/optimize-hook",
+                json={
+                    "persona_id": persona_id,
+                    "base_content": base_content,
+                },
+            )
+            response.raise_for_status()
+            viral_result = response.json()
+
+            # Use viral hook if it meets quality threshold
+            if viral_result["expected_engagement_rate"] > 0.06:  # 6% threshold
+                print(
+                    f"[VIRAL] Using viral hook: {viral_result['selected_pattern']} (ER: {viral_result['expected_engagement_rate']:.3f})"
+                )
+                return str(viral_result["optimized_hooks"][0]["content"])
+            print(
+                f"[VIRAL] Viral hook below threshold ({viral_result['expected_engagement_rate']:.3f}), falling back to LLM"
+            )
+
+    except Exception as e:
+        print(f"[VIRAL] Hook optimization failed: {e}, falling back to LLM")
+        record_error("persona_runtime", "viral_hook_error", "error")
+    return None
+
+
+async def _generate_hook(persona_id: str, base_content: str) -> tuple[str, bool]:
+    """Return ``(hook, is_viral)``; falls back to the LLM like the sequential DAG."""
+    hook = await _viral_hook(persona_id, base_content)
+    is_viral = hook is not None
+
+    # Fall back to LLM if viral hook not available or below threshold
+    if hook is None:
+        hook = await _llm(HOOK_MODEL, base_content, "hook")
+        print("[VIRAL] Using LLM-generated hook")
+
+    # Record content quality metrics
+    quality_score = _calculate_content_quality(hook, "hook")
+    update_content_quality(persona_id, "hook", quality_score)
+    return hook, is_viral
+
+
+async def _generate_body(persona_id: str, seed: str) -> str:
+    """Write the post body from *seed* (the hook, or the raw input)."""
+    body = await _llm(BODY_MODEL, f"{seed}\n\nWrite a detailed post:", "body")
+
+    # Record content quality metrics
+    quality_score = _calculate_content_quality(body, "body")
+    update_content_quality(persona_id, "body", quality_score)
+    return body
+
+
+def _record_combined_quality(persona_id: str, hook: str, body: str) -> None:
+    combined_quality = (
+        _calculate_content_quality(hook, "hook")
+        + _calculate_content_quality(body, "body")
+    ) / 2
+    update_content_quality(persona_id, "combined", combined_quality)
+
+
+async def _part_is_safe(part: str, txt: str) -> bool:
+    """Moderation plus content-safety check for one draft part."""
+    # Original moderation check
+    if not await _moderate(txt):
+        return False
+
+    # Additional content safety check
+    safety_check = ai_security.check_content_safety(txt)
+    if not safety_check["safe"]:
+        print(f"🚨 Content safety violation in {part}: {safety_check['violations']}")
+        return False
+    return True
+
+
 # ─────────────────────────── DAG factory ───────────────────────────────
-def build_dag_from_persona(persona_id: str) -> Any | None:
+def get_dag(persona_id: str, mode: str | None = None) -> Any | None:
+    """
+    Return the compiled DAG for *persona_id*, compiling it only once.
+
+    The DAG is rebuilt when the persona's entry in ``_PERSONA_DB`` changes,
+    so persona updates take effect without an explicit invalidation.
+    """
+    key = (persona_id, mode or DAG_MODE)
+    cfg = _PERSONA_DB.get(persona_id)
+    if cfg is None:
+        _DAG_CACHE.pop(key, None)
+        return None
+    snapshot = dict(vars(cfg))
+    cached = _DAG_CACHE.get(key)
+    if cached is not None and cached[0] == snapshot:
+        return cached[1]
+    dag = build_dag_from_persona(persona_id, key[1])
+    if dag is not None:
+        _DAG_CACHE[key] = (snapshot, dag)
+    return dag
+
+
+def invalidate_dag_cache(persona_id: str | None = None) -> None:
+    """Drop the cached DAGs for *persona_id* (or all personas)."""
+    if persona_id is None:
+        _DAG_CACHE.clear()
+        return
+    for key in [k for k in _DAG_CACHE if k[0] == persona_id]:
+        del _DAG_CACHE[key]
+
+
+def build_dag_from_persona(persona_id: str, mode: str = "sequential") -> Any | None:
+    """
+    Build the persona DAG.
+
+    ``sequential`` runs ingest → hook_llm → body_llm → guardrail → format.
+    ``parallel`` replaces the middle three nodes with a single ``draft`` node
+    that moderates the hook while the body is written, checks all parts
+    concurrently and (with ``SPECULATIVE_BODY``) starts the body from the raw
+    input while the hook is in flight, restarting it only if the viral engine
+    returns a hook.
+    """
     cfg = _PERSONA_DB.get(persona_id)
     if cfg is None:
         return None
+    if mode not in DAG_MODES:
+        raise ValueError(f"unknown DAG mode {mode!r}; expected one of {DAG_MODES}")
 
     dag: StateGraph[Any] = StateGraph(FlowState)
 
@@ -275,93 +438,72 @@ def build_dag_from_persona(persona_id: str) -> Any | None:
 
     # 2️⃣ hook LLM (enhanced with viral patterns)
     async def hook_llm(state: FlowState) -> FlowState:
-        base_content = state.get("text", "")
-        hook = None
-
-        # Try viral hook optimization first
-        if VIRAL_ENGINE_AVAILABLE and VIRAL_ENGINE_URL:
-            try:
-                with record_latency("viral_hook_optimization"):
-                    async with httpx.AsyncClient() as client:
-                        response = await client.post(
-                            f"{VIRAL_ENGINE_URL}/optimize-hook",
-                            json={
-                                "persona_id": persona_id,
-                                "base_content": base_content,
-                            },
-                            timeout=5.0,
-                        )
-                        response.raise_for_status()
-                        viral_result = response.json()
-
-                    # Use viral hook if it meets quality threshold
-                    if viral_result["expected_engagement_rate"] > 0.06:  # 6% threshold
-                        hook = viral_result["optimized_hooks"][0]["content"]
-                        print(
-                            f"[VIRAL] Using viral hook: {viral_result['selected_pattern']} (ER: {viral_result['expected_engagement_rate']:.3f})"
-                        )
-                    else:
-                        print(
-                            f"[VIRAL] Viral hook below threshold ({viral_result['expected_engagement_rate']:.3f}), falling back to LLM"
-                        )
-
-            except Exception as e:
-                print(f"[VIRAL] Hook optimization failed: {e}, falling back to LLM")
-                record_error("persona_runtime", "viral_hook_error", "error")
-
-        # Fall back to LLM if viral hook not available or below threshold
-        if hook is None:
-            hook = await _llm(HOOK_MODEL, base_content, "hook")
-            print("[VIRAL] Using LLM-generated hook")
-
-        # Record content quality metrics
-        quality_score = _calculate_content_quality(hook, "hook")
-        update_content_quality(persona_id, "hook", quality_score)
-
+        hook, _ = await _generate_hook(persona_id, state.get("text", ""))
         return {"draft": {"hook": hook}}
 
     # 3️⃣ body LLM
     async def body_llm(state: FlowState) -> FlowState:
-        prompt = f"{state.get('draft', {}).get('hook', '')}\n\nWrite a detailed post:"
-        body = await _llm(BODY_MODEL, prompt, "body")
-
-        # Record content quality metrics
-        quality_score = _calculate_content_quality(body, "body")
-        update_content_quality(persona_id, "body", quality_score)
-
-        # Calculate combined quality score
-        hook_quality = _calculate_content_quality(
-            state.get("draft", {}).get("hook", ""), "hook"
-        )
-        combined_quality = (hook_quality + quality_score) / 2
-        update_content_quality(persona_id, "combined", combined_quality)
-
-        return {"draft": {"body": body}}
+        hook = state.get("draft", {}).get("hook", "")
+        body = await _generate_body(persona_id, hook)
+        _record_combined_quality(persona_id, hook, body)
+        return {"draft": {"hook": hook, "body": body}}
 
     # 4️⃣ guard-rail
     async def guardrail(state: FlowState) -> FlowState:
         draft = state.get("draft", {})
-        bad = []
-
-        # Check each part for moderation and content safety
-        for part, txt in draft.items():
-            # Original moderation check
-            if not await _moderate(txt):
-                bad.append(part)
-                continue
-
-            # Additional content safety check
-            safety_check = ai_security.check_content_safety(txt)
-            if not safety_check["safe"]:
-                print(
-                    f"🚨 Content safety violation in {part}: {safety_check['violations']}"
-                )
-                bad.append(part)
-
+        checks = await asyncio.gather(
+            *[_part_is_safe(part, txt) for part, txt in draft.items()]
+        )
+        bad = [part for part, ok in zip(draft, checks) if not ok]
         if bad:
             raise RuntimeError(f"Guard-rail blocked parts: {bad}")
         return {}
 
+    # 2️⃣–4️⃣ overlapped hook, body and guard-rail (parallel mode)
+    async def draft(state: FlowState) -> FlowState:
+        text = state.get("text", "")
+        start = time.time()
+        hook_task = asyncio.create_task(_generate_hook(persona_id, text))
+        body_task = (
+            asyncio.create_task(_generate_body(persona_id, text))
+            if SPECULATIVE_BODY
+            else None
+        )
+        pending = [hook_task, body_task]
+        try:
+            hook, is_viral = await hook_task
+            hook_ready = time.time()
+            record_content_generation_latency(persona_id, "hook", hook_ready - start)
+
+            hook_check = asyncio.create_task(_part_is_safe("hook", hook))
+            pending.append(hook_check)
+            if body_task is None or is_viral:
+                # A viral hook beats the raw input as the body's seed
+                if body_task is not None:
+                    body_task.cancel()
+                    print("[SPEC] Viral hook arrived, restarting body from it")
+                body_task = asyncio.create_task(_generate_body(persona_id, hook))
+                pending.append(body_task)
+
+            body = await body_task
+            record_content_generation_latency(
+                persona_id, "body", time.time() - hook_ready
+            )
+            _record_combined_quality(persona_id, hook, body)
+
+            hook_ok, body_ok = await asyncio.gather(
+                hook_check, _part_is_safe("body", body)
+            )
+        finally:
+            for task in pending:
+                if task is not None and not task.done():
+                    task.cancel()
+
+        bad = [part for part, ok in (("hook", hook_ok), ("body", body_ok)) if not ok]
+        if bad:
+            raise RuntimeError(f"Guard-rail blocked parts: {bad}")
+        return {"draft": {"hook": hook, "body": body}}
+
     # 5️⃣ format final output
     def format_(state: FlowState) -> FlowState:
         draft = state.get("draft", {})
@@ -370,16 +512,22 @@ def build_dag_from_persona(persona_id: str) -> Any | None:
 
     # ─── wiring ───
     dag.add_node("ingest", ingest)
-    dag.add_node("hook_llm", hook_llm)
-    dag.add_node("body_llm", body_llm)
-    dag.add_node("guardrail", guardrail)
     dag.add_node("format", format_)
-
     dag.add_edge(START, "ingest")
-    dag.add_edge("ingest", "hook_llm")
-    dag.add_edge("hook_llm", "body_llm")
-    dag.add_edge("body_llm", "guardrail")
-    dag.add_edge("guardrail", "format")
+
+    if mode == "parallel":
+        dag.add_node("draft", draft)
+        dag.add_edge("ingest", "draft")
+        dag.add_edge("draft", "format")
+    else:
+        dag.add_node("hook_llm", hook_llm)
+        dag.add_node("body_llm", body_llm)
+        dag.add_node("guardrail", guardrail)
+        dag.add_edge("ingest", "hook_llm")
+        dag.add_edge("hook_llm", "body_llm")
+        dag.add_edge("body_llm", "guardrail")
+        dag.add_edge("guardrail", "format")
+
     dag.add_edge("format", END)
 
     return dag.compile()  # exposes .ainvoke / .astream
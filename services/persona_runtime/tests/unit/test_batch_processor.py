@@ -0,0 +1,229 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+
+from services.persona_runtime.batch_processor import (
+    BatchBackend,
+    BatchProcessor,
+    OpenAIBatchBackend,
+    PackedPromptBackend,
+)
+
+
+class RecordingBackend(BatchBackend):
+    """Answers every prompt and records each provider call."""
+
+    def __init__(self, gate: asyncio.Event | None = None):
+        self.calls: List[tuple[str, List[str]]] = []
+        self.gate = gate
+
+    async def complete(self, model: str, batch: List[Any]) -> List[Any]:
+        self.calls.append((model, [req.prompt for req in batch]))
+        if self.gate is not None:
+            await self.gate.wait()
+        return [f"{model}:{req.prompt}" for req in batch]
+
+
+@pytest.mark.asyncio
+async def test_batch_released_when_full() -> None:
+    backend = RecordingBackend()
+    processor = BatchProcessor(batch_size=3, max_wait_time_ms=10000, backend=backend)
+
+    start = time.monotonic()
+    results = await asyncio.gather(*[processor.add_request(f"p{i}") for i in range(3)])
+
+    assert time.monotonic() - start < 1.0
+    assert backend.calls == [("gpt-3.5-turbo", ["p0", "p1", "p2"])]
+    assert [r["response"] for r in results] == [
+        "gpt-3.5-turbo:p0",
+        "gpt-3.5-turbo:p1",
+        "gpt-3.5-turbo:p2",
+    ]
+    metrics = processor.get_metrics()
+    assert metrics["release_reasons"]["size"] == 1
+    assert metrics["avg_fill_ratio"] == 1.0
+    await processor.close()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_released_at_oldest_deadline() -> None:
+    backend = RecordingBackend()
+    processor = BatchProcessor(batch_size=10, max_wait_time_ms=50, backend=backend)
+
+    start = time.monotonic()
+    await asyncio.gather(processor.add_request("a"), processor.add_request("b"))
+    elapsed = time.monotonic() - start
+
+    assert 0.04 <= elapsed < 0.5
+    assert backend.calls == [("gpt-3.5-turbo", ["a", "b"])]
+    metrics = processor.get_metrics()
+    assert metrics["release_reasons"]["deadline"] == 1
+    assert metrics["avg_fill_ratio"] == pytest.approx(0.2)
+    assert metrics["avg_wait_time_ms"] >= 40
+    await processor.close()
+
+
+@pytest.mark.asyncio
+async def test_token_budget_releases_and_bounds_batches() -> None:
+    backend = RecordingBackend()
+    processor = BatchProcessor(
+        batch_size=10, max_wait_time_ms=100, token_budget=250, backend=backend
+    )
+
+    await asyncio.gather(
+        *[processor.add_request(f"p{i}", max_tokens=100) for i in range(5)]
+    )
+
+    # Two batches fill the budget; the remainder waits for its deadline
+    assert [len(prompts) for _, prompts in backend.calls] == [2, 2, 1]
+    reasons = processor.get_metrics()["release_reasons"]
+    assert (reasons["tokens"], reasons["deadline"]) == (2, 1)
+    await processor.close()
+
+
+@pytest.mark.asyncio
+async def test_interactive_lane_fills_batches_first() -> None:
+    gate = asyncio.Event()
+    backend = RecordingBackend(gate)
+    processor = BatchProcessor(
+        batch_size=2, max_wait_time_ms=200, max_inflight_batches=1, backend=backend
+    )
+
+    # The first batch occupies the only in-flight slot while the rest queue
+    first = [asyncio.create_task(processor.add_request(f"d{i}")) for i in range(2)]
+    await asyncio.sleep(0.01)
+    rest = [asyncio.create_task(processor.add_request(f"d{i}")) for i in (2, 3)]
+    rest.append(asyncio.create_task(processor.add_request("urgent", priority=True)))
+    await asyncio.sleep(0.01)
+    gate.set()
+    await asyncio.gather(*first, *rest)
+
+    assert backend.calls[1][1] == ["urgent", "d2"]
+    await processor.close()
+
+
+@pytest.mark.asyncio
+async def test_any_model_name_gets_its_own_scheduler() -> None:
+    backend = RecordingBackend()
+    processor = BatchProcessor(batch_size=2, max_wait_time_ms=20, backend=backend)
+
+    await asyncio.gather(
+        processor.add_request("a", model="gpt-4o-mini"),
+        processor.add_request("b", model="llama-3-70b"),
+    )
+
+    assert sorted(model for model, _ in backend.calls) == ["gpt-4o-mini", "llama-3-70b"]
+    await processor.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_lane_uses_bulk_backend() -> None:
+    online, bulk = RecordingBackend(), RecordingBackend()
+    processor = BatchProcessor(
+        batch_size=2,
+        max_wait_time_ms=20,
+        bulk_max_wait_ms=20,
+        backend=online,
+        bulk_backend=bulk,
+    )
+
+    await asyncio.gather(
+        processor.add_request("online"),
+        processor.add_request("bulk-1", lane="bulk"),
+        processor.add_request("bulk-2", lane="bulk"),
+    )
+
+    assert online.calls == [("gpt-3.5-turbo", ["online"])]
+    assert bulk.calls == [("gpt-3.5-turbo", ["bulk-1", "bulk-2"])]
+    await processor.close()
+
+
+@pytest.mark.asyncio
+async def test_packed_backend_makes_one_call_and_falls_back_on_bad_split() -> None:
+    calls: List[str] = []
+
+    async def call_llm(prompt: str, model: str, max_tokens: int) -> str:
+        calls.append(prompt)
+        return "single answer"
+
+    # Default backend packs prompts into one (mock) provider call
+    processor = BatchProcessor(batch_size=2, max_wait_time_ms=10000)
+    results = await asyncio.gather(
+        processor.add_request("a", model="gpt-4o"),
+        processor.add_request("b", model="gpt-4o"),
+    )
+    assert [r["response"] for r in results] == [
+        "Generated response 1 for gpt-4o",
+        "Generated response 2 for gpt-4o",
+    ]
+    await processor.close()
+
+    backend = PackedPromptBackend(call_llm)
+    batch = [SimpleNamespace(prompt=p, max_tokens=10) for p in ("a", "b")]
+    assert await backend.complete("gpt-4o", batch) == ["single answer"] * 2
+    # One packed attempt, then one call per prompt
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_openai_batch_backend_submits_one_job() -> None:
+    class FakeFiles:
+        def __init__(self) -> None:
+            self.uploaded = b""
+
+        async def create(self, file: Any, purpose: str) -> Any:
+            self.uploaded = file[1]
+            return SimpleNamespace(id="file-in")
+
+        async def content(self, file_id: str) -> Any:
+            lines = []
+            for line in self.uploaded.decode().splitlines():
+                item = json.loads(line)
+                prompt = item["body"]["messages"][0]["content"]
+                lines.append(
+                    json.dumps(
+                        {
+                            "custom_id": item["custom_id"],
+                            "response": {
+                                "body": {
+                                    "choices": [
+                                        {"message": {"content": prompt.upper()}}
+                                    ]
+                                }
+                            },
+                        }
+                    )
+                )
+            return SimpleNamespace(text="\n".join(lines))
+
+    class FakeBatches:
+        def __init__(self) -> None:
+            self.retrievals = 0
+
+        async def create(self, **kwargs: Any) -> Any:
+            return SimpleNamespace(id="batch-1", status="validating")
+
+        async def retrieve(self, batch_id: str) -> Any:
+            self.retrievals += 1
+            return SimpleNamespace(
+                id=batch_id, status="completed", output_file_id="file-out"
+            )
+
+    client = SimpleNamespace(files=FakeFiles(), batches=FakeBatches())
+    processor = BatchProcessor(
+        bulk_max_wait_ms=10,
+        bulk_backend=OpenAIBatchBackend(client, poll_interval=0),
+    )
+
+    results = await asyncio.gather(
+        *[processor.add_request(p, lane="bulk") for p in ("x", "y")]
+    )
+
+    assert [r["response"] for r in results] == ["X", "Y"]
+    assert client.batches.retrievals == 1
+    assert len(client.files.uploaded.decode().splitlines()) == 2
+    await processor.close()
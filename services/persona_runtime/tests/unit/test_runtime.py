@@ -26,3 +26,168 @@ async def test_dag_produces_draft(monkeypatch: pytest.MonkeyPatch) -> None:
 
     assert res["draft"]["hook"].startswith("🙏")
     assert res["draft"]["body"].startswith("resp-")
+
+
+def test_dag_compiled_once_per_persona() -> None:
+    """The compiled DAG is reused until the persona is invalidated."""
+    from services.persona_runtime.runtime import get_dag, invalidate_dag_cache
+
+    invalidate_dag_cache()
+    dag = get_dag("ai-jesus")
+
+    assert get_dag("ai-jesus") is dag
+    assert get_dag("ai-elon") is not dag
+    assert get_dag("unknown") is None
+
+    invalidate_dag_cache("ai-jesus")
+    assert get_dag("ai-jesus") is not dag
+
+
+def test_dag_rebuilt_when_persona_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changing a persona's config recompiles its DAG on the next request."""
+    from types import SimpleNamespace
+
+    from services.persona_runtime import runtime
+
+    runtime.invalidate_dag_cache()
+    dag = runtime.get_dag("ai-jesus")
+
+    monkeypatch.setattr(runtime._PERSONA_DB["ai-jesus"], "emoji", "✨")
+    updated = runtime.get_dag("ai-jesus")
+    assert updated is not dag
+    assert runtime.get_dag("ai-jesus") is updated
+
+    monkeypatch.setitem(
+        runtime._PERSONA_DB, "ai-jesus", SimpleNamespace(emoji="✨", temperament="calm")
+    )
+    assert runtime.get_dag("ai-jesus") is not updated
+
+    monkeypatch.delitem(runtime._PERSONA_DB, "ai-jesus")
+    assert runtime.get_dag("ai-jesus") is None
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared() -> None:
+    """Viral-engine calls reuse one pooled client until it is closed."""
+    from services.persona_runtime.runtime import close_http_client, get_http_client
+
+    client = get_http_client()
+    assert get_http_client() is client
+
+    await close_http_client()
+    assert client.is_closed
+    assert get_http_client() is not client
+    await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_parallel_dag_keeps_speculative_body_on_llm_hook(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Without a viral hook the body started from the raw input is kept."""
+    prompts: list[str] = []
+
+    async def fake_llm(model: str, prompt: str, content_type: str = "unknown") -> str:
+        prompts.append(prompt)
+        return f"{content_type}-resp"
+
+    moderated: list[str] = []
+
+    async def fake_mod(text: str) -> bool:
+        moderated.append(text)
+        return True
+
+    monkeypatch.setattr("services.persona_runtime.runtime._llm", fake_llm)
+    monkeypatch.setattr("services.persona_runtime.runtime._moderate", fake_mod)
+
+    dag = build_dag_from_persona("ai-jesus", "parallel")
+    res = await cast(Any, dag).ainvoke({"text": " hello "})
+
+    assert res["draft"] == {"hook": "🙏 hook-resp 🙏", "body": "body-resp"}
+    assert sorted(prompts) == ["hello", "hello\n\nWrite a detailed post:"]
+    assert sorted(moderated) == ["body-resp", "hook-resp"]
+
+
+@pytest.mark.asyncio
+async def test_parallel_dag_restarts_body_from_viral_hook(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A viral hook cancels the speculative body and seeds a new one."""
+    import asyncio
+
+    started: list[str] = []
+    cancelled: list[str] = []
+
+    async def fake_viral(persona_id: str, base_content: str) -> str:
+        await asyncio.sleep(0.01)
+        return "viral hook"
+
+    async def fake_llm(model: str, prompt: str, content_type: str = "unknown") -> str:
+        started.append(prompt)
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            cancelled.append(prompt)
+            raise
+        return f"body for {prompt.splitlines()[0]}"
+
+    async def fake_mod(_text: str) -> bool:
+        return True
+
+    monkeypatch.setattr("services.persona_runtime.runtime._viral_hook", fake_viral)
+    monkeypatch.setattr("services.persona_runtime.runtime._llm", fake_llm)
+    monkeypatch.setattr("services.persona_runtime.runtime._moderate", fake_mod)
+
+    dag = build_dag_from_persona("ai-jesus", "parallel")
+    res = await cast(Any, dag).ainvoke({"text": "hello"})
+
+    assert res["draft"]["body"] == "body for viral hook"
+    assert cancelled == ["hello\n\nWrite a detailed post:"]
+    assert len(started) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["sequential", "parallel"])
+async def test_guardrail_moderates_parts_concurrently(
+    monkeypatch: pytest.MonkeyPatch, mode: str
+) -> None:
+    """Both parts are moderated at once and a bad part blocks the draft."""
+    import asyncio
+
+    in_flight = 0
+    peak = 0
+
+    async def fake_llm(model: str, prompt: str, content_type: str = "unknown") -> str:
+        return "bad" if content_type == "body" else "fine"
+
+    async def fake_mod(text: str) -> bool:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return text != "bad"
+
+    monkeypatch.setattr("services.persona_runtime.runtime._llm", fake_llm)
+    monkeypatch.setattr("services.persona_runtime.runtime._moderate", fake_mod)
+
+    dag = build_dag_from_persona("ai-jesus", mode)
+    with pytest.raises(RuntimeError, match="body"):
+        await cast(Any, dag).ainvoke({"text": "hello"})
+    assert peak == 2
+
+
+def test_latency_tracker_percentiles_per_persona_and_mode() -> None:
+    from services.persona_runtime.main import PersonaLatencyTracker
+
+    tracker = PersonaLatencyTracker(window_size=100)
+    for ms in range(1, 101):
+        tracker.record("ai-jesus", "parallel", ms / 1000)
+    tracker.record("ai-elon", "sequential", 0.2)
+
+    snapshot = tracker.snapshot()
+
+    assert snapshot["ai-jesus"]["parallel"]["count"] == 100
+    assert snapshot["ai-jesus"]["parallel"]["p50_ms"] == pytest.approx(51)
+    assert snapshot["ai-jesus"]["parallel"]["p99_ms"] == pytest.approx(100)
+    assert snapshot["ai-elon"]["sequential"]["p95_ms"] == pytest.approx(200)
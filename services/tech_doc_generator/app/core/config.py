@@ -44,6 +44,8 @@ class Settings(BaseSettings):
     # Code analysis settings
     repo_path: str = os.getenv("REPO_PATH", "/app")
     analysis_depth: str = os.getenv("ANALYSIS_DEPTH", "medium")  # shallow, medium, deep
+    code_index_dir: str = os.getenv("CODE_INDEX_DIR", "/tmp/tech_doc_code_index")
+    code_index_workers: int = int(os.getenv("CODE_INDEX_WORKERS", "0"))  # 0: CPUs
 
     # Content generation settings
     max_article_length: int = int(os.getenv("MAX_ARTICLE_LENGTH", "5000"))
@@ -1,4 +1,3 @@
-import ast
 import os
 import subprocess
 from typing import Dict, List, Any
@@ -9,6 +8,8 @@ import structlog
 
 from ..models.article import CodeAnalysis, SourceType
 from ..core.cache import get_cache_manager
+from ..core.config import get_settings
+from .code_index import CodeIndex, summarize_source
 
 logger = structlog.get_logger()
 
@@ -16,6 +17,9 @@ logger = structlog.get_logger()
 class CodeAnalyzer:
     """Analyzes codebase to extract insights for article generation"""
 
+    # Metrics computed within this many seconds share one index refresh
+    INDEX_MAX_AGE = 5.0
+
     def __init__(self, repo_path: str):
         self.repo_path = Path(repo_path)
         self.repo = (
@@ -24,6 +28,12 @@ class CodeAnalyzer:
             else None
         )
         self.cache = get_cache_manager()
+        settings = get_settings()
+        self.code_index = CodeIndex(
+            self.repo_path,
+            index_dir=settings.code_index_dir,
+            max_workers=settings.code_index_workers,
+        )
 
     async def analyze_source(
         self, source_type: SourceType, source_path: str
@@ -48,10 +58,14 @@ class CodeAnalyzer:
 
     async def _analyze_repository(self) -> CodeAnalysis:
         """Analyze entire repository with caching"""
-        # Check if we have cached full analysis
+        # Only files whose blob changed since the last refresh are parsed
+        await self.code_index.refresh()
+
+        # Check if we have cached full analysis of exactly these files
         cache_key_data = {
             "repo_path": str(self.repo_path),
             "git_head": self._get_git_head_hash(),
+            "index": self.code_index.fingerprint,
         }
 
         cached_analysis = await self.cache.get_cached_result(
@@ -87,6 +101,16 @@ class CodeAnalyzer:
 
         return analysis
 
+    async def _refresh_index(self) -> CodeIndex:
+        """Code index, refreshed unless a metric of this analysis just did"""
+        await self.code_index.refresh(max_age=self.INDEX_MAX_AGE)
+        return self.code_index
+
+    def _index_prefix(self, directory: Path) -> str:
+        """Index path prefix of a directory inside the repository"""
+        relative = directory.resolve().relative_to(self.repo_path.resolve()).as_posix()
+        return "" if relative == "." else f"{relative}/"
+
     def _get_git_head_hash(self) -> str:
         """Get current git HEAD hash for cache invalidation"""
         if self.repo:
@@ -154,7 +178,7 @@ class CodeAnalyzer:
         return CodeAnalysis(patterns=["pr_analysis"], metrics={"pr_id": pr_identifier})
 
     async def _detect_architectural_patterns(self) -> List[str]:
-        """Detect architectural patterns in the codebase with memory-efficient streaming"""
+        """Detect architectural patterns in the codebase"""
         patterns = []
 
         # Check for microservices pattern
@@ -171,129 +195,37 @@ class CodeAnalyzer:
         if (self.repo_path / "k8s").exists() or (self.repo_path / "charts").exists():
             patterns.append("kubernetes")
 
-        # Memory-efficient pattern detection with streaming
-        async for pattern in self._detect_patterns_streaming():
+        # Source patterns from the code index
+        index = await self._refresh_index()
+        for pattern in index.aggregate.patterns:
             if pattern not in patterns:
                 patterns.append(pattern)
 
         return patterns
 
-    async def _detect_patterns_streaming(self):
-        """Stream pattern detection to avoid memory spikes"""
-        MAX_FILE_SIZE = 1024 * 1024  # 1MB limit per file
-        files_checked = 0
-        MAX_FILES_TO_CHECK = 50  # Limit to prevent excessive scanning
-
-        # Use generator to process files one by one
-        python_files_gen = self.repo_path.rglob("*.py")
-
-        for file_path in python_files_gen:
-            if files_checked >= MAX_FILES_TO_CHECK:
-                break
-
-            try:
-                # Check file size before reading
-                if file_path.stat().st_size > MAX_FILE_SIZE:
-                    continue
-
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    # Read in chunks to avoid memory spikes
-                    content_chunk = f.read(8192)  # Read first 8KB only
-
-                    if "FastAPI" in content_chunk or "@app.route" in content_chunk:
-                        yield "rest_api"
-                    if "async def" in content_chunk or "await " in content_chunk:
-                        yield "async_programming"
-                    if "prometheus" in content_chunk.lower():
-                        yield "observability"
-
-                files_checked += 1
-            except (OSError, UnicodeDecodeError):
-                continue
-
     async def _calculate_complexity_score(self) -> float:
-        """Calculate overall complexity score with memory optimization"""
-        try:
-            # Use radon for complexity analysis if available (with timeout)
-            result = subprocess.run(
-                ["radon", "cc", str(self.repo_path), "-a"],
-                capture_output=True,
-                text=True,
-                timeout=15,  # Reduced timeout
-            )
-            if result.returncode == 0:
-                # Parse radon output to get average complexity
-                lines = result.stdout.strip().split("\n")
-                for line in lines:
-                    if "Average complexity:" in line:
-                        return float(line.split(":")[-1].strip().split()[0])
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-
-        # Fallback: memory-efficient streaming complexity calculation
-        return await self._calculate_complexity_streaming()
-
-    async def _calculate_complexity_streaming(self) -> float:
-        """Calculate complexity using streaming to avoid memory spikes"""
-        MAX_FILE_SIZE = 512 * 1024  # 512KB limit per file
-        MAX_FILES_TO_ANALYZE = 30  # Reduced from 20 to balance speed vs accuracy
-
-        total_complexity = 0
-        file_count = 0
-
-        # Use generator to process files one by one
-        python_files_gen = self.repo_path.rglob("*.py")
-
-        for file_path in python_files_gen:
-            if file_count >= MAX_FILES_TO_ANALYZE:
-                break
-
-            try:
-                # Skip large files to prevent memory issues
-                if file_path.stat().st_size > MAX_FILE_SIZE:
-                    continue
-
-                complexity = await self._calculate_file_complexity(file_path)
-                total_complexity += complexity
-                file_count += 1
-            except (OSError, UnicodeDecodeError, MemoryError):
-                continue
-
-        return total_complexity / max(file_count, 1) if file_count > 0 else 1.0
+        """Average per-file complexity over every indexed Python file"""
+        index = await self._refresh_index()
+        return index.aggregate.mean_complexity
 
     async def _calculate_file_complexity(self, file_path: Path) -> float:
         """Calculate complexity for a single file"""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            tree = ast.parse(content)
-
-            # Count control flow statements as complexity indicators
-            complexity = 0
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.If, ast.For, ast.While, ast.Try, ast.With)):
-                    complexity += 1
-                elif isinstance(node, ast.FunctionDef):
-                    complexity += 0.5
-                elif isinstance(node, ast.ClassDef):
-                    complexity += 0.3
-
-            return complexity
+            return summarize_source(file_path.read_bytes())["complexity"]
         except Exception:
             return 1.0
 
     async def _calculate_directory_complexity(self, directory: Path) -> float:
         """Calculate complexity for a directory"""
-        python_files = list(directory.rglob("*.py"))
-        if not python_files:
+        index = await self._refresh_index()
+        complexities = [
+            summary["complexity"]
+            for _, summary in index.summaries(self._index_prefix(directory))
+        ]
+        if not complexities:
             return 1.0
 
-        total_complexity = 0
-        for file_path in python_files:
-            total_complexity += await self._calculate_file_complexity(file_path)
-
-        return total_complexity / len(python_files)
+        return sum(complexities) / len(complexities)
 
     async def _get_test_coverage(self) -> float:
         """Get test coverage percentage"""
@@ -319,8 +251,8 @@ class CodeAnalyzer:
             pass
 
         # Fallback: estimate based on test file presence
-        python_files = list(self.repo_path.rglob("*.py"))
-        test_files = [f for f in python_files if "test" in str(f).lower()]
+        python_files = list((await self._refresh_index()).files)
+        test_files = [f for f in python_files if "test" in f.lower()]
 
         if not python_files:
             return 0.0
@@ -371,19 +303,8 @@ class CodeAnalyzer:
         metrics["file_counts"] = dict(file_counts)
 
         # Lines of code
-        total_loc = 0
-        python_loc = 0
-
-        for py_file in self.repo_path.rglob("*.py"):
-            try:
-                with open(py_file, "r", encoding="utf-8") as f:
-                    lines = len(f.readlines())
-                    python_loc += lines
-                    total_loc += lines
-            except Exception:
-                continue
-
-        metrics["lines_of_code"] = {"total": total_loc, "python": python_loc}
+        python_loc = (await self._refresh_index()).aggregate.loc
+        metrics["lines_of_code"] = {"total": python_loc, "python": python_loc}
 
         # Git metrics if available
         if self.repo:
@@ -399,69 +320,21 @@ class CodeAnalyzer:
         return metrics
 
     async def _find_interesting_functions(self) -> List[Dict[str, Any]]:
-        """Find interesting functions worth highlighting with memory optimization"""
-        interesting_functions = []
-        MAX_FILES_TO_SCAN = 15  # Reduced from 10 to balance discovery vs performance
-        MAX_FILE_SIZE = 256 * 1024  # 256KB limit per file
-
-        files_scanned = 0
-        python_files_gen = self.repo_path.rglob("*.py")
-
-        for file_path in python_files_gen:
-            if files_scanned >= MAX_FILES_TO_SCAN:
-                break
-
-            try:
-                # Skip large files
-                if file_path.stat().st_size > MAX_FILE_SIZE:
-                    continue
-
-                functions = await self._extract_functions_from_file(file_path)
-                interesting_functions.extend(functions)
-                files_scanned += 1
-            except (OSError, UnicodeDecodeError, MemoryError):
-                continue
-
-        # Sort by "interestingness" (complexity, length, etc.)
-        interesting_functions.sort(key=lambda x: x.get("complexity", 0), reverse=True)
-
-        return interesting_functions[:10]
+        """Find the most complex functions across the whole repository"""
+        index = await self._refresh_index()
+        return index.top_functions(10)
 
     async def _extract_functions_from_file(
         self, file_path: Path
     ) -> List[Dict[str, Any]]:
         """Extract functions from a single file"""
-        functions = []
-
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            tree = ast.parse(content)
-
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    # Calculate function complexity
-                    func_complexity = 0
-                    for child in ast.walk(node):
-                        if isinstance(child, (ast.If, ast.For, ast.While, ast.Try)):
-                            func_complexity += 1
-
-                    functions.append(
-                        {
-                            "name": node.name,
-                            "file": str(file_path.relative_to(self.repo_path)),
-                            "line": node.lineno,
-                            "complexity": func_complexity,
-                            "docstring": ast.get_docstring(node),
-                            "args": [arg.arg for arg in node.args.args],
-                            "is_async": isinstance(node, ast.AsyncFunctionDef),
-                        }
-                    )
+            functions = summarize_source(file_path.read_bytes())["functions"]
         except Exception:
-            pass
+            return []
 
-        return functions
+        relative_path = str(file_path.relative_to(self.repo_path))
+        return [{**function, "file": relative_path} for function in functions]
 
     async def _get_recent_changes(self) -> List[Dict[str, Any]]:
         """Get recent changes from git history"""
@@ -576,16 +449,8 @@ class CodeAnalyzer:
         self, directory: Path
     ) -> List[Dict[str, Any]]:
         """Find interesting functions in a directory"""
-        functions = []
-
-        for py_file in directory.rglob("*.py"):
-            try:
-                file_functions = await self._extract_functions_from_file(py_file)
-                functions.extend(file_functions)
-            except Exception:
-                continue
-
-        return functions[:20]  # Limit results
+        index = await self._refresh_index()
+        return index.top_functions(20, prefix=self._index_prefix(directory))
 
     async def _extract_directory_dependencies(self, directory: Path) -> List[str]:
         """Extract dependencies specific to a directory"""
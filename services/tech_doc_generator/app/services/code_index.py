@@ -0,0 +1,342 @@
+import ast
+import asyncio
+import hashlib
+import heapq
+import json
+import os
+import subprocess
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+# Bump when summarize_source output changes so stale summaries are ignored
+SUMMARY_VERSION = 1
+
+MAX_FILE_SIZE = 1024 * 1024  # Files above 1MB are not indexed
+
+# Below this many files to parse, a process pool costs more than it saves
+PARALLEL_THRESHOLD = 32
+
+CONTROL_FLOW = (ast.If, ast.For, ast.While, ast.Try, ast.With)
+FUNCTION_CONTROL_FLOW = (ast.If, ast.For, ast.While, ast.Try)
+
+
+def git_blob_hash(data: bytes) -> str:
+    """Hash ``data`` the way ``git hash-object`` does."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def summarize_source(data: bytes) -> Dict[str, Any]:
+    """
+    Every per-file metric CodeAnalyzer uses, from a single parse.
+
+    The summary depends only on the file content, so it is shared by every
+    path and commit with the same blob.
+    """
+    text = data.decode("utf-8", errors="ignore")
+    summary: Dict[str, Any] = {
+        "loc": text.count("\n") + (1 if text and not text.endswith("\n") else 0),
+        "complexity": 1.0,
+        "functions": [],
+        "patterns": [],
+    }
+
+    patterns = []
+    if "FastAPI" in text or "@app.route" in text:
+        patterns.append("rest_api")
+    if "async def" in text or "await " in text:
+        patterns.append("async_programming")
+    if "prometheus" in text.lower():
+        patterns.append("observability")
+    summary["patterns"] = patterns
+
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return summary
+
+    complexity = 0.0
+    functions = []
+    for node in ast.walk(tree):
+        if isinstance(node, CONTROL_FLOW):
+            complexity += 1
+        elif isinstance(node, ast.ClassDef):
+            complexity += 0.3
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if isinstance(node, ast.FunctionDef):
+                complexity += 0.5
+            functions.append(
+                {
+                    "name": node.name,
+                    "line": node.lineno,
+                    "complexity": sum(
+                        isinstance(child, FUNCTION_CONTROL_FLOW)
+                        for child in ast.walk(node)
+                    ),
+                    "docstring": ast.get_docstring(node),
+                    "args": [arg.arg for arg in node.args.args],
+                    "is_async": isinstance(node, ast.AsyncFunctionDef),
+                }
+            )
+
+    summary["complexity"] = complexity
+    summary["functions"] = functions
+    return summary
+
+
+@dataclass
+class RepoAggregate:
+    """Repository totals, updated by adding and removing file summaries."""
+
+    files: int = 0
+    loc: int = 0
+    complexity: float = 0.0
+    patterns: Counter = field(default_factory=Counter)
+
+    def add(self, summary: Dict[str, Any], sign: int = 1) -> None:
+        self.files += sign
+        self.loc += sign * summary["loc"]
+        self.complexity += sign * summary["complexity"]
+        self.patterns.update({p: sign for p in summary["patterns"]})
+        self.patterns = +self.patterns  # Drop patterns no file has any more
+
+    def remove(self, summary: Dict[str, Any]) -> None:
+        self.add(summary, sign=-1)
+
+    @property
+    def mean_complexity(self) -> float:
+        return self.complexity / self.files if self.files else 1.0
+
+
+class CodeIndex:
+    """Per-file code index keyed by git blob hash.
+
+    Each refresh lists the repository's Python files with their blob hashes
+    (``git ls-files -s`` for clean tracked files, hashing only modified and
+    untracked ones), parses just the blobs it has not seen before, in a
+    process pool when there are many, and moves the repository aggregate by
+    the files that changed. Summaries are stored on disk by blob, so
+    unchanged files are reused across commits, branches and restarts.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        index_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.repo_path = Path(repo_path)
+        self.index_dir = Path(index_dir) / f"v{SUMMARY_VERSION}" if index_dir else None
+        self.max_workers = max_workers or None
+        self.files: Dict[str, str] = {}  # path -> blob
+        self.aggregate = RepoAggregate()
+        self._summaries: Dict[str, Dict[str, Any]] = {}  # blob -> summary
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, max_age: float = 0.0) -> Dict[str, int]:
+        """
+        Bring the index up to date with the working tree.
+
+        Args:
+            max_age: Skip the refresh if the last one is younger than this
+                many seconds
+
+        Returns:
+            Counts of indexed, changed, parsed and reused files
+        """
+        async with self._lock:
+            if max_age and time.monotonic() - self._refreshed_at < max_age:
+                return {
+                    "files": len(self.files),
+                    "changed": 0,
+                    "parsed": 0,
+                    "reused": 0,
+                }
+
+            start = time.perf_counter()
+            snapshot = await asyncio.to_thread(self._snapshot)
+            changed = {
+                path: blob
+                for path, blob in snapshot.items()
+                if self.files.get(path) != blob
+            }
+            removed = [path for path in self.files if path not in snapshot]
+
+            missing = [
+                (path, blob)
+                for path, blob in changed.items()
+                if blob not in self._summaries
+            ]
+            loaded = await asyncio.to_thread(self._load, missing)
+            to_parse = [(p, b) for p, b in missing if b not in loaded]
+            self._summaries.update(loaded)
+            if to_parse:
+                parsed = await asyncio.to_thread(self._parse, to_parse)
+                self._summaries.update(parsed)
+                await asyncio.to_thread(self._store, parsed)
+
+            for path in removed + [p for p in changed if p in self.files]:
+                self.aggregate.remove(self._summaries[self.files.pop(path)])
+            for path, blob in changed.items():
+                self.files[path] = blob
+                self.aggregate.add(self._summaries[blob])
+
+            self._refreshed_at = time.monotonic()
+            stats = {
+                "files": len(self.files),
+                "changed": len(changed) + len(removed),
+                "parsed": len(to_parse),
+                "reused": len(changed) - len(to_parse),
+            }
+            if stats["changed"]:
+                logger.info(
+                    "Code index refreshed",
+                    duration_ms=round((time.perf_counter() - start) * 1000, 1),
+                    **stats,
+                )
+            return stats
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the indexed (path, blob) set, for caching derived results."""
+        digest = hashlib.sha1()
+        for path in sorted(self.files):
+            digest.update(f"{path}\0{self.files[path]}\n".encode())
+        return digest.hexdigest()[:16]
+
+    def summaries(self, prefix: str = "") -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(path, summary) for indexed files under ``prefix``."""
+        for path, blob in self.files.items():
+            if path.startswith(prefix):
+                yield path, self._summaries[blob]
+
+    def top_functions(self, limit: int = 10, prefix: str = "") -> List[Dict[str, Any]]:
+        """Most complex functions under ``prefix``, with their file paths."""
+        candidates = (
+            {**function, "file": path}
+            for path, summary in self.summaries(prefix)
+            for function in summary["functions"]
+        )
+        return heapq.nlargest(limit, candidates, key=lambda f: f["complexity"])
+
+    # -- snapshot ------------------------------------------------------------
+
+    def _snapshot(self) -> Dict[str, str]:
+        """Current {path: blob} of the repository's Python files."""
+        if (self.repo_path / ".git").exists():
+            try:
+                return self._git_snapshot()
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning("git listing failed, hashing files", error=str(e))
+        return self._hash_files(
+            str(path.relative_to(self.repo_path))
+            for path in self.repo_path.rglob("*.py")
+            if not any(
+                part.startswith(".")
+                for part in path.relative_to(self.repo_path).parts[:-1]
+            )
+        )
+
+    def _git(self, *args: str) -> List[str]:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=self.repo_path,
+            capture_output=True,
+            check=True,
+            timeout=30,
+        )
+        return [entry for entry in result.stdout.decode().split("\0") if entry]
+
+    def _git_snapshot(self) -> Dict[str, str]:
+        # Staged blob hashes; only files differing from them are read
+        snapshot = {}
+        for entry in self._git("ls-files", "-s", "-z", "--", "*.py"):
+            meta, path = entry.split("\t", 1)
+            snapshot[path] = meta.split()[1]
+        dirty = self._git(
+            "ls-files", "-m", "-o", "--exclude-standard", "-z", "--", "*.py"
+        )
+        for path in dirty:
+            snapshot.pop(path, None)
+        snapshot.update(self._hash_files(dirty))
+
+        too_large = [
+            path
+            for path in snapshot
+            if not (self.repo_path / path).is_file()
+            or (self.repo_path / path).stat().st_size > MAX_FILE_SIZE
+        ]
+        for path in too_large:
+            del snapshot[path]
+        return snapshot
+
+    def _hash_files(self, paths) -> Dict[str, str]:
+        snapshot = {}
+        for path in paths:
+            full_path = self.repo_path / path
+            try:
+                if full_path.stat().st_size > MAX_FILE_SIZE:
+                    continue
+                snapshot[path] = git_blob_hash(full_path.read_bytes())
+            except OSError:
+                continue  # Deleted from the working tree
+        return snapshot
+
+    # -- parsing and storage -------------------------------------------------
+
+    def _parse(self, items: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        """Summarize files by blob, in a process pool for large batches."""
+        blobs, sources = [], []
+        for path, blob in items:
+            try:
+                sources.append((self.repo_path / path).read_bytes())
+            except OSError:
+                sources.append(b"")
+            blobs.append(blob)
+
+        if len(sources) < PARALLEL_THRESHOLD or self.max_workers == 1:
+            summaries = map(summarize_source, sources)
+            return dict(zip(blobs, summaries))
+
+        workers = self.max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(sources) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return dict(
+                zip(blobs, pool.map(summarize_source, sources, chunksize=chunksize))
+            )
+
+    def _blob_path(self, blob: str) -> Path:
+        return self.index_dir / blob[:2] / f"{blob[2:]}.json"
+
+    def _load(self, items: List[Tuple[str, str]]) -> Dict[str, Dict[str, Any]]:
+        if self.index_dir is None:
+            return {}
+        loaded = {}
+        for _, blob in items:
+            try:
+                loaded[blob] = json.loads(self._blob_path(blob).read_text())
+            except (OSError, ValueError):
+                continue
+        return loaded
+
+    def _store(self, summaries: Dict[str, Dict[str, Any]]) -> None:
+        if self.index_dir is None:
+            return
+        try:
+            for blob, summary in summaries.items():
+                path = self._blob_path(blob)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Write then rename so concurrent readers never see a partial file
+                tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp_path.write_text(json.dumps(summary))
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not persist code index", error=str(e))
@@ -0,0 +1,101 @@
+"""
+Tests for CodeIndex - the blob-keyed per-file index behind CodeAnalyzer
+"""
+
+import subprocess
+
+import pytest
+
+from app.services.code_index import CodeIndex, RepoAggregate, git_blob_hash
+
+
+def write(root, path, text):
+    full_path = root / path
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    full_path.write_text(text)
+
+
+def full_aggregate(index):
+    aggregate = RepoAggregate()
+    for _, summary in index.summaries():
+        aggregate.add(summary)
+    return aggregate
+
+
+@pytest.mark.asyncio
+async def test_refresh_parses_only_changed_files(tmp_path):
+    """
+    Test: a refresh should parse new blobs only and move the aggregate
+    Expected: incremental totals equal a rebuild from all summaries
+    """
+    write(tmp_path, "a.py", "def a():\n    if True:\n        pass\n")
+    write(tmp_path, "pkg/b.py", "async def b():\n    await c()\n")
+    write(tmp_path, "pkg/c.py", "import prometheus_client\n")
+    index = CodeIndex(tmp_path)
+
+    stats = await index.refresh()
+    assert stats["parsed"] == 3
+    assert index.aggregate.patterns == {"async_programming": 1, "observability": 1}
+
+    write(
+        tmp_path,
+        "a.py",
+        "def a():\n    for x in y:\n        while x:\n            pass\n",
+    )
+    (tmp_path / "pkg/c.py").unlink()
+    write(tmp_path, "pkg/d.py", "async def b():\n    await c()\n")  # Same blob as b.py
+
+    stats = await index.refresh()
+    assert stats == {"files": 3, "changed": 3, "parsed": 1, "reused": 1}
+    assert index.aggregate == full_aggregate(index)
+    assert "observability" not in index.aggregate.patterns
+    assert [f["name"] for f in index.top_functions(1)] == ["a"]
+    assert {f["file"] for f in index.top_functions(prefix="pkg/")} == {
+        "pkg/b.py",
+        "pkg/d.py",
+    }
+
+
+@pytest.mark.asyncio
+async def test_summaries_are_reused_across_instances(tmp_path):
+    """
+    Test: summaries persisted by blob should survive a restart
+    Expected: a new index over the same files parses nothing
+    """
+    repo = tmp_path / "repo"
+    for i in range(40):  # Enough to go through the process pool
+        write(repo, f"m{i}.py", f"def f{i}():\n    return {i}\n")
+
+    first = CodeIndex(repo, index_dir=str(tmp_path / "index"), max_workers=2)
+    assert (await first.refresh())["parsed"] == 40
+
+    second = CodeIndex(repo, index_dir=str(tmp_path / "index"))
+    stats = await second.refresh()
+    assert stats["parsed"] == 0
+    assert second.aggregate == first.aggregate
+    assert second.fingerprint == first.fingerprint
+
+
+@pytest.mark.asyncio
+async def test_git_snapshot_matches_git_blob_hashes(tmp_path):
+    """
+    Test: tracked files take git's blob hash, modified ones are rehashed
+    Expected: every indexed blob equals git hash-object of the working tree
+    """
+    write(tmp_path, "clean.py", "x = 1\n")
+    write(tmp_path, "dirty.py", "y = 1\n")
+    write(tmp_path, "ignored.py", "z = 1\n")
+    write(tmp_path, ".gitignore", "ignored.py\n")
+    git = ["git", "-c", "user.name=t", "-c", "user.email=t@t"]
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["add", "clean.py", "dirty.py"], cwd=tmp_path, check=True)
+    subprocess.run(git + ["commit", "-qm", "init"], cwd=tmp_path, check=True)
+    write(tmp_path, "dirty.py", "y = 2\n")
+    write(tmp_path, "new.py", "w = 1\n")
+
+    index = CodeIndex(tmp_path)
+    await index.refresh()
+
+    assert set(index.files) == {"clean.py", "dirty.py", "new.py"}
+    for path, blob in index.files.items():
+        assert blob == git_blob_hash((tmp_path / path).read_bytes())
@@ -1,29 +1,101 @@
 """Client for interacting with the Threads Adaptor service."""
 
+import asyncio
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List
+
+# Post IDs per /engagement/bulk request and concurrent chunk requests
+BULK_CHUNK_SIZE = 200
+BULK_MAX_CONCURRENCY = 8
+
+
+def engagement_to_performance(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform an engagement response into the performance format."""
+    return {
+        "views": data.get("impressions_count", 0),
+        "interactions": data.get("likes_count", 0)
+        + data.get("comments_count", 0)
+        + data.get("shares_count", 0),
+        "engagement_rate": data.get("engagement_rate", 0.0),
+    }
+
+
+def error_performance(error: str) -> Dict[str, Any]:
+    """Minimal performance entry for a post that could not be fetched."""
+    return {"views": 0, "interactions": 0, "engagement_rate": 0.0, "error": error}
+
+
+def chunked(items: List[str], size: int) -> Iterator[List[str]]:
+    """Split a list of IDs into request-sized chunks."""
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def bulk_results(post_ids: List[str], body: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an /engagement/bulk response body to performance entries per ID."""
+    posts = body.get("posts", {})
+    return {
+        post_id: engagement_to_performance(posts[post_id])
+        if post_id in posts
+        else error_performance("Post not found")
+        for post_id in post_ids
+    }
 
 
 class ThreadsClient:
     """Client for Threads Adaptor API."""
 
-    def __init__(self, base_url: str = "http://threads-adaptor:8070"):
+    def __init__(
+        self,
+        base_url: str = "http://threads-adaptor:8070",
+        chunk_size: int = BULK_CHUNK_SIZE,
+        max_concurrency: int = BULK_MAX_CONCURRENCY,
+    ):
         self.base_url = base_url
-        self.client = httpx.AsyncClient()
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_keepalive_connections=max_concurrency,
+                max_connections=max(max_concurrency, 20),
+                keepalive_expiry=30.0,
+            ),
+            timeout=httpx.Timeout(10.0, connect=2.0),
+        )
 
     async def get_post_performance(self, post_id: str) -> Dict[str, Any]:
         """Get performance metrics for a post."""
         response = await self.client.get(f"{self.base_url}/engagement/{post_id}")
         response.raise_for_status()
-        data = response.json()
-
-        return {
-            "views": data.get("impressions_count", 0),
-            "interactions": data.get("likes_count", 0)
-            + data.get("comments_count", 0)
-            + data.get("shares_count", 0),
-            "engagement_rate": data.get("engagement_rate", 0.0),
-        }
+        return engagement_to_performance(response.json())
+
+    async def bulk_get_performance(self, post_ids: List[str]) -> List[Dict[str, Any]]:
+        """Bulk fetch performance data, one request per chunk of IDs.
+
+        Chunks are fetched concurrently over the pooled client. A failed chunk
+        yields error entries for its IDs only. Results are in input order.
+        """
+        unique_ids = list(dict.fromkeys(post_ids))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_chunk(chunk: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    response = await self.client.post(
+                        f"{self.base_url}/engagement/bulk",
+                        json={"thread_ids": chunk},
+                    )
+                    response.raise_for_status()
+                    return bulk_results(chunk, response.json())
+                except Exception as e:
+                    return {post_id: error_performance(str(e)) for post_id in chunk}
+
+        results: Dict[str, Any] = {}
+        for chunk_results in await asyncio.gather(
+            *(fetch_chunk(chunk) for chunk in chunked(unique_ids, self.chunk_size))
+        ):
+            results.update(chunk_results)
+        return [results[post_id] for post_id in post_ids]
 
     async def delete_post(self, post_id: str) -> bool:
         """Delete a post from Threads (not implemented in current API)."""
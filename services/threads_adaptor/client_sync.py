@@ -1,15 +1,32 @@
 """Synchronous client for Threads Adaptor with connection pooling."""
 
 import httpx
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List
 import time
 
+from services.threads_adaptor.client import (
+    BULK_CHUNK_SIZE,
+    BULK_MAX_CONCURRENCY,
+    bulk_results,
+    chunked,
+    engagement_to_performance,
+    error_performance,
+)
+
 
 class ThreadsClientSync:
     """Synchronous client with connection pooling for Celery tasks."""
 
-    def __init__(self, base_url: str = "http://threads-adaptor:8070"):
+    def __init__(
+        self,
+        base_url: str = "http://threads-adaptor:8070",
+        chunk_size: int = BULK_CHUNK_SIZE,
+        max_concurrency: int = BULK_MAX_CONCURRENCY,
+    ):
         self.base_url = base_url
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
         # Connection pooling with limits
         self.client = httpx.Client(
             limits=httpx.Limits(
@@ -39,15 +56,7 @@ class ThreadsClientSync:
         data = response.json()
 
         # Transform to expected format
-        result = {
-            "views": data.get("impressions_count", 0),
-            "interactions": (
-                data.get("likes_count", 0)
-                + data.get("comments_count", 0)
-                + data.get("shares_count", 0)
-            ),
-            "engagement_rate": data.get("engagement_rate", 0.0),
-        }
+        result = engagement_to_performance(data)
 
         # Update local cache
         self._cache[post_id] = result
@@ -55,28 +64,54 @@ class ThreadsClientSync:
 
         return result
 
+    def _fetch_chunk(self, chunk: List[str]) -> Dict[str, Any]:
+        """Fetch one chunk of IDs from the bulk endpoint."""
+        try:
+            response = self.client.post(
+                f"{self.base_url}/engagement/bulk", json={"thread_ids": chunk}
+            )
+            response.raise_for_status()
+            return bulk_results(chunk, response.json())
+        except Exception as e:
+            # Return minimal data on error
+            return {post_id: error_performance(str(e)) for post_id in chunk}
+
     def bulk_get_performance(self, post_ids: List[str]) -> List[Dict[str, Any]]:
-        """Bulk fetch performance data efficiently."""
-        results = []
-
-        # This would ideally call a bulk endpoint
-        # For now, we'll fetch individually but with caching
-        for post_id in post_ids:
-            try:
-                perf = self.get_post_performance(post_id)
-                results.append(perf)
-            except Exception as e:
-                # Return minimal data on error
-                results.append(
-                    {
-                        "views": 0,
-                        "interactions": 0,
-                        "engagement_rate": 0.0,
-                        "error": str(e),
-                    }
-                )
-
-        return results
+        """Bulk fetch performance data efficiently.
+
+        Uncached IDs are split into chunks for the bulk endpoint and the
+        chunks are fetched concurrently over the pooled client. Results are
+        returned in input order.
+        """
+        results = {
+            post_id: self._cache[post_id]
+            for post_id in post_ids
+            if self._is_cache_valid(post_id)
+        }
+        to_fetch = [
+            post_id for post_id in dict.fromkeys(post_ids) if post_id not in results
+        ]
+
+        chunks = list(chunked(to_fetch, self.chunk_size))
+        if len(chunks) == 1:
+            fetched = [self._fetch_chunk(chunks[0])]
+        elif chunks:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_concurrency, len(chunks))
+            ) as pool:
+                fetched = list(pool.map(self._fetch_chunk, chunks))
+        else:
+            fetched = []
+
+        now = time.time()
+        for chunk_results in fetched:
+            for post_id, perf in chunk_results.items():
+                results[post_id] = perf
+                if not perf.get("error"):
+                    self._cache[post_id] = perf
+                    self._cache_timestamps[post_id] = now
+
+        return [results[post_id] for post_id in post_ids]
 
     def delete_post(self, post_id: str) -> bool:
         """Delete a post from Threads."""
@@ -2,8 +2,11 @@
 """
 Token-bucket rate limiter for Threads API with exponential backoff.
 
-Implements a simple in-memory leaky-bucket rate limiter that:
+Implements a rate limiter that:
 - Defaults to 20 requests per minute
+- Is shared by all replicas through Redis when REDIS_URL is set, with
+  requests served fairly across personas
+- Otherwise uses a simple in-memory leaky bucket
 - Falls back to sleep/backoff 0.5-32s on 429 responses
 - Supports THREADS_RATE environment variable override
 """
@@ -11,7 +14,7 @@ Implements a simple in-memory leaky-bucket rate limiter that:
 import asyncio
 import os
 import time
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Optional, Union
 
 from tenacity import (
     retry,
@@ -20,6 +23,12 @@ from tenacity import (
     wait_exponential,
 )
 
+from services.common.distributed_rate_limiter import (
+    DEFAULT_FAIRNESS_KEY,
+    DistributedRateLimiter,
+    GCRALimit,
+)
+
 
 class RateLimitError(Exception):
     """Exception raised when rate limit is exceeded."""
@@ -68,16 +77,20 @@ class TokenBucketLimiter:
                 self.max_tokens, self.tokens + (elapsed * self.refill_rate)
             )
 
-    async def acquire(self) -> None:
+    async def acquire(
+        self, cost: float = 1.0, fairness_key: str = DEFAULT_FAIRNESS_KEY
+    ) -> None:
         """
-        Acquire a token from the bucket.
+        Acquire tokens from the bucket.
 
-        If no tokens are available, sleeps until a token becomes available.
+        If not enough tokens are available, sleeps until they are. The
+        fairness key is accepted for interface parity with
+        DistributedRateLimiter and ignored.
         """
         self._refill_tokens()
 
-        if self.tokens >= 1.0:
-            self.tokens -= 1.0
+        if self.tokens >= cost:
+            self.tokens -= cost
             return
 
         # If no tokens available, calculate sleep time and wait
@@ -86,14 +99,14 @@ class TokenBucketLimiter:
 
         # Calculate how long to sleep to get at least one token
         # We add a small buffer to account for timing precision
-        tokens_needed = 1.0 - self.tokens
+        tokens_needed = cost - self.tokens
         sleep_time = tokens_needed / self.refill_rate
 
         await asyncio.sleep(sleep_time)
 
         # After sleeping, refill and consume the token
         self._refill_tokens()
-        self.tokens = max(0.0, self.tokens - 1.0)
+        self.tokens = max(0.0, self.tokens - cost)
 
     def acquire_nowait(self) -> bool:
         """
@@ -111,11 +124,29 @@ class TokenBucketLimiter:
         return False
 
 
+def create_rate_limiter() -> Union[TokenBucketLimiter, DistributedRateLimiter]:
+    """
+    Create the Threads API limiter.
+
+    With REDIS_URL set, every replica draws from one shared quota; otherwise
+    each process keeps its own in-memory bucket.
+    """
+    if not os.getenv("REDIS_URL"):
+        return TokenBucketLimiter()
+
+    threads_rate = int(os.getenv("THREADS_RATE", "20"))
+    return DistributedRateLimiter(
+        "threads_api",
+        GCRALimit(rate=threads_rate, period=60.0),
+        fallback_share=1.0 / int(os.getenv("THREADS_ADAPTOR_REPLICAS", "1")),
+    )
+
+
 # Global rate limiter instance
-_rate_limiter = TokenBucketLimiter()
+_rate_limiter = create_rate_limiter()
 
 
-def get_rate_limiter() -> TokenBucketLimiter:
+def get_rate_limiter() -> Union[TokenBucketLimiter, DistributedRateLimiter]:
     """Get the global rate limiter instance."""
     return _rate_limiter
 
@@ -126,7 +157,10 @@ def get_rate_limiter() -> TokenBucketLimiter:
     stop=stop_after_attempt(5),
 )
 async def with_rate_limit_retry(
-    func: Callable[..., Any], *args: Any, **kwargs: Any
+    func: Callable[..., Any],
+    *args: Any,
+    fairness_key: str = DEFAULT_FAIRNESS_KEY,
+    **kwargs: Any,
 ) -> Any:
     """
     Execute a function with rate limiting and exponential backoff on 429 errors.
@@ -134,6 +168,7 @@ async def with_rate_limit_retry(
     Args:
         func: The function to execute
         *args: Arguments to pass to the function
+        fairness_key: Key (e.g. persona ID) used to share the quota fairly
         **kwargs: Keyword arguments to pass to the function
 
     Returns:
@@ -143,7 +178,7 @@ async def with_rate_limit_retry(
         RateLimitError: If 429 response is received (will trigger retry)
     """
     # Acquire token before making request
-    await get_rate_limiter().acquire()
+    await get_rate_limiter().acquire(fairness_key=fairness_key)
 
     try:
         result = await func(*args, **kwargs)
@@ -156,11 +191,18 @@ async def with_rate_limit_retry(
         raise
 
 
-async def rate_limited_call(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+async def rate_limited_call(
+    func: Callable[..., Any],
+    *args: Any,
+    fairness_key: str = DEFAULT_FAIRNESS_KEY,
+    **kwargs: Any,
+) -> Any:
     """
     Convenience function to make rate-limited API calls.
 
     Usage:
-        result = await rate_limited_call(api_client.post, url, data=data)
+        result = await rate_limited_call(
+            api_client.post, url, data=data, fairness_key=persona_id
+        )
     """
-    return await with_rate_limit_retry(func, *args, **kwargs)
+    return await with_rate_limit_retry(func, *args, fairness_key=fairness_key, **kwargs)
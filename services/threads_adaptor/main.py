@@ -15,7 +15,7 @@ from __future__ import annotations
 import asyncio
 import os
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import BackgroundTasks, FastAPI, HTTPException
 from pydantic import BaseModel, Field
@@ -116,6 +116,25 @@ class EngagementResponse(BaseModel):
     updated_at: datetime
 
 
+class BulkEngagementRequest(BaseModel):
+    """
+    Request model for bulk engagement lookups.
+    """
+
+    thread_ids: List[str] = Field(
+        ..., description="Threads post IDs to look up", max_length=1000
+    )
+
+
+class BulkEngagementResponse(BaseModel):
+    """
+    Response model for bulk engagement lookups.
+    """
+
+    posts: Dict[str, EngagementResponse]
+    missing: List[str]
+
+
 class ProfileMetrics(BaseModel):
     """
     Response model for profile-level metrics.
@@ -172,7 +191,10 @@ async def publish_post(
 
         # Rate-limited API call
         media_response = await rate_limited_call(
-            "POST", THREADS_MEDIA_ENDPOINT, json=media_payload
+            "POST",
+            THREADS_MEDIA_ENDPOINT,
+            json=media_payload,
+            fairness_key=request.persona_id,
         )
         media_id = media_response["id"]
 
@@ -183,7 +205,10 @@ async def publish_post(
         }
 
         publish_response = await rate_limited_call(
-            "POST", THREADS_PUBLISH_ENDPOINT, json=publish_payload
+            "POST",
+            THREADS_PUBLISH_ENDPOINT,
+            json=publish_payload,
+            fairness_key=request.persona_id,
         )
         thread_id = publish_response["id"]
 
@@ -243,6 +268,54 @@ async def publish_post(
         raise HTTPException(status_code=500, detail=f"Publishing failed: {str(e)}")
 
 
+@app.post("/engagement/bulk", response_model=BulkEngagementResponse)
+async def get_engagement_bulk(request: BulkEngagementRequest) -> BulkEngagementResponse:
+    """
+    Get stored engagement metrics for many posts in one database query.
+
+    Unlike the single-post endpoint this does not refresh from the Threads
+    API; it answers from the metrics kept current by engagement tracking, so
+    monitoring jobs can poll thousands of posts without spending rate limit.
+
+    Args:
+        request: Threads post IDs to look up
+
+    Returns:
+        Engagement metrics keyed by thread ID, plus IDs that were not found
+    """
+    thread_ids = list(dict.fromkeys(request.thread_ids))
+    if not thread_ids:
+        return BulkEngagementResponse(posts={}, missing=[])
+
+    db = SessionLocal()
+    try:
+        posts = (
+            db.query(ThreadsPost).filter(ThreadsPost.thread_id.in_(thread_ids)).all()
+        )
+
+        found = {
+            post.thread_id: EngagementResponse(
+                thread_id=post.thread_id,
+                persona_id=post.persona_id,
+                engagement_rate=post.engagement_rate or 0.0,
+                likes_count=post.likes_count or 0,
+                comments_count=post.comments_count or 0,
+                shares_count=post.shares_count or 0,
+                impressions_count=post.impressions_count or 0,
+                published_at=post.published_at,
+                updated_at=post.updated_at,
+            )
+            for post in posts
+        }
+
+        return BulkEngagementResponse(
+            posts=found,
+            missing=[thread_id for thread_id in thread_ids if thread_id not in found],
+        )
+    finally:
+        db.close()
+
+
 @app.get("/engagement/{thread_id}", response_model=EngagementResponse)
 async def get_engagement(thread_id: str) -> EngagementResponse:
     """
@@ -415,7 +488,7 @@ async def update_post_engagement(post: ThreadsPost) -> None:
 
         insights_url = f"{THREADS_API_BASE}/{post.thread_id}/insights"
         insights_response = await rate_limited_call(
-            "GET", insights_url, params=insights_payload
+            "GET", insights_url, params=insights_payload, fairness_key=post.persona_id
         )
 
         # Parse metrics (simplified - actual API response structure may vary)
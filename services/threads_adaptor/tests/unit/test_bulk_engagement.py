@@ -0,0 +1,156 @@
+"""Unit tests for the bulk engagement endpoint and bulk clients."""
+
+import json
+import threading
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from services.threads_adaptor.client import ThreadsClient
+from services.threads_adaptor.client_sync import ThreadsClientSync
+from services.threads_adaptor.main import ThreadsPost, app
+
+
+def _engagement(thread_id: str) -> dict:
+    return {
+        "thread_id": thread_id,
+        "persona_id": "ai-jesus",
+        "engagement_rate": 0.05,
+        "likes_count": 3,
+        "comments_count": 1,
+        "shares_count": 1,
+        "impressions_count": 100,
+        "published_at": "2025-01-01T00:00:00",
+        "updated_at": "2025-01-01T00:00:00",
+    }
+
+
+class FakeBulkServer:
+    """Records /engagement/bulk requests and answers for every known ID."""
+
+    def __init__(self, missing=(), fail_on=None):
+        self.missing = set(missing)
+        self.fail_on = fail_on
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        thread_ids = json.loads(request.content)["thread_ids"]
+        with self._lock:
+            self.requests.append(thread_ids)
+        if self.fail_on in thread_ids:
+            return httpx.Response(500, json={"detail": "boom"})
+        return httpx.Response(
+            200,
+            json={
+                "posts": {
+                    tid: _engagement(tid)
+                    for tid in thread_ids
+                    if tid not in self.missing
+                },
+                "missing": [tid for tid in thread_ids if tid in self.missing],
+            },
+        )
+
+
+class TestBulkEngagementEndpoint:
+    """Test POST /engagement/bulk."""
+
+    def test_returns_stored_metrics_and_missing_ids(self, test_db, db_session):
+        thread_ids = [f"bulk_{uuid.uuid4().hex}" for _ in range(3)]
+        for i, thread_id in enumerate(thread_ids[:2]):
+            db_session.add(
+                ThreadsPost(
+                    thread_id=thread_id,
+                    persona_id="ai-jesus",
+                    content="post",
+                    published_at=datetime.utcnow(),
+                    likes_count=i + 1,
+                    comments_count=0,
+                    shares_count=0,
+                    impressions_count=10,
+                    engagement_rate=(i + 1) / 10,
+                )
+            )
+        db_session.commit()
+
+        response = TestClient(app).post(
+            "/engagement/bulk", json={"thread_ids": thread_ids}
+        )
+
+        assert response.status_code == 200
+        body = response.json()
+        assert set(body["posts"]) == set(thread_ids[:2])
+        assert body["posts"][thread_ids[1]]["likes_count"] == 2
+        assert body["missing"] == [thread_ids[2]]
+
+    def test_rejects_oversized_requests(self, test_db):
+        response = TestClient(app).post(
+            "/engagement/bulk",
+            json={"thread_ids": [str(i) for i in range(1001)]},
+        )
+
+        assert response.status_code == 422
+
+
+class TestThreadsClientSyncBulk:
+    """Test chunked bulk fetching in the sync client."""
+
+    def _client(self, server, **kwargs):
+        client = ThreadsClientSync(base_url="http://adaptor", **kwargs)
+        client.client = httpx.Client(transport=httpx.MockTransport(server))
+        return client
+
+    def test_chunks_requests_and_preserves_order(self):
+        server = FakeBulkServer(missing={"p3"})
+        post_ids = [f"p{i}" for i in range(10)]
+
+        with self._client(server, chunk_size=4) as client:
+            results = client.bulk_get_performance(post_ids)
+
+        assert sorted(len(chunk) for chunk in server.requests) == [2, 4, 4]
+        assert len(results) == 10
+        assert results[0] == {"views": 100, "interactions": 5, "engagement_rate": 0.05}
+        assert results[3]["error"] == "Post not found"
+
+    def test_failed_chunk_only_affects_its_ids(self):
+        server = FakeBulkServer(fail_on="p0")
+
+        with self._client(server, chunk_size=2) as client:
+            results = client.bulk_get_performance(["p0", "p1", "p2", "p3"])
+
+        assert "error" in results[0] and "error" in results[1]
+        assert "error" not in results[2] and "error" not in results[3]
+
+    def test_cached_posts_are_not_refetched(self):
+        server = FakeBulkServer(missing={"p2"})
+
+        with self._client(server) as client:
+            client.bulk_get_performance(["p0", "p1", "p2"])
+            client.bulk_get_performance(["p0", "p1", "p2"])
+
+        # Errors are never cached, so only the missing post is asked for again
+        assert server.requests == [["p0", "p1", "p2"], ["p2"]]
+
+
+class TestThreadsClientBulk:
+    """Test chunked bulk fetching in the async client."""
+
+    @pytest.mark.asyncio
+    async def test_chunks_fetched_concurrently_and_deduplicated(self):
+        server = FakeBulkServer()
+        client = ThreadsClient(base_url="http://adaptor", chunk_size=3)
+        await client.client.aclose()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+
+        try:
+            results = await client.bulk_get_performance(["p0", "p1", "p2", "p3", "p0"])
+        finally:
+            await client.close()
+
+        assert [len(chunk) for chunk in server.requests] == [3, 1]
+        assert len(results) == 5
+        assert results[4] == results[0]
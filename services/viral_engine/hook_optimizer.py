@@ -3,10 +3,12 @@ from __future__ import annotations
 
 import json
 import random
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from cachetools import LRUCache  # type: ignore[import-untyped]
 from prometheus_client import Counter, Histogram
 
@@ -26,16 +28,105 @@ CACHE_HITS = Counter("viral_hook_cache_hits_total", "Cache hit rate")
 CACHE_MISSES = Counter("viral_hook_cache_misses_total", "Cache miss rate")
 
 
+DEFAULT_ER = 0.08
+# Pseudo-impressions behind a pattern's declared avg_er before live data
+PRIOR_STRENGTH = 200.0
+# Patterns per category considered by a draw (top of the posterior ranking)
+CANDIDATES_PER_CATEGORY = 8
+
+
+class _CategoryIndex:
+    """
+    One category's patterns as Beta posteriors over engagement rate.
+
+    Patterns are kept sorted by posterior mean so a draw only samples the
+    leading ``CANDIDATES_PER_CATEGORY`` entries, whatever the category size.
+    """
+
+    def __init__(
+        self, data: Dict[str, Any], performance: Dict[str, Dict[str, Any]]
+    ) -> None:
+        patterns = list(data["patterns"])
+        prior = np.array([p.get("avg_er", DEFAULT_ER) for p in patterns], dtype=float)
+        impressions = np.zeros(len(patterns))
+        engagements = np.zeros(len(patterns))
+        for i, pattern in enumerate(patterns):
+            stats = performance.get(pattern["id"])
+            if stats:
+                impressions[i] = stats["impressions"]
+                engagements[i] = stats["engagements"]
+
+        self.alpha = prior * PRIOR_STRENGTH + engagements
+        self.beta = (1 - prior) * PRIOR_STRENGTH + impressions - engagements
+        self.patterns = patterns
+        self._sort()
+
+        category_er = data.get("avg_engagement_rate", DEFAULT_ER)
+        self.category_alpha = category_er * PRIOR_STRENGTH + engagements.sum()
+        self.category_beta = (1 - category_er) * PRIOR_STRENGTH + (
+            impressions.sum() - engagements.sum()
+        )
+
+    def _sort(self) -> None:
+        order = np.argsort(-(self.alpha / (self.alpha + self.beta)), kind="stable")
+        self.alpha = self.alpha[order]
+        self.beta = self.beta[order]
+        self.patterns = [self.patterns[i] for i in order]
+        self.positions = {p["id"]: i for i, p in enumerate(self.patterns)}
+
+    def record(self, pattern_id: str, impressions: int, engagements: int) -> None:
+        """Fold new observations into one pattern and restore the ordering."""
+        i = self.positions[pattern_id]
+        self.alpha[i] += engagements
+        self.beta[i] += impressions - engagements
+        self.category_alpha += engagements
+        self.category_beta += impressions - engagements
+        self._sort()
+
+    def sample_patterns(
+        self, rng: np.random.Generator, count: int
+    ) -> List[Dict[str, Any]]:
+        """Thompson-sample ``count`` patterns from the leading candidates."""
+        top = min(CANDIDATES_PER_CATEGORY, len(self.patterns))
+        if top == 0:
+            return []
+        draws = rng.beta(self.alpha[:top], self.beta[:top])
+        return [self.patterns[i] for i in np.argsort(-draws)[:count]]
+
+    def mean(self, pattern_id: str) -> float:
+        i = self.positions[pattern_id]
+        return float(self.alpha[i] / (self.alpha[i] + self.beta[i]))
+
+    @property
+    def category_mean(self) -> float:
+        return float(self.category_alpha / (self.category_alpha + self.category_beta))
+
+
 class ViralHookEngine:
     """
     Core viral hook optimization engine that selects and generates
     high-engagement hooks using proven patterns.
     """
 
-    def __init__(self, patterns_dir: Optional[str] = None) -> None:
+    PATTERN_FILES = [
+        "controversy.json",
+        "curiosity_gap.json",
+        "social_proof.json",
+        "pattern_interrupt.json",
+        "emotion_triggers.json",
+        "story_hooks.json",
+    ]
+
+    def __init__(
+        self,
+        patterns_dir: Optional[str] = None,
+        reload_interval: float = 30.0,
+        seed: Optional[int] = None,
+    ) -> None:
         self.patterns_dir = patterns_dir or Path(__file__).parent / "patterns"
         self.patterns: Dict[str, Dict[str, Any]] = {}
         self.performance_cache: LRUCache[str, Dict[str, Any]] = LRUCache(maxsize=1000)
+        # Observed results per pattern id: {"impressions": n, "engagements": m}
         self.pattern_performance: Dict[str, Dict[str, Any]] = {}
 
         # Time-based optimization
@@ -69,32 +160,91 @@ class ViralHookEngine:
             },
         }
 
+        # Precomputed selection index
+        self._rng = np.random.default_rng(seed)
+        self._index: Dict[str, _CategoryIndex] = {}
+        self._pattern_category: Dict[str, str] = {}
+        self._categories: List[str] = []
+        self._context_scores: Dict[Tuple[str, str], np.ndarray] = {}
+        self._file_mtimes: Dict[str, float] = {}
+        self.reload_interval = reload_interval
+        self._last_reload_check = time.monotonic()
+
         # Load all pattern files
         self._load_patterns()
 
     def _load_patterns(self) -> None:
         """Load all pattern files from the patterns directory"""
-        pattern_files = [
-            "controversy.json",
-            "curiosity_gap.json",
-            "social_proof.json",
-            "pattern_interrupt.json",
-            "emotion_triggers.json",
-            "story_hooks.json",
-        ]
-
-        for filename in pattern_files:
+        self.reload_patterns()
+
+    def reload_patterns(self) -> List[str]:
+        """
+        Reload pattern files whose mtime changed and reindex their categories.
+
+        Returns:
+            Categories that were reloaded
+        """
+        changed = []
+        for filename in self.PATTERN_FILES:
             file_path = Path(self.patterns_dir) / filename
-            if file_path.exists():
-                try:
-                    with open(file_path, "r") as f:
-                        category_data = json.load(f)
-                        self.patterns[category_data["category"]] = category_data
-                        print(
-                            f"Loaded {len(category_data['patterns'])} patterns for {category_data['category']}"
-                        )
-                except Exception as e:
-                    print(f"Error loading {filename}: {e}")
+            try:
+                mtime = file_path.stat().st_mtime
+            except OSError:
+                continue
+            if self._file_mtimes.get(filename) == mtime:
+                continue
+            try:
+                with open(file_path, "r") as f:
+                    category_data = json.load(f)
+            except Exception as e:
+                print(f"Error loading {filename}: {e}")
+                continue
+
+            self._file_mtimes[filename] = mtime
+            category = category_data["category"]
+            self.patterns[category] = category_data
+            self._index_category(category)
+            changed.append(category)
+            print(f"Loaded {len(category_data['patterns'])} patterns for {category}")
+
+        if changed:
+            self._categories = list(self.patterns.keys())
+            self._context_scores.clear()
+            # Cached hooks may reference removed or rescored patterns
+            self.performance_cache.clear()
+        return changed
+
+    def _maybe_reload_patterns(self) -> None:
+        now = time.monotonic()
+        if now - self._last_reload_check >= self.reload_interval:
+            self._last_reload_check = now
+            self.reload_patterns()
+
+    def _index_category(self, category: str) -> None:
+        index = _CategoryIndex(self.patterns[category], self.pattern_performance)
+        self._index[category] = index
+        for pattern in index.patterns:
+            self._pattern_category[pattern["id"]] = category
+
+    def record_pattern_performance(
+        self, pattern_id: str, impressions: int, engagements: int
+    ) -> None:
+        """
+        Add observed impressions and engagements for a pattern.
+
+        Only the pattern's own category is re-ranked.
+        """
+        if impressions <= 0 or not 0 <= engagements <= impressions:
+            raise ValueError("engagements must be between 0 and impressions > 0")
+        stats = self.pattern_performance.setdefault(
+            pattern_id, {"impressions": 0, "engagements": 0}
+        )
+        stats["impressions"] += impressions
+        stats["engagements"] += engagements
+
+        category = self._pattern_category.get(pattern_id)
+        if category is not None:
+            self._index[category].record(pattern_id, impressions, engagements)
 
     def get_available_patterns(self) -> Dict[str, int]:
         """Get count of available patterns by category"""
@@ -121,85 +271,82 @@ class ViralHookEngine:
         else:
             return "night"
 
-    def _select_optimal_patterns(
-        self,
-        persona_id: str,
-        topic_category: Optional[str] = None,
-        posting_time: Optional[str] = None,
-        variant_count: int = 1,
-    ) -> List[Tuple[str, Dict[str, Any]]]:
-        """Select optimal patterns based on context"""
+    def _context_score_row(self, persona_id: str, time_context: str) -> np.ndarray:
+        """
+        Static score per category for a persona and time context.
 
-        # Determine time context
-        time_context = posting_time or self._get_current_time_context()
+        Rows of the persona x time matrix are built on first use and dropped
+        when patterns reload. Avoided categories score ``-inf``.
+        """
+        key = (persona_id, time_context)
+        row = self._context_scores.get(key)
+        if row is not None:
+            return row
 
-        # Get persona preferences
         persona_prefs = self.persona_preferences.get(
             persona_id,
             {
-                "preferred_categories": list(self.patterns.keys()),
+                "preferred_categories": self._categories,
                 "tone": "general",
                 "avoid": [],
             },
         )
+        time_prefs = set(self.time_preferences.get(time_context, self._categories))
 
-        # Get time-based preferences
-        time_prefs = self.time_preferences.get(time_context, list(self.patterns.keys()))
-
-        # Calculate category scores
-        category_scores = {}
-        for category in self.patterns.keys():
+        row = np.zeros(len(self._categories))
+        for i, category in enumerate(self._categories):
             if category in persona_prefs.get("avoid", []):
+                row[i] = -np.inf
                 continue
-
-            score = 0.0
-
-            # Base engagement rate
-            base_er = self.patterns[category].get("avg_engagement_rate", 0.08)
-            score += base_er * 100
-
-            # Persona preference bonus
+            # Pattern files may declare their own best times
+            best_times = self.patterns[category].get("best_times", [])
             if category in persona_prefs.get("preferred_categories", []):
-                score += 20
+                row[i] += 20
+            if (
+                category in time_prefs
+                or time_context in best_times
+                or ("anytime" in best_times)
+            ):
+                row[i] += 15
 
-            # Time preference bonus
-            if category in time_prefs:
-                score += 15
+        self._context_scores[key] = row
+        return row
 
-            # Topic relevance (simplified)
-            if topic_category and category == "social_proof":
-                score += 10
-
-            # Add some randomness for exploration
-            score += random.uniform(-5, 5)
+    def _select_optimal_patterns(
+        self,
+        persona_id: str,
+        topic_category: Optional[str] = None,
+        posting_time: Optional[str] = None,
+        variant_count: int = 1,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Select optimal patterns based on context"""
+        self._maybe_reload_patterns()
+        if not self._categories:
+            return []
 
-            category_scores[category] = score
+        # Determine time context
+        time_context = posting_time or self._get_current_time_context()
+        scores = self._context_score_row(persona_id, time_context).copy()
 
-        # Select top categories
-        sorted_categories = sorted(
-            category_scores.items(), key=lambda x: x[1], reverse=True
+        # Thompson-sample each category's engagement rate
+        indexes = [self._index[category] for category in self._categories]
+        scores += 100 * self._rng.beta(
+            [index.category_alpha for index in indexes],
+            [index.category_beta for index in indexes],
         )
 
-        selected_patterns = []
-        patterns_needed = variant_count
+        # Topic relevance (simplified)
+        if topic_category and "social_proof" in self._index:
+            scores[self._categories.index("social_proof")] += 10
 
-        for category, score in sorted_categories:
-            if patterns_needed <= 0:
+        selected_patterns: List[Tuple[str, Dict[str, Any]]] = []
+        for i in np.argsort(-scores):
+            if len(selected_patterns) >= variant_count or scores[i] == -np.inf:
                 break
-
-            # Select patterns from this category
-            category_patterns = self.patterns[category]["patterns"]
-
-            # Sort patterns by engagement rate
-            sorted_patterns = sorted(
-                category_patterns, key=lambda p: p.get("avg_er", 0.08), reverse=True
-            )
-
-            # Take top patterns from this category
-            take_count = min(patterns_needed, len(sorted_patterns))
-            for pattern in sorted_patterns[:take_count]:
+            category = self._categories[i]
+            needed = variant_count - len(selected_patterns)
+            for pattern in self._index[category].sample_patterns(self._rng, needed):
                 selected_patterns.append((category, pattern))
-                patterns_needed -= 1
 
         return selected_patterns[:variant_count]
 
@@ -282,6 +429,7 @@ class ViralHookEngine:
             }
 
         category, pattern = selected_patterns[0]
+        expected_er = self._index[category].mean(pattern["id"])
 
         # Generate optimized hook
         optimized_hook = self._fill_pattern_template(pattern, base_content, persona_id)
@@ -293,12 +441,12 @@ class ViralHookEngine:
                     "content": optimized_hook,
                     "pattern": pattern["id"],
                     "pattern_category": category,
-                    "score": pattern.get("avg_er", 0.08),
+                    "score": expected_er,
                     "template": pattern["template"],
                 }
             ],
             "selected_pattern": pattern["id"],
-            "expected_engagement_rate": pattern.get("avg_er", 0.08),
+            "expected_engagement_rate": expected_er,
             "optimization_reason": f"Selected {category} pattern for {posting_time or 'current'} time context",
         }
 
@@ -343,7 +491,7 @@ class ViralHookEngine:
                 "content": optimized_hook,
                 "pattern": pattern["id"],
                 "pattern_category": category,
-                "expected_er": pattern.get("avg_er", 0.08),
+                "expected_er": self._index[category].mean(pattern["id"]),
                 "template": pattern["template"],
                 "original_content": base_content,
             }
@@ -361,8 +509,8 @@ class ViralHookEngine:
     ) -> Dict[str, Any]:
         """Get pattern performance analytics"""
 
-        # This would typically query a database for actual performance data
-        # For now, return mock analytics based on pattern definitions
+        # Declared pattern rates blended with outcomes fed through
+        # record_pattern_performance
 
         analytics = {
             "persona_id": persona_id,
@@ -371,14 +519,17 @@ class ViralHookEngine:
                 [p for category in self.patterns.values() for p in category["patterns"]]
             ),
             "top_performing_categories": [],
-            "pattern_usage_stats": {},
+            "pattern_usage_stats": {
+                pattern_id: dict(stats)
+                for pattern_id, stats in self.pattern_performance.items()
+            },
             "recommendation": "",
         }
 
         # Calculate category performance
         category_performance = []
         for category, data in self.patterns.items():
-            avg_er = data.get("avg_engagement_rate", 0.08)
+            avg_er = self._index[category].category_mean
             pattern_count = len(data["patterns"])
 
             category_performance.append(
@@ -65,6 +65,12 @@ class PatternPerformanceRequest(BaseModel):
     )
 
 
+class PatternFeedbackRequest(BaseModel):
+    pattern_id: str = Field(..., examples=["controversy_001"])
+    impressions: int = Field(..., gt=0)
+    engagements: int = Field(..., ge=0)
+
+
 class EngagementPredictionRequest(BaseModel):
     content: str = Field(
         ...,
@@ -157,6 +163,21 @@ async def get_pattern_performance(req: PatternPerformanceRequest) -> Dict[str, A
         )
 
 
+@api.post("/pattern-feedback")
+async def record_pattern_feedback(req: PatternFeedbackRequest) -> Dict[str, Any]:
+    """Feed observed engagement for a pattern back into hook selection"""
+    try:
+        hook_engine.record_pattern_performance(
+            req.pattern_id, req.impressions, req.engagements
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {
+        "pattern_id": req.pattern_id,
+        **hook_engine.pattern_performance[req.pattern_id],
+    }
+
+
 @api.post("/predict/engagement", response_model=EngagementPredictionResponse)
 async def predict_engagement(
     req: EngagementPredictionRequest,
@@ -1,6 +1,9 @@
 # services/viral_engine/tests/test_hook_optimizer.py
 from __future__ import annotations
 
+import json
+import os
+import time
 from unittest.mock import patch
 
 import pytest
@@ -209,6 +212,93 @@ class TestViralHookEngine:
         assert "optimized_hooks" in result
 
 
+def _write_category(directory, category, count, er=0.05, best_times=None):
+    data = {
+        "category": category,
+        "avg_engagement_rate": er,
+        "best_times": best_times or [],
+        "patterns": [
+            {
+                "id": f"{category}_{i:04d}",
+                "template": f"{category} {i}: {{statement}}",
+                "variables": ["statement"],
+                "avg_er": er,
+            }
+            for i in range(count)
+        ],
+    }
+    (directory / f"{category}.json").write_text(json.dumps(data))
+
+
+class TestPatternIndex:
+    """Index-backed, bandit-driven pattern selection"""
+
+    def test_live_performance_reorders_patterns(self, tmp_path):
+        _write_category(tmp_path, "controversy", 20)
+        engine = ViralHookEngine(patterns_dir=str(tmp_path), seed=1)
+
+        # A pattern at the bottom of its category starts winning
+        engine.record_pattern_performance("controversy_0019", 1000, 400)
+
+        picks = [
+            engine._select_optimal_patterns("ai-elon", posting_time="evening")[0][1]
+            for _ in range(20)
+        ]
+        assert all(p["id"] == "controversy_0019" for p in picks)
+        assert engine._index["controversy"].patterns[0]["id"] == "controversy_0019"
+
+    def test_sampling_explores_comparable_patterns(self, tmp_path):
+        _write_category(tmp_path, "story_hooks", 5)
+        engine = ViralHookEngine(patterns_dir=str(tmp_path), seed=2)
+
+        picks = {
+            engine._select_optimal_patterns("ai-jesus", posting_time="morning")[0][1][
+                "id"
+            ]
+            for _ in range(50)
+        }
+        assert len(picks) > 1
+
+    def test_changed_pattern_file_is_reloaded(self, tmp_path):
+        _write_category(tmp_path, "controversy", 3)
+        _write_category(tmp_path, "story_hooks", 3)
+        engine = ViralHookEngine(patterns_dir=str(tmp_path), reload_interval=0)
+        story_index = engine._index["story_hooks"]
+
+        _write_category(tmp_path, "controversy", 6)
+        stat = (tmp_path / "controversy.json").stat()
+        os.utime(tmp_path / "controversy.json", (stat.st_atime, stat.st_mtime + 1))
+        engine._select_optimal_patterns("ai-elon", posting_time="morning")
+
+        assert engine.get_available_patterns()["controversy"] == 6
+        # Untouched categories keep their index
+        assert engine._index["story_hooks"] is story_index
+
+    def test_avoided_category_never_selected(self, tmp_path):
+        _write_category(tmp_path, "controversy", 3, er=0.5)
+        _write_category(tmp_path, "story_hooks", 1, er=0.01)
+        engine = ViralHookEngine(patterns_dir=str(tmp_path), seed=3)
+
+        selected = engine._select_optimal_patterns(
+            "ai-jesus", posting_time="evening", variant_count=4
+        )
+        assert [category for category, _ in selected] == ["story_hooks"]
+
+    def test_selection_cost_flat_for_large_library(self, tmp_path):
+        for category in ("controversy", "curiosity_gap", "story_hooks"):
+            _write_category(tmp_path, category, 3000)
+        engine = ViralHookEngine(patterns_dir=str(tmp_path), seed=4)
+
+        start = time.perf_counter()
+        for _ in range(200):
+            engine._select_optimal_patterns(
+                "ai-elon", posting_time="morning", variant_count=3
+            )
+        per_call_ms = (time.perf_counter() - start) / 200 * 1000
+
+        assert per_call_ms < 2
+
+
 # Performance benchmarks
 class TestPerformance:
     """Performance tests for ViralHookEngine"""
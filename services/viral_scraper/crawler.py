@@ -0,0 +1,297 @@
+# services/viral_scraper/crawler.py
+"""
+Incremental crawling of monitored accounts.
+
+Each crawl starts from the account's high-water mark, so the upstream only
+returns posts at or after the newest one already stored, and stops paging
+as soon as a page brings nothing new. The mark only advances once paging
+has reached it: a crawl cut short by its page, post or request limit saves
+a resume cursor, and the next crawl finishes the older pages first. Accounts are crawled concurrently
+within a shared ``RateBudget``, highest historical viral yield first, so
+when a run's request budget runs out it has been spent where new viral
+posts are most likely.
+"""
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Protocol
+
+from prometheus_client import Counter as PromCounter, Gauge
+
+from .models import ViralPost
+from .rate_limiter import RateBudget
+from .store import AccountState, PostStore
+
+# Beta-style prior on viral posts per request: accounts without history
+# rank as if they had found one viral post in five requests, so they are
+# still explored ahead of accounts that have proven unproductive
+PRIOR_VIRAL_POSTS = 1.0
+PRIOR_REQUESTS = 5.0
+
+UPSTREAM_REQUESTS = PromCounter(
+    "viral_scraper_upstream_requests_total",
+    "Upstream page requests made by crawls",
+    ["account_id"],
+)
+POSTS_FETCHED = PromCounter(
+    "viral_scraper_posts_fetched_total",
+    "Posts returned by the upstream",
+    ["account_id"],
+)
+NEW_POSTS = PromCounter(
+    "viral_scraper_new_posts_total",
+    "Fetched posts not already in the store",
+    ["account_id"],
+)
+NEW_POSTS_PER_REQUEST = Gauge(
+    "viral_scraper_new_posts_per_request",
+    "New posts per upstream request over the account's crawl history",
+    ["account_id"],
+)
+
+
+@dataclass
+class UpstreamPage:
+    """One page of an account's posts, newest first."""
+
+    posts: List[ViralPost]
+    next_cursor: Optional[str] = None
+
+
+class Upstream(Protocol):
+    """Source of an account's posts."""
+
+    async def fetch_posts(
+        self,
+        account_id: str,
+        since: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ) -> UpstreamPage:
+        """Posts created at or after ``since``, newest first, one page per call."""
+        ...
+
+
+class FakeUpstream:
+    """In-memory upstream for tests and local runs."""
+
+    def __init__(self, page_size: int = 20, latency: float = 0.0):
+        self.page_size = page_size
+        self.latency = latency
+        self.posts: Dict[str, List[ViralPost]] = {}
+        self.requests: Counter = Counter()
+
+    def publish(self, *posts: ViralPost) -> None:
+        for post in posts:
+            self.posts.setdefault(post.account_id, []).append(post)
+
+    async def fetch_posts(
+        self,
+        account_id: str,
+        since: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+    ) -> UpstreamPage:
+        self.requests[account_id] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        posts = sorted(
+            (
+                post
+                for post in self.posts.get(account_id, [])
+                if since is None or _utc(post.timestamp) >= since
+            ),
+            key=lambda post: _utc(post.timestamp),
+            reverse=True,
+        )
+        start = int(cursor or 0)
+        end = start + self.page_size
+        return UpstreamPage(
+            posts=posts[start:end],
+            next_cursor=str(end) if end < len(posts) else None,
+        )
+
+
+def _utc(timestamp: datetime) -> datetime:
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+@dataclass
+class AccountCrawl:
+    """Outcome of crawling one account."""
+
+    account_id: str
+    requests: int = 0
+    posts_fetched: int = 0
+    new_posts: int = 0
+    viral_posts: int = 0
+    skipped: bool = False
+
+
+@dataclass
+class CrawlReport:
+    """Outcome of a scheduler run."""
+
+    accounts: List[AccountCrawl] = field(default_factory=list)
+
+    @property
+    def requests(self) -> int:
+        return sum(a.requests for a in self.accounts)
+
+    @property
+    def new_posts(self) -> int:
+        return sum(a.new_posts for a in self.accounts)
+
+    @property
+    def new_posts_per_request(self) -> float:
+        return self.new_posts / self.requests if self.requests else 0.0
+
+
+class CrawlScheduler:
+    """Crawls accounts incrementally, concurrently and by viral yield."""
+
+    def __init__(
+        self,
+        store: PostStore,
+        upstream: Upstream,
+        budget: RateBudget,
+        max_concurrency: int = 4,
+        max_pages_per_account: int = 10,
+    ):
+        """
+        Args:
+            store: Post store holding posts and crawl state
+            upstream: Source of account posts
+            budget: Upstream request rate shared by all crawls
+            max_concurrency: Accounts crawled at once
+            max_pages_per_account: Page limit of one account crawl
+        """
+        self.store = store
+        self.upstream = upstream
+        self.budget = budget
+        self.max_concurrency = max_concurrency
+        self.max_pages_per_account = max_pages_per_account
+
+    @staticmethod
+    def priority(state: AccountState) -> float:
+        """Smoothed viral posts per upstream request."""
+        return (state.viral_posts + PRIOR_VIRAL_POSTS) / (
+            state.requests + PRIOR_REQUESTS
+        )
+
+    def plan(self, account_ids: List[str]) -> List[str]:
+        """Accounts in crawl order, highest priority first."""
+        states = {a: self.store.get_account(a) for a in dict.fromkeys(account_ids)}
+        return sorted(states, key=lambda a: self.priority(states[a]), reverse=True)
+
+    async def crawl(
+        self, account_ids: List[str], request_budget: Optional[int] = None
+    ) -> CrawlReport:
+        """
+        Crawl accounts concurrently in priority order.
+
+        Args:
+            account_ids: Accounts to crawl
+            request_budget: Upstream requests this run may make; accounts
+                not started when it is spent are reported as skipped
+
+        Returns:
+            CrawlReport with one entry per account, in crawl order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        remaining = [request_budget]
+
+        async def run(account_id: str) -> AccountCrawl:
+            # Semaphore waiters wake in order, so priority order is kept
+            async with semaphore:
+                if remaining[0] is not None and remaining[0] <= 0:
+                    return AccountCrawl(account_id, skipped=True)
+                return await self.crawl_account(account_id, remaining=remaining)
+
+        results = await asyncio.gather(*(run(a) for a in self.plan(account_ids)))
+        return CrawlReport(accounts=list(results))
+
+    async def crawl_account(
+        self,
+        account_id: str,
+        max_posts: Optional[int] = None,
+        remaining: Optional[List[Optional[int]]] = None,
+    ) -> AccountCrawl:
+        """
+        Fetch and store an account's posts newer than its high-water mark.
+
+        Args:
+            account_id: Account to crawl
+            max_posts: Stop after fetching this many posts
+            remaining: Shared request budget of a scheduler run
+
+        Returns:
+            AccountCrawl with the counts of this crawl
+        """
+        state = self.store.get_account(account_id)
+        result = AccountCrawl(account_id)
+        # Resume an interrupted crawl of the same window, if there is one
+        cursor = state.resume_cursor
+        resuming = cursor is not None
+        newest = state.pending_mark or state.high_water_mark
+        complete = False
+
+        for _ in range(self.max_pages_per_account):
+            if remaining is not None and remaining[0] is not None:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            await self.budget.acquire()
+            page = await self.upstream.fetch_posts(
+                account_id, since=state.high_water_mark, cursor=cursor
+            )
+            result.requests += 1
+            result.posts_fetched += len(page.posts)
+
+            new_posts = self.store.save_posts(page.posts)
+            result.new_posts += len(new_posts)
+            result.viral_posts += sum(post.is_top_1_percent() for post in new_posts)
+            for post in page.posts:
+                timestamp = _utc(post.timestamp)
+                if newest is None or timestamp > newest:
+                    newest = timestamp
+
+            # Pages are newest first: one with nothing new reached stored
+            # posts, unless it is a resumed page above older unfetched ones
+            if not page.next_cursor or (not new_posts and not resuming):
+                complete = True
+                break
+            cursor = page.next_cursor
+            if max_posts is not None and result.posts_fetched >= max_posts:
+                break
+
+        if complete:
+            self.store.record_crawl(
+                account_id,
+                requests=result.requests,
+                posts_fetched=result.posts_fetched,
+                new_posts=result.new_posts,
+                viral_posts=result.viral_posts,
+                high_water_mark=newest,
+            )
+        else:
+            # Older posts are still unfetched; keep the mark where it is
+            self.store.record_crawl(
+                account_id,
+                requests=result.requests,
+                posts_fetched=result.posts_fetched,
+                new_posts=result.new_posts,
+                viral_posts=result.viral_posts,
+                high_water_mark=state.high_water_mark,
+                resume_cursor=cursor,
+                pending_mark=newest,
+            )
+        UPSTREAM_REQUESTS.labels(account_id=account_id).inc(result.requests)
+        POSTS_FETCHED.labels(account_id=account_id).inc(result.posts_fetched)
+        NEW_POSTS.labels(account_id=account_id).inc(result.new_posts)
+        NEW_POSTS_PER_REQUEST.labels(account_id=account_id).set(
+            self.store.get_account(account_id).new_posts_per_request
+        )
+        return result
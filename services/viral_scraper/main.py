@@ -3,21 +3,49 @@
 Viral Content Scraper Service
 
 Monitors and extracts viral content from high-performing Threads accounts.
-Minimal implementation to pass initial tests.
+
+Scraped posts are kept in a persistent ``PostStore``; scrapes and crawls
+fetch only posts newer than each account's high-water mark once an
+upstream is configured with ``configure_upstream``.
 """
 
-from fastapi import FastAPI, HTTPException
-from typing import Dict, Optional, Any
+from fastapi import FastAPI, HTTPException, Response
+from typing import Dict, List, Optional, Any
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel
+import os
 import uuid
 
-from .rate_limiter import RateLimiter
+from .crawler import CrawlScheduler, Upstream
+from .rate_limiter import RateBudget, RateLimiter
+from .store import PostStore
 
 app = FastAPI(title="viral-scraper", description="Viral content scraper service")
 
 # Initialize rate limiter (1 request per minute for testing)
 rate_limiter = RateLimiter(requests_per_window=1, window_seconds=60)
 
+# Set VIRAL_SCRAPER_DB_PATH to persist posts; the default keeps them in memory
+store = PostStore(os.getenv("VIRAL_SCRAPER_DB_PATH", ":memory:"))
+
+# Upstream requests per second shared by all crawls
+crawl_budget = RateBudget(
+    requests_per_second=float(os.getenv("VIRAL_SCRAPER_REQUESTS_PER_SECOND", "1")),
+    burst=int(os.getenv("VIRAL_SCRAPER_REQUEST_BURST", "5")),
+)
+
+scheduler: Optional[CrawlScheduler] = None
+
+
+def configure_upstream(upstream: Optional[Upstream], max_concurrency: int = 4) -> None:
+    """Set the source of account posts; None leaves scrapes queued."""
+    global scheduler
+    scheduler = (
+        CrawlScheduler(store, upstream, crawl_budget, max_concurrency=max_concurrency)
+        if upstream is not None
+        else None
+    )
+
 
 class ScrapeRequest(BaseModel):
     """Request model for scraping configuration"""
@@ -27,12 +55,25 @@ class ScrapeRequest(BaseModel):
     min_performance_percentile: Optional[float] = 99.0
 
 
+class CrawlRequest(BaseModel):
+    """Request model for a scheduled crawl"""
+
+    account_ids: Optional[List[str]] = None
+    request_budget: Optional[int] = None
+
+
 @app.get("/health")
 async def health() -> Dict[str, str]:
     """Health check endpoint"""
     return {"status": "healthy", "service": "viral-scraper"}
 
 
+@app.get("/metrics")
+async def metrics() -> Response:
+    """Prometheus metrics endpoint"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.post("/scrape/account/{account_id}")
 async def scrape_account(
     account_id: str, request: Optional[ScrapeRequest] = None
@@ -72,9 +113,61 @@ async def scrape_account(
             }
         )
 
+    if scheduler is not None:
+        result = await scheduler.crawl_account(
+            account_id, max_posts=request.max_posts if request else None
+        )
+        response.update(
+            {
+                "status": "completed",
+                "posts_scraped": result.posts_fetched,
+                "new_posts": result.new_posts,
+                "viral_posts": result.viral_posts,
+                "requests": result.requests,
+            }
+        )
+
     return response
 
 
+@app.post("/crawl")
+async def crawl(request: Optional[CrawlRequest] = None) -> Dict[str, Any]:
+    """Crawl accounts incrementally, highest viral yield first"""
+    if scheduler is None:
+        raise HTTPException(status_code=503, detail="No upstream configured")
+
+    request = request or CrawlRequest()
+    account_ids = request.account_ids or [a.account_id for a in store.list_accounts()]
+    report = await scheduler.crawl(account_ids, request_budget=request.request_budget)
+    return {
+        "accounts": [vars(account) for account in report.accounts],
+        "requests": report.requests,
+        "new_posts": report.new_posts,
+        "new_posts_per_request": report.new_posts_per_request,
+    }
+
+
+@app.get("/crawl/stats")
+async def get_crawl_stats() -> Dict[str, Any]:
+    """Per-account crawl history and scheduling priority"""
+    return {
+        "accounts": [
+            {
+                "account_id": state.account_id,
+                "high_water_mark": state.high_water_mark,
+                "backfill_pending": state.resume_cursor is not None,
+                "crawls": state.crawls,
+                "requests": state.requests,
+                "new_posts": state.new_posts,
+                "viral_posts": state.viral_posts,
+                "new_posts_per_request": state.new_posts_per_request,
+                "priority": CrawlScheduler.priority(state),
+            }
+            for state in store.list_accounts()
+        ]
+    }
+
+
 @app.get("/scrape/tasks/{task_id}/status")
 async def get_scraping_task_status(task_id: str) -> Dict[str, Any]:
     """Get status of a scraping task"""
@@ -91,28 +184,17 @@ async def get_viral_posts(
     top_1_percent_only: bool = False,
 ) -> Dict[str, Any]:
     """Get list of viral posts with optional filtering"""
-    # Minimal implementation - return mock data
-    mock_posts = []
-
-    # If top_1_percent_only, return posts with >99% percentile
-    if top_1_percent_only:
-        mock_posts = [
-            {
-                "content": "Mock viral post",
-                "account_id": account_id or "test_account",
-                "post_url": "https://threads.net/test/123",
-                "timestamp": "2023-12-01T10:00:00Z",
-                "likes": 5000,
-                "comments": 200,
-                "shares": 1000,
-                "engagement_rate": 0.25,
-                "performance_percentile": 99.5,
-            }
-        ]
+    posts, total = store.query_posts(
+        account_id=account_id,
+        min_engagement_rate=min_engagement_rate,
+        min_percentile=99.0 if top_1_percent_only else None,
+        limit=limit,
+        offset=(max(page, 1) - 1) * limit,
+    )
 
     return {
-        "posts": mock_posts,
-        "total_count": len(mock_posts),
+        "posts": [post.model_dump(mode="json") for post in posts],
+        "total_count": total,
         "page": page,
         "page_size": limit,
     }
@@ -121,8 +203,11 @@ async def get_viral_posts(
 @app.get("/viral-posts/{account_id}")
 async def get_viral_posts_by_account(account_id: str) -> Dict[str, Any]:
     """Get viral posts for a specific account"""
-    # Minimal implementation - return mock data
-    return {"account_id": account_id, "posts": []}
+    posts, _ = store.query_posts(account_id=account_id, limit=100)
+    return {
+        "account_id": account_id,
+        "posts": [post.model_dump(mode="json") for post in posts],
+    }
 
 
 @app.get("/rate-limit/status/{account_id}")
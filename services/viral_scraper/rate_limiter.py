@@ -5,6 +5,8 @@ Simple rate limiter for viral content scraper.
 Minimal implementation to pass initial tests.
 """
 
+import asyncio
+import time
 from typing import Dict, Any
 from datetime import datetime, timedelta
 
@@ -73,3 +75,36 @@ class RateLimiter:
             "requests_remaining": remaining,
             "reset_time": reset_time.isoformat(),
         }
+
+
+class RateBudget:
+    """Token bucket of upstream requests shared by concurrent crawls.
+
+    Unlike ``RateLimiter``, which limits how often one account may be
+    scraped, the budget caps the total request rate to the upstream across
+    all accounts. Waiters are served in arrival order.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        self.requests_per_second = requests_per_second
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent, then spend one token."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst,
+                    self._tokens + (now - self._updated) * self.requests_per_second,
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.requests_per_second)
@@ -0,0 +1,313 @@
+# services/viral_scraper/store.py
+"""
+Persistent store for scraped posts and per-account crawl state.
+
+Posts are keyed by a hash of their normalized content, so reposts and
+re-fetched pages are stored once. Each account keeps a high-water mark (the
+newest post timestamp up to which every post has been fetched) that
+incremental crawls start from, a resume cursor while a crawl that stopped
+early still has older pages to fetch, and cumulative counters the crawl
+scheduler uses to rank accounts.
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from .models import ViralPost
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    content_hash TEXT PRIMARY KEY,
+    account_id TEXT NOT NULL,
+    content TEXT NOT NULL,
+    post_url TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    likes INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    shares INTEGER NOT NULL,
+    engagement_rate REAL NOT NULL,
+    performance_percentile REAL NOT NULL,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_account_timestamp
+    ON posts(account_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_percentile
+    ON posts(performance_percentile DESC);
+
+CREATE TABLE IF NOT EXISTS accounts (
+    account_id TEXT PRIMARY KEY,
+    high_water_mark TEXT,
+    crawls INTEGER NOT NULL DEFAULT 0,
+    requests INTEGER NOT NULL DEFAULT 0,
+    posts_fetched INTEGER NOT NULL DEFAULT 0,
+    new_posts INTEGER NOT NULL DEFAULT 0,
+    viral_posts INTEGER NOT NULL DEFAULT 0,
+    last_crawled_at TEXT,
+    resume_cursor TEXT,
+    pending_mark TEXT
+);
+"""
+
+# Columns added to the accounts table after its first release
+_ACCOUNT_COLUMNS = {"resume_cursor": "TEXT", "pending_mark": "TEXT"}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(content: str) -> str:
+    """Hash of post content with case and whitespace normalized."""
+    normalized = _WHITESPACE.sub(" ", content).strip().lower()
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def _to_utc(timestamp: datetime) -> str:
+    """ISO timestamp in UTC, so stored values sort chronologically."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc).isoformat()
+
+
+@dataclass
+class AccountState:
+    """Crawl history of one account."""
+
+    account_id: str
+    high_water_mark: Optional[datetime] = None
+    crawls: int = 0
+    requests: int = 0
+    posts_fetched: int = 0
+    new_posts: int = 0
+    viral_posts: int = 0
+    last_crawled_at: Optional[datetime] = None
+    # Set while an interrupted crawl has older pages left: the cursor of the
+    # next page, and the newest timestamp the crawl has fetched
+    resume_cursor: Optional[str] = None
+    pending_mark: Optional[datetime] = None
+
+    @property
+    def new_posts_per_request(self) -> float:
+        return self.new_posts / self.requests if self.requests else 0.0
+
+
+class PostStore:
+    """SQLite-backed post store, safe to share between threads."""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            existing = {
+                row["name"] for row in self._conn.execute("PRAGMA table_info(accounts)")
+            }
+            for column, kind in _ACCOUNT_COLUMNS.items():
+                if column not in existing:
+                    self._conn.execute(
+                        f"ALTER TABLE accounts ADD COLUMN {column} {kind}"
+                    )
+
+    def save_posts(self, posts: Iterable[ViralPost]) -> List[ViralPost]:
+        """
+        Insert posts whose content has not been stored before.
+
+        Returns:
+            The posts that were new
+        """
+        scraped_at = _to_utc(datetime.now(timezone.utc))
+        new_posts = []
+        with self._lock, self._conn:
+            for post in posts:
+                cursor = self._conn.execute(
+                    """
+                    INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(content_hash) DO NOTHING
+                    """,
+                    (
+                        content_hash(post.content),
+                        post.account_id,
+                        post.content,
+                        post.post_url,
+                        _to_utc(post.timestamp),
+                        post.likes,
+                        post.comments,
+                        post.shares,
+                        post.engagement_rate,
+                        post.performance_percentile,
+                        scraped_at,
+                    ),
+                )
+                if cursor.rowcount:
+                    new_posts.append(post)
+        return new_posts
+
+    def get_account(self, account_id: str) -> AccountState:
+        """Crawl state of ``account_id`` (empty if never crawled)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM accounts WHERE account_id = ?", (account_id,)
+            ).fetchone()
+        return self._account(row) if row else AccountState(account_id)
+
+    def list_accounts(self) -> List[AccountState]:
+        """Crawl state of every account crawled so far."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM accounts ORDER BY account_id"
+            ).fetchall()
+        return [self._account(row) for row in rows]
+
+    def record_crawl(
+        self,
+        account_id: str,
+        requests: int,
+        posts_fetched: int,
+        new_posts: int,
+        viral_posts: int,
+        high_water_mark: Optional[datetime],
+        resume_cursor: Optional[str] = None,
+        pending_mark: Optional[datetime] = None,
+    ) -> None:
+        """
+        Add one crawl's counts and advance the account's high-water mark.
+
+        ``resume_cursor`` and ``pending_mark`` replace the stored values, so
+        a crawl that reaches the end of its pages clears them.
+        """
+        mark = _to_utc(high_water_mark) if high_water_mark else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO accounts (
+                    account_id, high_water_mark, crawls, requests,
+                    posts_fetched, new_posts, viral_posts, last_crawled_at,
+                    resume_cursor, pending_mark
+                ) VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(account_id) DO UPDATE SET
+                    high_water_mark = CASE
+                        WHEN accounts.high_water_mark IS NULL
+                            OR excluded.high_water_mark > accounts.high_water_mark
+                        THEN excluded.high_water_mark
+                        ELSE accounts.high_water_mark
+                    END,
+                    crawls = accounts.crawls + 1,
+                    requests = accounts.requests + excluded.requests,
+                    posts_fetched = accounts.posts_fetched + excluded.posts_fetched,
+                    new_posts = accounts.new_posts + excluded.new_posts,
+                    viral_posts = accounts.viral_posts + excluded.viral_posts,
+                    last_crawled_at = excluded.last_crawled_at,
+                    resume_cursor = excluded.resume_cursor,
+                    pending_mark = excluded.pending_mark
+                """,
+                (
+                    account_id,
+                    mark,
+                    requests,
+                    posts_fetched,
+                    new_posts,
+                    viral_posts,
+                    _to_utc(datetime.now(timezone.utc)),
+                    resume_cursor,
+                    _to_utc(pending_mark) if pending_mark else None,
+                ),
+            )
+
+    def query_posts(
+        self,
+        account_id: Optional[str] = None,
+        min_engagement_rate: Optional[float] = None,
+        min_percentile: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Tuple[List[ViralPost], int]:
+        """
+        Stored posts, newest first.
+
+        Args:
+            account_id: Only posts of this account
+            min_engagement_rate: Only posts at or above this engagement rate
+            min_percentile: Only posts strictly above this percentile
+            limit: Page size
+            offset: Posts to skip
+
+        Returns:
+            (posts, total matching count)
+        """
+        clauses, params = [], []
+        if account_id is not None:
+            clauses.append("account_id = ?")
+            params.append(account_id)
+        if min_engagement_rate is not None:
+            clauses.append("engagement_rate >= ?")
+            params.append(min_engagement_rate)
+        if min_percentile is not None:
+            clauses.append("performance_percentile > ?")
+            params.append(min_percentile)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT count(*) FROM posts {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""
+                SELECT * FROM posts {where}
+                ORDER BY timestamp DESC, content_hash
+                LIMIT ? OFFSET ?
+                """,
+                [*params, limit, offset],
+            ).fetchall()
+
+        posts = [
+            ViralPost(
+                content=row["content"],
+                account_id=row["account_id"],
+                post_url=row["post_url"],
+                timestamp=datetime.fromisoformat(row["timestamp"]),
+                likes=row["likes"],
+                comments=row["comments"],
+                shares=row["shares"],
+                engagement_rate=row["engagement_rate"],
+                performance_percentile=row["performance_percentile"],
+            )
+            for row in rows
+        ]
+        return posts, total
+
+    @staticmethod
+    def _account(row: sqlite3.Row) -> AccountState:
+        return AccountState(
+            account_id=row["account_id"],
+            high_water_mark=(
+                datetime.fromisoformat(row["high_water_mark"])
+                if row["high_water_mark"]
+                else None
+            ),
+            crawls=row["crawls"],
+            requests=row["requests"],
+            posts_fetched=row["posts_fetched"],
+            new_posts=row["new_posts"],
+            viral_posts=row["viral_posts"],
+            last_crawled_at=(
+                datetime.fromisoformat(row["last_crawled_at"])
+                if row["last_crawled_at"]
+                else None
+            ),
+            resume_cursor=row["resume_cursor"],
+            pending_mark=(
+                datetime.fromisoformat(row["pending_mark"])
+                if row["pending_mark"]
+                else None
+            ),
+        )
+
+    def close(self) -> None:
+        self._conn.close()
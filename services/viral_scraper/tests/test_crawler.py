@@ -0,0 +1,258 @@
+# services/viral_scraper/tests/test_crawler.py
+"""
+Tests for the post store and incremental crawl scheduler
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from services.viral_scraper.crawler import CrawlScheduler, FakeUpstream
+from services.viral_scraper.models import ViralPost
+from services.viral_scraper.rate_limiter import RateBudget
+from services.viral_scraper.store import PostStore
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_post(account_id: str, i: int, percentile: float = 50.0, **kwargs):
+    return ViralPost(
+        **{
+            "content": f"Post {i} from {account_id}",
+            "account_id": account_id,
+            "post_url": f"https://threads.net/{account_id}/post/{i}",
+            "timestamp": START + timedelta(minutes=i),
+            "likes": 100 + i,
+            "comments": 10,
+            "shares": 5,
+            "engagement_rate": 0.05,
+            "performance_percentile": percentile,
+            **kwargs,
+        }
+    )
+
+
+def make_scheduler(upstream, **kwargs):
+    budget = RateBudget(requests_per_second=1000, burst=1000)
+    return CrawlScheduler(PostStore(), upstream, budget, **kwargs)
+
+
+def test_store_deduplicates_normalized_content():
+    store = PostStore()
+    post = make_post("acct", 1)
+    repost = make_post("other", 2, content="  POST 1 from   acct ")
+
+    assert store.save_posts([post, repost]) == [post]
+    assert store.save_posts([post]) == []
+
+    posts, total = store.query_posts()
+    assert total == 1
+    assert posts[0].content == post.content
+
+
+def test_store_query_filters_and_pages_newest_first():
+    store = PostStore()
+    store.save_posts(
+        make_post("acct", i, percentile=99.5 if i % 2 else 50.0) for i in range(10)
+    )
+
+    posts, total = store.query_posts(min_percentile=99.0, limit=2, offset=1)
+    assert total == 5
+    assert [p.content for p in posts] == ["Post 7 from acct", "Post 5 from acct"]
+
+
+def test_store_adds_resume_columns_to_existing_database(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "posts.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE accounts (account_id TEXT PRIMARY KEY, high_water_mark TEXT, "
+        "crawls INTEGER NOT NULL DEFAULT 0, requests INTEGER NOT NULL DEFAULT 0, "
+        "posts_fetched INTEGER NOT NULL DEFAULT 0, "
+        "new_posts INTEGER NOT NULL DEFAULT 0, "
+        "viral_posts INTEGER NOT NULL DEFAULT 0, last_crawled_at TEXT)"
+    )
+    conn.execute("INSERT INTO accounts (account_id) VALUES ('acct')")
+    conn.commit()
+    conn.close()
+
+    store = PostStore(path)
+    assert store.get_account("acct").resume_cursor is None
+    store.record_crawl("acct", 1, 10, 10, 0, None, resume_cursor="10")
+    assert store.get_account("acct").resume_cursor == "10"
+    store.close()
+
+
+def test_incremental_crawl_fetches_only_new_posts():
+    upstream = FakeUpstream(page_size=10)
+    upstream.publish(*(make_post("acct", i) for i in range(35)))
+    scheduler = make_scheduler(upstream)
+
+    first = asyncio.run(scheduler.crawl_account("acct"))
+    assert first.requests == 4
+    assert first.new_posts == 35
+
+    upstream.publish(*(make_post("acct", i) for i in range(35, 38)))
+    second = asyncio.run(scheduler.crawl_account("acct"))
+
+    # One page from the high-water mark: 3 new posts plus the boundary post
+    assert second.requests == 1
+    assert second.posts_fetched == 4
+    assert second.new_posts == 3
+
+    state = scheduler.store.get_account("acct")
+    assert state.high_water_mark == START + timedelta(minutes=37)
+    assert state.crawls == 2
+    assert state.requests == 5
+    assert state.new_posts == 38
+
+
+def test_crawl_stops_at_max_posts():
+    upstream = FakeUpstream(page_size=10)
+    upstream.publish(*(make_post("acct", i) for i in range(50)))
+    scheduler = make_scheduler(upstream)
+
+    result = asyncio.run(scheduler.crawl_account("acct", max_posts=15))
+    assert result.requests == 2
+    assert result.posts_fetched == 20
+
+    # The rest is fetched by the next crawl, not skipped by a moved mark
+    state = scheduler.store.get_account("acct")
+    assert state.high_water_mark is None
+    assert state.resume_cursor is not None
+    rest = asyncio.run(scheduler.crawl_account("acct"))
+    assert rest.new_posts == 30
+    assert scheduler.store.query_posts(limit=100)[1] == 50
+
+
+def test_early_stop_keeps_older_posts_reachable():
+    upstream = FakeUpstream(page_size=10)
+    upstream.publish(*(make_post("acct", i) for i in range(30)))
+    scheduler = make_scheduler(upstream, max_pages_per_account=1)
+    store = scheduler.store
+
+    crawls = [asyncio.run(scheduler.crawl_account("acct")) for _ in range(3)]
+
+    assert [c.new_posts for c in crawls] == [10, 10, 10]
+    state = store.get_account("acct")
+    assert state.high_water_mark == START + timedelta(minutes=29)
+    assert state.resume_cursor is None
+    assert state.pending_mark is None
+
+    # Posts published while the backlog was fetched are picked up next
+    upstream.publish(make_post("acct", 30), make_post("acct", 31))
+    latest = asyncio.run(scheduler.crawl_account("acct"))
+    assert latest.new_posts == 2
+    assert store.query_posts(limit=100)[1] == 32
+
+
+def test_exhausted_request_budget_resumes_next_run():
+    upstream = FakeUpstream(page_size=10)
+    upstream.publish(*(make_post("acct", i) for i in range(25)))
+    scheduler = make_scheduler(upstream)
+
+    first = asyncio.run(scheduler.crawl(["acct"], request_budget=1))
+    second = asyncio.run(scheduler.crawl(["acct"]))
+
+    assert first.new_posts == 10
+    assert second.new_posts == 15
+    assert scheduler.store.get_account("acct").high_water_mark == START + timedelta(
+        minutes=24
+    )
+
+
+def test_crawl_prioritizes_viral_accounts_within_request_budget():
+    upstream = FakeUpstream(page_size=10)
+    upstream.publish(*(make_post("viral", i, percentile=99.5) for i in range(5)))
+    upstream.publish(*(make_post("quiet", i) for i in range(5)))
+    scheduler = make_scheduler(upstream, max_concurrency=1)
+    store = scheduler.store
+    store.record_crawl("viral", 4, 40, 10, 8, None)
+    store.record_crawl("quiet", 20, 200, 10, 0, None)
+
+    assert scheduler.plan(["quiet", "new", "viral"]) == ["viral", "new", "quiet"]
+
+    report = asyncio.run(scheduler.crawl(["quiet", "viral"], request_budget=1))
+    assert [(a.account_id, a.skipped) for a in report.accounts] == [
+        ("viral", False),
+        ("quiet", True),
+    ]
+    assert report.requests == 1
+    assert report.new_posts == 5
+    assert upstream.requests == {"viral": 1}
+
+
+def test_concurrent_crawls_share_rate_budget():
+    upstream = FakeUpstream(page_size=10, latency=0.05)
+    accounts = [f"acct_{i}" for i in range(4)]
+    for account_id in accounts:
+        upstream.publish(*(make_post(account_id, i) for i in range(5)))
+    budget = RateBudget(requests_per_second=20, burst=2)
+    scheduler = CrawlScheduler(PostStore(), upstream, budget, max_concurrency=4)
+
+    start = time.perf_counter()
+    report = asyncio.run(scheduler.crawl(accounts))
+    elapsed = time.perf_counter() - start
+
+    assert report.requests == 4
+    assert report.new_posts == 20
+    # Two requests from the burst, then one per 50 ms
+    assert elapsed >= 0.09
+
+
+def test_rate_budget_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        RateBudget(requests_per_second=0)
+
+
+def test_endpoints_use_store_and_upstream():
+    from services.viral_scraper import main
+
+    account_id = f"crawl_account_{uuid.uuid4().hex[:8]}"
+    upstream = FakeUpstream(page_size=10)
+    upstream.publish(
+        *(
+            make_post(account_id, i, percentile=99.5 if i < 3 else 50.0)
+            for i in range(12)
+        )
+    )
+    client = TestClient(main.app)
+
+    assert client.post("/crawl").status_code == 503
+
+    main.configure_upstream(upstream)
+    try:
+        response = client.post(f"/scrape/account/{account_id}")
+        data = response.json()
+        assert data["status"] == "completed"
+        assert data["posts_scraped"] == 12
+        assert data["new_posts"] == 12
+
+        response = client.get(
+            "/viral-posts",
+            params={"account_id": account_id, "top_1_percent_only": True},
+        )
+        data = response.json()
+        assert data["total_count"] == 3
+        assert all(p["account_id"] == account_id for p in data["posts"])
+
+        response = client.post("/crawl", json={"account_ids": [account_id]})
+        data = response.json()
+        assert data["requests"] == 1
+        assert data["new_posts"] == 0
+
+        stats = {
+            a["account_id"]: a for a in client.get("/crawl/stats").json()["accounts"]
+        }
+        assert stats[account_id]["crawls"] == 2
+        assert stats[account_id]["viral_posts"] == 3
+
+        metrics = client.get("/metrics").text
+        assert "viral_scraper_new_posts_total" in metrics
+    finally:
+        main.configure_upstream(None)